@@ -12,7 +12,8 @@ from responses import (
     handle_exceptions
 )
 from validation import validate_boat_registration, sanitize_dict, boat_registration_schema
-from database import get_db_client, get_timestamp
+from database import get_db_client, get_timestamp, race_index_keys
+from team_activity import record_team_activity, BOAT_COUNT
 from auth_utils import require_admin
 from boat_registration_utils import (
     get_required_seats_for_boat_type,
@@ -140,8 +141,13 @@ def lambda_handler(event, context):
         'created_at': get_timestamp(),
         'updated_at': get_timestamp()
     }
+    boat_registration_item.update(race_index_keys(
+        boat_registration_item['race_id'],
+        boat_registration_item['created_at']
+    ))
     
     db.put_item(boat_registration_item)
+    record_team_activity(db, team_manager_id, BOAT_COUNT, 1)
     logger.info(f"Admin created boat registration: {boat_registration_id} for team manager: {team_manager_id}")
     
     # Return success response
@@ -10,6 +10,7 @@ from datetime import datetime
 from responses import success_response, validation_error, handle_exceptions
 from auth_utils import require_admin
 from database import get_db_client
+from team_activity import record_team_activity, CREW_COUNT
 from validation import validate_crew_member
 
 logger = logging.getLogger()
@@ -110,7 +111,8 @@ def lambda_handler(event, context):
         }
         
         # Save to DynamoDB
-        db.table.put_item(Item=crew_member)
+        db.put_item(crew_member)
+        record_team_activity(db, team_manager_id, CREW_COUNT, 1)
         
         logger.info(f"Admin created crew member {crew_id} for team manager {team_manager_id}")
         
@@ -12,6 +12,7 @@ from responses import (
     handle_exceptions
 )
 from database import get_db_client
+from team_activity import record_team_activity, BOAT_COUNT
 from auth_utils import require_admin
 
 logger = logging.getLogger()
@@ -82,10 +83,13 @@ def lambda_handler(event, context):
                 logger.info(f"Admin unassigned crew member {crew_member_id} from boat {boat_registration_id}")
     
     # Delete boat registration
-    db.delete_item(
+    deleted = db.delete_item(
         pk=f'TEAM#{team_manager_id}',
         sk=f'BOAT#{boat_registration_id}'
     )
+    # A concurrent or retried delete may have removed the boat already
+    if deleted.get('Attributes'):
+        record_team_activity(db, team_manager_id, BOAT_COUNT, -1)
     
     logger.info(f"Admin deleted boat registration: {boat_registration_id}")
     
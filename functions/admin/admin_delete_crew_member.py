@@ -8,6 +8,7 @@ import logging
 from responses import success_response, validation_error, not_found_error, handle_exceptions
 from auth_utils import require_admin
 from database import get_db_client
+from team_activity import record_team_activity, CREW_COUNT
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -63,12 +64,16 @@ def lambda_handler(event, context):
             )
         
         # Delete crew member
-        db.table.delete_item(
+        deleted = db.table.delete_item(
             Key={
                 'PK': f'TEAM#{team_manager_id}',
                 'SK': f'CREW#{crew_member_id}'
-            }
+            },
+            ReturnValues='ALL_OLD'
         )
+        # A concurrent or retried delete may have removed the crew member already
+        if deleted.get('Attributes'):
+            record_team_activity(db, team_manager_id, CREW_COUNT, -1)
         
         logger.info(f"Admin deleted crew member {crew_member_id} for team manager {team_manager_id}")
         
@@ -112,26 +112,8 @@ def lambda_handler(event, context):
             )
             boats = response.get('Items', [])
         else:
-            # Scan all boats across all team managers
-            response = db.table.scan(
-                FilterExpression='begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':sk_prefix': 'BOAT#'
-                }
-            )
-            
-            boats = response.get('Items', [])
-            
-            # Handle pagination if needed
-            while 'LastEvaluatedKey' in response:
-                response = db.table.scan(
-                    FilterExpression='begins_with(SK, :sk_prefix)',
-                    ExpressionAttributeValues={
-                        ':sk_prefix': 'BOAT#'
-                    },
-                    ExclusiveStartKey=response['LastEvaluatedKey']
-                )
-                boats.extend(response.get('Items', []))
+            # Query all boats across all team managers on the entity index
+            boats = db.list_entities('BOAT')
         
         # Get pricing configuration once
         config_manager = ConfigurationManager()
@@ -60,26 +60,8 @@ def lambda_handler(event, context):
             )
             crew_members = response.get('Items', [])
         else:
-            # Scan all crew members across all team managers
-            response = db.table.scan(
-                FilterExpression='begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':sk_prefix': 'CREW#'
-                }
-            )
-            
-            crew_members = response.get('Items', [])
-            
-            # Handle pagination if needed
-            while 'LastEvaluatedKey' in response:
-                response = db.table.scan(
-                    FilterExpression='begins_with(SK, :sk_prefix)',
-                    ExpressionAttributeValues={
-                        ':sk_prefix': 'CREW#'
-                    },
-                    ExclusiveStartKey=response['LastEvaluatedKey']
-                )
-                crew_members.extend(response.get('Items', []))
+            # Query all crew members across all team managers on the entity index
+            crew_members = db.list_entities('CREW')
         
         # Get team manager information for each crew member
         # Note: Crew members include license verification fields if present:
@@ -12,14 +12,14 @@ from responses import (
     handle_exceptions
 )
 from validation import validate_boat_registration, sanitize_dict, sanitize_xss, boat_registration_schema
-from database import get_db_client, get_timestamp
+from database import get_db_client, get_timestamp, race_index_keys, item_edition, RACE_INDEX_KEYS
 from auth_utils import require_admin
 from boat_registration_utils import (
     calculate_registration_status,
     detect_multi_club_crew,
     get_assigned_crew_members,
     calculate_boat_club_info,
-    generate_boat_number
+    allocate_boat_number
 )
 
 logger = logging.getLogger()
@@ -151,33 +151,12 @@ def lambda_handler(event, context):
                         if display_order == 0:
                             logger.warning(f"Race missing display_order: {new_race_id}, using 0 as fallback")
                         
-                        # Scan all boats with the same race_id
-                        from boto3.dynamodb.conditions import Attr
-                        response = db.table.scan(
-                            FilterExpression=Attr('race_id').eq(new_race_id) & Attr('SK').begins_with('BOAT#')
-                        )
-                        all_boats_in_race = response.get('Items', [])
-                        
-                        # Handle pagination
-                        while 'LastEvaluatedKey' in response:
-                            response = db.table.scan(
-                                FilterExpression=Attr('race_id').eq(new_race_id) & Attr('SK').begins_with('BOAT#'),
-                                ExclusiveStartKey=response['LastEvaluatedKey']
-                            )
-                            all_boats_in_race.extend(response.get('Items', []))
-                        
-                        # Filter out the current boat from the list
-                        all_boats_in_race = [
-                            b for b in all_boats_in_race 
-                            if b.get('boat_registration_id') != boat_registration_id
-                        ]
-                        
-                        # Generate boat_number
-                        boat_number = generate_boat_number(
+                        # Allocate boat_number from the race's sequence counter
+                        boat_number = allocate_boat_number(
+                            db,
                             event_type=event_type,
                             display_order=display_order,
-                            race_id=new_race_id,
-                            all_boats_in_race=all_boats_in_race
+                            race_id=new_race_id
                         )
                         update_data['boat_number'] = boat_number
                         logger.info(f"Generated boat_number: {boat_number}")
@@ -245,11 +224,25 @@ def lambda_handler(event, context):
     # Update timestamp
     update_data['updated_at'] = get_timestamp()
     
+    # Keep the race index in step with race_id (index keys cannot be null)
+    remove = None
+    if 'race_id' in update_data:
+        index_keys = race_index_keys(
+            update_data['race_id'],
+            existing_boat.get('created_at') or update_data['updated_at'],
+            item_edition(existing_boat)
+        )
+        if index_keys:
+            update_data.update(index_keys)
+        else:
+            remove = list(RACE_INDEX_KEYS)
+    
     # Update boat registration in DynamoDB
     updated_boat = db.update_item(
         pk=f'TEAM#{team_manager_id}',
         sk=f'BOAT#{boat_registration_id}',
-        updates=update_data
+        updates=update_data,
+        remove=remove
     )
     
     logger.info(f"Admin updated boat registration: {boat_registration_id}")
@@ -5,10 +5,12 @@ Admin only - allows marking multiple licenses as verified in one request
 import json
 import os
 import logging
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr
 
 # Import from Lambda layer
 from responses import success_response, validation_error, handle_exceptions
-from database import get_db_client, get_timestamp
+from database import get_db_client, get_timestamp, is_conditional_check_failure
 from auth_utils import require_admin, get_user_from_event
 from access_control import require_permission
 
@@ -23,6 +25,9 @@ VALID_STATUSES = [
     'manually_verified_invalid'
 ]
 
+# Verifications written per TransactWriteItems call
+TRANSACTION_CHUNK_SIZE = 25
+
 
 @handle_exceptions
 @require_admin
@@ -71,8 +76,9 @@ def lambda_handler(event, context):
     db = get_db_client()
     current_timestamp = get_timestamp()
     
-    # Process each verification
+    # Validate each verification
     results = []
+    valid_entries = []
     success_count = 0
     failure_count = 0
     
@@ -81,6 +87,7 @@ def lambda_handler(event, context):
             'crew_member_id': verification.get('crew_member_id'),
             'success': False
         }
+        results.append(result)
         
         try:
             # Validate verification object
@@ -93,72 +100,115 @@ def lambda_handler(event, context):
             if not crew_member_id:
                 result['error'] = 'Crew member ID is required'
                 failure_count += 1
-                results.append(result)
                 continue
             
             if not team_manager_id:
                 result['error'] = 'Team manager ID is required'
                 failure_count += 1
-                results.append(result)
                 continue
             
             if not status:
                 result['error'] = 'Verification status is required'
                 failure_count += 1
-                results.append(result)
                 continue
             
             if status not in VALID_STATUSES:
                 result['error'] = f'Invalid status: {status}'
                 failure_count += 1
-                results.append(result)
                 continue
             
             # Validate details length
             if details and len(details) > 500:
                 result['error'] = 'Details must be 500 characters or less'
                 failure_count += 1
-                results.append(result)
-                continue
-            
-            # Get crew member
-            crew_member = db.get_item(
-                pk=f'TEAM#{team_manager_id}',
-                sk=f'CREW#{crew_member_id}'
-            )
-            
-            if not crew_member:
-                result['error'] = 'Crew member not found'
-                failure_count += 1
-                results.append(result)
                 continue
             
-            # Update crew member with verification fields
-            crew_member['license_verification_status'] = status
-            crew_member['license_verification_date'] = current_timestamp
-            crew_member['license_verification_details'] = details if details else None
-            crew_member['license_verified_by'] = admin_user_id
-            crew_member['updated_at'] = current_timestamp
-            
-            # Save to database
-            db.put_item(crew_member)
+            valid_entries.append((result, crew_member_id, team_manager_id, status, details))
             
-            # Success
+        except Exception as e:
+            logger.error(f"Error validating crew member {verification.get('crew_member_id')}: {str(e)}")
+            result['error'] = str(e)
+            failure_count += 1
+    
+    # Crew members that exist, from one bulk read (a missing one would cancel
+    # the whole transaction of its chunk)
+    existing_keys = {
+        (crew['PK'], crew['SK']) for crew in db.batch_get_items(
+            [(f'TEAM#{team_manager_id}', f'CREW#{crew_member_id}')
+             for _, crew_member_id, team_manager_id, _, _ in valid_entries]
+        )
+    }
+    
+    # Group the writes into transactions of up to TRANSACTION_CHUNK_SIZE updates,
+    # never twice the same crew member in one transaction
+    chunks = []
+    chunk_keys = set()
+    for entry in valid_entries:
+        result, crew_member_id, team_manager_id, status, details = entry
+        key = (f'TEAM#{team_manager_id}', f'CREW#{crew_member_id}')
+        if key not in existing_keys:
+            result['error'] = 'Crew member not found'
+            failure_count += 1
+            continue
+        if not chunks or len(chunks[-1]) >= TRANSACTION_CHUNK_SIZE or key in chunk_keys:
+            chunks.append([])
+            chunk_keys = set()
+        chunks[-1].append(entry)
+        chunk_keys.add(key)
+    
+    def verification_update(crew_member_id, team_manager_id, status, details):
+        # Only the verification fields are written; the condition keeps a crew
+        # member deleted since the read from being recreated as a partial item
+        return {
+            'pk': f'TEAM#{team_manager_id}',
+            'sk': f'CREW#{crew_member_id}',
+            'updates': {
+                'license_verification_status': status,
+                'license_verification_date': current_timestamp,
+                'license_verification_details': details if details else None,
+                'license_verified_by': admin_user_id,
+                'updated_at': current_timestamp
+            },
+            'condition_expression': Attr('PK').exists()
+        }
+    
+    for chunk in chunks:
+        try:
+            db.transact_update_items([verification_update(*entry[1:]) for entry in chunk])
+            applied = chunk
+        except ClientError as e:
+            # A cancelled chunk is written item by item, so only the crew
+            # members that actually fail are reported
+            logger.info(f"Verification transaction cancelled, updating {len(chunk)} crew members one by one: {e}")
+            applied = []
+            for entry in chunk:
+                result, crew_member_id = entry[0], entry[1]
+                update = verification_update(*entry[1:])
+                try:
+                    db.update_item(
+                        pk=update['pk'],
+                        sk=update['sk'],
+                        updates=update['updates'],
+                        condition_expression=update['condition_expression']
+                    )
+                except ClientError as e:
+                    if is_conditional_check_failure(e):
+                        result['error'] = 'Crew member not found'
+                    else:
+                        logger.error(f"Error updating crew member {crew_member_id}: {str(e)}")
+                        result['error'] = str(e)
+                    failure_count += 1
+                    continue
+                applied.append(entry)
+        
+        for result, crew_member_id, team_manager_id, status, details in applied:
             result['success'] = True
             result['status'] = status
             result['date'] = current_timestamp
             result['verified_by'] = admin_user_id
             result['details'] = details if details else None
             success_count += 1
-            results.append(result)
-            
             logger.info(f"License verification updated for crew member {crew_member_id}")
-            
-        except Exception as e:
-            logger.error(f"Error updating crew member {verification.get('crew_member_id')}: {str(e)}")
-            result['error'] = str(e)
-            failure_count += 1
-            results.append(result)
     
     logger.info(f"Bulk verification complete: {success_count} succeeded, {failure_count} failed")
     
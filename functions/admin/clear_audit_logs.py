@@ -15,7 +15,9 @@ import os
 from datetime import datetime
 from decimal import Decimal
 from boto3.dynamodb.conditions import Key
-import boto3
+
+from aws_clients import get_dynamodb_resource
+from access_control import audit_ttl
 
 
 def decimal_default(obj):
@@ -37,7 +39,7 @@ def lambda_handler(event, context):
     - timestamp: When the operation was performed
     """
     # Initialize DynamoDB
-    dynamodb = boto3.resource('dynamodb')
+    dynamodb = get_dynamodb_resource()
     table_name = os.environ.get('DYNAMODB_TABLE') or os.environ.get('TABLE_NAME')
     table = dynamodb.Table(table_name)
     
@@ -101,7 +103,8 @@ def lambda_handler(event, context):
                 'action': 'clear_audit_logs',
                 'timestamp': timestamp,
                 'deleted_count': total_deleted,
-                'description': f'Cleared all audit logs ({total_deleted} entries)'
+                'description': f'Cleared all audit logs ({total_deleted} entries)',
+                **audit_ttl()
             }
         )
         
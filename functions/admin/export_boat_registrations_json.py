@@ -8,8 +8,9 @@ from datetime import datetime
 
 from responses import success_response, handle_exceptions, internal_error
 from auth_utils import require_admin
-from database import get_db_client, decimal_to_float
+from database import decimal_to_float
 from race_eligibility import calculate_age
+from registration_snapshot import get_export_db_client
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -21,36 +22,21 @@ def lambda_handler(event, context):
     """
     Export all boat registrations as JSON with race names and team manager information
     
+    Query parameters:
+        mode: 'fast' to read the registration snapshot instead of the table
+            (data as of snapshot_watermark)
+    
     Returns:
         JSON response with boat registration data including all boats regardless of status
     """
     logger.info("Admin export boat registrations JSON request")
     
-    db = get_db_client()
+    db, snapshot_watermark = get_export_db_client(event)
     
     try:
-        # Scan all boat registrations across all team managers
+        # Query all boat registrations across all team managers on the entity index
         # Include ALL boats regardless of status (no filtering)
-        response = db.table.scan(
-            FilterExpression='begins_with(SK, :sk_prefix)',
-            ExpressionAttributeValues={
-                ':sk_prefix': 'BOAT#'
-            }
-        )
-        
-        boats = response.get('Items', [])
-        
-        # Handle pagination for large datasets
-        while 'LastEvaluatedKey' in response:
-            logger.info(f"Paginating boat registrations scan, current count: {len(boats)}")
-            response = db.table.scan(
-                FilterExpression='begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':sk_prefix': 'BOAT#'
-                },
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            boats.extend(response.get('Items', []))
+        boats = db.list_entities('BOAT')
         
         logger.info(f"Found {len(boats)} boat registrations")
         
@@ -202,7 +188,9 @@ def lambda_handler(event, context):
         return success_response(data={
             'boats': boats,
             'total_count': len(boats),
-            'exported_at': datetime.utcnow().isoformat() + 'Z'
+            'exported_at': datetime.utcnow().isoformat() + 'Z',
+            'source': 'snapshot' if snapshot_watermark else 'live',
+            'snapshot_watermark': snapshot_watermark
         })
         
     except Exception as e:
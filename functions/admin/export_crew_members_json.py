@@ -8,8 +8,9 @@ from datetime import datetime
 
 from responses import success_response, handle_exceptions, internal_error
 from auth_utils import require_admin
-from database import get_db_client, decimal_to_float
+from database import decimal_to_float
 from race_eligibility import calculate_age
+from registration_snapshot import get_export_db_client
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -21,35 +22,20 @@ def lambda_handler(event, context):
     """
     Export all crew members as JSON
     
+    Query parameters:
+        mode: 'fast' to read the registration snapshot instead of the table
+            (data as of snapshot_watermark)
+    
     Returns:
         JSON response with crew member data and team manager information
     """
     logger.info("Admin export crew members JSON request")
     
-    db = get_db_client()
+    db, snapshot_watermark = get_export_db_client(event)
     
     try:
-        # Scan all crew members across all team managers
-        response = db.table.scan(
-            FilterExpression='begins_with(SK, :sk_prefix)',
-            ExpressionAttributeValues={
-                ':sk_prefix': 'CREW#'
-            }
-        )
-        
-        crew_members = response.get('Items', [])
-        
-        # Handle pagination for large datasets
-        while 'LastEvaluatedKey' in response:
-            logger.info(f"Paginating crew members scan, current count: {len(crew_members)}")
-            response = db.table.scan(
-                FilterExpression='begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':sk_prefix': 'CREW#'
-                },
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            crew_members.extend(response.get('Items', []))
+        # Query all crew members across all team managers on the entity index
+        crew_members = db.list_entities('CREW')
         
         logger.info(f"Found {len(crew_members)} crew members")
         
@@ -177,7 +163,9 @@ def lambda_handler(event, context):
         return success_response(data={
             'crew_members': crew_members,
             'total_count': len(crew_members),
-            'exported_at': datetime.utcnow().isoformat() + 'Z'
+            'exported_at': datetime.utcnow().isoformat() + 'Z',
+            'source': 'snapshot' if snapshot_watermark else 'live',
+            'snapshot_watermark': snapshot_watermark
         })
         
     except Exception as e:
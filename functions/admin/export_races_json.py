@@ -8,12 +8,30 @@ from datetime import datetime
 
 from responses import success_response, handle_exceptions, internal_error
 from auth_utils import require_admin
-from database import get_db_client, decimal_to_float
+from database import decimal_to_float
 from race_eligibility import calculate_age
+from registration_snapshot import get_export_db_client
+from configuration import ConfigurationManager
+from team_summary import get_team_summaries
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Attributes read from DynamoDB for each exported entity
+TEAM_MANAGER_EXPORT_ATTRIBUTES = [
+    'PK', 'club_affiliation', 'email', 'first_name', 'last_name', 'mobile_number'
+]
+BOAT_EXPORT_ATTRIBUTES = [
+    'PK', 'boat_registration_id', 'boat_number', 'race_id', 'event_type', 'boat_type',
+    'registration_status', 'forfait', 'boat_club_display', 'club_list', 'seats',
+    'crew_composition', 'is_multi_club_crew', 'assigned_boat_identifier',
+    'assigned_boat_comment', 'created_at', 'updated_at', 'paid_at'
+]
+CREW_EXPORT_ATTRIBUTES = [
+    'crew_member_id', 'first_name', 'last_name', 'date_of_birth', 'gender',
+    'license_number', 'club_affiliation'
+]
+
 
 @handle_exceptions
 @require_admin
@@ -21,6 +39,12 @@ def lambda_handler(event, context):
     """
     Export all races, boats, crew members, and team managers as JSON
     
+    Query parameters:
+        race_id: Optional race ID to export a single race (its boats are
+            read from the race index, with only their crew and team managers)
+        mode: 'fast' to read the registration snapshot instead of the table
+            (data as of snapshot_watermark)
+    
     Returns:
         JSON response with comprehensive race data including:
         - System configuration (competition date)
@@ -31,22 +55,20 @@ def lambda_handler(event, context):
     """
     logger.info("Admin export races JSON request")
     
-    db = get_db_client()
+    db, snapshot_watermark = get_export_db_client(event)
     
     try:
+        # Configuration is not part of the snapshot, it is always read live
+        # (system, race timing and pricing in one query)
+        config_manager = ConfigurationManager(bundle=True)
+        
         # Get system configuration (competition date)
-        config_response = db.table.get_item(
-            Key={'PK': 'CONFIG', 'SK': 'SYSTEM'}
-        )
-        config = config_response.get('Item', {})
+        config = config_manager.get_system_config()
         competition_date = config.get('competition_date', '2025-05-01')
         logger.info(f"Competition date: {competition_date}")
         
         # Get race timing configuration
-        race_timing_response = db.table.get_item(
-            Key={'PK': 'CONFIG', 'SK': 'RACE_TIMING'}
-        )
-        race_timing = race_timing_response.get('Item', {})
+        race_timing = config_manager.get_race_timing_config()
         marathon_start_time = race_timing.get('marathon_start_time', '07:45')
         semi_marathon_start_time = race_timing.get('semi_marathon_start_time', '09:00')
         semi_marathon_interval_seconds = race_timing.get('semi_marathon_interval_seconds', 30)
@@ -54,86 +76,32 @@ def lambda_handler(event, context):
         semi_marathon_bow_start = race_timing.get('semi_marathon_bow_start', 41)
         logger.info(f"Race timing - Marathon: {marathon_start_time}, Semi-Marathon: {semi_marathon_start_time}, Interval: {semi_marathon_interval_seconds}s, Bow starts: M={marathon_bow_start}, SM={semi_marathon_bow_start}")
         
-        # Get all races
-        races_response = db.table.query(
-            KeyConditionExpression='PK = :pk',
-            ExpressionAttributeValues={
-                ':pk': 'RACE'
-            }
-        )
-        races = races_response.get('Items', [])
-        logger.info(f"Found {len(races)} races")
-        
-        # Get all boat registrations (include ALL boats regardless of status)
-        boats_response = db.table.scan(
-            FilterExpression='begins_with(SK, :sk_prefix)',
-            ExpressionAttributeValues={
-                ':sk_prefix': 'BOAT#'
-            }
-        )
-        boats = boats_response.get('Items', [])
-        
-        # Handle pagination for boats
-        while 'LastEvaluatedKey' in boats_response:
-            logger.info(f"Paginating boats scan, current count: {len(boats)}")
-            boats_response = db.table.scan(
-                FilterExpression='begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':sk_prefix': 'BOAT#'
-                },
-                ExclusiveStartKey=boats_response['LastEvaluatedKey']
-            )
-            boats.extend(boats_response.get('Items', []))
-        
-        logger.info(f"Found {len(boats)} boat registrations (all statuses)")
-        
-        # Get all crew members
-        crew_response = db.table.scan(
-            FilterExpression='begins_with(SK, :sk_prefix)',
-            ExpressionAttributeValues={
-                ':sk_prefix': 'CREW#'
-            }
-        )
-        crew_members = crew_response.get('Items', [])
-        
-        # Handle pagination for crew members
-        while 'LastEvaluatedKey' in crew_response:
-            logger.info(f"Paginating crew members scan, current count: {len(crew_members)}")
-            crew_response = db.table.scan(
-                FilterExpression='begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':sk_prefix': 'CREW#'
-                },
-                ExclusiveStartKey=crew_response['LastEvaluatedKey']
-            )
-            crew_members.extend(crew_response.get('Items', []))
-        
-        logger.info(f"Found {len(crew_members)} crew members")
-        
-        # Get all team managers (users with PROFILE)
-        users_response = db.table.scan(
-            FilterExpression='SK = :sk',
-            ExpressionAttributeValues={
-                ':sk': 'PROFILE'
-            }
-        )
-        team_managers = users_response.get('Items', [])
-        
-        # Handle pagination for team managers
-        while 'LastEvaluatedKey' in users_response:
-            logger.info(f"Paginating team managers scan, current count: {len(team_managers)}")
-            users_response = db.table.scan(
-                FilterExpression='SK = :sk',
-                ExpressionAttributeValues={
-                    ':sk': 'PROFILE'
-                },
-                ExclusiveStartKey=users_response['LastEvaluatedKey']
+        query_params = event.get('queryStringParameters') or {}
+        race_id = query_params.get('race_id')
+        
+        if race_id:
+            # Single race: bounded reads on the race index and by key
+            race = db.get_item('RACE', race_id)
+            races = [race] if race else []
+            boats = db.list_race_boats(race_id, attributes=BOAT_EXPORT_ATTRIBUTES)
+            team_manager_ids = {boat.get('PK', '').replace('TEAM#', '') for boat in boats}
+            team_managers = db.batch_get_items(
+                [(f'USER#{user_id}', 'PROFILE') for user_id in team_manager_ids]
             )
-            team_managers.extend(users_response.get('Items', []))
-        
-        logger.info(f"Found {len(team_managers)} team managers")
+            crew_members = db.batch_get_items([
+                (boat['PK'], f"CREW#{seat['crew_member_id']}")
+                for boat in boats
+                for seat in boat.get('seats', [])
+                if seat.get('crew_member_id')
+            ])
+        else:
+            races = list(db.iter_query('RACE'))
+            boats = db.iter_entities('BOAT', attributes=BOAT_EXPORT_ATTRIBUTES)
+            team_managers = db.iter_entities('PROFILE', attributes=TEAM_MANAGER_EXPORT_ATTRIBUTES)
+            crew_members = db.iter_entities('CREW', attributes=CREW_EXPORT_ATTRIBUTES)
+        logger.info(f"Found {len(races)} races")
         
-        # Cache team manager lookups for performance
+        # Get team managers (users with PROFILE), reading only the exported fields
         team_manager_cache = {}
         for tm in team_managers:
             user_id = tm.get('PK', '').replace('USER#', '')
@@ -146,59 +114,21 @@ def lambda_handler(event, context):
                 'phone': tm.get('mobile_number', '')  # Database field is 'mobile_number'
             }
         
-        # Calculate payment balance for each team manager
-        logger.info("Calculating payment balances for team managers")
-        for user_id in team_manager_cache.keys():
-            # Query payments for this team manager
-            payments_response = db.table.query(
-                KeyConditionExpression='PK = :pk AND begins_with(SK, :sk_prefix)',
-                ExpressionAttributeValues={
-                    ':pk': f'TEAM#{user_id}',
-                    ':sk_prefix': 'PAYMENT#'
-                }
-            )
-            payments = payments_response.get('Items', [])
-            
-            # Calculate total paid
-            total_paid = sum(float(p.get('amount', 0)) for p in payments)
-            
-            # Query unpaid boats (status='complete')
-            unpaid_boats_response = db.table.query(
-                KeyConditionExpression='PK = :pk AND begins_with(SK, :sk_prefix)',
-                FilterExpression='registration_status = :status',
-                ExpressionAttributeValues={
-                    ':pk': f'TEAM#{user_id}',
-                    ':sk_prefix': 'BOAT#',
-                    ':status': 'complete'
-                }
-            )
-            unpaid_boats = unpaid_boats_response.get('Items', [])
-            
-            # Calculate outstanding balance
-            outstanding_balance = 0.0
-            for boat in unpaid_boats:
-                # Use locked_pricing if available, otherwise pricing
-                if boat.get('locked_pricing') and boat['locked_pricing'].get('total'):
-                    outstanding_balance += float(boat['locked_pricing']['total'])
-                elif boat.get('pricing') and boat['pricing'].get('total'):
-                    outstanding_balance += float(boat['pricing']['total'])
-            
-            # Determine payment status
-            if outstanding_balance == 0 and total_paid > 0:
-                payment_status = 'Paid in Full'
-            elif total_paid > 0 and outstanding_balance > 0:
-                payment_status = 'Partial Payment'
-            else:
-                payment_status = 'No Payment'
-            
-            # Add payment fields to team manager cache
-            team_manager_cache[user_id]['total_paid'] = round(total_paid, 2)
-            team_manager_cache[user_id]['outstanding_balance'] = round(outstanding_balance, 2)
-            team_manager_cache[user_id]['payment_status'] = payment_status
+        logger.info(f"Found {len(team_manager_cache)} team managers")
+        
+        # Payment balance of each team manager, from the team summary items
+        # (computed from the snapshot data in fast mode)
+        logger.info("Reading payment balances from team summaries")
+        pricing_config = config_manager.get_pricing_config()
+        summaries = get_team_summaries(db, list(team_manager_cache.keys()), pricing_config)
+        for user_id, summary in summaries.items():
+            team_manager_cache[user_id]['total_paid'] = round(float(summary['total_paid']), 2)
+            team_manager_cache[user_id]['outstanding_balance'] = round(float(summary['outstanding_balance']), 2)
+            team_manager_cache[user_id]['payment_status'] = summary['payment_status']
         
         logger.info(f"Calculated payment balances for {len(team_manager_cache)} team managers")
         
-        # Simplify boat data for export (keep essential fields)
+        # Stream boat registrations (ALL statuses), keeping only the exported fields
         simplified_boats = []
         for boat in boats:
             team_manager_id = boat.get('PK', '').replace('TEAM#', '')
@@ -227,7 +157,9 @@ def lambda_handler(event, context):
             }
             simplified_boats.append(simplified_boat)
         
-        # Simplify crew member data for export
+        logger.info(f"Found {len(simplified_boats)} boat registrations (all statuses)")
+        
+        # Stream crew members, keeping only the exported fields
         simplified_crew = []
         for crew in crew_members:
             # Calculate age using centralized function
@@ -249,6 +181,8 @@ def lambda_handler(event, context):
                 'age': age
             })
         
+        logger.info(f"Found {len(simplified_crew)} crew members")
+        
         # Simplify race data for export
         simplified_races = []
         for race in races:
@@ -289,7 +223,9 @@ def lambda_handler(event, context):
             'total_races': len(simplified_races),
             'total_boats': len(simplified_boats),
             'total_crew_members': len(simplified_crew),
-            'exported_at': datetime.utcnow().isoformat() + 'Z'
+            'exported_at': datetime.utcnow().isoformat() + 'Z',
+            'source': 'snapshot' if snapshot_watermark else 'live',
+            'snapshot_watermark': snapshot_watermark
         })
         
     except Exception as e:
@@ -24,8 +24,8 @@ def lambda_handler(event, context):
     """
     logger.info("Get event configuration request")
     
-    # Get system configuration
-    config_manager = ConfigurationManager()
+    # Get system configuration (with race timing, in one query)
+    config_manager = ConfigurationManager(bundle=True)
     system_config = config_manager.get_system_config()
     
     # Get race timing configuration
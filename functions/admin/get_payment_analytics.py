@@ -7,6 +7,7 @@ import logging
 from decimal import Decimal
 from datetime import datetime, timedelta
 from collections import defaultdict
+from boto3.dynamodb.conditions import Attr
 
 # Import from Lambda layer
 from responses import (
@@ -19,7 +20,7 @@ from database import get_db_client
 from auth_utils import require_admin
 from access_control import require_permission
 from configuration import ConfigurationManager
-from payment_queries import query_unpaid_boats
+from payment_queries import query_unpaid_boats, query_payments_by_date
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -34,7 +35,7 @@ def lambda_handler(event, context):
     
     Query parameters:
         - start_date: Optional ISO 8601 timestamp to filter from
-        - end_date: Optional ISO 8601 timestamp to filter to
+        - end_date: Optional ISO 8601 timestamp to filter to (paid_at <= end_date)
         - group_by: Optional grouping ('day', 'week', 'month', default: 'day')
     
     Returns:
@@ -83,35 +84,10 @@ def lambda_handler(event, context):
     db = get_db_client()
     
     try:
-        # Scan all PAYMENT# records
-        all_payments = []
-        scan_kwargs = {
-            'FilterExpression': 'begins_with(SK, :payment_prefix)',
-            'ExpressionAttributeValues': {
-                ':payment_prefix': 'PAYMENT#'
-            }
-        }
-        
-        while True:
-            response = db.table.scan(**scan_kwargs)
-            all_payments.extend(response.get('Items', []))
-            if 'LastEvaluatedKey' not in response:
-                break
-            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        # Query the payments paid in the requested range on the payment date index
+        filtered_payments = query_payments_by_date(db, start_date, end_date, newest_first=False)
         
-        logger.info(f"Scanned {len(all_payments)} total payments")
-        
-        # Apply date filters
-        filtered_payments = all_payments
-        if start_date or end_date:
-            filtered_payments = []
-            for payment in all_payments:
-                paid_at = payment.get('paid_at', '')
-                if start_date and paid_at < start_date:
-                    continue
-                if end_date and paid_at > end_date:
-                    continue
-                filtered_payments.append(payment)
+        logger.info(f"Found {len(filtered_payments)} payments")
         
         # Calculate total revenue and statistics
         total_revenue = sum(float(p.get('amount', 0)) for p in filtered_payments)
@@ -126,22 +102,11 @@ def lambda_handler(event, context):
         config_manager = ConfigurationManager()
         pricing_config = config_manager.get_pricing_config()
         
-        # Scan all unpaid boats
-        all_boats = []
-        scan_kwargs = {
-            'FilterExpression': 'begins_with(SK, :boat_prefix) AND registration_status = :status',
-            'ExpressionAttributeValues': {
-                ':boat_prefix': 'BOAT#',
-                ':status': 'complete'
-            }
-        }
-        
-        while True:
-            response = db.table.scan(**scan_kwargs)
-            all_boats.extend(response.get('Items', []))
-            if 'LastEvaluatedKey' not in response:
-                break
-            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        # Query all unpaid boats
+        all_boats = db.list_entities(
+            'BOAT',
+            filter_expression=Attr('registration_status').eq('complete')
+        )
         
         # Calculate outstanding balance with dynamic pricing recalculation
         outstanding_balance = Decimal('0')
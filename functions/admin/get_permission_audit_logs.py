@@ -12,7 +12,8 @@ import os
 from datetime import datetime
 from decimal import Decimal
 from boto3.dynamodb.conditions import Key, Attr
-import boto3
+
+from aws_clients import get_dynamodb_resource
 
 
 def decimal_default(obj):
@@ -41,7 +42,7 @@ def lambda_handler(event, context):
     - total_count: Total number of logs matching filters
     """
     # Initialize DynamoDB table
-    dynamodb = boto3.resource('dynamodb')
+    dynamodb = get_dynamodb_resource()
     table_name = os.environ.get('DYNAMODB_TABLE') or os.environ.get('TABLE_NAME')
     table = dynamodb.Table(table_name)
     
@@ -5,12 +5,12 @@ Admin only.
 import json
 import os
 import sys
-import boto3
 from botocore.exceptions import ClientError
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from shared.aws_clients import get_dynamodb_resource
 from shared.access_control import get_default_permissions
 
 def lambda_handler(event, context):
@@ -23,7 +23,7 @@ def lambda_handler(event, context):
     """
     try:
         # Initialize DynamoDB
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = get_dynamodb_resource()
         table_name = os.environ.get('DYNAMODB_TABLE') or os.environ.get('TABLE_NAME')
         table = dynamodb.Table(table_name)
         
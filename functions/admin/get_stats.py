@@ -8,6 +8,7 @@ import logging
 from responses import success_response, handle_exceptions
 from auth_utils import require_admin
 from database import get_db_client
+from dashboard_stats import STATS_PK, STATS_SK, format_stats
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -19,6 +20,9 @@ def lambda_handler(event, context):
     """
     Get admin dashboard statistics
     
+    Reads the STATS item kept up to date from the table stream
+    (see process_table_stream and rebuild_stats).
+    
     Returns:
         Statistics object with counts
     """
@@ -27,60 +31,11 @@ def lambda_handler(event, context):
     db = get_db_client()
     
     try:
-        # Count total crew members
-        crew_response = db.table.scan(
-            FilterExpression='begins_with(SK, :sk_prefix)',
-            ExpressionAttributeValues={
-                ':sk_prefix': 'CREW#'
-            },
-            Select='COUNT'
-        )
-        total_crew_members = crew_response.get('Count', 0)
-        
-        # Count total boat registrations (stored as TEAM#xxx / BOAT#xxx)
-        boat_response = db.table.scan(
-            FilterExpression='begins_with(SK, :sk_prefix)',
-            ExpressionAttributeValues={
-                ':sk_prefix': 'BOAT#'
-            },
-            Select='COUNT'
-        )
-        total_boat_registrations = boat_response.get('Count', 0)
-        
-        # Count total payments (paid boat registrations)
-        payment_response = db.table.scan(
-            FilterExpression='begins_with(SK, :sk_prefix) AND registration_status = :status',
-            ExpressionAttributeValues={
-                ':sk_prefix': 'BOAT#',
-                ':status': 'paid'
-            },
-            Select='COUNT'
-        )
-        total_payments = payment_response.get('Count', 0)
-        
-        # Count reserved rental boats (requested, confirmed, or paid)
-        rental_response = db.table.scan(
-            FilterExpression='begins_with(PK, :pk_prefix) AND SK = :sk AND (#status = :requested OR #status = :confirmed OR #status = :paid)',
-            ExpressionAttributeValues={
-                ':pk_prefix': 'RENTAL_BOAT#',
-                ':sk': 'METADATA',
-                ':requested': 'requested',
-                ':confirmed': 'confirmed',
-                ':paid': 'paid'
-            },
-            ExpressionAttributeNames={
-                '#status': 'status'
-            },
-            Select='COUNT'
-        )
-        rental_boats_reserved = rental_response.get('Count', 0)
+        stats_item = db.get_item(STATS_PK, STATS_SK)
+        if stats_item is None:
+            logger.warning("STATS item not found, run POST /admin/stats/rebuild")
         
-        stats = {
-            'total_crew_members': total_crew_members,
-            'total_boat_registrations': total_boat_registrations,
-            'total_payments': total_payments,
-            'rental_boats_reserved': rental_boats_reserved
-        }
+        stats = format_stats(stats_item)
         
         logger.info(f"Retrieved stats: {stats}")
         
@@ -88,9 +43,4 @@ def lambda_handler(event, context):
         
     except Exception as e:
         logger.error(f"Failed to get stats: {str(e)}")
-        return success_response(data={
-            'total_crew_members': 0,
-            'total_boat_registrations': 0,
-            'total_payments': 0,
-            'rental_boats_reserved': 0
-        })
+        return success_response(data=format_stats(None))
@@ -9,7 +9,8 @@ from datetime import datetime, timedelta
 from responses import success_response, validation_error, handle_exceptions
 from auth_utils import require_admin, get_user_from_event
 from database import get_db_client
-from configuration import ConfigurationManager
+from configuration import ConfigurationManager, bump_config_version
+from access_control import audit_ttl, grant_expiry_attributes
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -76,11 +77,15 @@ def lambda_handler(event, context):
             'granted_by_admin_id': admin_user_id,
             'status': 'active',
             'hours': hours,
-            'notes': body.get('notes', '')
+            'notes': body.get('notes', ''),
+            **grant_expiry_attributes(expiration_timestamp)
         }
         
         db.table.put_item(Item=grant_item)
         
+        # Let warm containers drop their cached "no active grant" lookups
+        bump_config_version(db.table)
+        
         logger.info(f"Granted temporary access to user {user_id} for {hours} hours by admin {admin_user_id}")
         
         # Log the grant creation to audit log
@@ -93,7 +98,8 @@ def lambda_handler(event, context):
             'expiration_timestamp': expiration_timestamp.isoformat() + 'Z',
             'hours': hours,
             'action': 'grant_created',
-            'notes': body.get('notes', '')
+            'notes': body.get('notes', ''),
+            **audit_ttl(grant_timestamp)
         }
         
         try:
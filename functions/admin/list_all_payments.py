@@ -18,6 +18,7 @@ from auth_utils import require_admin
 from access_control import require_permission
 from payment_formatters import format_payment_list_response, sort_payments_by_field
 from payment_calculations import calculate_payment_summary_stats
+from payment_queries import query_payments_by_date, query_payments_by_team
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -32,7 +33,7 @@ def lambda_handler(event, context):
     
     Query parameters:
         - start_date: Optional ISO 8601 timestamp to filter from
-        - end_date: Optional ISO 8601 timestamp to filter to
+        - end_date: Optional ISO 8601 timestamp to filter to (paid_at <= end_date)
         - team_manager_id: Optional filter by specific team manager
         - limit: Optional maximum number of payments to return
         - sort_by: Optional sort field ('date', 'amount', 'team_manager_name', 'club')
@@ -92,47 +93,14 @@ def lambda_handler(event, context):
     db = get_db_client()
     
     try:
-        # Scan all PAYMENT# records across all teams
-        all_payments = []
-        
-        # Use scan with filter expression
-        scan_kwargs = {
-            'FilterExpression': 'begins_with(SK, :payment_prefix)',
-            'ExpressionAttributeValues': {
-                ':payment_prefix': 'PAYMENT#'
-            }
-        }
-        
-        # Scan with pagination
-        while True:
-            response = db.table.scan(**scan_kwargs)
-            all_payments.extend(response.get('Items', []))
-            
-            # Check if there are more items
-            if 'LastEvaluatedKey' not in response:
-                break
-            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
-        
-        logger.info(f"Scanned {len(all_payments)} total payments")
-        
-        # Apply date filters
-        if start_date or end_date:
-            filtered_payments = []
-            for payment in all_payments:
-                paid_at = payment.get('paid_at', '')
-                if start_date and paid_at < start_date:
-                    continue
-                if end_date and paid_at > end_date:
-                    continue
-                filtered_payments.append(payment)
-            all_payments = filtered_payments
-        
-        # Apply team manager filter
+        # Query the payments paid in the requested range; every matching
+        # payment is needed for the totals, so the limit is applied later
         if team_manager_filter:
-            all_payments = [
-                p for p in all_payments
-                if p.get('team_manager_id') == team_manager_filter
-            ]
+            all_payments = query_payments_by_team(db, team_manager_filter, start_date, end_date)
+        else:
+            all_payments = query_payments_by_date(db, start_date, end_date)
+        
+        logger.info(f"Found {len(all_payments)} payments")
         
         # Cache team manager lookups for performance
         team_manager_cache = {}
@@ -1,21 +1,24 @@
 """
 Lambda function for admin to list all team managers
 Admin only - retrieves all users who have created boats or crew members
+(from the boat_count/crew_count activity counters on their profiles)
 """
 import json
 import logging
 import os
 from decimal import Decimal
-import boto3
 
 from responses import success_response, validation_error, handle_exceptions
 from auth_utils import require_admin
 from database import get_db_client
+from team_activity import team_manager_filter
+from aws_clients import LazyClient
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-cognito = boto3.client('cognito-idp')
+# Built on first use by the shared client registry
+cognito = LazyClient('cognito-idp')
 
 
 def decimal_to_float(obj):
@@ -44,25 +47,12 @@ def lambda_handler(event, context):
     user_pool_id = os.environ.get('USER_POOL_ID')
     
     try:
-        # Query all user profiles
+        # Query the profiles of users with boats or crew members (one paginated
+        # query on the entity index, filtered on the profile activity counters)
         # User profiles are stored with PK=USER#{user_id}, SK=PROFILE
-        response = db.table.scan(
-            FilterExpression='begins_with(SK, :profile)',
-            ExpressionAttributeValues={':profile': 'PROFILE'}
-        )
-        
-        users = response.get('Items', [])
-        
-        # Handle pagination if needed
-        while 'LastEvaluatedKey' in response:
-            response = db.table.scan(
-                FilterExpression='begins_with(SK, :profile)',
-                ExpressionAttributeValues={':profile': 'PROFILE'},
-                ExclusiveStartKey=response['LastEvaluatedKey']
-            )
-            users.extend(response.get('Items', []))
+        users = db.list_entities('PROFILE', filter_expression=team_manager_filter())
         
-        logger.info(f"Found {len(users)} total users")
+        logger.info(f"Found {len(users)} users with boats or crew members")
         
         # Get admin group members from Cognito
         admin_user_ids = set()
@@ -76,37 +66,21 @@ def lambda_handler(event, context):
         except Exception as e:
             logger.warning(f"Failed to fetch admin group members: {str(e)}")
         
-        # Filter for team managers (those who have created boats or crew)
         team_managers = []
         for user in users:
             user_id = user.get('user_id')
             if not user_id:
                 continue
             
-            # Check if user has any boats or crew members
-            # Data is stored with PK=TEAM#{user_id}, SK=BOAT#... or SK=CREW#...
-            has_boats = db.query_by_pk(
-                pk=f'TEAM#{user_id}',
-                sk_prefix='BOAT#',
-                limit=1
-            )
-            
-            has_crew = db.query_by_pk(
-                pk=f'TEAM#{user_id}',
-                sk_prefix='CREW#',
-                limit=1
-            )
-            
-            if has_boats or has_crew:
-                team_managers.append({
-                    'user_id': user_id,
-                    'first_name': user.get('first_name', ''),
-                    'last_name': user.get('last_name', ''),
-                    'email': user.get('email', ''),
-                    'phone_number': user.get('mobile_number', ''),
-                    'club_affiliation': user.get('club_affiliation', ''),
-                    'is_admin': user_id in admin_user_ids
-                })
+            team_managers.append({
+                'user_id': user_id,
+                'first_name': user.get('first_name', ''),
+                'last_name': user.get('last_name', ''),
+                'email': user.get('email', ''),
+                'phone_number': user.get('mobile_number', ''),
+                'club_affiliation': user.get('club_affiliation', ''),
+                'is_admin': user_id in admin_user_ids
+            })
         
         # Sort by last name, then first name
         team_managers.sort(key=lambda x: (x['last_name'], x['first_name']))
@@ -1,6 +1,7 @@
 """
 Lambda function to list all temporary access grants
 Admin only - retrieves all grants with their status and remaining time
+(read only: expiry is computed, and expired grants are deleted by DynamoDB TTL)
 """
 import json
 import logging
@@ -10,6 +11,7 @@ from decimal import Decimal
 from responses import success_response, validation_error, handle_exceptions
 from auth_utils import require_admin
 from database import get_db_client
+from access_control import grant_status
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -94,39 +96,13 @@ def lambda_handler(event, context):
         
         # Process grants and calculate remaining time
         processed_grants = []
-        now = datetime.utcnow()
         
         for grant in grants:
-            # Check if grant has expired and update status if needed
-            expiration_str = grant.get('expiration_timestamp', '')
-            current_status = grant.get('status', 'active')
-            
-            try:
-                # Parse timestamp - handle both with and without 'Z'
-                expiration_str = expiration_str.replace('Z', '')
-                expiration = datetime.fromisoformat(expiration_str)
-                if current_status == 'active' and now >= expiration:
-                    # Mark as expired
-                    db.table.update_item(
-                        Key={
-                            'PK': grant['PK'],
-                            'SK': grant['SK']
-                        },
-                        UpdateExpression='SET #status = :status',
-                        ExpressionAttributeNames={
-                            '#status': 'status'
-                        },
-                        ExpressionAttributeValues={
-                            ':status': 'expired'
-                        }
-                    )
-                    current_status = 'expired'
-                    logger.info(f"Marked grant {grant['SK']} as expired")
-            except Exception as e:
-                logger.warning(f"Failed to check/update expiration for grant {grant.get('SK')}: {str(e)}")
+            # Expired grants keep their stored status until TTL deletes them
+            current_status = grant_status(grant)
             
             # Calculate remaining time
-            remaining_hours = calculate_remaining_time(expiration_str)
+            remaining_hours = calculate_remaining_time(grant.get('expiration_timestamp', ''))
             
             grant_data = {
                 'user_id': grant.get('user_id'),
@@ -0,0 +1,79 @@
+"""
+Lambda function consuming the table stream to maintain derived items
+Not an API handler - invoked by the DynamoDB stream event source
+
+Maintains the dashboard STATS item, the per-team SUMMARY items, the race
+catalogue version, and the registration snapshot and club directory in S3.
+"""
+import logging
+
+from database import get_db_client, log_invocation_usage
+from configuration import ConfigurationManager
+from dashboard_stats import STATS_PK, STATS_SK, stream_record_deltas
+from team_summary import refresh_team_summary, stream_record_team
+from race_catalogue import bump_catalogue_version, stream_record_is_race
+from club_directory import rebuild_club_directory, stream_record_is_club
+from registration_snapshot import (
+    SNAPSHOT_COMPACT_THRESHOLD,
+    write_snapshot_changes,
+    compact_snapshot
+)
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def lambda_handler(event, context):
+    """
+    Apply a batch of stream records to the derived items
+
+    Each team touched by the batch has its summary refreshed once, and the
+    batch is stored as one snapshot change set (compacted into the base
+    snapshot once enough are pending). The stats changes of the whole batch
+    are summed and written last, with a single atomic update, so a failed
+    batch is retried as a whole without counting any record twice (summary
+    refreshes and change sets are idempotent). Errors are raised to trigger
+    that retry.
+
+    Returns:
+        Number of records processed, teams refreshed and stats changes applied
+    """
+    try:
+        records = event.get('Records', [])
+        db = get_db_client()
+
+        teams = list(dict.fromkeys(
+            team for team in (stream_record_team(record) for record in records) if team
+        ))
+        if teams:
+            pricing_config = ConfigurationManager().get_pricing_config()
+            for team_manager_id in teams:
+                refresh_team_summary(db, team_manager_id, pricing_config)
+
+        if write_snapshot_changes(records):
+            compact_snapshot(min_changes=SNAPSHOT_COMPACT_THRESHOLD)
+
+        # Warm list_races containers reload the races on their next revalidation
+        if any(stream_record_is_race(record) for record in records):
+            bump_catalogue_version(db)
+
+        # Clubs change rarely: the directory is rewritten whole from the table
+        if any(stream_record_is_club(record) for record in records):
+            rebuild_club_directory(db)
+
+        deltas = {}
+        for record in records:
+            for attribute, delta in stream_record_deltas(record).items():
+                deltas[attribute] = deltas.get(attribute, 0) + delta
+        deltas = {attribute: delta for attribute, delta in deltas.items() if delta}
+
+        if deltas:
+            db.increment_counters(STATS_PK, STATS_SK, deltas)
+
+        logger.info(f"Processed {len(records)} stream records, "
+                    f"refreshed {len(teams)} team summaries, stats changes: {deltas}")
+        return {'records': len(records), 'teams': len(teams), 'deltas': deltas}
+    finally:
+        # Not an API handler (no handle_exceptions): log the usage and reset
+        # the retry budget here so warm invocations start with a full budget
+        log_invocation_usage()
@@ -0,0 +1,37 @@
+"""
+Lambda function to rebuild the per-race boat-number sequence counters
+Admin only - raises each race's counter to its highest existing boat number
+"""
+import logging
+
+from responses import success_response, handle_exceptions
+from database import get_db_client, get_timestamp, decimal_to_float
+from auth_utils import require_admin
+from boat_registration_utils import rebuild_boat_number_counters
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@handle_exceptions
+@require_admin
+def lambda_handler(event, context):
+    """
+    Rebuild the boat-number sequence counters from existing boat numbers
+
+    Missing counters are seeded on first use; run this to repair counters
+    that drifted, e.g. after migrations that renumber boats, so newly
+    allocated numbers continue from the highest existing one.
+
+    Returns:
+        Counter value of each race after the rebuild
+    """
+    logger.info("Admin rebuild boat number counters request")
+
+    db = get_db_client()
+    counters = rebuild_boat_number_counters(db, get_timestamp())
+
+    return success_response(data={
+        'counters': decimal_to_float(counters),
+        'total_races': len(counters)
+    })
@@ -0,0 +1,37 @@
+"""
+Lambda function to rebuild the registration snapshot
+Admin only - rewrites the S3 snapshot read by the exports' fast mode, and the
+club directory read by list_clubs, from the table
+"""
+import logging
+
+from responses import success_response, handle_exceptions
+from database import get_db_client
+from auth_utils import require_admin
+from registration_snapshot import rebuild_snapshot
+from club_directory import rebuild_club_directory
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@handle_exceptions
+@require_admin
+def lambda_handler(event, context):
+    """
+    Rebuild the registration snapshot and the club directory from scratch
+
+    Run once after deploying the snapshot, and whenever the stream consumer
+    has missed records (e.g. after a long outage).
+
+    Returns:
+        Snapshot watermark and number of items, club directory version
+        and number of clubs
+    """
+    logger.info("Admin rebuild registration snapshot request")
+
+    db = get_db_client()
+    result = rebuild_snapshot(db)
+    result['club_directory'] = rebuild_club_directory(db)
+
+    return success_response(data=result)
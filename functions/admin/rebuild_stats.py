@@ -0,0 +1,34 @@
+"""
+Lambda function to rebuild the admin dashboard statistics
+Admin only - recomputes the STATS item counters from the table
+"""
+import logging
+
+from responses import success_response, handle_exceptions
+from database import get_db_client, get_timestamp
+from auth_utils import require_admin
+from dashboard_stats import rebuild_stats, format_stats
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@handle_exceptions
+@require_admin
+def lambda_handler(event, context):
+    """
+    Recompute the dashboard counters from scratch
+
+    Run once after deploying the stream consumer, and whenever the
+    counters are suspected to have drifted.
+
+    Returns:
+        Statistics object with the rebuilt counts
+    """
+    logger.info("Admin rebuild stats request")
+
+    db = get_db_client()
+    timestamp = get_timestamp()
+    stats = rebuild_stats(db, timestamp)
+
+    return success_response(data=format_stats({**stats, 'updated_at': timestamp}))
@@ -6,12 +6,15 @@ import json
 import os
 import sys
 from datetime import datetime
-import boto3
 from botocore.exceptions import ClientError
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from shared.aws_clients import get_dynamodb_resource
+from shared.access_control import audit_ttl
+from shared.configuration import bump_config_version
+
 def lambda_handler(event, context):
     """
     Reset permission configuration to defaults.
@@ -22,7 +25,7 @@ def lambda_handler(event, context):
     """
     try:
         # Initialize DynamoDB
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = get_dynamodb_resource()
         table_name = os.environ.get('DYNAMODB_TABLE') or os.environ.get('TABLE_NAME')
         table = dynamodb.Table(table_name)
         
@@ -49,6 +52,9 @@ def lambda_handler(event, context):
             }
         )
         
+        # Let warm containers drop their cached permission matrix
+        bump_config_version(table)
+        
         # Log configuration reset
         table.put_item(
             Item={
@@ -57,7 +63,8 @@ def lambda_handler(event, context):
                 'action': 'reset_permission_config',
                 'admin_email': admin_email,
                 'timestamp': timestamp,
-                'permissions': default_permissions
+                'permissions': default_permissions,
+                **audit_ttl()
             }
         )
         
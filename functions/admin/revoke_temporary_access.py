@@ -9,6 +9,8 @@ from datetime import datetime
 from responses import success_response, validation_error, not_found_error, handle_exceptions
 from auth_utils import require_admin, get_user_from_event
 from database import get_db_client
+from configuration import bump_config_version
+from access_control import audit_ttl, grant_status
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -63,10 +65,11 @@ def lambda_handler(event, context):
             return not_found_error(f'No temporary access grant found for user {user_id}')
         
         # Check if already revoked or expired
-        if grant.get('status') == 'revoked':
+        status = grant_status(grant)
+        if status == 'revoked':
             return validation_error('Grant is already revoked')
         
-        if grant.get('status') == 'expired':
+        if status == 'expired':
             return validation_error('Grant has already expired')
         
         # Update grant status to revoked
@@ -88,6 +91,9 @@ def lambda_handler(event, context):
             }
         )
         
+        # Let warm containers drop their cached grant lookups
+        bump_config_version(db.table)
+        
         logger.info(f"Revoked temporary access for user {user_id} by admin {admin_user_id}")
         
         # Log the revocation to audit log
@@ -99,7 +105,8 @@ def lambda_handler(event, context):
             'revoked_at': revoked_at.isoformat() + 'Z',
             'action': 'grant_revoked',
             'original_grant_timestamp': grant.get('grant_timestamp'),
-            'original_expiration_timestamp': grant.get('expiration_timestamp')
+            'original_expiration_timestamp': grant.get('expiration_timestamp'),
+            **audit_ttl(revoked_at)
         }
         
         try:
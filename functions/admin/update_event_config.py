@@ -137,7 +137,7 @@ def lambda_handler(event, context):
         return validation_error('No valid fields provided for update')
     
     # Get current configuration for validation
-    config_manager = ConfigurationManager()
+    config_manager = ConfigurationManager(bundle=True)
     current_system_config = config_manager.get_system_config()
     current_race_timing_config = config_manager.get_race_timing_config()
     
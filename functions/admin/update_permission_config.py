@@ -6,12 +6,15 @@ import json
 import os
 import sys
 from datetime import datetime
-import boto3
 from botocore.exceptions import ClientError
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from shared.aws_clients import get_dynamodb_resource
+from shared.access_control import audit_ttl
+from shared.configuration import bump_config_version
+
 def validate_permission_matrix(permissions):
     """
     Validate the permission matrix for consistency.
@@ -93,7 +96,7 @@ def lambda_handler(event, context):
     """
     try:
         # Initialize DynamoDB
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = get_dynamodb_resource()
         table_name = os.environ.get('DYNAMODB_TABLE') or os.environ.get('TABLE_NAME')
         table = dynamodb.Table(table_name)
         
@@ -152,6 +155,9 @@ def lambda_handler(event, context):
             }
         )
         
+        # Let warm containers drop their cached permission matrix
+        bump_config_version(table)
+        
         # Log configuration change
         table.put_item(
             Item={
@@ -160,12 +166,11 @@ def lambda_handler(event, context):
                 'action': 'update_permission_config',
                 'admin_email': admin_email,
                 'timestamp': timestamp,
-                'permissions': permissions
+                'permissions': permissions,
+                **audit_ttl()
             }
         )
         
-        # Invalidate permission cache (handled by access_control module on next request)
-        
         return {
             'statusCode': 200,
             'headers': {
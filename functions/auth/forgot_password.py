@@ -4,7 +4,6 @@ Sends password reset code via email using Cognito
 """
 import json
 import os
-import boto3
 import logging
 
 # Import from Lambda layer (shared modules are in /opt/python/)
@@ -16,11 +15,13 @@ from responses import (
     parse_request_body
 )
 from validation import validate_email
+from aws_clients import LazyClient
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-cognito = boto3.client('cognito-idp')
+# Built on first use by the shared client registry
+cognito = LazyClient('cognito-idp')
 
 
 @handle_exceptions
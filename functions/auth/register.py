@@ -4,7 +4,6 @@ Creates Cognito user and stores profile in DynamoDB
 """
 import json
 import os
-import boto3
 import logging
 from datetime import datetime
 
@@ -18,11 +17,13 @@ from responses import (
 )
 from validation import validate_team_manager, sanitize_dict
 from database import get_db_client, get_timestamp
+from aws_clients import LazyClient
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-cognito = boto3.client('cognito-idp')
+# Built on first use by the shared client registry
+cognito = LazyClient('cognito-idp')
 
 
 @handle_exceptions
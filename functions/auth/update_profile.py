@@ -4,7 +4,6 @@ Updates profile in both Cognito and DynamoDB
 """
 import json
 import os
-import boto3
 import logging
 
 # Import from Lambda layer (shared modules are in /opt/python/)
@@ -20,11 +19,13 @@ from validation import validate_team_manager, sanitize_dict
 from database import get_db_client, get_timestamp
 from auth_utils import require_auth, get_user_from_event
 from boat_registration_utils import calculate_boat_club_info
+from aws_clients import LazyClient
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-cognito = boto3.client('cognito-idp')
+# Built on first use by the shared client registry
+cognito = LazyClient('cognito-idp')
 
 
 @handle_exceptions
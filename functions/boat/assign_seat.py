@@ -4,6 +4,8 @@ Handles seat assignment with validation and audit logging
 """
 import json
 import logging
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr
 
 # Import from Lambda layer
 from responses import (
@@ -14,7 +16,13 @@ from responses import (
     internal_error,
     handle_exceptions
 )
-from database import get_db_client, get_timestamp
+from database import (
+    get_db_client,
+    get_timestamp,
+    with_request_cache,
+    is_conditional_check_failure,
+    in_current_edition
+)
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from boat_registration_utils import (
     validate_seat_assignment,
@@ -29,6 +37,7 @@ logger.setLevel(logging.INFO)
 
 
 @handle_exceptions
+@with_request_cache
 @require_team_manager_or_admin_override
 def lambda_handler(event, context):
     """
@@ -85,23 +94,53 @@ def lambda_handler(event, context):
     if not boat_registration:
         return not_found_error('Boat registration not found')
     
-    # Get all boat registrations for validation
-    all_boats = db.query_by_pk(
-        pk=f'TEAM#{team_manager_id}',
-        sk_prefix='BOAT#'
+    # Version of the boat used as the transaction condition
+    read_updated_at = boat_registration.get('updated_at')
+    
+    # Find the seat to change
+    seats = boat_registration.get('seats', [])
+    seat = next((seat for seat in seats if seat['position'] == position), None)
+    
+    # Read the crew seated in this boat, the crew member to assign and the
+    # team manager profile in one bulk read
+    pk = f'TEAM#{team_manager_id}'
+    crew_member_ids = {seat.get('crew_member_id') for seat in seats if seat.get('crew_member_id')}
+    if crew_member_id:
+        crew_member_ids.add(crew_member_id)
+    
+    items = db.batch_get_items(
+        [(pk, f'CREW#{member_id}') for member_id in crew_member_ids] + [(f'USER#{team_manager_id}', 'PROFILE')]
     )
+    crew_by_id = {item['crew_member_id']: item for item in items if item['SK'].startswith('CREW#')}
+    team_manager = next((item for item in items if item['SK'] == 'PROFILE'), None)
+    
+    # Other boats of the team in the current edition (crew members span
+    # editions, so seats in past editions' boats do not count)
+    other_boat_ids = []
     
     # If assigning a crew member (not clearing)
     if crew_member_id:
-        # Get crew member to verify it exists and for validation
-        crew_member = db.get_item(
-            pk=f'TEAM#{team_manager_id}',
-            sk=f'CREW#{crew_member_id}'
-        )
+        crew_member = crew_by_id.get(crew_member_id)
         
         if not crew_member:
             return not_found_error('Crew member not found')
         
+        # Boat creation and admin edits write seats without setting
+        # assigned_boat_id, so the seats of every boat of the team in the
+        # current edition are checked (only the fields the check needs are read)
+        all_boats = [
+            boat for boat in db.iter_query(
+                pk,
+                sk_prefix='BOAT#',
+                attributes=['SK', 'edition', 'boat_registration_id', 'boat_type', 'event_type', 'seats']
+            )
+            if in_current_edition(boat)
+        ]
+        other_boat_ids = [
+            boat['boat_registration_id'] for boat in all_boats
+            if boat['boat_registration_id'] != boat_registration_id
+        ]
+        
         # Validate seat assignment (including J14 restriction)
         validation = validate_seat_assignment(
             boat_registration,
@@ -114,76 +153,79 @@ def lambda_handler(event, context):
         if not validation['valid']:
             return conflict_error(validation['reason'])
     
-    # Find and update the seat
-    seats = boat_registration.get('seats', [])
-    seat_found = False
-    old_crew_member_id = None
-    
-    for seat in seats:
-        if seat['position'] == position:
-            old_crew_member_id = seat.get('crew_member_id')
-            seat['crew_member_id'] = crew_member_id
-            seat_found = True
-            break
-    
-    if not seat_found:
+    if not seat:
         return validation_error({'position': f'Invalid position {position} for this boat type'})
     
-    # Update crew member assignment status
-    if old_crew_member_id and old_crew_member_id != crew_member_id:
-        # Unassign old crew member
-        old_crew = db.get_item(
-            pk=f'TEAM#{team_manager_id}',
-            sk=f'CREW#{old_crew_member_id}'
-        )
-        if old_crew:
-            old_crew['assigned_boat_id'] = None
-            old_crew['updated_at'] = get_timestamp()
-            db.put_item(old_crew)
-            logger.info(f"Unassigned crew member {old_crew_member_id} from boat {boat_registration_id}")
-    
-    if crew_member_id:
-        # Assign new crew member
-        new_crew = db.get_item(
-            pk=f'TEAM#{team_manager_id}',
-            sk=f'CREW#{crew_member_id}'
-        )
-        if new_crew:
-            new_crew['assigned_boat_id'] = boat_registration_id
-            new_crew['updated_at'] = get_timestamp()
-            db.put_item(new_crew)
-            logger.info(f"Assigned crew member {crew_member_id} to boat {boat_registration_id} position {position}")
-    
-    # Get all crew members for multi-club detection
-    all_crew_members = db.query_by_pk(
-        pk=f'TEAM#{team_manager_id}',
-        sk_prefix='CREW#'
-    )
+    old_crew_member_id = seat.get('crew_member_id')
+    seat['crew_member_id'] = crew_member_id
     
     # Get assigned crew members
-    assigned_members = get_assigned_crew_members(seats, all_crew_members)
-    
-    # Detect multi-club crew (for backward compatibility)
-    boat_registration['is_multi_club_crew'] = detect_multi_club_crew(assigned_members)
+    assigned_members = get_assigned_crew_members(seats, list(crew_by_id.values()))
     
     # Get team manager's club affiliation for club field calculation
-    team_manager = db.get_item(
-        pk=f'USER#{team_manager_id}',
-        sk='PROFILE'
-    )
     team_manager_club = team_manager.get('club_affiliation', '') if team_manager else ''
     
     # Recalculate club display fields based on assigned crew
     club_info = calculate_boat_club_info(assigned_members, team_manager_club)
-    boat_registration['boat_club_display'] = club_info['boat_club_display']
-    boat_registration['club_list'] = club_info['club_list']
+    
+    boat_updates = {
+        'seats': seats,
+        # Detect multi-club crew (for backward compatibility)
+        'is_multi_club_crew': detect_multi_club_crew(assigned_members),
+        'boat_club_display': club_info['boat_club_display'],
+        'club_list': club_info['club_list'],
+        'updated_at': get_timestamp()
+    }
+    boat_registration.update(boat_updates)
     
     # Calculate registration status
     boat_registration['registration_status'] = calculate_registration_status(boat_registration)
+    boat_updates['registration_status'] = boat_registration['registration_status']
+    
+    # Update the boat, the previous occupant and the new occupant in one transaction.
+    # The boat must be unchanged since it was read, and the new occupant must not
+    # be seated in another boat of the edition, so parallel requests cannot seat
+    # a rower twice (an assignment to a past edition's boat is free).
+    if read_updated_at is not None:
+        boat_unchanged = Attr('updated_at').eq(read_updated_at)
+    else:
+        boat_unchanged = Attr('PK').exists() & Attr('updated_at').not_exists()
+    
+    operations = [{
+        'pk': pk,
+        'sk': f'BOAT#{boat_registration_id}',
+        'updates': boat_updates,
+        'condition_expression': boat_unchanged
+    }]
     
-    # Update boat registration
-    boat_registration['seats'] = seats
-    boat_registration['updated_at'] = get_timestamp()
+    if old_crew_member_id and old_crew_member_id != crew_member_id:
+        old_crew = crew_by_id.get(old_crew_member_id)
+        # Only clear the assignment if the previous occupant still points at this boat
+        if old_crew and old_crew.get('assigned_boat_id') == boat_registration_id:
+            operations.append({
+                'pk': pk,
+                'sk': f'CREW#{old_crew_member_id}',
+                'updates': {'assigned_boat_id': None, 'updated_at': get_timestamp()},
+                'condition_expression': Attr('assigned_boat_id').eq(boat_registration_id)
+            })
+    
+    if crew_member_id and crew_member_id != old_crew_member_id:
+        operations.append({
+            'pk': pk,
+            'sk': f'CREW#{crew_member_id}',
+            'updates': {'assigned_boat_id': boat_registration_id, 'updated_at': get_timestamp()},
+            'condition_expression': (
+                Attr('PK').exists() & ~Attr('assigned_boat_id').is_in(other_boat_ids)
+                if other_boat_ids else Attr('PK').exists()
+            )
+        })
+    
+    try:
+        db.transact_update_items(operations)
+    except ClientError as e:
+        if is_conditional_check_failure(e):
+            return conflict_error('Seat assignment conflicts with a concurrent change, please retry')
+        raise
     
     # Audit log
     audit_entry = {
@@ -197,7 +239,5 @@ def lambda_handler(event, context):
     }
     logger.info(f"Seat assignment audit: {json.dumps(audit_entry)}")
     
-    db.put_item(boat_registration)
-    
     # Return success response
     return success_response(data=boat_registration)
@@ -15,7 +15,8 @@ from responses import (
     handle_exceptions
 )
 from validation import validate_boat_registration, sanitize_dict, sanitize_xss, boat_registration_schema
-from database import get_db_client, get_timestamp
+from database import get_db_client, get_timestamp, race_index_keys
+from team_activity import record_team_activity, BOAT_COUNT
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from access_control import require_permission
 from boat_registration_utils import (
@@ -150,28 +151,13 @@ def lambda_handler(event, context):
                     if display_order == 0:
                         logger.warning(f"Race missing display_order: {boat_data['race_id']}, using 0 as fallback")
                     
-                    # Scan all boats with the same race_id
-                    from boto3.dynamodb.conditions import Attr
-                    response = db.table.scan(
-                        FilterExpression=Attr('race_id').eq(boat_data['race_id']) & Attr('SK').begins_with('BOAT#')
-                    )
-                    all_boats_in_race = response.get('Items', [])
-                    
-                    # Handle pagination
-                    while 'LastEvaluatedKey' in response:
-                        response = db.table.scan(
-                            FilterExpression=Attr('race_id').eq(boat_data['race_id']) & Attr('SK').begins_with('BOAT#'),
-                            ExclusiveStartKey=response['LastEvaluatedKey']
-                        )
-                        all_boats_in_race.extend(response.get('Items', []))
-                    
-                    # Generate boat_number
-                    from boat_registration_utils import generate_boat_number
-                    boat_number = generate_boat_number(
+                    # Allocate boat_number from the race's sequence counter
+                    from boat_registration_utils import allocate_boat_number
+                    boat_number = allocate_boat_number(
+                        db,
                         event_type=event_type,
                         display_order=display_order,
-                        race_id=boat_data['race_id'],
-                        all_boats_in_race=all_boats_in_race
+                        race_id=boat_data['race_id']
                     )
                     logger.info(f"Generated boat_number: {boat_number}")
                 else:
@@ -225,8 +211,13 @@ def lambda_handler(event, context):
         'created_at': get_timestamp(),
         'updated_at': get_timestamp()
     }
+    boat_registration_item.update(race_index_keys(
+        boat_registration_item['race_id'],
+        boat_registration_item['created_at']
+    ))
     
     db.put_item(boat_registration_item)
+    record_team_activity(db, team_manager_id, BOAT_COUNT, 1)
     logger.info(f"Boat registration created: {boat_registration_id}")
     
     # Send Slack notification for new boat registration
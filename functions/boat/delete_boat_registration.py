@@ -4,6 +4,8 @@ Team managers can delete boat registrations during registration period
 """
 import json
 import logging
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr
 
 # Import from Lambda layer
 from responses import (
@@ -14,7 +16,8 @@ from responses import (
     internal_error,
     handle_exceptions
 )
-from database import get_db_client, get_timestamp
+from database import get_db_client, get_timestamp, with_request_cache, is_conditional_check_failure
+from team_activity import record_team_activity, BOAT_COUNT
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from access_control import require_permission
 from configuration import ConfigurationManager
@@ -24,6 +27,7 @@ logger.setLevel(logging.INFO)
 
 
 @handle_exceptions
+@with_request_cache
 @require_team_manager_or_admin_override
 @require_permission('delete_boat_registration')
 def lambda_handler(event, context):
@@ -71,30 +75,41 @@ def lambda_handler(event, context):
     config_manager = ConfigurationManager()
     system_config = config_manager.get_system_config()
     
-    # Unassign crew members from this boat
+    # Delete boat registration from DynamoDB (unless it was paid in the meantime),
+    # before touching its crew so a boat paid concurrently keeps them
+    try:
+        deleted = db.delete_item(
+            pk=f'TEAM#{team_manager_id}',
+            sk=f'BOAT#{boat_registration_id}',
+            condition_expression=Attr('registration_status').ne('paid')
+        )
+    except ClientError as e:
+        if is_conditional_check_failure(e):
+            return forbidden_error('Cannot delete a paid boat registration. Please contact support if you need to make changes.')
+        raise
+    
+    # Unassign crew members from the deleted boat
     seats = existing_boat.get('seats', [])
     crew_member_ids = [seat.get('crew_member_id') for seat in seats if seat.get('crew_member_id')]
     
-    if crew_member_ids:
-        # Update crew members to remove boat assignment
-        for crew_member_id in crew_member_ids:
-            crew_member = db.get_item(
+    for crew_member_id in crew_member_ids:
+        # Clear the assignment in place, only if the crew member still points at this boat
+        try:
+            db.update_item(
                 pk=f'TEAM#{team_manager_id}',
-                sk=f'CREW#{crew_member_id}'
+                sk=f'CREW#{crew_member_id}',
+                updates={'assigned_boat_id': None, 'updated_at': get_timestamp()},
+                condition_expression=Attr('assigned_boat_id').eq(boat_registration_id)
             )
-            
-            if crew_member and crew_member.get('assigned_boat_id') == boat_registration_id:
-                crew_member['assigned_boat_id'] = None
-                crew_member['updated_at'] = get_timestamp()
-                db.put_item(crew_member)
-                logger.info(f"Unassigned crew member {crew_member_id} from boat {boat_registration_id}")
-    
-    # Delete boat registration from DynamoDB
-    db.delete_item(
-        pk=f'TEAM#{team_manager_id}',
-        sk=f'BOAT#{boat_registration_id}'
-    )
+            logger.info(f"Unassigned crew member {crew_member_id} from boat {boat_registration_id}")
+        except ClientError as e:
+            if not is_conditional_check_failure(e):
+                raise
+            logger.info(f"Crew member {crew_member_id} was not assigned to boat {boat_registration_id}")
     
+    # A concurrent or retried delete may have removed the boat already
+    if deleted.get('Attributes'):
+        record_team_activity(db, team_manager_id, BOAT_COUNT, -1)
     logger.info(f"Boat registration deleted: {boat_registration_id}")
     
     # Return success response
@@ -16,7 +16,15 @@ from responses import (
     handle_exceptions
 )
 from validation import validate_boat_registration, sanitize_dict, sanitize_xss, boat_registration_schema
-from database import get_db_client, get_timestamp
+from database import (
+    get_db_client,
+    get_timestamp,
+    with_request_cache,
+    race_index_keys,
+    item_edition,
+    in_current_edition,
+    RACE_INDEX_KEYS
+)
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from access_control import require_permission
 from configuration import ConfigurationManager
@@ -27,7 +35,7 @@ from boat_registration_utils import (
     get_assigned_crew_members,
     validate_seat_assignment,
     calculate_boat_club_info,
-    generate_boat_number
+    allocate_boat_number
 )
 from race_eligibility import analyze_crew_composition
 
@@ -50,6 +58,7 @@ logger.setLevel(logging.INFO)
 
 
 @handle_exceptions
+@with_request_cache
 @require_team_manager_or_admin_override
 @require_permission('edit_boat_registration')
 def lambda_handler(event, context):
@@ -218,33 +227,12 @@ def lambda_handler(event, context):
                         if display_order == 0:
                             logger.warning(f"Race missing display_order: {new_race_id}, using 0 as fallback")
                         
-                        # Scan all boats with the same race_id
-                        from boto3.dynamodb.conditions import Attr
-                        response = db.table.scan(
-                            FilterExpression=Attr('race_id').eq(new_race_id) & Attr('SK').begins_with('BOAT#')
-                        )
-                        all_boats_in_race = response.get('Items', [])
-                        
-                        # Handle pagination
-                        while 'LastEvaluatedKey' in response:
-                            response = db.table.scan(
-                                FilterExpression=Attr('race_id').eq(new_race_id) & Attr('SK').begins_with('BOAT#'),
-                                ExclusiveStartKey=response['LastEvaluatedKey']
-                            )
-                            all_boats_in_race.extend(response.get('Items', []))
-                        
-                        # Filter out the current boat from the list
-                        all_boats_in_race = [
-                            b for b in all_boats_in_race 
-                            if b.get('boat_registration_id') != boat_registration_id
-                        ]
-                        
-                        # Generate boat_number
-                        boat_number = generate_boat_number(
+                        # Allocate boat_number from the race's sequence counter
+                        boat_number = allocate_boat_number(
+                            db,
                             event_type=event_type,
                             display_order=display_order,
-                            race_id=new_race_id,
-                            all_boats_in_race=all_boats_in_race
+                            race_id=new_race_id
                         )
                         boat_fields_to_validate['boat_number'] = boat_number
                         logger.info(f"Generated boat_number: {boat_number}")
@@ -265,11 +253,12 @@ def lambda_handler(event, context):
             sk_prefix='CREW#'
         )
         
-        # Get all boat registrations for validation
-        all_boats = db.query_by_pk(
-            pk=f'TEAM#{team_manager_id}',
-            sk_prefix='BOAT#'
-        )
+        # Get the boat registrations of the current edition for validation
+        # (crew members span editions and keep their past seats)
+        all_boats = [
+            boat for boat in db.query_by_pk(pk=f'TEAM#{team_manager_id}', sk_prefix='BOAT#')
+            if in_current_edition(boat)
+        ]
         
         # Create a map of crew members for easy lookup
         crew_member_map = {member['crew_member_id']: member for member in all_crew_members}
@@ -394,6 +383,15 @@ def lambda_handler(event, context):
     updated_boat = {**existing_boat, **boat_fields_to_validate}
     updated_boat['updated_at'] = get_timestamp()
     
+    # Keep the race index in step with race_id
+    for key in RACE_INDEX_KEYS:
+        updated_boat.pop(key, None)
+    updated_boat.update(race_index_keys(
+        updated_boat.get('race_id'),
+        updated_boat.get('created_at') or updated_boat['updated_at'],
+        item_edition(updated_boat)
+    ))
+    
     # Update boat registration in DynamoDB
     db.put_item(updated_boat)
     logger.info(f"Boat registration updated: {boat_registration_id}")
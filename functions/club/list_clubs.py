@@ -1,65 +1,86 @@
 """
 List Clubs Lambda Function
-Returns list of rowing clubs for searchable dropdown
+Returns rowing clubs for the searchable dropdown, from the prebuilt club directory
 """
-import json
 import logging
-import os
-import sys
 
-# Add shared layer to path
-sys.path.insert(0, '/opt/python')
-
-from shared.database import DatabaseClient
-from shared.responses import success_response, error_response, unauthorized_error
-from shared.auth_utils import get_user_from_event
+# Import from Lambda layer
+from responses import (
+    success_response,
+    not_modified_response,
+    get_header,
+    etag_matches,
+    validation_error,
+    handle_exceptions
+)
+from database import get_db_client
+from club_directory import CLUB_SEARCH_LIMIT, get_club_directory
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-db = DatabaseClient()
+# Clubs change a few times a season: browsers keep the list for five minutes
+# and the CDN for up to an hour, then serve it stale while revalidating, so
+# registration-day traffic rarely reaches the function
+CACHE_CONTROL = 'public, max-age=300, s-maxage=3600, stale-while-revalidate=86400'
 
 
+@handle_exceptions
 def lambda_handler(event, context):
     """
-    List all rowing clubs
-    
+    List rowing clubs (public endpoint for registration)
+
+    Query parameters (optional):
+        - q: Search text; returns the clubs with a name word starting with
+          each of its words (case and accents ignored), best matches first
+        - limit: Maximum number of clubs for a search (up to CLUB_SEARCH_LIMIT)
+
+    Headers (optional):
+        - If-None-Match: ETag of a previous response; answered with 304
+          while the directory is unchanged
+
     Returns:
-        200: List of clubs with id, name, and url
-        500: Server error
+        200: Clubs with id, name and url (all of them without q)
+        304: Directory unchanged
+        400: Invalid limit
     """
-    try:
-        # No authentication required - this is a public endpoint for registration
-        logger.info("Listing clubs (public endpoint)")
-        
-        # Query all clubs from database
-        # Clubs have PK=CLUB and SK=<club_id>
-        response = db.table.query(
-            KeyConditionExpression='PK = :pk',
-            ExpressionAttributeValues={
-                ':pk': 'CLUB'
-            }
-        )
-        
-        clubs = []
-        for item in response.get('Items', []):
-            clubs.append({
-                'club_id': item.get('club_id'),
-                'name': item.get('name'),
-                'url': item.get('url', '')
-            })
-        
-        # Sort by name for better UX
-        clubs.sort(key=lambda x: x['name'])
-        
-        logger.info(f"Found {len(clubs)} clubs")
-        
-        return success_response({
+    query_params = event.get('queryStringParameters') or {}
+    query = (query_params.get('q') or '').strip()
+
+    limit = CLUB_SEARCH_LIMIT
+    if query_params.get('limit'):
+        try:
+            limit = int(query_params['limit'])
+        except ValueError:
+            return validation_error({'limit': 'Must be an integer'})
+        if limit < 1:
+            return validation_error({'limit': 'Must be at least 1'})
+        limit = min(limit, CLUB_SEARCH_LIMIT)
+
+    db = get_db_client()
+    directory = get_club_directory(db)
+
+    # Every response of a URL only depends on the directory version
+    etag = f'W/"{directory.version}"'
+    headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
+
+    if etag_matches(get_header(event, 'If-None-Match'), etag):
+        logger.info(f"Clubs unchanged (directory version {directory.version})")
+        return not_modified_response(headers)
+
+    if query:
+        clubs, truncated = directory.search(query, limit)
+        logger.info(f"Found {len(clubs)} clubs for '{query}'")
+        response = success_response({
             'clubs': clubs,
-            'count': len(clubs)
+            'count': len(clubs),
+            'truncated': truncated
         })
-        
-    except Exception as e:
-        logger.error(f"Error listing clubs: {str(e)}", exc_info=True)
-        from shared.responses import internal_error
-        return internal_error('Failed to list clubs')
+    else:
+        response = success_response({
+            'clubs': directory.clubs,
+            'count': len(directory.clubs)
+        })
+        logger.info(f"Serving {len(directory.clubs)} clubs of directory version {directory.version}")
+
+    return {**response, 'headers': {**response['headers'], **headers}}
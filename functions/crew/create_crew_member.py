@@ -18,6 +18,7 @@ from responses import (
 )
 from validation import validate_crew_member, sanitize_dict, crew_member_schema, is_rcpm_member
 from database import get_db_client, get_timestamp
+from team_activity import record_team_activity, CREW_COUNT
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from access_control import require_permission
 
@@ -131,6 +132,7 @@ def lambda_handler(event, context):
     }
     
     db.put_item(crew_member_item)
+    record_team_activity(db, team_manager_id, CREW_COUNT, 1)
     logger.info(f"Crew member created: {crew_member_id}")
     
     # Return success response
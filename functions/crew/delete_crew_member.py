@@ -12,7 +12,8 @@ from responses import (
     conflict_error,
     handle_exceptions
 )
-from database import get_db_client
+from database import get_db_client, with_request_cache
+from team_activity import record_team_activity, CREW_COUNT
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from access_control import require_permission
 
@@ -21,6 +22,7 @@ logger.setLevel(logging.INFO)
 
 
 @handle_exceptions
+@with_request_cache
 @require_team_manager_or_admin_override
 @require_permission('delete_crew_member')
 def lambda_handler(event, context):
@@ -68,10 +70,13 @@ def lambda_handler(event, context):
         )
     
     # Delete crew member from DynamoDB
-    db.delete_item(
+    deleted = db.delete_item(
         pk=f'TEAM#{team_manager_id}',
         sk=f'CREW#{crew_member_id}'
     )
+    # A concurrent or retried delete may have removed the crew member already
+    if deleted.get('Attributes'):
+        record_team_activity(db, team_manager_id, CREW_COUNT, -1)
     
     logger.info(f"Crew member deleted: {crew_member_id}")
     
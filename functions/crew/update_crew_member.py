@@ -15,7 +15,7 @@ from responses import (
     handle_exceptions
 )
 from validation import validate_crew_member, sanitize_dict, crew_member_schema, is_rcpm_member
-from database import get_db_client, get_timestamp
+from database import get_db_client, get_timestamp, with_request_cache
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from configuration import ConfigurationManager
 from boat_registration_utils import calculate_boat_club_info
@@ -26,6 +26,7 @@ logger.setLevel(logging.INFO)
 
 
 @handle_exceptions
+@with_request_cache
 @require_team_manager_or_admin_override
 @require_permission('edit_crew_member')
 def lambda_handler(event, context):
@@ -8,10 +8,12 @@ from datetime import datetime
 from decimal import Decimal
 import uuid
 import copy
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr
 
 # Import from Lambda layer
 from responses import success_response, validation_error, internal_error
-from database import get_db_client
+from database import get_db_client, with_request_cache, is_conditional_check_failure
 from stripe_client import verify_webhook_signature, get_webhook_secret, get_charge_receipt_url
 from email_utils import send_payment_confirmation_email
 
@@ -73,41 +75,47 @@ def create_payment_record(
 
 def update_boat_status_to_paid(
     team_manager_id: str,
-    boat_registration_ids: list,
+    boats: list,
     payment_id: str,
     db
 ):
     """
     Update boat registration status to 'paid'
+    
+    Only the payment fields are written. Boats that were deleted or already
+    marked paid (e.g. a redelivered webhook) are left untouched.
     """
     timestamp = datetime.utcnow().isoformat()
+    pk = f'TEAM#{team_manager_id}'
+    updated_count = 0
     
-    for boat_id in boat_registration_ids:
-        # Get current boat registration
-        pk = f'TEAM#{team_manager_id}'
-        sk = f'BOAT#{boat_id}'
+    for boat in boats:
+        boat_id = boat.get('boat_registration_id')
+        updates = {
+            'registration_status': 'paid',
+            'payment_id': payment_id,
+            'paid_at': timestamp,
+            'updated_at': timestamp
+        }
         
-        boat = db.get_item(pk, sk)
+        # Lock the pricing (deep copy to prevent reference issues)
+        if 'pricing' in boat:
+            updates['locked_pricing'] = copy.deepcopy(boat['pricing'])
         
-        if boat:
-            # Ensure PK and SK are present (uppercase as required by DynamoDB)
-            boat['PK'] = pk
-            boat['SK'] = sk
-            
-            # Update status to paid
-            boat['registration_status'] = 'paid'
-            boat['payment_id'] = payment_id
-            boat['paid_at'] = timestamp
-            boat['updated_at'] = timestamp
-            
-            # Lock the pricing (deep copy to prevent reference issues)
-            if 'pricing' in boat:
-                boat['locked_pricing'] = copy.deepcopy(boat['pricing'])
-            
-            db.put_item(boat)
-            logger.info(f"Updated boat {boat_id} status to 'paid'")
-        else:
-            logger.warning(f"Boat {boat_id} not found when updating to paid status")
+        try:
+            db.update_item(
+                pk=pk,
+                sk=f'BOAT#{boat_id}',
+                updates=updates,
+                condition_expression=Attr('PK').exists() & Attr('registration_status').ne('paid')
+            )
+            updated_count += 1
+        except ClientError as e:
+            if not is_conditional_check_failure(e):
+                raise
+            logger.warning(f"Boat {boat_id} was deleted or already paid, status not updated")
+    
+    logger.info(f"Updated {updated_count} boats status to 'paid'")
 
 
 def update_rental_request_status_to_paid(
@@ -153,35 +161,50 @@ def handle_payment_succeeded(event_data: dict, db):
     # Get receipt URL
     receipt_url = get_charge_receipt_url(payment_intent_id)
     
+    # Get boats and their stroke seat crew members in two bulk reads
+    pk = f'TEAM#{team_manager_id}'
+    boats_by_id = {
+        boat.get('boat_registration_id'): boat
+        for boat in db.batch_get_items([(pk, f'BOAT#{boat_id}') for boat_id in boat_registration_ids])
+    }
+    boats = [boats_by_id[boat_id] for boat_id in boat_registration_ids if boat_id in boats_by_id]
+    for boat_id in boat_registration_ids:
+        if boat_id not in boats_by_id:
+            logger.warning(f"Boat {boat_id} from payment {payment_intent_id} not found")
+    
+    stroke_crew_ids = []
+    for boat in boats:
+        seats = boat.get('seats', [])
+        if seats and seats[0].get('crew_member_id'):  # Seat 1 is stroke
+            stroke_crew_ids.append(seats[0]['crew_member_id'])
+    crew_by_id = {
+        crew.get('crew_member_id'): crew
+        for crew in db.batch_get_items([(pk, f'CREW#{crew_id}') for crew_id in stroke_crew_ids])
+    }
+    
     # Get boat details for payment record snapshot
     boat_details = []
-    for boat_id in boat_registration_ids:
-        boat = db.get_item(f'TEAM#{team_manager_id}', f'BOAT#{boat_id}')
-        if boat:
-            # Get stroke seat name (seat 1)
-            stroke_seat_name = None
-            seats = boat.get('seats', [])
-            if seats and len(seats) > 0:
-                stroke_seat = seats[0]  # Seat 1 is stroke
-                stroke_crew_id = stroke_seat.get('crew_member_id')
-                if stroke_crew_id:
-                    # Fetch crew member details
-                    crew_member = db.get_item(f'TEAM#{team_manager_id}', f'CREW#{stroke_crew_id}')
-                    if crew_member:
-                        first_name = crew_member.get('first_name', '')
-                        last_name = crew_member.get('last_name', '')
-                        stroke_seat_name = f"{first_name} {last_name}".strip()
-            
-            # Create a snapshot with essential fields including pricing
-            boat_snapshot = {
-                'boat_registration_id': boat.get('boat_registration_id'),
-                'event_type': boat.get('event_type'),
-                'boat_type': boat.get('boat_type'),
-                'boat_number': boat.get('boat_number'),
-                'stroke_seat_name': stroke_seat_name,
-                'pricing': copy.deepcopy(boat.get('pricing', {}))  # Snapshot of pricing at payment time
-            }
-            boat_details.append(boat_snapshot)
+    for boat in boats:
+        # Get stroke seat name (seat 1)
+        stroke_seat_name = None
+        seats = boat.get('seats', [])
+        if seats:
+            crew_member = crew_by_id.get(seats[0].get('crew_member_id'))
+            if crew_member:
+                first_name = crew_member.get('first_name', '')
+                last_name = crew_member.get('last_name', '')
+                stroke_seat_name = f"{first_name} {last_name}".strip()
+        
+        # Create a snapshot with essential fields including pricing
+        boat_snapshot = {
+            'boat_registration_id': boat.get('boat_registration_id'),
+            'event_type': boat.get('event_type'),
+            'boat_type': boat.get('boat_type'),
+            'boat_number': boat.get('boat_number'),
+            'stroke_seat_name': stroke_seat_name,
+            'pricing': copy.deepcopy(boat.get('pricing', {}))  # Snapshot of pricing at payment time
+        }
+        boat_details.append(boat_snapshot)
     
     # Create payment record with boat details snapshot
     payment_id = create_payment_record(
@@ -195,12 +218,8 @@ def handle_payment_succeeded(event_data: dict, db):
         db=db
     )
     
-    # Get boat details again for email (full details)
-    boats_for_email = []
-    for boat_id in boat_registration_ids:
-        boat = db.get_item(f'TEAM#{team_manager_id}', f'BOAT#{boat_id}')
-        if boat:
-            boats_for_email.append(boat)
+    # Full boat details for email
+    boats_for_email = boats
     
     # Get team manager details
     team_manager = db.get_item(f'TEAM#{team_manager_id}', 'METADATA')
@@ -223,7 +242,7 @@ def handle_payment_succeeded(event_data: dict, db):
     # Update boat registrations to 'paid' status
     update_boat_status_to_paid(
         team_manager_id=team_manager_id,
-        boat_registration_ids=boat_registration_ids,
+        boats=boats,
         payment_id=payment_id,
         db=db
     )
@@ -347,6 +366,7 @@ def handle_payment_failed(event_data: dict, db):
     # For now, we just log it
 
 
+@with_request_cache
 def lambda_handler(event, context):
     """
     Handle Stripe webhook events
@@ -6,6 +6,8 @@ import json
 import logging
 from decimal import Decimal
 from typing import List, Dict, Any
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr
 
 # Import from Lambda layer
 from responses import (
@@ -15,7 +17,7 @@ from responses import (
     internal_error,
     handle_exceptions
 )
-from database import get_db_client
+from database import get_db_client, is_conditional_check_failure
 from auth_utils import get_user_from_event, require_team_manager, require_team_manager_or_admin_override
 from pricing import calculate_boat_pricing
 from configuration import ConfigurationManager
@@ -94,7 +96,20 @@ def calculate_total_amount(
         # Store pricing in boat record if db client provided
         if db and 'PK' in boat and 'SK' in boat:
             boat['pricing'] = pricing
-            db.put_item(boat)
+            try:
+                # Write only the pricing, and never reprice a boat that was paid meanwhile
+                db.update_item(
+                    pk=boat['PK'],
+                    sk=boat['SK'],
+                    updates={'pricing': pricing},
+                    condition_expression=Attr('PK').exists() & Attr('registration_status').ne('paid')
+                )
+            except ClientError as e:
+                if is_conditional_check_failure(e):
+                    raise ValueError(
+                        f"Boat registration {boat.get('boat_registration_id')} was paid or deleted"
+                    )
+                raise
             logger.info(f"Stored pricing for boat {boat.get('boat_registration_id')}: {pricing['total']} EUR")
     
     return total
@@ -15,8 +15,7 @@ from database import get_db_client
 from auth_utils import get_user_from_event, require_team_manager_or_admin_override
 from access_control import require_permission
 from configuration import ConfigurationManager
-from payment_queries import query_payments_by_team, query_unpaid_boats
-from payment_calculations import calculate_total_paid, calculate_outstanding_balance, count_boats_in_payments
+from team_summary import get_team_summary
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -43,7 +42,8 @@ def lambda_handler(event, context):
                 "boat_count": 2,
                 "boats": [...]
             },
-            "total_registered_boats": 12
+            "total_registered_boats": 12,
+            "payment_status": "Partial Payment"
         }
     """
     logger.info("Get payment summary request")
@@ -58,46 +58,17 @@ def lambda_handler(event, context):
     db = get_db_client()
     
     try:
-        # Query all payments for team manager
-        payments = query_payments_by_team(
-            db=db,
-            team_manager_id=team_manager_id
-        )
-        
-        # Calculate total paid
-        total_paid = calculate_total_paid(payments)
-        payment_count = len(payments)
-        boats_paid_count = count_boats_in_payments(payments)
-        
-        # Query unpaid boats
-        unpaid_boats = query_unpaid_boats(db, team_manager_id)
-        
-        # Get all crew members for pricing calculation
-        all_crew_members = db.query_by_pk(
-            pk=f'TEAM#{team_manager_id}',
-            sk_prefix='CREW#'
-        )
-        
-        # Get pricing configuration
+        # Read the team's summary item (refreshed if missing or priced with an older configuration)
         config_manager = ConfigurationManager()
         pricing_config = config_manager.get_pricing_config()
+        summary = get_team_summary(db, team_manager_id, pricing_config)
         
-        # Calculate outstanding balance with dynamic pricing recalculation
-        total_outstanding = calculate_outstanding_balance(
-            boats=unpaid_boats,
-            pricing_config=pricing_config,
-            all_crew_members=all_crew_members
-        )
-        
-        # Use unpaid boats as boat details
-        boat_details = unpaid_boats
-        
-        # Calculate total registered boats
-        all_boats = db.query_by_pk(
-            pk=f'TEAM#{team_manager_id}',
-            sk_prefix='BOAT#'
-        )
-        total_registered_boats = len(all_boats)
+        total_paid = summary['total_paid']
+        total_outstanding = summary['outstanding_balance']
+        outstanding_boats = [
+            {**boat, 'amount': float(boat['amount'])}
+            for boat in summary.get('outstanding_boats', [])
+        ]
         
         logger.info(f"Payment summary for team manager {team_manager_id}: "
                    f"paid={float(total_paid)}, outstanding={float(total_outstanding)}")
@@ -107,16 +78,17 @@ def lambda_handler(event, context):
             'paid': {
                 'total_amount': float(total_paid),
                 'currency': 'EUR',
-                'payment_count': payment_count,
-                'boat_count': boats_paid_count
+                'payment_count': int(summary['payment_count']),
+                'boat_count': int(summary['boats_paid_count'])
             },
             'outstanding': {
                 'total_amount': float(total_outstanding),
                 'currency': 'EUR',
-                'boat_count': len(unpaid_boats),
-                'boats': boat_details
+                'boat_count': len(outstanding_boats),
+                'boats': outstanding_boats
             },
-            'total_registered_boats': total_registered_boats
+            'total_registered_boats': int(summary['total_registered_boats']),
+            'payment_status': summary['payment_status']
         })
         
     except Exception as e:
@@ -1,21 +1,28 @@
 """
 Lambda function for listing available races
-Returns all race definitions from the database
+Returns race definitions from the container's race catalogue
 """
-import json
 import logging
 
 # Import from Lambda layer
 from responses import (
     success_response,
+    not_modified_response,
+    get_header,
+    etag_matches,
     internal_error,
     handle_exceptions
 )
 from database import get_db_client
+from race_catalogue import INDEXED_ATTRIBUTES, get_race_catalogue
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Clients (and the CDN) may store the list but revalidate it on every use,
+# which costs a 304 while the catalogue is unchanged
+CACHE_CONTROL = 'public, no-cache'
+
 
 @handle_exceptions
 def lambda_handler(event, context):
@@ -28,40 +35,36 @@ def lambda_handler(event, context):
         - age_category: Filter by age category (j16, j18, senior, master)
         - gender_category: Filter by gender category (men, women, mixed)
     
+    Headers (optional):
+        - If-None-Match: ETag of a previous response; answered with 304
+          while the matching races are unchanged
+    
     Returns:
-        List of race objects
+        List of race objects, with a weak ETag
     """
     logger.info("List races request")
     
     # Get query parameters
     query_params = event.get('queryStringParameters') or {}
-    event_type_filter = query_params.get('event_type')
-    boat_type_filter = query_params.get('boat_type')
-    age_category_filter = query_params.get('age_category')
-    gender_category_filter = query_params.get('gender_category')
+    filters = {
+        attribute: query_params[attribute]
+        for attribute in INDEXED_ATTRIBUTES
+        if query_params.get(attribute)
+    }
     
-    # Get all races from DynamoDB
+    # Races from the container's catalogue (indexed by each filter)
     db = get_db_client()
+    catalogue = get_race_catalogue(db)
     
-    races = db.query_by_pk(
-        pk='RACE',
-        sk_prefix=''
-    )
-    
-    # Apply filters if provided
-    if event_type_filter:
-        races = [r for r in races if r.get('event_type') == event_type_filter]
-    
-    if boat_type_filter:
-        races = [r for r in races if r.get('boat_type') == boat_type_filter]
-    
-    if age_category_filter:
-        races = [r for r in races if r.get('age_category') == age_category_filter]
+    races, etag = catalogue.selection(filters)
+    headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
     
-    if gender_category_filter:
-        races = [r for r in races if r.get('gender_category') == gender_category_filter]
+    if etag_matches(get_header(event, 'If-None-Match'), etag):
+        logger.info(f"Races unchanged (catalogue version {catalogue.version})")
+        return not_modified_response(headers)
     
-    logger.info(f"Found {len(races)} races")
+    logger.info(f"Serving races of catalogue version {catalogue.version} for filters {filters}")
     
     # Return success response
-    return success_response(data={'races': races})
+    response = success_response(data={'races': races})
+    return {**response, 'headers': {**response['headers'], **headers}}
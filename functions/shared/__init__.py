@@ -1,6 +1,13 @@
 """
 Shared utilities for Course des Impressionnistes Registration System Backend
 """
+from .aws_clients import (
+    get_client,
+    get_resource,
+    get_dynamodb_resource,
+    LazyClient
+)
+
 from .configuration import (
     ConfigurationManager,
     get_config_manager,
@@ -12,13 +19,34 @@ from .configuration import (
 
 from .database import (
     DatabaseClient,
+    BatchOperationError,
+    ServiceOverloadedError,
+    is_conditional_check_failure,
     get_db_client,
+    with_request_cache,
+    log_invocation_usage,
+    current_edition,
+    edition_partition,
+    entity_partition,
+    item_edition,
+    is_edition_scoped,
+    in_current_edition,
+    backfill_edition,
+    race_index_keys,
+    entity_index_keys,
+    payment_date_index_keys,
+    index_keys,
     generate_id,
     get_timestamp,
     decimal_to_float,
     float_to_decimal
 )
 
+from .memory_table import (
+    MemoryTable,
+    MemoryDynamoDB
+)
+
 from .validation import (
     validate_crew_member,
     validate_boat_registration,
@@ -47,6 +75,9 @@ from .responses import (
     get_user_id,
     get_path_parameter,
     get_query_parameter,
+    get_header,
+    etag_matches,
+    not_modified_response,
     cors_preflight_response
 )
 
@@ -64,6 +95,12 @@ from .auth_utils import (
 )
 
 __all__ = [
+    # AWS clients
+    'get_client',
+    'get_resource',
+    'get_dynamodb_resource',
+    'LazyClient',
+    
     # Configuration
     'ConfigurationManager',
     'get_config_manager',
@@ -74,12 +111,21 @@ __all__ = [
     
     # Database
     'DatabaseClient',
+    'BatchOperationError',
+    'ServiceOverloadedError',
+    'is_conditional_check_failure',
     'get_db_client',
+    'with_request_cache',
+    'log_invocation_usage',
     'generate_id',
     'get_timestamp',
     'decimal_to_float',
     'float_to_decimal',
     
+    # In-memory table
+    'MemoryTable',
+    'MemoryDynamoDB',
+    
     # Validation
     'validate_crew_member',
     'validate_boat_registration',
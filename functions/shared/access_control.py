@@ -11,12 +11,15 @@ Key Components:
 - ResourceContext: Resource information for permission checks
 - PermissionResult: Result of a permission check
 - PermissionChecker: Main class for evaluating permissions
+- get_permission_checker: Container-level PermissionChecker shared by warm invocations
 """
 
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
+import calendar
+import os
 import time
 
 
@@ -108,6 +111,30 @@ class PermissionResult:
 # Cache TTL in seconds
 DEFAULT_CACHE_TTL = 60
 
+# Cache TTL of the container-level checker (see get_permission_checker):
+# admin changes invalidate it through the configuration version stamp, the
+# TTL only bounds how long configuration written outside the admin API
+# (scripts, console) can be served stale
+CONTAINER_CACHE_TTL = 300
+
+# DynamoDB TTL attribute of the table (epoch seconds): temporary access grants
+# and audit entries are deleted by the storage layer once it has passed
+TTL_ATTRIBUTE = 'ttl'
+
+# Days audit entries (AUDIT#* partitions) are kept
+AUDIT_LOG_RETENTION_DAYS = int(os.environ.get('AUDIT_LOG_RETENTION_DAYS', '365'))
+
+# Days an ended temporary access grant stays listed before it is deleted
+TEMP_ACCESS_RETENTION_DAYS = int(os.environ.get('TEMP_ACCESS_RETENTION_DAYS', '30'))
+
+# Grant attribute holding expiration_timestamp as epoch seconds, so checks
+# compare numbers instead of parsing timestamps
+GRANT_EXPIRES_AT = 'expires_at'
+
+# Seconds a user without an active grant is remembered by a checker. Grants
+# and revocations bump the configuration version, which clears it sooner
+GRANT_NEGATIVE_CACHE_TTL = 60
+
 # Default permission matrix (used as fallback if database config is missing)
 DEFAULT_PERMISSIONS = {
     "create_crew_member": {
@@ -244,6 +271,14 @@ class PermissionChecker:
         self._config_cache = {}
         self._phase_cache = None
         self._phase_cache_time = 0
+        self._config_version = None
+        
+        # Temporary access grant caches: lookups of the current request, users
+        # known to have no active grant, and whether no grant is active at all
+        self._request_grants = {}
+        self._grant_negative_cache = {}
+        self._no_active_grants = None
+        self._no_active_grants_time = 0
         
     def check_permission(
         self,
@@ -420,15 +455,49 @@ class PermissionChecker:
         """
         Determine current event phase based on system time and config dates.
         
-        Uses caching to avoid repeated database queries within the cache TTL.
+        The configuration dates are cached for the cache TTL to avoid repeated
+        database queries; the phase itself is evaluated on every call, so a
+        long-lived checker switches phase exactly at the configured dates.
         
         Returns:
             EventPhase enum value
         """
         # Check cache first
         current_time = time.time()
-        if self._phase_cache is not None and (current_time - self._phase_cache_time) < self.cache_ttl:
-            return self._phase_cache
+        if self._phase_cache is None or (current_time - self._phase_cache_time) >= self.cache_ttl:
+            self._phase_cache = self._load_phase_dates()
+            self._phase_cache_time = current_time
+        
+        # Missing or invalid configuration - default to most restrictive phase for safety
+        if not self._phase_cache:
+            return EventPhase.AFTER_PAYMENT_DEADLINE
+        
+        registration_start, registration_end, payment_deadline = self._phase_cache
+        
+        # Get current time (use UTC for consistency)
+        now = datetime.utcnow()
+        
+        # Determine phase based on current time
+        if now < registration_start:
+            return EventPhase.BEFORE_REGISTRATION
+        elif registration_start <= now <= registration_end:
+            return EventPhase.DURING_REGISTRATION
+        elif registration_end < now <= payment_deadline:
+            return EventPhase.AFTER_REGISTRATION
+        else:  # now > payment_deadline
+            return EventPhase.AFTER_PAYMENT_DEADLINE
+    
+    def _load_phase_dates(self) -> tuple:
+        """
+        Load the phase dates from the system configuration.
+        
+        Returns:
+            (registration_start, registration_end, payment_deadline) as naive
+            UTC datetimes, or an empty tuple if the configuration is missing
+            or invalid
+        """
+        import logging
+        logger = logging.getLogger(__name__)
         
         # Import configuration module
         from configuration import ConfigurationManager
@@ -447,16 +516,10 @@ class PermissionChecker:
         registration_end_str = system_config.get('registration_end_date')
         payment_deadline_str = system_config.get('payment_deadline')
         
-        # Handle missing configuration - default to most restrictive phase
+        # Handle missing configuration
         if not all([registration_start_str, registration_end_str, payment_deadline_str]):
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error("Missing date configuration for event phase detection")
-            # Default to most restrictive phase for safety
-            phase = EventPhase.AFTER_PAYMENT_DEADLINE
-            self._phase_cache = phase
-            self._phase_cache_time = current_time
-            return phase
+            return ()
         
         # Parse dates (handle both date-only and ISO datetime formats)
         try:
@@ -482,33 +545,10 @@ class PermissionChecker:
             else:
                 payment_deadline = datetime.fromisoformat(payment_deadline_str + 'T23:59:59')
         except (ValueError, AttributeError) as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Invalid date format in configuration: {e}")
-            # Default to most restrictive phase for safety
-            phase = EventPhase.AFTER_PAYMENT_DEADLINE
-            self._phase_cache = phase
-            self._phase_cache_time = current_time
-            return phase
-        
-        # Get current time (use UTC for consistency)
-        now = datetime.utcnow()
-        
-        # Determine phase based on current time
-        if now < registration_start:
-            phase = EventPhase.BEFORE_REGISTRATION
-        elif registration_start <= now <= registration_end:
-            phase = EventPhase.DURING_REGISTRATION
-        elif registration_end < now <= payment_deadline:
-            phase = EventPhase.AFTER_REGISTRATION
-        else:  # now > payment_deadline
-            phase = EventPhase.AFTER_PAYMENT_DEADLINE
-        
-        # Cache the result
-        self._phase_cache = phase
-        self._phase_cache_time = current_time
+            return ()
         
-        return phase
+        return registration_start, registration_end, payment_deadline
     
     def get_permission_matrix(self) -> Dict[str, Any]:
         """
@@ -538,10 +578,9 @@ class PermissionChecker:
                 config_manager = get_config_manager()
             
             # Query for CONFIG#PERMISSIONS
-            import boto3
             if self.db is None:
-                dynamodb = boto3.resource('dynamodb')
-                table = dynamodb.Table(config_manager.table_name)
+                from aws_clients import get_dynamodb_resource
+                table = get_dynamodb_resource().Table(config_manager.table_name)
             else:
                 table = self.db.Table(config_manager.table_name)
             
@@ -584,8 +623,14 @@ class PermissionChecker:
         """
         Check if user has an active temporary access grant.
         
-        Queries DynamoDB for active grants and checks expiration.
-        Automatically marks expired grants as expired.
+        Lookups are memoized for the current request (see start_request).
+        Users without an active grant are remembered for
+        GRANT_NEGATIVE_CACHE_TTL seconds, and while no grant is active at all
+        no user is looked up, so the common case costs no read. Grants and
+        revocations bump the configuration version, which clears these
+        caches. Expired grants are recognized from their expires_at and are
+        never updated here (DynamoDB TTL deletes them after
+        TEMP_ACCESS_RETENTION_DAYS).
         
         Args:
             user_id: User ID to check
@@ -593,93 +638,97 @@ class PermissionChecker:
         Returns:
             True if active grant exists, False otherwise
         """
-        # Import configuration module
-        from configuration import ConfigurationManager
+        if user_id in self._request_grants:
+            return self._request_grants[user_id]
         
+        current_time = time.time()
+        negative_time = self._grant_negative_cache.get(user_id)
+        if negative_time is not None and (current_time - negative_time) < GRANT_NEGATIVE_CACHE_TTL:
+            has_grant = False
+        elif self._check_no_active_grants():
+            has_grant = False
+        else:
+            has_grant = self._get_grant_status(user_id)
+            if has_grant is None:
+                # Lookup failed - deny without caching
+                return False
+            if not has_grant:
+                self._grant_negative_cache[user_id] = current_time
+        
+        self._request_grants[user_id] = has_grant
+        return has_grant
+    
+    def _get_grant_status(self, user_id: str) -> Optional[bool]:
+        """
+        Read the temporary access grant of a user (a single read, no write).
+        
+        Args:
+            user_id: User ID to check
+        
+        Returns:
+            True if the grant is active, False otherwise, None if the read failed
+        """
         try:
-            # Get table
-            if self.table_name:
-                config_manager = ConfigurationManager(table_name=self.table_name)
-            else:
-                from configuration import get_config_manager
-                config_manager = get_config_manager()
-            
-            import boto3
-            if self.db is None:
-                dynamodb = boto3.resource('dynamodb')
-                table = dynamodb.Table(config_manager.table_name)
-            else:
-                table = self.db.Table(config_manager.table_name)
-            
-            # Query for temporary access grant
-            response = table.get_item(
+            response = self._get_table().get_item(
                 Key={
                     'PK': 'TEMP_ACCESS',
                     'SK': f'USER#{user_id}'
                 }
             )
-            
-            if 'Item' not in response:
-                return False
-            
-            grant = response['Item']
-            
-            # Check if grant is active
-            if grant.get('status') != 'active':
-                return False
-            
-            # Check if grant has expired
-            expiration_str = grant.get('expiration_timestamp')
-            if not expiration_str:
-                return False
-            
-            # Parse expiration timestamp
-            try:
-                if 'T' in expiration_str:
-                    expiration = datetime.fromisoformat(expiration_str.replace('Z', '+00:00'))
-                    # Remove timezone info for comparison
-                    expiration = expiration.replace(tzinfo=None)
-                else:
-                    expiration = datetime.fromisoformat(expiration_str + 'T23:59:59')
-            except (ValueError, AttributeError):
-                return False
-            
-            # Get current time (UTC)
-            now = datetime.utcnow()
-            
-            # Check if expired
-            if now > expiration:
-                # Mark grant as expired
-                try:
-                    table.update_item(
-                        Key={
-                            'PK': 'TEMP_ACCESS',
-                            'SK': f'USER#{user_id}'
-                        },
-                        UpdateExpression='SET #status = :expired, updated_at = :now',
-                        ExpressionAttributeNames={
-                            '#status': 'status'
-                        },
-                        ExpressionAttributeValues={
-                            ':expired': 'expired',
-                            ':now': datetime.utcnow().isoformat() + 'Z'
-                        }
-                    )
-                except Exception as e:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"Failed to mark grant as expired: {e}")
-                
-                return False
-            
-            # Grant is active and not expired
-            return True
-            
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"Error checking temporary access grant: {e}")
+            return None
+        
+        if 'Item' not in response:
             return False
+        
+        return grant_status(response['Item']) == 'active'
+    
+    def _check_no_active_grants(self) -> bool:
+        """
+        Check whether no temporary access grant is active at all (with caching).
+        
+        Reads the TEMP_ACCESS partition, kept small by TTL, at most once per
+        cache TTL. Active grants only stop being active with time, so "no
+        active grant" stays true until a new grant bumps the configuration
+        version.
+        
+        Returns:
+            True if no grant is active, False if some may be
+        """
+        current_time = time.time()
+        if self._no_active_grants is not None and \
+           (current_time - self._no_active_grants_time) < self.cache_ttl:
+            return self._no_active_grants
+        
+        try:
+            table = self._get_table()
+            query_kwargs = {
+                'KeyConditionExpression': 'PK = :pk',
+                'ExpressionAttributeNames': {'#status': 'status'},
+                'ExpressionAttributeValues': {':pk': 'TEMP_ACCESS'},
+                'ProjectionExpression': f'#status, {GRANT_EXPIRES_AT}, expiration_timestamp'
+            }
+            no_active_grants = True
+            while no_active_grants:
+                response = table.query(**query_kwargs)
+                if any(grant_status(grant, current_time) == 'active' for grant in response.get('Items', [])):
+                    no_active_grants = False
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Error listing temporary access grants: {e}")
+            # Fall back to per-user lookups
+            return False
+        
+        self._no_active_grants = no_active_grants
+        self._no_active_grants_time = current_time
+        return no_active_grants
     
     def invalidate_cache(self):
         """
@@ -692,12 +741,192 @@ class PermissionChecker:
         self._config_cache.clear()
         self._phase_cache = None
         self._phase_cache_time = 0
+        self._request_grants.clear()
+        self._grant_negative_cache.clear()
+        self._no_active_grants = None
+        self._no_active_grants_time = 0
+    
+    def start_request(self):
+        """
+        Prepare the checker for a new request.
+        
+        Forgets the grant lookups of the previous request and invalidates
+        the caches if the configuration changed.
+        """
+        self._request_grants.clear()
+        self.sync_config_version()
+    
+    def sync_config_version(self):
+        """
+        Invalidate the caches if the configuration changed since they were filled.
+        
+        Reads the configuration version stamp (one small item) that admin
+        configuration changes and temporary access grants and revocations
+        bump. Called once per request by the container-level checker, so
+        warm containers pick up admin changes without re-reading the full
+        configuration.
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        from configuration import get_config_version
+        
+        try:
+            version = get_config_version(self._get_table())
+        except Exception as e:
+            logger.error(f"Error reading configuration version: {e}")
+            # Unknown version - do not trust the caches
+            self.invalidate_cache()
+            self._config_version = None
+            return
+        
+        if version != self._config_version:
+            if self._config_version is not None:
+                logger.info(f"Configuration version changed ({self._config_version} -> {version}), "
+                            f"permission caches invalidated")
+            self.invalidate_cache()
+            self._config_version = version
+    
+    def _get_table(self):
+        """
+        Get the DynamoDB table holding configuration and grants.
+        
+        Returns:
+            DynamoDB Table resource
+        """
+        if self.table_name:
+            table_name = self.table_name
+        else:
+            from configuration import get_config_manager
+            table_name = get_config_manager().table_name
+        
+        if self.db is None:
+            from aws_clients import get_dynamodb_resource
+            return get_dynamodb_resource().Table(table_name)
+        return self.db.Table(table_name)
+
+
+# ============================================================================
+# Container-level Permission Checker
+# ============================================================================
+
+# Shared by the warm invocations of a Lambda container (see get_permission_checker)
+_permission_checker = None
+
+
+def get_permission_checker(table_name: str = None) -> PermissionChecker:
+    """
+    Get the container-level PermissionChecker.
+    
+    Its phase, permission matrix and grant caches survive across warm
+    invocations; callers run start_request once per request so admin
+    configuration changes and grants are picked up immediately.
+    
+    Args:
+        table_name: DynamoDB table name (optional, defaults to TABLE_NAME env var)
+    
+    Returns:
+        PermissionChecker shared by the container
+    """
+    global _permission_checker
+    if _permission_checker is None or _permission_checker.table_name != table_name:
+        _permission_checker = PermissionChecker(cache_ttl=CONTAINER_CACHE_TTL, table_name=table_name)
+    return _permission_checker
 
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+def _epoch_seconds(moment: datetime) -> int:
+    """Epoch seconds of a naive UTC datetime"""
+    return calendar.timegm(moment.utctimetuple())
+
+
+def audit_ttl(now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    TTL attribute of a new audit entry, AUDIT_LOG_RETENTION_DAYS from now.
+    
+    Args:
+        now: Entry timestamp (naive UTC, defaults to now)
+    
+    Returns:
+        Dictionary with the TTL attribute to store on the entry
+    """
+    now = now or datetime.utcnow()
+    return {TTL_ATTRIBUTE: _epoch_seconds(now + timedelta(days=AUDIT_LOG_RETENTION_DAYS))}
+
+
+def grant_expiry_attributes(expiration: datetime) -> Dict[str, int]:
+    """
+    Expiry attributes of a temporary access grant.
+    
+    Args:
+        expiration: Grant expiration (naive UTC)
+    
+    Returns:
+        Dictionary with expires_at and the TTL attribute (expiration plus
+        TEMP_ACCESS_RETENTION_DAYS, so ended grants stay listed for a while)
+    """
+    return {
+        GRANT_EXPIRES_AT: _epoch_seconds(expiration),
+        TTL_ATTRIBUTE: _epoch_seconds(expiration + timedelta(days=TEMP_ACCESS_RETENTION_DAYS))
+    }
+
+
+def grant_expires_at(grant: Dict[str, Any]) -> Optional[int]:
+    """
+    Expiration of a temporary access grant in epoch seconds.
+    
+    Grants created before expires_at was stored fall back to parsing
+    expiration_timestamp.
+    
+    Args:
+        grant: TEMP_ACCESS item
+    
+    Returns:
+        Epoch seconds, or None when the grant has no valid expiration
+    """
+    if grant.get(GRANT_EXPIRES_AT) is not None:
+        return int(grant[GRANT_EXPIRES_AT])
+    
+    expiration_str = grant.get('expiration_timestamp')
+    if not expiration_str:
+        return None
+    try:
+        if 'T' in expiration_str:
+            expiration = datetime.fromisoformat(expiration_str.replace('Z', '+00:00')).replace(tzinfo=None)
+        else:
+            expiration = datetime.fromisoformat(expiration_str + 'T23:59:59')
+    except (ValueError, AttributeError):
+        return None
+    return _epoch_seconds(expiration)
+
+
+def grant_status(grant: Dict[str, Any], now: Optional[float] = None) -> str:
+    """
+    Effective status of a temporary access grant.
+    
+    Stored statuses are 'active' and 'revoked'; an active grant past its
+    expiration (or without one) is reported as 'expired' without being
+    updated.
+    
+    Args:
+        grant: TEMP_ACCESS item
+        now: Current epoch seconds (defaults to now)
+    
+    Returns:
+        'active', 'expired' or 'revoked'
+    """
+    status = grant.get('status', 'active')
+    if status != 'active':
+        return status
+    expires_at = grant_expires_at(grant)
+    if expires_at is None or (time.time() if now is None else now) > expires_at:
+        return 'expired'
+    return 'active'
+
+
 def require_permission(action: str):
     """
     Decorator for Lambda handlers to enforce permissions.
@@ -730,6 +959,10 @@ def require_permission(action: str):
                 import os
                 table_name = os.environ.get('TABLE_NAME')
                 
+                # Container-level checker, refreshed if the configuration changed
+                checker = get_permission_checker(table_name)
+                checker.start_request()
+                
                 # Step 1: Extract user context from event
                 user_context = get_user_context_from_event(event)
                 
@@ -752,7 +985,6 @@ def require_permission(action: str):
                 resource_context = get_resource_context_from_body(body, resource_type, event, table_name)
                 
                 # Step 3: Check permission
-                checker = PermissionChecker(table_name=table_name)
                 result = checker.check_permission(user_context, action, resource_context)
                 
                 # Step 4: Handle result
@@ -897,7 +1129,7 @@ def get_user_context_from_event(event: Dict[str, Any]) -> UserContext:
         
         # Check for temporary access grant using effective user ID
         table_name = os.environ.get('TABLE_NAME')
-        checker = PermissionChecker(table_name=table_name)
+        checker = get_permission_checker(table_name)
         has_temporary_access = checker.check_temporary_access_grant(effective_user_id)
         
         return UserContext(
@@ -1022,10 +1254,12 @@ def _get_crew_member_state(crew_member_id: str, team_manager_id: str, table_name
     logger = logging.getLogger(__name__)
     
     try:
-        from database import DatabaseClient
+        from database import DatabaseClient, get_db_client
         
-        # Create a new client with the specified table name
-        db = DatabaseClient(table_name=table_name)
+        # Reuse the global client (and its request cache) unless another table is requested
+        db = get_db_client()
+        if table_name and table_name != db.table_name:
+            db = DatabaseClient(table_name=table_name)
         
         # Query crew member using the correct PK/SK structure
         crew_member = db.get_item(
@@ -1063,10 +1297,12 @@ def _get_boat_registration_state(boat_registration_id: str, team_manager_id: str
     logger = logging.getLogger(__name__)
     
     try:
-        from database import DatabaseClient
+        from database import DatabaseClient, get_db_client
         
-        # Create a new client with the specified table name
-        db = DatabaseClient(table_name=table_name)
+        # Reuse the global client (and its request cache) unless another table is requested
+        db = get_db_client()
+        if table_name and table_name != db.table_name:
+            db = DatabaseClient(table_name=table_name)
         
         # Query boat registration using the correct PK/SK structure
         boat = db.get_item(
@@ -1111,8 +1347,8 @@ def log_permission_denial(
         table_name: DynamoDB table name (optional)
     """
     import logging
-    import boto3
     from datetime import datetime
+    from aws_clients import get_dynamodb_resource
     
     logger = logging.getLogger(__name__)
     
@@ -1126,8 +1362,7 @@ def log_permission_denial(
             config_manager = get_config_manager()
         
         if db_client is None:
-            dynamodb = boto3.resource('dynamodb')
-            table = dynamodb.Table(config_manager.table_name)
+            table = get_dynamodb_resource().Table(config_manager.table_name)
         else:
             table = db_client.Table(config_manager.table_name)
         
@@ -1143,7 +1378,8 @@ def log_permission_denial(
             'resource_type': resource_context.resource_type,
             'resource_id': resource_context.resource_id or 'N/A',
             'denial_reason': reason,
-            'timestamp': timestamp
+            'timestamp': timestamp,
+            **audit_ttl()
         }
         
         # Add optional fields if available
@@ -1184,8 +1420,8 @@ def log_permission_grant_with_bypass(
         table_name: DynamoDB table name (optional)
     """
     import logging
-    import boto3
     from datetime import datetime
+    from aws_clients import get_dynamodb_resource
     
     logger = logging.getLogger(__name__)
     
@@ -1199,8 +1435,7 @@ def log_permission_grant_with_bypass(
             config_manager = get_config_manager()
         
         if db_client is None:
-            dynamodb = boto3.resource('dynamodb')
-            table = dynamodb.Table(config_manager.table_name)
+            table = get_dynamodb_resource().Table(config_manager.table_name)
         else:
             table = db_client.Table(config_manager.table_name)
         
@@ -1216,7 +1451,8 @@ def log_permission_grant_with_bypass(
             'resource_type': resource_context.resource_type,
             'resource_id': resource_context.resource_id or 'N/A',
             'bypass_reason': bypass_reason,
-            'timestamp': timestamp
+            'timestamp': timestamp,
+            **audit_ttl()
         }
         
         # Add impersonated_user_id if applicable
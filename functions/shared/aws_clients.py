@@ -0,0 +1,107 @@
+"""
+Shared AWS client registry
+Builds each boto3 client/resource once per Lambda container, on first use,
+with connection settings tuned for short-lived invocations
+"""
+import os
+import logging
+import threading
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Connection settings shared by every client
+# - pool large enough for parallel scans and batch workers
+# - TCP keep-alive so warm containers reuse connections
+# - short timeouts so a stuck connection fails instead of eating the Lambda timeout
+# - adaptive retries: throttled calls are retried with backoff and the client
+#   rate-limits itself, shared by every invocation of a warm container
+CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '16')),
+    connect_timeout=float(os.environ.get('AWS_CONNECT_TIMEOUT', '3')),
+    read_timeout=float(os.environ.get('AWS_READ_TIMEOUT', '10')),
+    tcp_keepalive=True,
+    retries={
+        'mode': os.environ.get('AWS_RETRY_MODE', 'adaptive'),
+        'max_attempts': int(os.environ.get('AWS_MAX_ATTEMPTS', '3'))
+    }
+)
+
+_clients = {}
+_resources = {}
+_lock = threading.Lock()
+
+
+def _region(region_name):
+    """Resolve the region a client is built for (explicit or from the environment)"""
+    return region_name or os.environ.get('AWS_REGION') or os.environ.get('AWS_DEFAULT_REGION')
+
+
+def get_client(service_name, region_name=None):
+    """
+    Get the shared low-level client for a service
+
+    Args:
+        service_name: AWS service name (e.g. 'cognito-idp', 's3')
+        region_name: Optional region (defaults to the Lambda region)
+
+    Returns:
+        botocore client
+    """
+    key = (service_name, _region(region_name))
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = boto3.client(service_name, region_name=region_name, config=CLIENT_CONFIG)
+                _clients[key] = client
+                logger.info(f"Created {service_name} client")
+    return client
+
+
+def get_resource(service_name, region_name=None):
+    """
+    Get the shared resource for a service
+
+    Args:
+        service_name: AWS service name (e.g. 'dynamodb')
+        region_name: Optional region (defaults to the Lambda region)
+
+    Returns:
+        boto3 service resource
+    """
+    key = (service_name, _region(region_name))
+    resource = _resources.get(key)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(key)
+            if resource is None:
+                resource = boto3.resource(service_name, region_name=region_name, config=CLIENT_CONFIG)
+                _resources[key] = resource
+                logger.info(f"Created {service_name} resource")
+    return resource
+
+
+def get_dynamodb_resource():
+    """Get the shared DynamoDB resource"""
+    return get_resource('dynamodb')
+
+
+class LazyClient:
+    """
+    Module-level stand-in for a client that is only built on first use
+
+    Usage:
+        cognito = LazyClient('cognito-idp')
+        cognito.admin_get_user(...)  # client created here
+    """
+
+    def __init__(self, service_name, region_name=None):
+        self._service_name = service_name
+        self._region_name = region_name
+
+    def __getattr__(self, name):
+        return getattr(get_client(self._service_name, self._region_name), name)
@@ -5,8 +5,19 @@ Helper functions for boat registration management and validation
 from typing import List, Dict, Any, Optional
 import logging
 
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from database import edition_partition, get_timestamp, is_conditional_check_failure
+
 logger = logging.getLogger(__name__)
 
+# Per-race boat-number sequence counters of the current edition
+# (PK=COUNTER, SK=BOAT_NUMBER#<race_id>[#<edition>]), so numbering restarts every year
+BOAT_NUMBER_COUNTER_PK = 'COUNTER'
+BOAT_NUMBER_COUNTER_SK_PREFIX = 'BOAT_NUMBER#'
+BOAT_NUMBER_COUNTER_ATTRIBUTE = 'last_sequence'
+
 
 def get_required_seats_for_boat_type(boat_type: str) -> List[Dict[str, Any]]:
     """
@@ -363,6 +374,71 @@ def calculate_registration_status(boat_registration: Dict[str, Any], assigned_cr
     return 'incomplete'
 
 
+def _boat_number_prefix(event_type: str, display_order: Any, race_id: str) -> Optional[tuple]:
+    """
+    Validate the race fields used in boat numbers
+    
+    Args:
+        event_type: '42km' or '21km'
+        display_order: Race display order (1-55)
+        race_id: Race ID (for logging)
+    
+    Returns:
+        Tuple of (prefix, display_order as int) or None if the race is invalid
+    """
+    # Validate event_type
+    if not event_type or event_type not in ['42km', '21km']:
+        logger.error(f"Invalid event_type for boat_number generation: {event_type}")
+        return None
+    
+    # Determine prefix based on event type
+    prefix = "M" if event_type == "42km" else "SM"
+    
+    # Handle missing or invalid display_order
+    if display_order is None:
+        logger.error(f"Missing display_order for race {race_id}, cannot generate boat_number")
+        return None
+    
+    # Convert display_order to int if it's not already
+    try:
+        display_order = int(display_order)
+    except (ValueError, TypeError):
+        logger.error(f"Invalid display_order for race {race_id}: {display_order}, cannot generate boat_number")
+        return None
+    
+    # Use 0 as fallback for missing display_order (log warning)
+    if display_order == 0:
+        logger.warning(f"Display order is 0 for race {race_id}, using 0 as fallback")
+    
+    return prefix, display_order
+
+
+def parse_boat_number_sequence(boat_number: Optional[str]) -> Optional[int]:
+    """
+    Extract the sequence from a boat number
+    
+    Args:
+        boat_number: Boat number (e.g., "SM.15.42")
+    
+    Returns:
+        Sequence number (e.g., 42) or None if missing or malformed
+    """
+    if not boat_number:
+        return None
+    
+    # Parse sequence from boat_number (e.g., "SM.15.42" -> 42)
+    parts = boat_number.split('.')
+    if len(parts) == 3:
+        try:
+            return int(parts[2])
+        except ValueError:
+            pass
+    
+    # Invalid format, skip this boat_number
+    logger.warning(f"Invalid boat_number format: {boat_number}")
+    return None
+
+
 def generate_boat_number(
     event_type: str,
     display_order: int,
@@ -378,6 +454,9 @@ def generate_boat_number(
     - display_order: Race display order (1-55)
     - sequence: Incrementing number starting at 1 for each race
     
+    Handlers allocate numbers with allocate_boat_number; this computes the
+    next number from a known list of boats (migrations and previews).
+    
     Args:
         event_type: '42km' or '21km'
         display_order: Race display order (1-55)
@@ -405,45 +484,17 @@ def generate_boat_number(
         'M.14.8'
     """
     try:
-        # Validate event_type
-        if not event_type or event_type not in ['42km', '21km']:
-            logger.error(f"Invalid event_type for boat_number generation: {event_type}")
+        race_prefix = _boat_number_prefix(event_type, display_order, race_id)
+        if not race_prefix:
             return None
-        
-        # Determine prefix based on event type
-        prefix = "M" if event_type == "42km" else "SM"
-        
-        # Handle missing or invalid display_order
-        if display_order is None:
-            logger.error(f"Missing display_order for race {race_id}, cannot generate boat_number")
-            return None
-        
-        # Convert display_order to int if it's not already
-        try:
-            display_order = int(display_order)
-        except (ValueError, TypeError):
-            logger.error(f"Invalid display_order for race {race_id}: {display_order}, cannot generate boat_number")
-            return None
-        
-        # Use 0 as fallback for missing display_order (log warning)
-        if display_order == 0:
-            logger.warning(f"Display order is 0 for race {race_id}, using 0 as fallback")
+        prefix, display_order = race_prefix
         
         # Find highest sequence number in this race
         max_sequence = 0
         for boat in all_boats_in_race:
-            boat_num = boat.get('boat_number', '')
-            if boat_num:
-                # Parse sequence from boat_number (e.g., "SM.15.42" -> 42)
-                parts = boat_num.split('.')
-                if len(parts) == 3:
-                    try:
-                        sequence = int(parts[2])
-                        max_sequence = max(max_sequence, sequence)
-                    except ValueError:
-                        # Invalid format, skip this boat_number
-                        logger.warning(f"Invalid boat_number format: {boat_num}")
-                        pass
+            sequence = parse_boat_number_sequence(boat.get('boat_number', ''))
+            if sequence is not None:
+                max_sequence = max(max_sequence, sequence)
         
         # Increment for new boat
         new_sequence = max_sequence + 1
@@ -458,6 +509,164 @@ def generate_boat_number(
         return None
 
 
+def boat_number_counter_key(race_id: str) -> tuple:
+    """
+    Key of the boat-number sequence counter of a race in the current edition
+    
+    Args:
+        race_id: Race ID
+    
+    Returns:
+        Tuple of (PK, SK)
+    """
+    return BOAT_NUMBER_COUNTER_PK, f'{BOAT_NUMBER_COUNTER_SK_PREFIX}{edition_partition(race_id)}'
+
+
+def allocate_boat_number(db, event_type: str, display_order: int, race_id: str) -> Optional[str]:
+    """
+    Allocate the next boat number of a race from its sequence counter
+    
+    The counter is incremented with an atomic ADD, so concurrent
+    registrations in the same race never get the same number and no boats
+    have to be read. A race without a counter yet has it seeded from the
+    highest boat number already in the race before the first increment;
+    rebuild_boat_number_counters repairs counters that drifted.
+    
+    Args:
+        db: DatabaseClient instance
+        event_type: '42km' or '21km'
+        display_order: Race display order (1-55)
+        race_id: Race ID to allocate a number in
+    
+    Returns:
+        Boat number string (e.g., "SM.15.42") or None if the race is invalid
+    """
+    race_prefix = _boat_number_prefix(event_type, display_order, race_id)
+    if not race_prefix:
+        return None
+    prefix, display_order = race_prefix
+    
+    pk, sk = boat_number_counter_key(race_id)
+    try:
+        sequence = db.increment_counters(
+            pk, sk, {BOAT_NUMBER_COUNTER_ATTRIBUTE: 1}, condition_expression=Attr('PK').exists()
+        )[BOAT_NUMBER_COUNTER_ATTRIBUTE]
+    except ClientError as e:
+        if not is_conditional_check_failure(e):
+            raise
+        seed_boat_number_counter(db, race_id)
+        sequence = db.increment_counter(pk, sk, BOAT_NUMBER_COUNTER_ATTRIBUTE)
+    
+    boat_number = f"{prefix}.{display_order}.{sequence}"
+    logger.info(f"Allocated boat_number: {boat_number} for race {race_id}")
+    return boat_number
+
+
+def seed_boat_number_counter(db, race_id: str) -> None:
+    """
+    Create a race's sequence counter at the highest boat number of the race
+    
+    The counter is only written if it does not exist, so a counter seeded
+    or incremented concurrently is kept. No number is allocated while the
+    counter is missing, so the boats read cannot miss a newer number.
+    
+    Args:
+        db: DatabaseClient instance
+        race_id: Race ID of the counter
+    """
+    boats = db.list_race_boats(race_id, attributes=['race_id', 'boat_number'])
+    sequence = compute_boat_number_sequences(boats).get(race_id, 0)
+    
+    pk, sk = boat_number_counter_key(race_id)
+    try:
+        db.put_item(
+            {
+                'PK': pk,
+                'SK': sk,
+                'race_id': race_id,
+                BOAT_NUMBER_COUNTER_ATTRIBUTE: sequence,
+                'updated_at': get_timestamp()
+            },
+            condition_expression=Attr('PK').not_exists()
+        )
+        logger.info(f"Seeded boat number counter of race {race_id} at {sequence}")
+    except ClientError as e:
+        if not is_conditional_check_failure(e):
+            raise
+
+
+def compute_boat_number_sequences(boats: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Highest boat-number sequence used in each race
+    
+    Args:
+        boats: Boat registrations with race_id and boat_number
+    
+    Returns:
+        Dictionary of race_id to highest sequence
+    """
+    sequences = {}
+    for boat in boats:
+        race_id = boat.get('race_id')
+        sequence = parse_boat_number_sequence(boat.get('boat_number'))
+        if race_id and sequence is not None:
+            sequences[race_id] = max(sequences.get(race_id, 0), sequence)
+    return sequences
+
+
+def rebuild_boat_number_counters(db, timestamp: str) -> Dict[str, int]:
+    """
+    Raise every race's sequence counter to its highest existing boat number
+    
+    Each counter is written with a condition that it is not ahead of the
+    computed value, so a number allocated while the boats were read is
+    never rolled back (which would hand it out again). Counters already
+    ahead are kept; races without counters start at 0.
+    
+    Args:
+        db: DatabaseClient instance
+        timestamp: Value stored as updated_at on the counters
+    
+    Returns:
+        Dictionary of race_id to the counter value after the rebuild
+    """
+    boats = db.iter_entities(
+        'BOAT',
+        filter_expression=Attr('boat_number').exists(),
+        attributes=['race_id', 'boat_number']
+    )
+    sequences = compute_boat_number_sequences(boats)
+    for race in db.iter_query('RACE', attributes=['SK']):
+        sequences.setdefault(race['SK'], 0)
+    
+    kept = 0
+    for race_id, sequence in sequences.items():
+        pk, sk = boat_number_counter_key(race_id)
+        try:
+            db.update_item(
+                pk=pk,
+                sk=sk,
+                updates={
+                    'race_id': race_id,
+                    BOAT_NUMBER_COUNTER_ATTRIBUTE: sequence,
+                    'updated_at': timestamp
+                },
+                condition_expression=(
+                    Attr(BOAT_NUMBER_COUNTER_ATTRIBUTE).not_exists()
+                    | Attr(BOAT_NUMBER_COUNTER_ATTRIBUTE).lte(sequence)
+                )
+            )
+        except ClientError as e:
+            if not is_conditional_check_failure(e):
+                raise
+            counter = db.get_item(pk, sk) or {}
+            sequences[race_id] = int(counter.get(BOAT_NUMBER_COUNTER_ATTRIBUTE, sequence))
+            kept += 1
+    
+    logger.info(f"Rebuilt {len(sequences)} boat number counters ({kept} already ahead and kept)")
+    return sequences
+
+
 def get_coxswain_substitutes(
     boat_registration: Dict[str, Any],
     all_crew_members: List[Dict[str, Any]],
@@ -0,0 +1,262 @@
+"""
+Club directory
+Prebuilt, gzip-compressed directory of the rowing clubs (PK=CLUB) in S3, with
+a normalized prefix index for the registration autocomplete, rewritten by the
+table stream consumer whenever a club changes
+
+Layout in SNAPSHOT_BUCKET:
+- snapshots/clubs.json.gz: {'version', 'generated_at', 'clubs', 'index'}
+  - clubs: public club fields (club_id, name, url), sorted by name
+  - index: sorted [token, [club positions]] pairs, tokens being the
+    normalized words of the club names, so the clubs matching a prefix are
+    the postings of one contiguous range of tokens
+"""
+import bisect
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from typing import Dict, Any, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from aws_clients import get_client
+from database import get_timestamp
+from registration_snapshot import snapshot_bucket
+
+logger = logging.getLogger(__name__)
+
+CLUB_DIRECTORY_KEY = 'snapshots/clubs.json.gz'
+
+# Club fields exposed by the directory
+CLUB_ATTRIBUTES = ('club_id', 'name', 'url')
+
+# Seconds the cached directory is served without any read; after that it is
+# revalidated against the object's ETag and only reloaded if it changed
+CLUB_DIRECTORY_TTL = int(os.environ.get('CLUB_DIRECTORY_TTL', '300'))
+
+# Maximum number of clubs returned by a search
+CLUB_SEARCH_LIMIT = int(os.environ.get('CLUB_SEARCH_LIMIT', '20'))
+
+# Directory of the container (see get_club_directory)
+_directory = None
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize a club name or query for matching
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Lowercase text without accents, punctuation folded to single spaces
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(re.split(r'[\W_]+', stripped.lower())).strip()
+
+
+def build_directory(clubs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the directory document of a list of clubs
+
+    Args:
+        clubs: Club items (any order, extra attributes ignored)
+
+    Returns:
+        Directory document, versioned by a hash of its clubs
+    """
+    entries = sorted(
+        ({attribute: club.get(attribute) or '' for attribute in CLUB_ATTRIBUTES} for club in clubs),
+        key=lambda club: (normalize(club['name']), club['club_id'])
+    )
+
+    postings = {}
+    for position, club in enumerate(entries):
+        for token in normalize(club['name']).split():
+            positions = postings.setdefault(token, [])
+            if not positions or positions[-1] != position:
+                positions.append(position)
+
+    encoded = json.dumps(entries, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return {
+        'version': hashlib.sha256(encoded).hexdigest()[:16],
+        'generated_at': get_timestamp(),
+        'clubs': entries,
+        'index': sorted([token, positions] for token, positions in postings.items())
+    }
+
+
+class ClubDirectory:
+    """Club directory loaded in memory, searchable by name prefix"""
+
+    def __init__(self, document: Dict[str, Any], etag: Optional[str] = None):
+        """
+        Load a directory document
+
+        Args:
+            document: Directory document (see build_directory)
+            etag: S3 ETag of the object it was read from (None if built locally)
+        """
+        self.clubs = document['clubs']
+        self.version = document['version']
+        self.tokens = [token for token, _ in document['index']]
+        self.postings = [positions for _, positions in document['index']]
+        self.names = [normalize(club['name']) for club in self.clubs]
+        self.etag = etag
+        self.checked_at = time.time()
+
+    def _prefix_positions(self, prefix: str) -> set:
+        """Positions of the clubs with a name token starting with a prefix"""
+        positions = set()
+        start = bisect.bisect_left(self.tokens, prefix)
+        for index in range(start, len(self.tokens)):
+            if not self.tokens[index].startswith(prefix):
+                break
+            positions.update(self.postings[index])
+        return positions
+
+    def search(self, query: str, limit: int = CLUB_SEARCH_LIMIT) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Clubs whose name has a word starting with each word of the query
+
+        Args:
+            query: Search text (case and accents are ignored)
+            limit: Maximum number of clubs to return
+
+        Returns:
+            (matching clubs, names starting with the query first, then by name;
+            whether more clubs matched than the limit)
+        """
+        normalized = normalize(query)
+        words = normalized.split()
+        if not words:
+            return self.clubs[:limit], len(self.clubs) > limit
+
+        matches = None
+        for word in sorted(set(words), key=len, reverse=True):
+            positions = self._prefix_positions(word)
+            matches = positions if matches is None else matches & positions
+            if not matches:
+                return [], False
+
+        ranked = sorted(matches, key=lambda position: (not self.names[position].startswith(normalized), position))
+        return [self.clubs[position] for position in ranked[:limit]], len(ranked) > limit
+
+
+def _query_clubs(db) -> List[Dict[str, Any]]:
+    """Read the clubs from the table"""
+    return list(db.iter_query('CLUB', attributes=list(CLUB_ATTRIBUTES)))
+
+
+def rebuild_club_directory(db, s3=None) -> Optional[Dict[str, Any]]:
+    """
+    Rewrite the directory object from the table
+
+    Args:
+        db: DatabaseClient instance
+        s3: Optional S3 client
+
+    Returns:
+        Dictionary with the directory version and number of clubs,
+        or None when the snapshot bucket is not configured
+    """
+    bucket = snapshot_bucket()
+    if not bucket:
+        return None
+
+    document = build_directory(_query_clubs(db))
+    (s3 or get_client('s3')).put_object(
+        Bucket=bucket,
+        Key=CLUB_DIRECTORY_KEY,
+        Body=gzip.compress(json.dumps(document).encode('utf-8')),
+        ContentType='application/json',
+        ContentEncoding='gzip'
+    )
+
+    logger.info(f"Rebuilt club directory version {document['version']} ({len(document['clubs'])} clubs)")
+    return {'version': document['version'], 'club_count': len(document['clubs'])}
+
+
+def _read_directory(s3, bucket: str, etag: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Read the directory object unless its ETag is still the given one
+
+    Returns:
+        (document, ETag); (None, etag) when unchanged; (None, None) when missing
+    """
+    kwargs = {'IfNoneMatch': etag} if etag else {}
+    try:
+        response = s3.get_object(Bucket=bucket, Key=CLUB_DIRECTORY_KEY, **kwargs)
+    except ClientError as e:
+        code = e.response['Error']['Code']
+        if code in ('304', 'NotModified'):
+            return None, etag
+        if code in ('NoSuchKey', '404'):
+            return None, None
+        raise
+    return json.loads(gzip.decompress(response['Body'].read())), response.get('ETag')
+
+
+def get_club_directory(db, s3=None) -> ClubDirectory:
+    """
+    Club directory of the container
+
+    Served without any read for CLUB_DIRECTORY_TTL seconds, then revalidated
+    with a conditional read of the directory object. Until the object exists
+    (or without a snapshot bucket) the directory is built from the table.
+
+    Args:
+        db: DatabaseClient instance
+        s3: Optional S3 client
+
+    Returns:
+        ClubDirectory
+    """
+    global _directory
+    now = time.time()
+
+    if _directory is not None and now - _directory.checked_at < CLUB_DIRECTORY_TTL:
+        return _directory
+
+    bucket = snapshot_bucket()
+    if bucket:
+        try:
+            document, etag = _read_directory(
+                s3 or get_client('s3'), bucket, _directory.etag if _directory is not None else None
+            )
+        except Exception as e:
+            if _directory is None:
+                raise
+            logger.error(f"Failed to read club directory, serving cached directory: {e}")
+            return _directory
+        if document is not None:
+            _directory = ClubDirectory(document, etag)
+            logger.info(f"Loaded club directory version {_directory.version} ({len(_directory.clubs)} clubs)")
+            return _directory
+        if etag is not None:
+            _directory.checked_at = now
+            return _directory
+        logger.warning("Club directory not built yet, reading clubs from the table")
+
+    _directory = ClubDirectory(build_directory(_query_clubs(db)))
+    return _directory
+
+
+def stream_record_is_club(record: Dict[str, Any]) -> bool:
+    """
+    Whether a stream record is a club change
+
+    Args:
+        record: DynamoDB stream record
+
+    Returns:
+        True for records of PK=CLUB items
+    """
+    keys = record.get('dynamodb', {}).get('Keys', {})
+    return keys.get('PK', {}).get('S') == 'CLUB'
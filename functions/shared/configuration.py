@@ -3,12 +3,14 @@ Configuration Manager for DynamoDB-based configuration
 Handles system, pricing, and notification configuration with caching
 """
 import os
-import boto3
+import time
 import logging
 from functools import lru_cache
 from datetime import datetime, timedelta
 from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Key
 from decimal import Decimal
+from aws_clients import get_dynamodb_resource
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -65,21 +67,79 @@ DEFAULT_RACE_TIMING_CONFIG = {
 }
 
 
+# Configuration version stamp: a counter bumped on every configuration
+# change, so containers caching configuration can detect changes with one
+# small read instead of re-reading every configuration item
+CONFIG_VERSION_KEY = {'PK': 'CONFIG', 'SK': 'VERSION'}
+
+# Seconds a configuration bundle is served without any read; after that it is
+# revalidated against the version stamp and only reloaded if it changed
+CONFIG_BUNDLE_TTL = int(os.environ.get('CONFIG_BUNDLE_TTL', '30'))
+
+# Configuration bundles of the container, by table name:
+# {'items': {SK: item}, 'version': int, 'checked_at': epoch seconds}
+_config_bundles = {}
+
+
+def get_config_version(table):
+    """
+    Get the configuration version stamp
+    
+    Args:
+        table: DynamoDB table holding the configuration
+        
+    Returns:
+        int: Current version (0 if the configuration was never changed)
+    """
+    response = table.get_item(Key=CONFIG_VERSION_KEY, ProjectionExpression='version')
+    return int(response.get('Item', {}).get('version', 0))
+
+
+def bump_config_version(table):
+    """
+    Bump the configuration version stamp after a configuration change
+    
+    Args:
+        table: DynamoDB table holding the configuration
+        
+    Returns:
+        int: New version
+    """
+    response = table.update_item(
+        Key=CONFIG_VERSION_KEY,
+        UpdateExpression='ADD version :one SET updated_at = :time',
+        ExpressionAttributeValues={
+            ':one': 1,
+            ':time': datetime.utcnow().isoformat() + 'Z'
+        },
+        ReturnValues='UPDATED_NEW'
+    )
+    version = int(response['Attributes']['version'])
+    logger.info(f"Configuration version bumped to {version}")
+    return version
+
+
 class ConfigurationManager:
     """
     Manages configuration stored in DynamoDB with caching
     """
     
-    def __init__(self, table_name=None):
+    def __init__(self, table_name=None, dynamodb=None, bundle=False):
         """
         Initialize configuration manager
         
         Args:
             table_name: DynamoDB table name (defaults to TABLE_NAME env var)
+            dynamodb: DynamoDB resource to use (defaults to the shared boto3
+                resource; tests and benchmarks pass a MemoryDynamoDB)
+            bundle: Read every configuration type from the container's
+                configuration bundle (all PK=CONFIG items, loaded in one
+                query), for handlers that need several configuration types
         """
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = dynamodb or get_dynamodb_resource()
         self.table_name = table_name or os.environ.get('TABLE_NAME', 'impressionnistes-registration-dev')
         self.table = self.dynamodb.Table(self.table_name)
+        self.bundle = bundle
         self._cache = {}
         self._cache_ttl = timedelta(minutes=5)
         logger.info(f"ConfigurationManager initialized with table: {self.table_name}")
@@ -131,6 +191,13 @@ class ConfigurationManager:
         Returns:
             dict: Configuration
         """
+        if self.bundle:
+            config = self.get_config_bundle().get(config_type)
+            if not config:
+                logger.warning(f"{config_type} configuration not found, using defaults")
+                return default_config.copy()
+            return dict(config)
+        
         cache_key = f'CONFIG#{config_type}'
         
         # Check cache
@@ -160,6 +227,50 @@ class ConfigurationManager:
             logger.error(f"Failed to get {config_type} config: {str(e)}")
             return default_config.copy()
     
+    def get_config_bundle(self):
+        """
+        Get every configuration item (PK=CONFIG), including PERMISSIONS
+        
+        The bundle is loaded with one query and shared by the managers of the
+        container. It is served without any read for CONFIG_BUNDLE_TTL
+        seconds, then revalidated against the configuration version stamp and
+        only reloaded if the configuration changed.
+        
+        Returns:
+            dict: Configuration items by sort key (SYSTEM, PRICING, ...)
+        """
+        cached = _config_bundles.get(self.table_name)
+        now = time.time()
+        
+        if cached:
+            if now - cached['checked_at'] < CONFIG_BUNDLE_TTL:
+                return cached['items']
+            try:
+                if get_config_version(self.table) == cached['version']:
+                    cached['checked_at'] = now
+                    return cached['items']
+            except Exception as e:
+                logger.error(f"Failed to get configuration version: {str(e)}")
+        
+        try:
+            items = {}
+            query_kwargs = {'KeyConditionExpression': Key('PK').eq('CONFIG')}
+            while True:
+                response = self.table.query(**query_kwargs)
+                for item in response.get('Items', []):
+                    items[item['SK']] = item
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except Exception as e:
+            logger.error(f"Failed to get configuration bundle: {str(e)}")
+            return cached['items'] if cached else {}
+        
+        version = int(items.get(CONFIG_VERSION_KEY['SK'], {}).get('version', 0))
+        _config_bundles[self.table_name] = {'items': items, 'version': version, 'checked_at': now}
+        logger.info(f"Fetched configuration bundle ({len(items)} items, version {version})")
+        return items
+    
     def update_config(self, config_type, updates, admin_user_id):
         """
         Update configuration with audit trail
@@ -208,6 +319,11 @@ class ConfigurationManager:
             if cache_key in self._cache:
                 del self._cache[cache_key]
             
+            _config_bundles.pop(self.table_name, None)
+            
+            # Let other containers drop their cached configuration
+            bump_config_version(self.table)
+            
             logger.info(f"Updated {config_type} configuration: {list(updates.keys())}")
             return response['Attributes']
             
@@ -218,6 +334,7 @@ class ConfigurationManager:
     def clear_cache(self):
         """Clear all cached configuration"""
         self._cache.clear()
+        _config_bundles.pop(self.table_name, None)
         logger.info("Configuration cache cleared")
 
 
@@ -0,0 +1,170 @@
+"""
+Admin dashboard statistics
+Global counters kept in a single STATS item, maintained from the table stream
+"""
+import logging
+from typing import Dict, Any, Optional
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from database import in_current_edition
+
+logger = logging.getLogger(__name__)
+
+# Single item holding the dashboard counters (PK=STATS, SK=GLOBAL)
+STATS_PK = 'STATS'
+STATS_SK = 'GLOBAL'
+
+# Counter attributes of the STATS item. Boats are also counted per
+# registration status, as BOAT_STATUS_PREFIX + status
+TOTAL_CREW_MEMBERS = 'total_crew_members'
+TOTAL_BOAT_REGISTRATIONS = 'total_boat_registrations'
+RENTAL_BOATS_RESERVED = 'rental_boats_reserved'
+BOAT_STATUS_PREFIX = 'boats_'
+
+# Statuses of a legacy RENTAL_BOAT#/METADATA item counted as reserved
+RESERVED_RENTAL_STATUSES = ('requested', 'confirmed', 'paid')
+
+_deserializer = TypeDeserializer()
+
+
+def stats_contribution(item: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Counters an item adds to the dashboard statistics (of the current edition)
+
+    Args:
+        item: Table item (or None for a missing stream image)
+
+    Returns:
+        Dictionary of counter attribute to count (empty for other items)
+    """
+    if not item:
+        return {}
+
+    pk = item.get('PK', '')
+    sk = item.get('SK', '')
+
+    if pk.startswith('TEAM#') and not in_current_edition(item):
+        return {}
+
+    if pk.startswith('TEAM#') and sk.startswith('CREW#'):
+        return {TOTAL_CREW_MEMBERS: 1}
+
+    if pk.startswith('TEAM#') and sk.startswith('BOAT#'):
+        status = item.get('registration_status') or 'incomplete'
+        return {TOTAL_BOAT_REGISTRATIONS: 1, f'{BOAT_STATUS_PREFIX}{status}': 1}
+
+    if pk.startswith('RENTAL_BOAT#') and sk == 'METADATA':
+        if item.get('status') in RESERVED_RENTAL_STATUSES:
+            return {RENTAL_BOATS_RESERVED: 1}
+
+    return {}
+
+
+def stats_deltas(old_item: Optional[Dict[str, Any]], new_item: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Counter changes caused by replacing old_item with new_item
+
+    Args:
+        old_item: Item before the write (None for an insert)
+        new_item: Item after the write (None for a removal)
+
+    Returns:
+        Dictionary of counter attribute to non-zero change
+    """
+    deltas = dict(stats_contribution(new_item))
+    for attribute, count in stats_contribution(old_item).items():
+        deltas[attribute] = deltas.get(attribute, 0) - count
+    return {attribute: delta for attribute, delta in deltas.items() if delta}
+
+
+def stream_record_deltas(record: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Counter changes of a DynamoDB stream record (NEW_AND_OLD_IMAGES)
+
+    Args:
+        record: Stream record from a Lambda event
+
+    Returns:
+        Dictionary of counter attribute to non-zero change
+    """
+    images = record.get('dynamodb', {})
+    old_item, new_item = (
+        {name: _deserializer.deserialize(value) for name, value in images[image].items()}
+        if image in images else None
+        for image in ('OldImage', 'NewImage')
+    )
+    return stats_deltas(old_item, new_item)
+
+
+def compute_stats(db) -> Dict[str, int]:
+    """
+    Recompute every dashboard counter from the table
+
+    Args:
+        db: DatabaseClient instance
+
+    Returns:
+        Dictionary of counter attribute to count
+    """
+    from boto3.dynamodb.conditions import Attr
+
+    stats = {
+        TOTAL_CREW_MEMBERS: db.count_entities('CREW'),
+        TOTAL_BOAT_REGISTRATIONS: 0,
+        # Legacy rental items are not indexed, so they are still counted by scan
+        RENTAL_BOATS_RESERVED: db.count_items(
+            Attr('PK').begins_with('RENTAL_BOAT#')
+            & Attr('SK').eq('METADATA')
+            & Attr('status').is_in(list(RESERVED_RENTAL_STATUSES))
+        )
+    }
+    for boat in db.iter_entities('BOAT', attributes=['PK', 'SK', 'registration_status']):
+        for attribute, count in stats_contribution(boat).items():
+            stats[attribute] = stats.get(attribute, 0) + count
+
+    return stats
+
+
+def rebuild_stats(db, timestamp: str) -> Dict[str, int]:
+    """
+    Overwrite the STATS item with counters recomputed from the table
+
+    Args:
+        db: DatabaseClient instance
+        timestamp: Value stored as updated_at on the item
+
+    Returns:
+        Dictionary of counter attribute to count written
+    """
+    stats = compute_stats(db)
+    db.put_item({'PK': STATS_PK, 'SK': STATS_SK, **stats, 'updated_at': timestamp})
+
+    logger.info(f"Rebuilt dashboard stats: {stats}")
+    return stats
+
+
+def format_stats(item: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Format the STATS item for the admin dashboard
+
+    Args:
+        item: STATS item (None before the first stream event or rebuild)
+
+    Returns:
+        Dictionary with the totals and the boat counts by status
+    """
+    item = item or {}
+    boats_by_status = {
+        attribute[len(BOAT_STATUS_PREFIX):]: int(count)
+        for attribute, count in item.items()
+        if attribute.startswith(BOAT_STATUS_PREFIX) and count
+    }
+    return {
+        TOTAL_CREW_MEMBERS: int(item.get(TOTAL_CREW_MEMBERS, 0)),
+        TOTAL_BOAT_REGISTRATIONS: int(item.get(TOTAL_BOAT_REGISTRATIONS, 0)),
+        'total_payments': boats_by_status.get('paid', 0),
+        RENTAL_BOATS_RESERVED: int(item.get(RENTAL_BOATS_RESERVED, 0)),
+        'boats_by_status': boats_by_status,
+        'updated_at': item.get('updated_at')
+    }
@@ -3,34 +3,376 @@ Database utilities for DynamoDB operations
 Provides helper functions for common database operations
 """
 import os
-import boto3
+import copy
+import json
+import time
+import zlib
+import random
 import logging
-from boto3.dynamodb.conditions import Key, Attr
+import threading
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key, Attr, ConditionExpressionBuilder
 from botocore.exceptions import ClientError
+from aws_clients import get_dynamodb_resource
 from decimal import Decimal
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# DynamoDB hard limits for batch operations
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+
+# Retry policy for unprocessed keys/items returned by batch operations
+BATCH_MAX_RETRIES = 8
+BATCH_BASE_DELAY_SECONDS = 0.05
+BATCH_MAX_DELAY_SECONDS = 2.0
+
+# Number of chunks sent to DynamoDB concurrently
+BATCH_MAX_WORKERS = 4
+
+# Edition (yearly competition) the deployment registers for. Boats and
+# payments are stamped with it and the index partitions below are per
+# edition, so listings, counts and exports of the current edition never read
+# past years. Unset means a single, unnamed edition.
+EDITION_ATTRIBUTE = 'edition'
+
+# Environment variable set to 'true' for the index key migrations to give
+# unstamped items the edition of their creation year instead of EDITION
+# (only when importing the data of past editions, see backfill_edition)
+EDITION_FROM_CREATION_YEAR_VARIABLE = 'EDITION_FROM_CREATION_YEAR'
+
+# Entity types that belong to one edition (profiles and crew members, who
+# are registered once and seated again every year, span editions)
+EDITION_SCOPED_TYPES = ('BOAT', 'PAYMENT')
+
+# Sparse global secondary index of boats by race (partition race_id, sort created_at)
+RACE_INDEX_NAME = 'GSI4'
+RACE_INDEX_KEYS = ('GSI4PK', 'GSI4SK')
+
+# Sparse global secondary index of entities by type (partition entity type,
+# per edition for EDITION_SCOPED_TYPES, sort owning PK), keys added by
+# put_item/batch_write_items (see index_keys)
+ENTITY_INDEX_NAME = 'GSI5'
+ENTITY_INDEX_KEYS = ('GSI5PK', 'GSI5SK')
+
+# Entity type of the items kept in the entity index, by sort key prefix
+ENTITY_TYPES = {
+    'BOAT#': 'BOAT',
+    'CREW#': 'CREW',
+    'PAYMENT#': 'PAYMENT',
+    'PROFILE': 'PROFILE'
+}
+
+# Global secondary index of payments by paid date, write-sharded over
+# PAYMENT_DATE_SHARDS partitions per edition (PAYMENT_DATE#<n>, sort paid_at#payment_id)
+# so payment writes never concentrate on one key. Changing the shard count
+# requires re-running the add_payment_date_index_keys migration.
+PAYMENT_DATE_INDEX_NAME = 'GSI6'
+PAYMENT_DATE_INDEX_KEYS = ('GSI6PK', 'GSI6SK')
+PAYMENT_DATE_SHARDS = int(os.environ.get('PAYMENT_DATE_SHARDS', '4'))
+
+# Parallel scan segments used by scan_by_sk_prefix (1 = serial scan)
+DEFAULT_SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '1'))
+
+
+# Retries (SDK retries and batch re-sends) one invocation may spend; once more
+# have been charged further DynamoDB calls fail fast with ServiceOverloadedError
+RETRY_BUDGET = int(os.environ.get('DYNAMODB_RETRY_BUDGET', '10'))
+
+# Environment variable the Lambda runtime sets to a new value for every
+# invocation; a change starts a new retry budget even if no decorator reset it
+INVOCATION_ID_VARIABLE = '_X_AMZN_TRACE_ID'
+
+# Seconds clients are asked to wait when a request is shed
+RETRY_AFTER_SECONDS = int(os.environ.get('DYNAMODB_RETRY_AFTER_SECONDS', '2'))
+
+# Error codes DynamoDB returns when a table or the account is throttled
+THROTTLING_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'LimitExceededException'
+}
+
+# Operations whose consumed capacity counts as writes in the usage summary
+WRITE_OPERATIONS = {'put_item', 'update_item', 'delete_item', 'batch_write_item', 'transact_write_items'}
+
+
+class BatchOperationError(Exception):
+    """
+    Raised when a batch operation still has unprocessed keys or items
+    after all retries have been exhausted
+    """
+    
+    def __init__(self, message, unprocessed):
+        super().__init__(message)
+        self.unprocessed = unprocessed
+
+
+class ServiceOverloadedError(Exception):
+    """
+    Raised when DynamoDB keeps throttling or the invocation has spent its
+    retry budget; handle_exceptions turns it into a 503 with Retry-After
+    """
+    
+    def __init__(self, message, retry_after=RETRY_AFTER_SECONDS):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_conditional_check_failure(error):
+    """
+    Check whether an error was raised because a ConditionExpression failed
+    
+    Covers single-item writes and transactions cancelled by a failed condition.
+    
+    Args:
+        error: Exception raised by a conditional write
+        
+    Returns:
+        bool: True if DynamoDB rejected the write on its condition
+    """
+    if not isinstance(error, ClientError):
+        return False
+    
+    code = error.response.get('Error', {}).get('Code')
+    if code == 'ConditionalCheckFailedException':
+        return True
+    if code == 'TransactionCanceledException':
+        reasons = error.response.get('CancellationReasons', [])
+        return any(reason.get('Code') == 'ConditionalCheckFailed' for reason in reasons)
+    return False
+
+
+def _chunk(values, size):
+    """
+    Split a list into consecutive chunks of at most `size` elements
+    """
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def _backoff_delay(attempt):
+    """
+    Full-jitter exponential backoff delay for a retry attempt
+    """
+    ceiling = min(BATCH_MAX_DELAY_SECONDS, BATCH_BASE_DELAY_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
 
 class DatabaseClient:
     """
     DynamoDB client with helper methods for common operations
     """
     
-    def __init__(self, table_name=None):
+    def __init__(self, table_name=None, dynamodb=None):
         """
         Initialize database client
         
         Args:
             table_name: DynamoDB table name (defaults to TABLE_NAME env var)
+            dynamodb: DynamoDB resource to use (defaults to the shared boto3
+                resource; tests and benchmarks pass a MemoryDynamoDB)
         """
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = dynamodb or get_dynamodb_resource()
         self.table_name = table_name or os.environ.get('TABLE_NAME', 'impressionnistes-registration-dev')
         self.table = self.dynamodb.Table(self.table_name)
+        
+        # Request-scoped identity map (disabled unless enable_request_cache is called)
+        self._item_cache = None
+        self._query_cache = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
+        # Per-invocation capacity, scan and retry accounting (see log_usage_summary)
+        self._usage = {}
+        self._retries_used = 0
+        self._usage_lock = threading.Lock()
+        self._invocation_id = os.environ.get(INVOCATION_ID_VARIABLE)
+        
         logger.info(f"DatabaseClient initialized with table: {self.table_name}")
     
+    def _call(self, operation, **kwargs):
+        """
+        Send a DynamoDB request and record its consumed capacity and retries
+        
+        Args:
+            operation: Method name, e.g. 'query' or 'batch_get_item'
+            **kwargs: Request parameters
+            
+        Returns:
+            dict: Response from DynamoDB
+            
+        Raises:
+            ServiceOverloadedError: If the retry budget is exceeded or the
+                request is still throttled after the SDK retries
+        """
+        self._start_invocation()
+        if self._budget_exceeded():
+            raise ServiceOverloadedError(
+                f"DynamoDB retry budget of {RETRY_BUDGET} exceeded, not sending {operation}"
+            )
+        
+        if operation in ('batch_get_item', 'batch_write_item'):
+            method = getattr(self.dynamodb, operation)
+        elif operation == 'transact_write_items':
+            method = self.dynamodb.meta.client.transact_write_items
+        else:
+            method = getattr(self.table, operation)
+        
+        try:
+            response = method(ReturnConsumedCapacity='TOTAL', **kwargs)
+        except ClientError as e:
+            self._record_retries(operation, e.response)
+            if e.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES:
+                logger.warning(f"DynamoDB {operation} throttled after retries: {e}")
+                raise ServiceOverloadedError(f"DynamoDB {operation} throttled") from e
+            raise
+        self._record_usage(operation, response)
+        return response
+    
+    def _start_invocation(self):
+        """
+        Close the previous invocation's accounting when a new one has started
+        
+        Handlers normally log (and reset) the usage through handle_exceptions
+        or with_request_cache; this keeps a handler without them from carrying
+        its retries over into the next invocations of the container.
+        """
+        invocation_id = os.environ.get(INVOCATION_ID_VARIABLE)
+        if invocation_id != self._invocation_id:
+            self._invocation_id = invocation_id
+            self.log_usage_summary()
+    
+    def _budget_exceeded(self):
+        """
+        Whether more retries than RETRY_BUDGET have been charged (the one
+        bound used by _call and _spend_retry)
+        """
+        return self._retries_used > RETRY_BUDGET
+    
+    def _record_retries(self, operation, response):
+        """
+        Charge the SDK retries of a request to the retry budget
+        """
+        attempts = response.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        if not attempts:
+            return
+        with self._usage_lock:
+            usage = self._usage.setdefault(operation, {'calls': 0, 'capacity_units': 0.0})
+            usage['retries'] = usage.get('retries', 0) + attempts
+            self._retries_used += attempts
+    
+    def _spend_retry(self, operation):
+        """
+        Charge one re-send of unprocessed batch items to the retry budget
+        
+        Raises:
+            ServiceOverloadedError: If the re-send would exceed the budget
+        """
+        with self._usage_lock:
+            usage = self._usage.setdefault(operation, {'calls': 0, 'capacity_units': 0.0})
+            usage['retries'] = usage.get('retries', 0) + 1
+            self._retries_used += 1
+            if self._budget_exceeded():
+                raise ServiceOverloadedError(
+                    f"DynamoDB retry budget of {RETRY_BUDGET} exceeded, not retrying {operation}"
+                )
+    
+    def _record_usage(self, operation, response):
+        """
+        Add a response's consumed capacity and scanned/returned counts to the totals
+        """
+        consumed = response.get('ConsumedCapacity') or []
+        if isinstance(consumed, dict):
+            consumed = [consumed]
+        capacity_units = sum(float(capacity.get('CapacityUnits', 0)) for capacity in consumed)
+        self._record_retries(operation, response)
+        
+        # Segmented scans record usage from several threads
+        with self._usage_lock:
+            usage = self._usage.setdefault(operation, {'calls': 0, 'capacity_units': 0.0})
+            usage['calls'] += 1
+            usage['capacity_units'] += capacity_units
+            if 'ScannedCount' in response:
+                usage['scanned'] = usage.get('scanned', 0) + response['ScannedCount']
+                usage['returned'] = usage.get('returned', 0) + response.get('Count', 0)
+    
+    def log_usage_summary(self):
+        """
+        Log one line with the capacity used, items scanned and retries per
+        operation since the last summary, then reset the totals and the
+        retry budget
+        
+        Scanned versus returned counts show how much of a filtered query or
+        scan was read only to be discarded.
+        """
+        with self._usage_lock:
+            usage, self._usage = self._usage, {}
+            retries, self._retries_used = self._retries_used, 0
+        
+        if not usage:
+            return
+        
+        read_units = sum(u['capacity_units'] for op, u in usage.items() if op not in WRITE_OPERATIONS)
+        write_units = sum(u['capacity_units'] for op, u in usage.items() if op in WRITE_OPERATIONS)
+        for totals in usage.values():
+            totals['capacity_units'] = round(totals['capacity_units'], 2)
+        
+        logger.info(
+            f"DynamoDB usage: read_units={read_units:.2f} write_units={write_units:.2f} "
+            f"retries={retries} operations={json.dumps(usage, sort_keys=True)}"
+        )
+    
+    def enable_request_cache(self):
+        """
+        Enable the request-scoped identity map
+        
+        While enabled, get_item, batch_get_items and query_by_pk results are
+        memoized by key and kept up to date by writes made through this client.
+        Items are copied on the way in and out, so callers may mutate them.
+        """
+        self._item_cache = {}
+        self._query_cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    def clear_request_cache(self):
+        """
+        Disable the request-scoped identity map and log its hit/miss counts
+        """
+        if self._item_cache is None:
+            return
+        
+        logger.info(f"Request cache: {self._cache_hits} hits, {self._cache_misses} misses")
+        self._item_cache = None
+        self._query_cache = None
+    
+    def _cache_item(self, pk, sk, item):
+        """
+        Record the current state of an item (None when deleted or missing)
+        """
+        if self._item_cache is None:
+            return
+        
+        self._item_cache[(pk, sk)] = copy.deepcopy(item)
+        # Any cached query over this partition may now be stale
+        for query_key in [key for key in self._query_cache if key[0] == pk]:
+            del self._query_cache[query_key]
+    
+    def _forget_item(self, pk, sk):
+        """
+        Drop an item whose new state is unknown so the next read refetches it
+        """
+        if self._item_cache is None:
+            return
+        
+        self._item_cache.pop((pk, sk), None)
+        for query_key in [key for key in self._query_cache if key[0] == pk]:
+            del self._query_cache[query_key]
+    
     def get_item(self, pk, sk):
         """
         Get a single item from DynamoDB
@@ -42,11 +384,18 @@ class DatabaseClient:
         Returns:
             dict: Item or None if not found
         """
+        if self._item_cache is not None:
+            if (pk, sk) in self._item_cache:
+                self._cache_hits += 1
+                return copy.deepcopy(self._item_cache[(pk, sk)])
+            self._cache_misses += 1
+        
         try:
-            response = self.table.get_item(
-                Key={'PK': pk, 'SK': sk}
-            )
-            return response.get('Item')
+            response = self._call('get_item', Key={'PK': pk, 'SK': sk})
+            item = response.get('Item')
+            if self._item_cache is not None:
+                self._item_cache[(pk, sk)] = copy.deepcopy(item)
+            return item
         except ClientError as e:
             logger.error(f"Error getting item {pk}#{sk}: {e}")
             raise
@@ -62,12 +411,14 @@ class DatabaseClient:
         Returns:
             dict: Response from DynamoDB
         """
+        item = {**item, **index_keys(item)}
         try:
             kwargs = {'Item': item}
             if condition_expression:
                 kwargs['ConditionExpression'] = condition_expression
             
-            response = self.table.put_item(**kwargs)
+            response = self._call('put_item', **kwargs)
+            self._cache_item(item.get('PK'), item.get('SK'), item)
             logger.info(f"Put item: {item.get('PK')}#{item.get('SK')}")
             return response
         except ClientError as e:
@@ -77,7 +428,7 @@ class DatabaseClient:
                 logger.error(f"Error putting item: {e}")
             raise
     
-    def update_item(self, pk, sk, updates, condition_expression=None):
+    def update_item(self, pk, sk, updates, condition_expression=None, remove=None):
         """
         Update an item in DynamoDB
         
@@ -86,6 +437,7 @@ class DatabaseClient:
             sk: Sort key value
             updates: Dictionary of fields to update
             condition_expression: Optional condition expression
+            remove: Optional list of attribute names to remove
             
         Returns:
             dict: Updated item
@@ -102,10 +454,15 @@ class DatabaseClient:
             expression_attribute_names[attr_name] = key
             expression_attribute_values[attr_value] = value
         
+        update_expression = 'SET ' + ', '.join(update_expression_parts)
+        if remove:
+            update_expression += ' REMOVE ' + ', '.join(f'#{key}' for key in remove)
+            expression_attribute_names.update({f'#{key}': key for key in remove})
+        
         try:
             kwargs = {
                 'Key': {'PK': pk, 'SK': sk},
-                'UpdateExpression': 'SET ' + ', '.join(update_expression_parts),
+                'UpdateExpression': update_expression,
                 'ExpressionAttributeNames': expression_attribute_names,
                 'ExpressionAttributeValues': expression_attribute_values,
                 'ReturnValues': 'ALL_NEW'
@@ -114,13 +471,72 @@ class DatabaseClient:
             if condition_expression:
                 kwargs['ConditionExpression'] = condition_expression
             
-            response = self.table.update_item(**kwargs)
+            response = self._call('update_item', **kwargs)
+            self._cache_item(pk, sk, response['Attributes'])
             logger.info(f"Updated item: {pk}#{sk}")
             return response['Attributes']
         except ClientError as e:
-            logger.error(f"Error updating item {pk}#{sk}: {e}")
+            if is_conditional_check_failure(e):
+                # Expected outcome of a conditional write, callers decide how to handle it
+                logger.info(f"Condition not met for update of {pk}#{sk}")
+            else:
+                logger.error(f"Error updating item {pk}#{sk}: {e}")
             raise
     
+    def increment_counter(self, pk, sk, attribute, amount=1):
+        """
+        Atomically add to a numeric attribute, creating the item if needed
+        
+        Uses an ADD update, so concurrent callers each get a distinct value
+        without reading the item first.
+        
+        Args:
+            pk: Partition key value
+            sk: Sort key value
+            attribute: Name of the counter attribute
+            amount: Value to add (default 1)
+        
+        Returns:
+            int: Counter value after the increment
+        """
+        return self.increment_counters(pk, sk, {attribute: amount})[attribute]
+    
+    def increment_counters(self, pk, sk, amounts, condition_expression=None):
+        """
+        Atomically add to several numeric attributes in one update
+        
+        Args:
+            pk: Partition key value
+            sk: Sort key value
+            amounts: Dictionary of counter attribute to value to add (may be negative)
+            condition_expression: Optional condition expression (e.g. to only
+                update an existing item)
+        
+        Returns:
+            dict: Counter values after the increment
+        """
+        names = {}
+        values = {':updated_at': get_timestamp()}
+        additions = []
+        for index, (attribute, amount) in enumerate(amounts.items()):
+            names[f'#counter{index}'] = attribute
+            values[f':amount{index}'] = amount
+            additions.append(f'#counter{index} :amount{index}')
+        
+        kwargs = {
+            'Key': {'PK': pk, 'SK': sk},
+            'UpdateExpression': f"ADD {', '.join(additions)} SET updated_at = :updated_at",
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values,
+            'ReturnValues': 'UPDATED_NEW'
+        }
+        if condition_expression is not None:
+            kwargs['ConditionExpression'] = condition_expression
+        
+        response = self._call('update_item', **kwargs)
+        self._forget_item(pk, sk)
+        return {attribute: int(response['Attributes'][attribute]) for attribute in amounts}
+    
     def delete_item(self, pk, sk, condition_expression=None):
         """
         Delete an item from DynamoDB
@@ -131,20 +547,76 @@ class DatabaseClient:
             condition_expression: Optional condition expression
             
         Returns:
-            dict: Response from DynamoDB
+            dict: Response from DynamoDB, with the deleted item under
+                'Attributes' (absent when there was nothing to delete)
         """
         try:
-            kwargs = {'Key': {'PK': pk, 'SK': sk}}
+            kwargs = {'Key': {'PK': pk, 'SK': sk}, 'ReturnValues': 'ALL_OLD'}
             if condition_expression:
                 kwargs['ConditionExpression'] = condition_expression
             
-            response = self.table.delete_item(**kwargs)
+            response = self._call('delete_item', **kwargs)
+            self._cache_item(pk, sk, None)
             logger.info(f"Deleted item: {pk}#{sk}")
             return response
         except ClientError as e:
-            logger.error(f"Error deleting item {pk}#{sk}: {e}")
+            if is_conditional_check_failure(e):
+                logger.info(f"Condition not met for delete of {pk}#{sk}")
+            else:
+                logger.error(f"Error deleting item {pk}#{sk}: {e}")
             raise
     
+    def transact_update_items(self, operations):
+        """
+        Apply several conditional updates atomically in one TransactWriteItems call
+        
+        Either every update is applied or none is: if any condition fails the
+        whole transaction is cancelled.
+        
+        Args:
+            operations: List of dicts with 'pk', 'sk', 'updates' (dictionary of
+                fields to set) and an optional 'condition_expression'
+            
+        Raises:
+            ClientError: TransactionCanceledException if a condition failed
+                (see is_conditional_check_failure) or the items were busy
+        """
+        transact_items = []
+        for operation in operations:
+            updates = operation['updates']
+            update = {
+                'TableName': self.table_name,
+                'Key': {'PK': operation['pk'], 'SK': operation['sk']},
+                'UpdateExpression': 'SET ' + ', '.join(f'#{key} = :{key}' for key in updates),
+                'ExpressionAttributeNames': {f'#{key}': key for key in updates},
+                'ExpressionAttributeValues': {f':{key}': value for key, value in updates.items()}
+            }
+            
+            condition_expression = operation.get('condition_expression')
+            if condition_expression is not None:
+                # Conditions nested in TransactItems are not built by boto3, only
+                # the attribute values are serialized
+                built = ConditionExpressionBuilder().build_expression(condition_expression)
+                update['ConditionExpression'] = built.condition_expression
+                update['ExpressionAttributeNames'].update(built.attribute_name_placeholders)
+                update['ExpressionAttributeValues'].update(built.attribute_value_placeholders)
+            
+            transact_items.append({'Update': update})
+        
+        try:
+            self._call('transact_write_items', TransactItems=transact_items)
+        except ClientError as e:
+            if is_conditional_check_failure(e):
+                logger.info(f"Transaction cancelled, condition not met: {e}")
+            else:
+                logger.error(f"Error in transaction of {len(operations)} updates: {e}")
+            raise
+        
+        for operation in operations:
+            # The transaction returns no item images, so cached copies are dropped
+            self._forget_item(operation['pk'], operation['sk'])
+        logger.info(f"Transaction applied {len(operations)} updates")
+    
     def query_by_pk(self, pk, sk_prefix=None, limit=None, scan_forward=True):
         """
         Query items by partition key
@@ -158,6 +630,13 @@ class DatabaseClient:
         Returns:
             list: List of items
         """
+        query_key = (pk, sk_prefix, limit, scan_forward)
+        if self._query_cache is not None:
+            if query_key in self._query_cache:
+                self._cache_hits += 1
+                return copy.deepcopy(self._query_cache[query_key])
+            self._cache_misses += 1
+        
         try:
             kwargs = {
                 'KeyConditionExpression': Key('PK').eq(pk),
@@ -170,21 +649,110 @@ class DatabaseClient:
             if limit:
                 kwargs['Limit'] = limit
             
-            response = self.table.query(**kwargs)
+            response = self._call('query', **kwargs)
             items = response.get('Items', [])
             
             # Handle pagination if needed
             while 'LastEvaluatedKey' in response and (not limit or len(items) < limit):
                 kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
-                response = self.table.query(**kwargs)
+                response = self._call('query', **kwargs)
                 items.extend(response.get('Items', []))
             
+            if self._query_cache is not None:
+                self._query_cache[query_key] = copy.deepcopy(items)
+                for item in items:
+                    self._item_cache[(item['PK'], item['SK'])] = copy.deepcopy(item)
+            
             logger.info(f"Queried {len(items)} items for PK={pk}")
             return items
         except ClientError as e:
             logger.error(f"Error querying items for PK={pk}: {e}")
             raise
     
+    def iter_query(self, pk, sk_prefix=None, attributes=None, filter_expression=None,
+                   scan_forward=True, page_size=None, consistent_read=False):
+        """
+        Iterate over the items of a partition, one page at a time
+        
+        Pages are only requested as the consumer advances, so breaking out
+        of the loop stops reading from DynamoDB.
+        
+        Args:
+            pk: Partition key value
+            sk_prefix: Optional sort key prefix to filter
+            attributes: Optional list of top-level attribute names to project
+            filter_expression: Optional filter expression
+            scan_forward: Sort order (True for ascending, False for descending)
+            page_size: Optional number of items evaluated per request
+            consistent_read: Use strongly consistent reads (default False)
+            
+        Yields:
+            dict: Items (only the projected attributes when attributes is given)
+        """
+        kwargs = {
+            'KeyConditionExpression': Key('PK').eq(pk),
+            'ScanIndexForward': scan_forward
+        }
+        
+        if consistent_read:
+            kwargs['ConsistentRead'] = True
+        
+        if sk_prefix:
+            kwargs['KeyConditionExpression'] &= Key('SK').begins_with(sk_prefix)
+        
+        if filter_expression is not None:
+            kwargs['FilterExpression'] = filter_expression
+        
+        yield from self._iter_pages('query', kwargs, attributes, page_size)
+    
+    def iter_scan(self, filter_expression=None, attributes=None, page_size=None):
+        """
+        Iterate over the items of the whole table, one page at a time
+        
+        Pages are only requested as the consumer advances, so breaking out
+        of the loop stops reading from DynamoDB.
+        
+        Args:
+            filter_expression: Optional filter expression
+            attributes: Optional list of top-level attribute names to project
+            page_size: Optional number of items evaluated per request
+            
+        Yields:
+            dict: Items (only the projected attributes when attributes is given)
+        """
+        kwargs = {}
+        if filter_expression is not None:
+            kwargs['FilterExpression'] = filter_expression
+        
+        yield from self._iter_pages('scan', kwargs, attributes, page_size)
+    
+    def _iter_pages(self, operation, kwargs, attributes=None, page_size=None):
+        """
+        Yield the items of a query or scan ('query' or 'scan' operation) page
+        by page, following LastEvaluatedKey
+        """
+        if attributes:
+            # Placeholders avoid clashes with reserved words such as 'status' or 'name'
+            names = {f'#p{i}': attribute for i, attribute in enumerate(attributes)}
+            kwargs['ProjectionExpression'] = ', '.join(names)
+            kwargs['ExpressionAttributeNames'] = names
+        
+        if page_size:
+            kwargs['Limit'] = page_size
+        
+        while True:
+            try:
+                response = self._call(operation, **kwargs)
+            except ClientError as e:
+                logger.error(f"Error reading page from table: {e}")
+                raise
+            
+            yield from response.get('Items', [])
+            
+            if 'LastEvaluatedKey' not in response:
+                return
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
     def query_gsi(self, index_name, pk_value, sk_value=None, limit=None, pk_attr_name=None, sk_attr_name=None):
         """
         Query items using a Global Secondary Index
@@ -216,7 +784,7 @@ class DatabaseClient:
             if limit:
                 kwargs['Limit'] = limit
             
-            response = self.table.query(**kwargs)
+            response = self._call('query', **kwargs)
             items = response.get('Items', [])
             
             logger.info(f"Queried {len(items)} items from {index_name}")
@@ -225,6 +793,26 @@ class DatabaseClient:
             logger.error(f"Error querying GSI {index_name}: {e}")
             raise
     
+    def list_race_boats(self, race_id, attributes=None, edition=None):
+        """
+        List the boat registrations of a race with a query on the race index
+        
+        Only boats written with race_index_keys are in the index.
+        
+        Args:
+            race_id: Race ID
+            attributes: Optional list of top-level attribute names to project
+            edition: Edition to list (defaults to the current edition)
+            
+        Returns:
+            list: Boat registrations of the race, in creation order
+        """
+        kwargs = {
+            'IndexName': RACE_INDEX_NAME,
+            'KeyConditionExpression': Key(RACE_INDEX_KEYS[0]).eq(edition_partition(race_id, edition))
+        }
+        return list(self._iter_pages('query', kwargs, attributes))
+    
     def check_license_number_exists(self, license_number):
         """
         Check if a license number already exists in the competition
@@ -252,13 +840,18 @@ class DatabaseClient:
             logger.error(f"Error checking license number {license_number}: {e}")
             raise
     
-    def scan_table(self, filter_expression=None, limit=None):
+    def scan_table(self, filter_expression=None, limit=None, segments=None):
         """
         Scan the entire table (use sparingly)
         
+        With segments > 1 the table is read as a DynamoDB parallel scan
+        (Segment/TotalSegments), one thread per segment, and the pages of
+        all segments are merged.
+        
         Args:
             filter_expression: Optional filter expression
             limit: Maximum number of items to return
+            segments: Optional number of parallel scan segments
             
         Returns:
             list: List of items
@@ -270,78 +863,398 @@ class DatabaseClient:
             if limit:
                 kwargs['Limit'] = limit
             
-            response = self.table.scan(**kwargs)
-            items = response.get('Items', [])
-            
-            # Handle pagination
-            while 'LastEvaluatedKey' in response and (not limit or len(items) < limit):
-                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
-                response = self.table.scan(**kwargs)
-                items.extend(response.get('Items', []))
+            if segments and segments > 1:
+                # boto3 builds condition placeholders with shared state, so
+                # build them once here rather than concurrently in each thread
+                if filter_expression is not None and not isinstance(filter_expression, str):
+                    built = ConditionExpressionBuilder().build_expression(filter_expression)
+                    kwargs['FilterExpression'] = built.condition_expression
+                    kwargs['ExpressionAttributeNames'] = built.attribute_name_placeholders
+                    if built.attribute_value_placeholders:
+                        kwargs['ExpressionAttributeValues'] = built.attribute_value_placeholders
+                
+                def scan_segment(segment):
+                    return self._scan_pages(
+                        dict(kwargs, Segment=segment, TotalSegments=segments),
+                        limit
+                    )
+                
+                items = []
+                with ThreadPoolExecutor(max_workers=segments) as executor:
+                    for segment_items in executor.map(scan_segment, range(segments)):
+                        items.extend(segment_items)
+                if limit:
+                    items = items[:limit]
+            else:
+                items = self._scan_pages(kwargs, limit)
             
-            logger.info(f"Scanned {len(items)} items from table")
+            logger.info(f"Scanned {len(items)} items from table ({segments or 1} segments)")
             return items
         except ClientError as e:
             logger.error(f"Error scanning table: {e}")
             raise
     
-    def batch_get_items(self, keys):
+    def iter_entities(self, entity_type, filter_expression=None, attributes=None, page_size=None,
+                      edition=None):
         """
-        Get multiple items in a single request
+        Iterate over all items of one entity type with a query on the entity index
+        
+        Only the items of that type (and, for boats and payments, of that
+        edition) are read, instead of scanning the table.
         
         Args:
-            keys: List of (pk, sk) tuples
+            entity_type: Entity type ('BOAT', 'CREW', 'PAYMENT' or 'PROFILE')
+            filter_expression: Optional filter expression
+            attributes: Optional list of top-level attribute names to project
+            page_size: Optional number of items evaluated per request
+            edition: Edition to list (defaults to the current edition)
+            
+        Yields:
+            dict: Items, grouped by owning partition key
+        """
+        kwargs = {
+            'IndexName': ENTITY_INDEX_NAME,
+            'KeyConditionExpression': Key(ENTITY_INDEX_KEYS[0]).eq(entity_partition(entity_type, edition))
+        }
+        if filter_expression is not None:
+            kwargs['FilterExpression'] = filter_expression
+        
+        yield from self._iter_pages('query', kwargs, attributes, page_size)
+    
+    def list_entities(self, entity_type, filter_expression=None, attributes=None, edition=None):
+        """
+        List all items of one entity type (see iter_entities)
+        
+        Args:
+            entity_type: Entity type ('BOAT', 'CREW', 'PAYMENT' or 'PROFILE')
+            filter_expression: Optional filter expression
+            attributes: Optional list of top-level attribute names to project
+            edition: Edition to list (defaults to the current edition)
             
         Returns:
             list: List of items
         """
-        try:
-            request_items = {
-                self.table_name: {
-                    'Keys': [{'PK': pk, 'SK': sk} for pk, sk in keys]
-                }
+        return list(self.iter_entities(entity_type, filter_expression, attributes, edition=edition))
+    
+    def query_payments_by_date(self, start_date=None, end_date=None, limit=None,
+                               newest_first=True, attributes=None, edition=None):
+        """
+        List payments in a paid_at range with range queries on the payment date index
+        
+        Every shard is queried (concurrently) on its sort key and the results
+        are merged, so only the matching payments are read. With a limit,
+        each shard stops after `limit` payments.
+        
+        Args:
+            start_date: Optional ISO 8601 date or timestamp, paid_at >= start_date
+            end_date: Optional ISO 8601 date or timestamp, paid_at <= end_date
+            limit: Optional maximum number of payments (the newest or oldest)
+            newest_first: Sort order of the result (default: newest first)
+            attributes: Optional list of top-level attribute names to project
+            edition: Edition to list (defaults to the current edition)
+            
+        Returns:
+            list: Payments ordered by paid_at
+        """
+        sort_key = PAYMENT_DATE_INDEX_KEYS[1]
+        # Sort keys are paid_at#payment_id. '$' sorts right after '#' and
+        # before every character of a timestamp, so the upper bound selects
+        # exactly paid_at <= end_date, as the filter on paid_at did: a payment
+        # made at end_date is kept, later ones are not (with a date-only
+        # end_date, payments made later that day are excluded)
+        if start_date and end_date:
+            range_condition = Key(sort_key).between(start_date, f'{end_date}$')
+        elif start_date:
+            range_condition = Key(sort_key).gte(start_date)
+        elif end_date:
+            range_condition = Key(sort_key).lte(f'{end_date}$')
+        else:
+            range_condition = None
+        
+        if attributes and sort_key not in attributes:
+            attributes = list(attributes) + [sort_key]
+        
+        def query_shard(shard):
+            condition = Key(PAYMENT_DATE_INDEX_KEYS[0]).eq(edition_partition(f'PAYMENT_DATE#{shard}', edition))
+            if range_condition is not None:
+                condition &= range_condition
+            kwargs = {
+                'IndexName': PAYMENT_DATE_INDEX_NAME,
+                'KeyConditionExpression': condition,
+                'ScanIndexForward': not newest_first
             }
+            payments = []
+            for payment in self._iter_pages('query', kwargs, attributes, page_size=limit):
+                payments.append(payment)
+                if limit and len(payments) >= limit:
+                    break
+            return payments
+        
+        payments = []
+        for shard_payments in self._run_chunks(query_shard, list(range(PAYMENT_DATE_SHARDS))):
+            payments.extend(shard_payments)
+        
+        payments.sort(key=lambda payment: payment[sort_key], reverse=newest_first)
+        return payments[:limit] if limit else payments
+    
+    def count_entities(self, entity_type, filter_expression=None, edition=None):
+        """
+        Count the items of one entity type (Select=COUNT query on the entity index)
+        
+        Args:
+            entity_type: Entity type ('BOAT', 'CREW', 'PAYMENT' or 'PROFILE')
+            filter_expression: Optional filter expression
+            edition: Edition to count (defaults to the current edition)
+            
+        Returns:
+            int: Number of matching items
+        """
+        kwargs = {
+            'IndexName': ENTITY_INDEX_NAME,
+            'KeyConditionExpression': Key(ENTITY_INDEX_KEYS[0]).eq(entity_partition(entity_type, edition)),
+            'Select': 'COUNT'
+        }
+        if filter_expression is not None:
+            kwargs['FilterExpression'] = filter_expression
+        
+        count = 0
+        while True:
+            response = self._call('query', **kwargs)
+            count += response.get('Count', 0)
+            if 'LastEvaluatedKey' not in response:
+                return count
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    def count_items(self, filter_expression=None):
+        """
+        Count the items of the table matching a filter (Select=COUNT scan)
+        
+        Args:
+            filter_expression: Optional filter expression
+            
+        Returns:
+            int: Number of matching items across all scan pages
+        """
+        kwargs = {'Select': 'COUNT'}
+        if filter_expression is not None:
+            kwargs['FilterExpression'] = filter_expression
+        
+        count = 0
+        while True:
+            response = self._call('scan', **kwargs)
+            count += response.get('Count', 0)
+            if 'LastEvaluatedKey' not in response:
+                return count
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    def scan_by_sk_prefix(self, sk_prefix, filter_expression=None, segments=None):
+        """
+        Scan all items whose sort key starts with a prefix (e.g. 'BOAT#', 'CREW#')
+        
+        Uses a parallel scan with DEFAULT_SCAN_SEGMENTS segments unless
+        segments is given.
+        
+        Args:
+            sk_prefix: Sort key prefix to keep
+            filter_expression: Optional additional filter expression
+            segments: Optional number of parallel scan segments
+            
+        Returns:
+            list: List of items
+        """
+        expression = Attr('SK').begins_with(sk_prefix)
+        if filter_expression is not None:
+            expression &= filter_expression
+        
+        return self.scan_table(
+            filter_expression=expression,
+            segments=segments or DEFAULT_SCAN_SEGMENTS
+        )
+    
+    def _scan_pages(self, kwargs, limit=None):
+        """
+        Follow LastEvaluatedKey through the pages of one scan (or scan segment)
+        """
+        kwargs = dict(kwargs)
+        response = self._call('scan', **kwargs)
+        items = response.get('Items', [])
+        
+        while 'LastEvaluatedKey' in response and (not limit or len(items) < limit):
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            response = self._call('scan', **kwargs)
+            items.extend(response.get('Items', []))
+        
+        return items
+    
+    def batch_get_items(self, keys):
+        """
+        Get multiple items, splitting the keys into chunks of 100
+        
+        Chunks are fetched concurrently and unprocessed keys are retried
+        with jittered exponential backoff. Duplicate keys are fetched once.
+        
+        Args:
+            keys: List of (pk, sk) tuples
             
-            response = self.dynamodb.batch_get_item(RequestItems=request_items)
-            items = response.get('Responses', {}).get(self.table_name, [])
+        Returns:
+            list: List of items found (missing items are simply absent)
             
-            logger.info(f"Batch got {len(items)} items")
+        Raises:
+            BatchOperationError: If some keys are still unprocessed after retries
+        """
+        unique_keys = list(dict.fromkeys((pk, sk) for pk, sk in keys))
+        
+        items = []
+        if self._item_cache is not None:
+            cached_keys = [key for key in unique_keys if key in self._item_cache]
+            self._cache_hits += len(cached_keys)
+            items.extend(
+                copy.deepcopy(self._item_cache[key]) for key in cached_keys
+                if self._item_cache[key] is not None
+            )
+            unique_keys = [key for key in unique_keys if key not in self._item_cache]
+            self._cache_misses += len(unique_keys)
+        
+        if not unique_keys:
             return items
-        except ClientError as e:
-            logger.error(f"Error batch getting items: {e}")
-            raise
+        
+        chunks = _chunk(
+            [{'PK': pk, 'SK': sk} for pk, sk in unique_keys],
+            BATCH_GET_MAX_KEYS
+        )
+        
+        fetched = []
+        for chunk_items in self._run_chunks(self._batch_get_chunk, chunks):
+            fetched.extend(chunk_items)
+        
+        if self._item_cache is not None:
+            for key in unique_keys:
+                self._item_cache[key] = None
+            for item in fetched:
+                self._item_cache[(item['PK'], item['SK'])] = copy.deepcopy(item)
+        items.extend(fetched)
+        
+        logger.info(f"Batch got {len(fetched)} items ({len(unique_keys)} keys, {len(chunks)} chunks)")
+        return items
     
     def batch_write_items(self, items_to_put=None, items_to_delete=None):
         """
-        Write multiple items in a single request
+        Write multiple items, splitting the requests into chunks of 25
+        
+        Chunks are written concurrently and unprocessed items are retried
+        with jittered exponential backoff.
         
         Args:
             items_to_put: List of items to put
             items_to_delete: List of (pk, sk) tuples to delete
             
         Returns:
-            dict: Response from DynamoDB
+            int: Number of write requests processed
+            
+        Raises:
+            BatchOperationError: If some items are still unprocessed after retries
         """
-        try:
-            request_items = []
+        request_items = []
+        
+        if items_to_put:
+            items_to_put = [{**item, **index_keys(item)} for item in items_to_put]
+            for item in items_to_put:
+                request_items.append({'PutRequest': {'Item': item}})
+        
+        if items_to_delete:
+            for pk, sk in items_to_delete:
+                request_items.append({'DeleteRequest': {'Key': {'PK': pk, 'SK': sk}}})
+        
+        if not request_items:
+            return 0
+        
+        chunks = _chunk(request_items, BATCH_WRITE_MAX_ITEMS)
+        self._run_chunks(self._batch_write_chunk, chunks)
+        
+        for item in items_to_put or []:
+            self._cache_item(item.get('PK'), item.get('SK'), item)
+        for pk, sk in items_to_delete or []:
+            self._cache_item(pk, sk, None)
+        
+        logger.info(f"Batch wrote {len(request_items)} items ({len(chunks)} chunks)")
+        return len(request_items)
+    
+    def _run_chunks(self, worker, chunks):
+        """
+        Run a batch worker over every chunk, concurrently when there is more than one
+        
+        Args:
+            worker: Callable processing a single chunk
+            chunks: List of chunks
             
-            if items_to_put:
-                for item in items_to_put:
-                    request_items.append({'PutRequest': {'Item': item}})
+        Returns:
+            list: Worker results, in chunk order
+        """
+        if len(chunks) == 1:
+            return [worker(chunks[0])]
+        
+        with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(chunks))) as executor:
+            return list(executor.map(worker, chunks))
+    
+    def _batch_get_chunk(self, keys):
+        """
+        Fetch one chunk of at most 100 keys, retrying unprocessed keys
+        """
+        items = []
+        request_items = {self.table_name: {'Keys': keys}}
+        
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            try:
+                response = self._call('batch_get_item', RequestItems=request_items)
+            except ClientError as e:
+                logger.error(f"Error batch getting items: {e}")
+                raise
             
-            if items_to_delete:
-                for pk, sk in items_to_delete:
-                    request_items.append({'DeleteRequest': {'Key': {'PK': pk, 'SK': sk}}})
+            items.extend(response.get('Responses', {}).get(self.table_name, []))
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                return items
             
-            response = self.dynamodb.batch_write_item(
-                RequestItems={self.table_name: request_items}
-            )
+            if attempt < BATCH_MAX_RETRIES:
+                self._spend_retry('batch_get_item')
+                remaining = len(request_items.get(self.table_name, {}).get('Keys', []))
+                logger.warning(f"Retrying {remaining} unprocessed keys (attempt {attempt + 1})")
+                time.sleep(_backoff_delay(attempt))
+        
+        unprocessed = request_items.get(self.table_name, {}).get('Keys', [])
+        raise BatchOperationError(
+            f"{len(unprocessed)} keys unprocessed after {BATCH_MAX_RETRIES} retries",
+            unprocessed
+        )
+    
+    def _batch_write_chunk(self, requests):
+        """
+        Write one chunk of at most 25 requests, retrying unprocessed items
+        """
+        request_items = {self.table_name: requests}
+        
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            try:
+                response = self._call('batch_write_item', RequestItems=request_items)
+            except ClientError as e:
+                logger.error(f"Error batch writing items: {e}")
+                raise
             
-            logger.info(f"Batch wrote {len(request_items)} items")
-            return response
-        except ClientError as e:
-            logger.error(f"Error batch writing items: {e}")
-            raise
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items:
+                return
+            
+            if attempt < BATCH_MAX_RETRIES:
+                self._spend_retry('batch_write_item')
+                remaining = len(request_items.get(self.table_name, []))
+                logger.warning(f"Retrying {remaining} unprocessed write requests (attempt {attempt + 1})")
+                time.sleep(_backoff_delay(attempt))
+        
+        unprocessed = request_items.get(self.table_name, [])
+        raise BatchOperationError(
+            f"{len(unprocessed)} write requests unprocessed after {BATCH_MAX_RETRIES} retries",
+            unprocessed
+        )
 
 
 # Global database client instance
@@ -361,6 +1274,255 @@ def get_db_client():
     return _db_client
 
 
+def log_invocation_usage():
+    """
+    Log the DynamoDB usage summary of the current invocation, if any
+    
+    Called once at the end of each handler invocation.
+    """
+    if _db_client is not None:
+        _db_client.log_usage_summary()
+
+
+def current_edition():
+    """
+    Edition the deployment registers for (EDITION environment variable)
+    
+    Returns:
+        str: Edition identifier (e.g. '2026'), empty for a single, unnamed edition
+    """
+    return os.environ.get('EDITION', '')
+
+
+def edition_partition(value, edition=None):
+    """
+    Index partition key value of an edition
+    
+    Args:
+        value: Partition value shared by all editions (entity type, race ID...)
+        edition: Edition (defaults to the current edition)
+        
+    Returns:
+        str: '<value>#<edition>', or value alone without an edition
+    """
+    edition = current_edition() if edition is None else edition
+    return f'{value}#{edition}' if edition else value
+
+
+def entity_partition(entity_type, edition=None):
+    """
+    Entity index partition key value of an entity type
+    
+    Args:
+        entity_type: Entity type ('BOAT', 'CREW', 'PAYMENT' or 'PROFILE')
+        edition: Edition (defaults to the current edition, ignored for
+            types that span editions)
+        
+    Returns:
+        str: GSI5PK value
+    """
+    if entity_type not in EDITION_SCOPED_TYPES:
+        return entity_type
+    return edition_partition(entity_type, edition)
+
+
+def item_edition(item):
+    """
+    Edition an item belongs to
+    
+    Args:
+        item: Table item
+        
+    Returns:
+        str: The item's edition attribute, or the current edition for items
+            not stamped yet
+    """
+    edition = item.get(EDITION_ATTRIBUTE)
+    return current_edition() if edition is None else edition
+
+
+def is_edition_scoped(sk):
+    """
+    Whether items with a sort key belong to one edition
+    
+    Args:
+        sk: Sort key of the item
+        
+    Returns:
+        bool: True for boats and payments (see EDITION_SCOPED_TYPES)
+    """
+    return any(
+        sk.startswith(prefix) for prefix, entity_type in ENTITY_TYPES.items()
+        if entity_type in EDITION_SCOPED_TYPES
+    )
+
+
+def in_current_edition(item):
+    """
+    Whether an item belongs to the current edition
+    
+    Items of types that span editions always do. Items written before
+    editions were introduced have no edition attribute until the index key
+    migrations backfill it, and belong to the unnamed edition.
+    
+    Args:
+        item: Table item
+        
+    Returns:
+        bool: True if the item spans editions or its edition is the current edition
+    """
+    if not is_edition_scoped(item.get('SK') or ''):
+        return True
+    return item.get(EDITION_ATTRIBUTE, '') == current_edition()
+
+
+def backfill_edition(item):
+    """
+    Edition the index key migrations record on an existing item
+    
+    Items written before editions were introduced belong to the edition
+    the migrations run for (EDITION): registrations open in the calendar
+    year before the competition, so the creation year is no reliable
+    guess. Only with EDITION_FROM_CREATION_YEAR=true (importing the data
+    of past editions) is the year of created_at used.
+    
+    Args:
+        item: Existing table item
+        
+    Returns:
+        str: The item's edition attribute if set, otherwise the current
+            edition (or the year of its created_at when opted in); empty
+            when editions are not named
+    """
+    if EDITION_ATTRIBUTE in item:
+        return item[EDITION_ATTRIBUTE]
+    if not current_edition():
+        return ''
+    if os.environ.get(EDITION_FROM_CREATION_YEAR_VARIABLE, '').lower() == 'true':
+        return (item.get('created_at') or '')[:4] or current_edition()
+    return current_edition()
+
+
+def race_index_keys(race_id, created_at, edition=None):
+    """
+    Key attributes placing a boat registration in the race index
+    
+    Args:
+        race_id: Race of the boat (None or empty when no race is selected)
+        created_at: Creation timestamp of the boat (index sort key)
+        edition: Edition of the boat (defaults to the current edition)
+        
+    Returns:
+        dict: GSI4PK/GSI4SK values, empty when the boat has no race (the
+            attributes must then be absent, DynamoDB rejects null index keys)
+    """
+    if not race_id:
+        return {}
+    return {RACE_INDEX_KEYS[0]: edition_partition(race_id, edition), RACE_INDEX_KEYS[1]: created_at}
+
+
+def entity_index_keys(pk, sk, edition=None):
+    """
+    Key attributes placing an item in the entity index
+    
+    Args:
+        pk: Partition key of the item
+        sk: Sort key of the item
+        edition: Edition of the item (defaults to the current edition)
+        
+    Returns:
+        dict: GSI5PK/GSI5SK values (entity partition, owning PK), empty for
+            items that are not listed by type (config, races, clubs, audit logs...)
+    """
+    if not sk:
+        return {}
+    for prefix, entity_type in ENTITY_TYPES.items():
+        if sk.startswith(prefix):
+            return {ENTITY_INDEX_KEYS[0]: entity_partition(entity_type, edition), ENTITY_INDEX_KEYS[1]: pk}
+    return {}
+
+
+def payment_date_index_keys(payment_id, paid_at, edition=None):
+    """
+    Key attributes placing a payment in the payment date index
+    
+    The shard is derived from the payment ID, spreading payments made at
+    the same time over PAYMENT_DATE_SHARDS partitions.
+    
+    Args:
+        payment_id: Payment ID
+        paid_at: ISO 8601 payment timestamp
+        edition: Edition of the payment (defaults to the current edition)
+        
+    Returns:
+        dict: GSI6PK/GSI6SK values, empty when either value is missing
+    """
+    if not payment_id or not paid_at:
+        return {}
+    shard = zlib.crc32(payment_id.encode('utf-8')) % PAYMENT_DATE_SHARDS
+    return {
+        PAYMENT_DATE_INDEX_KEYS[0]: edition_partition(f'PAYMENT_DATE#{shard}', edition),
+        PAYMENT_DATE_INDEX_KEYS[1]: f'{paid_at}#{payment_id}'
+    }
+
+
+def index_keys(item):
+    """
+    Index key attributes derived from an item, added by the shared write helpers
+    
+    Covers the entity index and, for payments, the payment date index.
+    Boats and payments keep the edition they were created in (stamped as
+    the edition attribute on their first write).
+    
+    Args:
+        item: Item about to be written
+        
+    Returns:
+        dict: Index key attributes (and edition) to store with the item
+    """
+    sk = item.get('SK') or ''
+    edition = item_edition(item)
+    keys = entity_index_keys(item.get('PK'), sk, edition)
+    if edition and is_edition_scoped(sk):
+        keys[EDITION_ATTRIBUTE] = edition
+    if sk.startswith('PAYMENT#'):
+        keys.update(payment_date_index_keys(
+            item.get('payment_id') or sk[len('PAYMENT#'):],
+            item.get('paid_at'),
+            edition
+        ))
+    return keys
+
+
+def with_request_cache(func):
+    """
+    Decorator enabling the global client's request-scoped identity map for
+    the duration of a Lambda handler
+    
+    Place it outside require_permission so that the items loaded for the
+    permission check are reused by the handler. The invocation's DynamoDB
+    usage summary is logged when the handler returns.
+    
+    Usage:
+        @handle_exceptions
+        @with_request_cache
+        @require_permission('edit_boat_registration')
+        def lambda_handler(event, context):
+            # Your code here
+    """
+    @wraps(func)
+    def wrapper(event, context):
+        db = get_db_client()
+        db.enable_request_cache()
+        try:
+            return func(event, context)
+        finally:
+            db.clear_request_cache()
+            db.log_usage_summary()
+    
+    return wrapper
+
+
 # Helper functions for common patterns
 def generate_id(prefix):
     """
@@ -2,11 +2,11 @@
 Email Utility for sending notifications via AWS SES
 Centralized email sending logic to be reused across Lambda functions
 """
-import boto3
 import logging
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from botocore.exceptions import ClientError
+from aws_clients import get_client
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -22,7 +22,7 @@ def get_ses_client():
     """Get or create SES client"""
     global _ses_client
     if _ses_client is None:
-        _ses_client = boto3.client('ses', region_name='eu-west-1')  # Paris region
+        _ses_client = get_client('ses', region_name='eu-west-1')  # Paris region
     return _ses_client
 
 
@@ -0,0 +1,1121 @@
+"""
+In-memory stand-in for the DynamoDB table
+Implements the part of the boto3 Table/resource API used by the backend so that
+DatabaseClient and ConfigurationManager can run without moto or network access
+(unit tests, local runs and load benchmarks)
+
+Also part of production: the admin exports' fast mode loads the registration
+snapshot into it (see registration_snapshot.snapshot_db_client), so behaviour
+changes must keep matching DynamoDB and be covered in tests/unit/test_memory_table.py
+
+Usage:
+    dynamodb = MemoryDynamoDB()
+    db = DatabaseClient(table_name='registration', dynamodb=dynamodb)
+    config = ConfigurationManager(table_name='registration', dynamodb=dynamodb)
+"""
+import re
+import copy
+import math
+import zlib
+import threading
+from types import SimpleNamespace
+from decimal import Decimal
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import Binary, TypeSerializer, TypeDeserializer
+from botocore.exceptions import ClientError
+
+# Key schema of the production table and its global secondary indexes
+# (index name -> (partition key attribute, sort key attribute))
+DEFAULT_KEY_SCHEMA = ('PK', 'SK')
+DEFAULT_INDEXES = {
+    'GSI1': ('GSI1PK', 'GSI1SK'),
+    'GSI2': ('GSI2PK', 'GSI2SK'),
+    'GSI3': ('license_number', 'SK'),
+    'GSI4': ('GSI4PK', 'GSI4SK'),
+    'GSI5': ('GSI5PK', 'GSI5SK'),
+    'GSI6': ('GSI6PK', 'GSI6SK'),
+}
+
+# DynamoDB request limits
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+TRANSACT_MAX_ITEMS = 100
+
+_MISSING = object()
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<op><>|<=|>=|=|<|>|\(|\)|,|\.|\[|\]|\+|-)
+      | (?P<value>:[A-Za-z0-9_]+)
+      | (?P<name>\#[A-Za-z0-9_]+|[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<number>[0-9]+)
+    )""", re.VERBOSE)
+
+_UPDATE_CLAUSES = ('SET', 'REMOVE', 'ADD', 'DELETE')
+
+
+def _client_error(code, message, operation, **extra):
+    """Build the ClientError boto3 would raise for a failed request"""
+    response = {
+        'Error': {'Code': code, 'Message': message},
+        'ResponseMetadata': {'HTTPStatusCode': 400, 'RetryAttempts': 0}
+    }
+    response.update(extra)
+    return ClientError(response, operation)
+
+
+class _ValidationError(Exception):
+    """Request rejected by DynamoDB validation (ValidationException)"""
+
+
+class _ConditionFailed(Exception):
+    """ConditionExpression evaluated to false"""
+
+
+def _normalize(value):
+    """
+    Convert a value the way a DynamoDB round trip does (ints become Decimal,
+    floats are rejected with TypeError as in boto3)
+    """
+    return _deserializer.deserialize(_serializer.serialize(value))
+
+
+def _type_of(value):
+    """DynamoDB type descriptor of a Python value"""
+    if isinstance(value, bool):
+        return 'BOOL'
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        return 'S'
+    if isinstance(value, (int, Decimal)):
+        return 'N'
+    if isinstance(value, (bytes, bytearray, Binary)):
+        return 'B'
+    if isinstance(value, (set, frozenset)):
+        element = next(iter(value), '')
+        return {'S': 'SS', 'N': 'NS', 'B': 'BS'}.get(_type_of(element), 'SS')
+    if isinstance(value, (list, tuple)):
+        return 'L'
+    if isinstance(value, dict):
+        return 'M'
+    return None
+
+
+def _scalar(value):
+    """Comparable form of a scalar value"""
+    return value.value if isinstance(value, Binary) else value
+
+
+def _compare(operator, left, right):
+    """Evaluate a comparison with DynamoDB semantics (no cross-type ordering)"""
+    if left is _MISSING or right is _MISSING:
+        return operator == '<>'
+    same_type = _type_of(left) == _type_of(right)
+    if operator in ('=', '<>'):
+        equal = same_type and _scalar(left) == _scalar(right)
+        return equal if operator == '=' else not equal
+    if not same_type or _type_of(left) not in ('S', 'N', 'B'):
+        return False
+    left, right = _scalar(left), _scalar(right)
+    if operator == '<':
+        return left < right
+    if operator == '<=':
+        return left <= right
+    if operator == '>':
+        return left > right
+    return left >= right
+
+
+def _get_path(item, path):
+    """Value at a document path, or _MISSING"""
+    value = item
+    for element in path:
+        if isinstance(element, int):
+            if not isinstance(value, list) or element >= len(value):
+                return _MISSING
+        elif not isinstance(value, dict) or element not in value:
+            return _MISSING
+        value = value[element]
+    return value
+
+
+def _set_path(item, path, value):
+    """Set the value at a document path, creating the last element"""
+    parent = _get_path(item, path[:-1])
+    last = path[-1]
+    if isinstance(last, int) and isinstance(parent, list):
+        if last >= len(parent):
+            parent.append(value)
+        else:
+            parent[last] = value
+    elif isinstance(last, str) and isinstance(parent, dict):
+        parent[last] = value
+    else:
+        raise _ValidationError('The document path provided in the update expression is invalid for update')
+
+
+def _remove_path(item, path):
+    """Remove the value at a document path if present"""
+    parent = _get_path(item, path[:-1])
+    last = path[-1]
+    if isinstance(last, int) and isinstance(parent, list):
+        if last < len(parent):
+            del parent[last]
+    elif isinstance(last, str) and isinstance(parent, dict):
+        parent.pop(last, None)
+
+
+def _value_size(value):
+    """Approximate stored size of a value in bytes"""
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, Decimal)):
+        return len(str(value)) // 2 + 1
+    if isinstance(value, Binary):
+        return len(value.value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return 3 + sum(len(key.encode('utf-8')) + _value_size(val) for key, val in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return 3 + sum(_value_size(val) for val in value)
+    return 0
+
+
+def _item_size(item):
+    """Approximate stored size of an item in bytes"""
+    return _value_size(item) - 3 if item else 0
+
+
+def _read_units(size, consistent=False):
+    """Read capacity units for reading `size` bytes"""
+    units = max(1, math.ceil(size / 4096))
+    return float(units if consistent else units / 2)
+
+
+def _write_units(size):
+    """Write capacity units for writing `size` bytes"""
+    return float(max(1, math.ceil(size / 1024)))
+
+
+class _Expressions:
+    """
+    Expression attribute names/values of one request
+
+    Builds boto3 condition objects into expression strings (as the boto3
+    resource layer does) and tracks which placeholders were used.
+    """
+
+    def __init__(self, params):
+        self.names = dict(params.get('ExpressionAttributeNames') or {})
+        self.values = {key: _normalize(value) for key, value in (params.get('ExpressionAttributeValues') or {}).items()}
+        self.used_names = set()
+        self.used_values = set()
+        self._builder = ConditionExpressionBuilder()
+
+    def text(self, expression, is_key_condition=False):
+        """Expression string for a string or a boto3 condition object"""
+        if isinstance(expression, ConditionBase):
+            built = self._builder.build_expression(expression, is_key_condition=is_key_condition)
+            self.names.update(built.attribute_name_placeholders)
+            self.values.update({key: _normalize(value) for key, value in built.attribute_value_placeholders.items()})
+            return built.condition_expression
+        return expression
+
+    def name(self, token):
+        """Resolve an attribute name token"""
+        if not token.startswith('#'):
+            return token
+        if token not in self.names:
+            raise _ValidationError(f'An expression attribute name used in the document path is not defined; attribute name: {token}')
+        self.used_names.add(token)
+        return self.names[token]
+
+    def value(self, token):
+        """Resolve an attribute value token"""
+        if token not in self.values:
+            raise _ValidationError(f'An expression attribute value used in expression is not defined; attribute value: {token}')
+        self.used_values.add(token)
+        return self.values[token]
+
+    def check_unused(self):
+        """Reject placeholders that no expression of the request used"""
+        unused_names = set(self.names) - self.used_names
+        if unused_names:
+            raise _ValidationError(f'Value provided in ExpressionAttributeNames unused in expressions: keys: {{{", ".join(sorted(unused_names))}}}')
+        unused_values = set(self.values) - self.used_values
+        if unused_values:
+            raise _ValidationError(f'Value provided in ExpressionAttributeValues unused in expressions: keys: {{{", ".join(sorted(unused_values))}}}')
+
+
+class _Parser:
+    """
+    Recursive-descent parser for condition, key condition, projection and
+    update expressions; conditions compile to predicates over an item
+    """
+
+    def __init__(self, expression, expressions):
+        self.expressions = expressions
+        self.tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN_RE.match(expression, position)
+            if not match or match.end() == position:
+                raise _ValidationError(f'Invalid expression: syntax error near "{expression[position:]}"')
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.position = 0
+        # Equality conditions on plain attributes (used to locate a query partition)
+        self.equalities = {}
+
+    # Token helpers
+
+    def _peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        if token[0] is None:
+            raise _ValidationError('Invalid expression: unexpected end of expression')
+        self.position += 1
+        return token
+
+    def _expect(self, op):
+        kind, text = self._next()
+        if kind != 'op' or text != op:
+            raise _ValidationError(f'Invalid expression: expected "{op}", found "{text}"')
+
+    def _at_op(self, op):
+        kind, text = self._peek()
+        return kind == 'op' and text == op
+
+    def _at_keyword(self, *keywords):
+        kind, text = self._peek()
+        return kind == 'name' and text.upper() in keywords
+
+    def _at_end(self):
+        return self._peek()[0] is None
+
+    def _finish(self):
+        if not self._at_end():
+            raise _ValidationError(f'Invalid expression: unexpected token "{self._peek()[1]}"')
+
+    # Operands
+
+    def parse_path(self):
+        """Parse a document path into a list of names and list indexes"""
+        kind, text = self._next()
+        if kind != 'name':
+            raise _ValidationError(f'Invalid expression: expected attribute name, found "{text}"')
+        path = [self.expressions.name(text)]
+        while True:
+            if self._at_op('.'):
+                self._next()
+                kind, text = self._next()
+                if kind != 'name':
+                    raise _ValidationError(f'Invalid expression: expected attribute name, found "{text}"')
+                path.append(self.expressions.name(text))
+            elif self._at_op('['):
+                self._next()
+                kind, text = self._next()
+                if kind != 'number':
+                    raise _ValidationError(f'Invalid expression: expected list index, found "{text}"')
+                path.append(int(text))
+                self._expect(']')
+            else:
+                return path
+
+    def _operand(self):
+        """Parse a condition operand into a function of the item"""
+        kind, text = self._peek()
+        if kind == 'value':
+            self._next()
+            value = self.expressions.value(text)
+            return lambda item: value
+        if kind == 'name' and text == 'size' and self._peek(1) == ('op', '('):
+            self._next()
+            self._expect('(')
+            path = self.parse_path()
+            self._expect(')')
+
+            def size(item):
+                value = _get_path(item, path)
+                if isinstance(value, Binary):
+                    value = value.value
+                if isinstance(value, (str, bytes, bytearray, list, dict, set, frozenset)):
+                    return Decimal(len(value))
+                return _MISSING
+            return size
+        path = self.parse_path()
+        return lambda item: _get_path(item, path)
+
+    # Conditions
+
+    def parse_condition(self):
+        """Parse a whole condition expression"""
+        predicate = self._or()
+        self._finish()
+        return predicate
+
+    def _or(self):
+        predicate = self._and()
+        while self._at_keyword('OR'):
+            self._next()
+            left, right = predicate, self._and()
+            predicate = lambda item, left=left, right=right: left(item) or right(item)
+        return predicate
+
+    def _and(self):
+        predicate = self._not()
+        while self._at_keyword('AND'):
+            self._next()
+            left, right = predicate, self._not()
+            predicate = lambda item, left=left, right=right: left(item) and right(item)
+        return predicate
+
+    def _not(self):
+        if self._at_keyword('NOT'):
+            self._next()
+            inner = self._not()
+            return lambda item: not inner(item)
+        return self._primary()
+
+    def _primary(self):
+        if self._at_op('('):
+            self._next()
+            predicate = self._or()
+            self._expect(')')
+            return predicate
+
+        kind, text = self._peek()
+        if kind == 'name' and text != 'size' and self._peek(1) == ('op', '('):
+            return self._function()
+
+        start = self.position
+        left = self._operand()
+        kind, text = self._next()
+
+        if kind == 'op' and text in ('=', '<>', '<', '<=', '>', '>='):
+            operator = text
+            value_token = self._peek()
+            right = self._operand()
+            # Remember "attribute = :value" for key conditions
+            if operator == '=' and value_token[0] == 'value' and self.position - start == 3:
+                self.equalities[self.expressions.name(self.tokens[start][1])] = right(None)
+            return lambda item: _compare(operator, left(item), right(item))
+
+        if kind == 'name' and text.upper() == 'BETWEEN':
+            low = self._operand()
+            if not self._at_keyword('AND'):
+                raise _ValidationError('Invalid expression: BETWEEN requires AND')
+            self._next()
+            high = self._operand()
+            return lambda item: _compare('>=', left(item), low(item)) and _compare('<=', left(item), high(item))
+
+        if kind == 'name' and text.upper() == 'IN':
+            self._expect('(')
+            candidates = [self._operand()]
+            while self._at_op(','):
+                self._next()
+                candidates.append(self._operand())
+            self._expect(')')
+            return lambda item: any(_compare('=', left(item), candidate(item)) for candidate in candidates)
+
+        raise _ValidationError(f'Invalid expression: unexpected token "{text}"')
+
+    def _function(self):
+        _, name = self._next()
+        self._expect('(')
+        path = self.parse_path()
+        argument = None
+        if self._at_op(','):
+            self._next()
+            argument = self._operand()
+        self._expect(')')
+
+        if name == 'attribute_exists':
+            return lambda item: _get_path(item, path) is not _MISSING
+        if name == 'attribute_not_exists':
+            return lambda item: _get_path(item, path) is _MISSING
+        if argument is None:
+            raise _ValidationError(f'Invalid function call: {name} requires two arguments')
+        if name == 'attribute_type':
+            return lambda item: _type_of(_get_path(item, path)) == argument(item) and _get_path(item, path) is not _MISSING
+        if name == 'begins_with':
+            def begins_with(item):
+                value, prefix = _scalar(_get_path(item, path)), _scalar(argument(item))
+                if isinstance(value, str) and isinstance(prefix, str):
+                    return value.startswith(prefix)
+                if isinstance(value, (bytes, bytearray)) and isinstance(prefix, (bytes, bytearray)):
+                    return value.startswith(prefix)
+                return False
+            return begins_with
+        if name == 'contains':
+            def contains(item):
+                value, operand = _get_path(item, path), argument(item)
+                if isinstance(value, str):
+                    return isinstance(operand, str) and operand in value
+                if isinstance(value, (set, frozenset, list)):
+                    return operand in value
+                return False
+            return contains
+        raise _ValidationError(f'Invalid function name; function: {name}')
+
+    # Projections
+
+    def parse_projection(self):
+        """Parse a comma-separated list of document paths"""
+        paths = [self.parse_path()]
+        while self._at_op(','):
+            self._next()
+            paths.append(self.parse_path())
+        self._finish()
+        return paths
+
+    # Updates
+
+    def parse_update(self):
+        """
+        Parse an update expression into a list of (clause, path, operand) actions
+        """
+        actions = []
+        seen = set()
+        while not self._at_end():
+            kind, text = self._next()
+            clause = text.upper() if kind == 'name' else None
+            if clause not in _UPDATE_CLAUSES or clause in seen:
+                raise _ValidationError(f'Invalid UpdateExpression: syntax error near "{text}"')
+            seen.add(clause)
+            while True:
+                path = self.parse_path()
+                if clause == 'SET':
+                    self._expect('=')
+                    actions.append((clause, path, self._set_value()))
+                elif clause == 'REMOVE':
+                    actions.append((clause, path, None))
+                else:
+                    kind, text = self._next()
+                    if kind != 'value':
+                        raise _ValidationError(f'Invalid UpdateExpression: {clause} requires a value')
+                    value = self.expressions.value(text)
+                    actions.append((clause, path, lambda item, value=value: value))
+                if not self._at_op(','):
+                    break
+                self._next()
+        if not actions:
+            raise _ValidationError('Invalid UpdateExpression: the expression can not be empty')
+        return actions
+
+    def _set_value(self):
+        left = self._set_operand()
+        if self._at_op('+') or self._at_op('-'):
+            _, operator = self._next()
+            right = self._set_operand()
+
+            def arithmetic(item):
+                a, b = left(item), right(item)
+                if _type_of(a) != 'N' or _type_of(b) != 'N':
+                    raise _ValidationError('An operand in the update expression has an incorrect data type')
+                return a + b if operator == '+' else a - b
+            return arithmetic
+        return left
+
+    def _set_operand(self):
+        kind, text = self._peek()
+        if kind == 'name' and self._peek(1) == ('op', '('):
+            self._next()
+            self._expect('(')
+            if text == 'if_not_exists':
+                path = self.parse_path()
+                self._expect(',')
+                default = self._set_operand()
+                self._expect(')')
+
+                def if_not_exists(item):
+                    value = _get_path(item, path)
+                    return default(item) if value is _MISSING else value
+                return if_not_exists
+            if text == 'list_append':
+                first = self._set_operand()
+                self._expect(',')
+                second = self._set_operand()
+                self._expect(')')
+
+                def list_append(item):
+                    a, b = first(item), second(item)
+                    if not isinstance(a, list) or not isinstance(b, list):
+                        raise _ValidationError('An operand in the update expression has an incorrect data type')
+                    return a + b
+                return list_append
+            raise _ValidationError(f'Invalid function name; function: {text}')
+
+        operand = self._operand()
+
+        def resolved(item):
+            value = operand(item)
+            if value is _MISSING:
+                raise _ValidationError('The provided expression refers to an attribute that does not exist in the item')
+            return copy.deepcopy(value)
+        return resolved
+
+
+class MemoryTable:
+    """
+    In-memory table with the boto3 Table interface
+
+    Supports get/put/update/delete with condition expressions, query (key
+    conditions, filters, secondary indexes, ordering), segmented scans,
+    projections, Select=COUNT and Limit/ExclusiveStartKey pagination.
+    Items are stored as DynamoDB would return them (numbers as Decimal).
+    """
+
+    def __init__(self, name='memory-table', key_schema=DEFAULT_KEY_SCHEMA, indexes=None, lock=None):
+        """
+        Initialize an empty table
+
+        Args:
+            name: Table name
+            key_schema: (partition key, sort key) attribute names
+            indexes: Global secondary indexes as {name: (partition key, sort key)}
+                (defaults to the production indexes)
+            lock: Lock shared with other tables for transactions
+        """
+        self.name = name
+        self.table_name = name
+        self.hash_key, self.range_key = key_schema
+        self.indexes = dict(DEFAULT_INDEXES if indexes is None else indexes)
+        self._partitions = {}
+        self._index_partitions = {index_name: {} for index_name in self.indexes}
+        self._scan_order = None
+        self._lock = lock or threading.RLock()
+
+    # Storage
+
+    def __len__(self):
+        return sum(len(partition) for partition in self._partitions.values())
+
+    def _key_of(self, item):
+        return (item.get(self.hash_key), item.get(self.range_key) if self.range_key else None)
+
+    def _key_dict(self, key):
+        result = {self.hash_key: key[0]}
+        if self.range_key:
+            result[self.range_key] = key[1]
+        return result
+
+    def _parse_key(self, key_dict):
+        """Validate a Key parameter and return the internal key tuple"""
+        expected = {self.hash_key, self.range_key} - {None}
+        if set(key_dict) != expected:
+            raise _ValidationError('The provided key element does not match the schema')
+        key_dict = _normalize(key_dict)
+        return self._key_of(key_dict)
+
+    def _lookup(self, key):
+        return self._partitions.get(key[0], {}).get(key[1])
+
+    def _store(self, key, item):
+        """Replace (or delete when item is None) the item at key, keeping indexes in sync"""
+        old = self._lookup(key)
+        if old is not None:
+            for index_name, (hash_attr, range_attr) in self.indexes.items():
+                if hash_attr in old and (range_attr is None or range_attr in old):
+                    entries = self._index_partitions[index_name].get(old[hash_attr])
+                    if entries is not None:
+                        entries.pop(key, None)
+                        if not entries:
+                            del self._index_partitions[index_name][old[hash_attr]]
+
+        if item is None:
+            partition = self._partitions.get(key[0], {})
+            if partition.pop(key[1], None) is not None:
+                self._scan_order = None
+            if not partition:
+                self._partitions.pop(key[0], None)
+            return
+
+        if old is None:
+            self._scan_order = None
+        self._partitions.setdefault(key[0], {})[key[1]] = item
+        for index_name, (hash_attr, range_attr) in self.indexes.items():
+            if hash_attr in item and (range_attr is None or range_attr in item):
+                self._index_partitions[index_name].setdefault(item[hash_attr], {})[key] = item
+
+    def _validate_item(self, item):
+        item = _normalize(item)
+        for attr in (self.hash_key, self.range_key):
+            if attr and (attr not in item or _type_of(item[attr]) not in ('S', 'N', 'B') or item[attr] == ''):
+                raise _ValidationError(f'One or more parameter values were invalid: Missing the key {attr} in the item')
+        return item
+
+    # Write preparation (shared by single writes and transactions)
+
+    def _check_condition(self, expressions, params, current):
+        condition = params.get('ConditionExpression')
+        if condition is None:
+            return
+        predicate = _Parser(expressions.text(condition), expressions).parse_condition()
+        if not predicate(current or {}):
+            raise _ConditionFailed()
+
+    def _prepare_put(self, params):
+        item = self._validate_item(params['Item'])
+        key = self._key_of(item)
+        expressions = _Expressions(params)
+        current = self._lookup(key)
+        self._check_condition(expressions, params, current)
+        expressions.check_unused()
+        return key, current, item
+
+    def _prepare_delete(self, params):
+        key = self._parse_key(params['Key'])
+        expressions = _Expressions(params)
+        current = self._lookup(key)
+        self._check_condition(expressions, params, current)
+        expressions.check_unused()
+        return key, current, None
+
+    def _prepare_update(self, params):
+        key = self._parse_key(params['Key'])
+        expressions = _Expressions(params)
+        current = self._lookup(key)
+        actions = []
+        if params.get('UpdateExpression'):
+            actions = _Parser(params['UpdateExpression'], expressions).parse_update()
+        self._check_condition(expressions, params, current)
+        expressions.check_unused()
+
+        original = current or self._key_dict(key)
+        updated = copy.deepcopy(original)
+        touched = set()
+        for clause, path, operand in actions:
+            if path[0] in (self.hash_key, self.range_key):
+                raise _ValidationError(f'Cannot update attribute {path[0]}. This attribute is part of the key')
+            touched.add(path[0])
+            if clause == 'SET':
+                _set_path(updated, path, operand(original))
+            elif clause == 'REMOVE':
+                _remove_path(updated, path)
+            elif clause == 'ADD':
+                value, existing = operand(original), _get_path(updated, path)
+                if existing is _MISSING:
+                    _set_path(updated, path, copy.deepcopy(value))
+                elif _type_of(existing) == 'N' and _type_of(value) == 'N':
+                    _set_path(updated, path, existing + value)
+                elif isinstance(existing, set) and isinstance(value, set):
+                    _set_path(updated, path, existing | value)
+                else:
+                    raise _ValidationError('An operand in the update expression has an incorrect data type')
+            else:
+                value, existing = operand(original), _get_path(updated, path)
+                if isinstance(existing, set) and isinstance(value, set):
+                    remaining = existing - value
+                    if remaining:
+                        _set_path(updated, path, remaining)
+                    else:
+                        _remove_path(updated, path)
+                elif existing is not _MISSING:
+                    raise _ValidationError('An operand in the update expression has an incorrect data type')
+        return key, current, updated, touched
+
+    # Reads
+
+    def _projector(self, params, expressions):
+        projection = params.get('ProjectionExpression')
+        if not projection:
+            return lambda item: copy.deepcopy(item)
+        paths = _Parser(projection, expressions).parse_projection()
+
+        def project(item):
+            result = {}
+            for path in paths:
+                value = _get_path(item, path)
+                if value is _MISSING:
+                    continue
+                target = result
+                for element, following in zip(path, path[1:]):
+                    if isinstance(target, dict):
+                        target = target.setdefault(element, [] if isinstance(following, int) else {})
+                    else:
+                        target.append([] if isinstance(following, int) else {})
+                        target = target[-1]
+                if isinstance(target, dict):
+                    target[path[-1]] = copy.deepcopy(value)
+                else:
+                    target.append(copy.deepcopy(value))
+            return result
+        return project
+
+    def _capacity(self, params, units):
+        if params.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            return {'ConsumedCapacity': {'TableName': self.name, 'CapacityUnits': units}}
+        return {}
+
+    @staticmethod
+    def _metadata():
+        return {'ResponseMetadata': {'HTTPStatusCode': 200, 'RetryAttempts': 0}}
+
+    def _run(self, operation, function, params):
+        """Run a request under the table lock, mapping failures to ClientError"""
+        try:
+            with self._lock:
+                return function(params)
+        except _ValidationError as e:
+            raise _client_error('ValidationException', str(e), operation)
+        except _ConditionFailed:
+            raise _client_error('ConditionalCheckFailedException', 'The conditional request failed', operation)
+
+    def get_item(self, **params):
+        """GetItem"""
+        return self._run('GetItem', self._get_item, params)
+
+    def _get_item(self, params):
+        key = self._parse_key(params['Key'])
+        expressions = _Expressions(params)
+        project = self._projector(params, expressions)
+        expressions.check_unused()
+        item = self._lookup(key)
+        response = self._metadata()
+        response.update(self._capacity(params, _read_units(_item_size(item), params.get('ConsistentRead', False))))
+        if item is not None:
+            response['Item'] = project(item)
+        return response
+
+    def put_item(self, **params):
+        """PutItem"""
+        return self._run('PutItem', self._put_item, params)
+
+    def _put_item(self, params):
+        key, current, item = self._prepare_put(params)
+        self._store(key, item)
+        response = self._metadata()
+        response.update(self._capacity(params, _write_units(max(_item_size(current), _item_size(item)))))
+        if params.get('ReturnValues') == 'ALL_OLD' and current is not None:
+            response['Attributes'] = copy.deepcopy(current)
+        return response
+
+    def delete_item(self, **params):
+        """DeleteItem"""
+        return self._run('DeleteItem', self._delete_item, params)
+
+    def _delete_item(self, params):
+        key, current, _ = self._prepare_delete(params)
+        self._store(key, None)
+        response = self._metadata()
+        response.update(self._capacity(params, _write_units(_item_size(current))))
+        if params.get('ReturnValues') == 'ALL_OLD' and current is not None:
+            response['Attributes'] = copy.deepcopy(current)
+        return response
+
+    def update_item(self, **params):
+        """UpdateItem"""
+        return self._run('UpdateItem', self._update_item, params)
+
+    def _update_item(self, params):
+        key, current, updated, touched = self._prepare_update(params)
+        self._store(key, updated)
+        response = self._metadata()
+        response.update(self._capacity(params, _write_units(max(_item_size(current), _item_size(updated)))))
+
+        return_values = params.get('ReturnValues', 'NONE')
+        if return_values == 'ALL_NEW':
+            response['Attributes'] = copy.deepcopy(updated)
+        elif return_values == 'ALL_OLD' and current is not None:
+            response['Attributes'] = copy.deepcopy(current)
+        elif return_values == 'UPDATED_NEW':
+            response['Attributes'] = {name: copy.deepcopy(updated[name]) for name in touched if name in updated}
+        elif return_values == 'UPDATED_OLD' and current is not None:
+            response['Attributes'] = {name: copy.deepcopy(current[name]) for name in touched if name in current}
+        return response
+
+    def query(self, **params):
+        """Query (table or global secondary index)"""
+        return self._run('Query', self._query, params)
+
+    def _query(self, params):
+        expressions = _Expressions(params)
+        index_name = params.get('IndexName')
+        if index_name is not None and index_name not in self.indexes:
+            raise _ValidationError(f'The table does not have the specified index: {index_name}')
+        hash_attr, range_attr = self.indexes[index_name] if index_name else (self.hash_key, self.range_key)
+
+        parser = _Parser(expressions.text(params['KeyConditionExpression'], is_key_condition=True), expressions)
+        key_condition = parser.parse_condition()
+        if hash_attr not in parser.equalities:
+            raise _ValidationError('Query condition missed key schema element')
+        hash_value = parser.equalities[hash_attr]
+
+        if index_name:
+            candidates = list(self._index_partitions[index_name].get(hash_value, {}).values())
+        else:
+            candidates = list(self._partitions.get(hash_value, {}).values())
+        candidates = [item for item in candidates if key_condition(item)]
+
+        def order(item):
+            range_value = _scalar(item.get(range_attr, '')) if range_attr else ''
+            if index_name:
+                return (range_value, _scalar(item[self.hash_key]), _scalar(item.get(self.range_key, '')))
+            return (range_value,)
+
+        forward = params.get('ScanIndexForward', True)
+        candidates.sort(key=order, reverse=not forward)
+
+        start_key = params.get('ExclusiveStartKey')
+        if start_key:
+            start = order(_normalize(start_key))
+            candidates = [item for item in candidates if (order(item) > start if forward else order(item) < start)]
+
+        key_attrs = [hash_attr, range_attr] if index_name else []
+        return self._page(candidates, params, expressions, key_attrs)
+
+    def scan(self, **params):
+        """Scan (optionally one segment of a parallel scan)"""
+        return self._run('Scan', self._scan, params)
+
+    def _scan_sequence(self):
+        if self._scan_order is None:
+            keys = [(hash_value, range_value) for hash_value, partition in self._partitions.items() for range_value in partition]
+            self._scan_order = sorted(keys, key=self._scan_position)
+        return self._scan_order
+
+    def _scan_position(self, key):
+        # Items are laid out by the hash of their partition key, as in DynamoDB
+        return (zlib.crc32(str(key[0]).encode('utf-8')), str(key[0]), _scalar(key[1]) if key[1] is not None else '')
+
+    def _scan(self, params):
+        expressions = _Expressions(params)
+        index_name = params.get('IndexName')
+        keys = self._scan_sequence()
+
+        total_segments = params.get('TotalSegments')
+        if total_segments:
+            segment = params.get('Segment', 0)
+            keys = [key for key in keys if (zlib.crc32(str(key[0]).encode('utf-8')) * total_segments) >> 32 == segment]
+
+        start_key = params.get('ExclusiveStartKey')
+        if start_key:
+            start = self._scan_position(self._key_of(_normalize(start_key)))
+            keys = [key for key in keys if self._scan_position(key) > start]
+
+        items = [self._lookup(key) for key in keys]
+        key_attrs = []
+        if index_name:
+            hash_attr, range_attr = self.indexes[index_name]
+            items = [item for item in items if hash_attr in item and (range_attr is None or range_attr in item)]
+            key_attrs = [hash_attr, range_attr]
+        return self._page(items, params, expressions, key_attrs)
+
+    def _page(self, candidates, params, expressions, index_key_attrs):
+        """Apply Limit, FilterExpression, projection and Select to ordered candidates"""
+        filter_predicate = None
+        if params.get('FilterExpression') is not None:
+            filter_predicate = _Parser(expressions.text(params['FilterExpression']), expressions).parse_condition()
+        project = self._projector(params, expressions)
+        expressions.check_unused()
+
+        limit = params.get('Limit')
+        evaluated = candidates[:limit] if limit else candidates
+        matched = [item for item in evaluated if filter_predicate is None or filter_predicate(item)]
+
+        response = self._metadata()
+        response['Count'] = len(matched)
+        response['ScannedCount'] = len(evaluated)
+        if params.get('Select') != 'COUNT':
+            response['Items'] = [project(item) for item in matched]
+        if limit and len(candidates) > limit:
+            last = evaluated[-1]
+            last_key = self._key_dict(self._key_of(last))
+            for attr in index_key_attrs:
+                if attr:
+                    last_key[attr] = last[attr]
+            response['LastEvaluatedKey'] = copy.deepcopy(last_key)
+        size = sum(_item_size(item) for item in evaluated)
+        response.update(self._capacity(params, _read_units(size, params.get('ConsistentRead', False))))
+        return response
+
+    # Test helpers
+
+    def items(self):
+        """Copy of every item in the table, in scan order"""
+        with self._lock:
+            return [copy.deepcopy(self._lookup(key)) for key in self._scan_sequence()]
+
+    def clear(self):
+        """Remove every item"""
+        with self._lock:
+            self._partitions = {}
+            self._index_partitions = {index_name: {} for index_name in self.indexes}
+            self._scan_order = None
+
+
+class MemoryDynamoDB:
+    """
+    In-memory stand-in for the boto3 DynamoDB service resource
+
+    Provides Table(name), the resource-level batch_get_item/batch_write_item
+    and meta.client.transact_write_items. Tables are created on first use
+    with the production key schema.
+    """
+
+    def __init__(self, indexes=None):
+        """
+        Initialize an empty set of tables
+
+        Args:
+            indexes: Global secondary indexes of the tables (defaults to the
+                production indexes)
+        """
+        self._indexes = indexes
+        self._tables = {}
+        self._lock = threading.RLock()
+        # boto3 exposes the low-level client as resource.meta.client
+        self.meta = SimpleNamespace(client=self)
+
+    def Table(self, name):
+        """Get (or create) the table with this name"""
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = MemoryTable(name, indexes=self._indexes, lock=self._lock)
+            return self._tables[name]
+
+    def _run(self, operation, function, params):
+        try:
+            with self._lock:
+                return function(params)
+        except _ValidationError as e:
+            raise _client_error('ValidationException', str(e), operation)
+
+    def batch_get_item(self, **params):
+        """BatchGetItem"""
+        return self._run('BatchGetItem', self._batch_get_item, params)
+
+    def _batch_get_item(self, params):
+        request_items = params['RequestItems']
+        if sum(len(spec['Keys']) for spec in request_items.values()) > BATCH_GET_MAX_KEYS:
+            raise _ValidationError('Too many items requested for the BatchGetItem call')
+
+        response = MemoryTable._metadata()
+        response['Responses'] = {}
+        response['UnprocessedKeys'] = {}
+        capacity = []
+        for table_name, spec in request_items.items():
+            table = self.Table(table_name)
+            keys = [table._parse_key(key) for key in spec['Keys']]
+            if len(set(keys)) != len(keys):
+                raise _ValidationError('Provided list of item keys contains duplicates')
+            expressions = _Expressions(spec)
+            project = table._projector(spec, expressions)
+            expressions.check_unused()
+            items = [table._lookup(key) for key in keys]
+            response['Responses'][table_name] = [project(item) for item in items if item is not None]
+            capacity.append({
+                'TableName': table_name,
+                'CapacityUnits': sum(_read_units(_item_size(item)) for item in items if item is not None)
+            })
+        if params.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = capacity
+        return response
+
+    def batch_write_item(self, **params):
+        """BatchWriteItem"""
+        return self._run('BatchWriteItem', self._batch_write_item, params)
+
+    def _batch_write_item(self, params):
+        request_items = params['RequestItems']
+        if sum(len(requests) for requests in request_items.values()) > BATCH_WRITE_MAX_ITEMS:
+            raise _ValidationError('Too many items requested for the BatchWriteItem call')
+
+        # Validate every request before applying any of them
+        writes = []
+        for table_name, requests in request_items.items():
+            table = self.Table(table_name)
+            seen = set()
+            for request in requests:
+                if 'PutRequest' in request:
+                    item = table._validate_item(request['PutRequest']['Item'])
+                    key = table._key_of(item)
+                else:
+                    item = None
+                    key = table._parse_key(request['DeleteRequest']['Key'])
+                if key in seen:
+                    raise _ValidationError('Provided list of item keys contains duplicates')
+                seen.add(key)
+                writes.append((table, key, item))
+
+        units = {}
+        for table, key, item in writes:
+            size = max(_item_size(table._lookup(key)), _item_size(item))
+            units[table.name] = units.get(table.name, 0.0) + _write_units(size)
+            table._store(key, item)
+
+        response = MemoryTable._metadata()
+        response['UnprocessedItems'] = {}
+        if params.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = [{'TableName': name, 'CapacityUnits': total} for name, total in units.items()]
+        return response
+
+    def transact_write_items(self, **params):
+        """TransactWriteItems (all conditions checked before any write)"""
+        return self._run('TransactWriteItems', self._transact_write_items, params)
+
+    def _transact_write_items(self, params):
+        transact_items = params['TransactItems']
+        if len(transact_items) > TRANSACT_MAX_ITEMS:
+            raise _ValidationError(f'Member must have length less than or equal to {TRANSACT_MAX_ITEMS}')
+
+        writes = []
+        reasons = []
+        seen = set()
+        for transact_item in transact_items:
+            (action, request), = transact_item.items()
+            table = self.Table(request['TableName'])
+            key = table._parse_key(request['Key']) if 'Key' in request else table._key_of(_normalize(request['Item']))
+            if (table.name, key) in seen:
+                raise _ValidationError('Transaction request cannot include multiple operations on one item')
+            seen.add((table.name, key))
+            try:
+                if action == 'Put':
+                    key, current, item = table._prepare_put(request)
+                elif action == 'Delete':
+                    key, current, item = table._prepare_delete(request)
+                elif action == 'Update':
+                    key, current, item, _ = table._prepare_update(request)
+                elif action == 'ConditionCheck':
+                    table._prepare_delete(request)
+                    reasons.append({'Code': 'None'})
+                    continue
+                else:
+                    raise _ValidationError(f'Unsupported transaction action: {action}')
+            except _ConditionFailed:
+                reasons.append({'Code': 'ConditionalCheckFailed', 'Message': 'The conditional request failed'})
+                continue
+            reasons.append({'Code': 'None'})
+            writes.append((table, key, current, item))
+
+        if any(reason['Code'] != 'None' for reason in reasons):
+            codes = ', '.join(reason['Code'] for reason in reasons)
+            raise _client_error(
+                'TransactionCanceledException',
+                f'Transaction cancelled, please refer cancellation reasons for specific reasons [{codes}]',
+                'TransactWriteItems',
+                CancellationReasons=reasons
+            )
+
+        units = {}
+        for table, key, current, item in writes:
+            size = max(_item_size(current), _item_size(item))
+            units[table.name] = units.get(table.name, 0.0) + 2 * _write_units(size)
+            table._store(key, item)
+
+        response = MemoryTable._metadata()
+        if params.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = [{'TableName': name, 'CapacityUnits': total} for name, total in units.items()]
+        return response
@@ -61,61 +61,37 @@ def query_payments_by_team(db, team_manager_id, start_date=None, end_date=None,
         raise
 
 
-def scan_all_payments(db, start_date=None, end_date=None):
+def query_payments_by_date(db, start_date=None, end_date=None, limit=None, newest_first=True):
     """
-    Scan all payment records across all team managers (admin only)
+    List payment records across all team managers by paid date (admin only)
+    
+    Range queries on the payment date index: only payments paid in the
+    requested range are read, and with a limit only the latest (or
+    earliest) ones.
     
     Args:
-        db: DynamoDB table resource
+        db: DatabaseClient instance
         start_date: Optional ISO 8601 date string to filter from
         end_date: Optional ISO 8601 date string to filter to
+        limit: Optional maximum number of payments to return
+        newest_first: If True, sort descending; if False, sort ascending
     
     Returns:
         List of payment records
     """
     try:
-        # Build scan parameters
-        scan_params = {
-            'FilterExpression': 'begins_with(SK, :sk_prefix)',
-            'ExpressionAttributeValues': {
-                ':sk_prefix': 'PAYMENT#'
-            }
-        }
-        
-        # Add date range filter if provided
-        if start_date or end_date:
-            filter_expressions = ['begins_with(SK, :sk_prefix)']
-            
-            if start_date:
-                scan_params['ExpressionAttributeValues'][':start_date'] = start_date
-                filter_expressions.append('paid_at >= :start_date')
-            
-            if end_date:
-                scan_params['ExpressionAttributeValues'][':end_date'] = end_date
-                filter_expressions.append('paid_at <= :end_date')
-            
-            scan_params['FilterExpression'] = ' AND '.join(filter_expressions)
-        
-        # Execute scan with pagination
-        payments = []
-        last_evaluated_key = None
-        
-        while True:
-            if last_evaluated_key:
-                scan_params['ExclusiveStartKey'] = last_evaluated_key
-            
-            response = db.table.scan(**scan_params)
-            payments.extend(response.get('Items', []))
-            
-            last_evaluated_key = response.get('LastEvaluatedKey')
-            if not last_evaluated_key:
-                break
+        payments = db.query_payments_by_date(
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            newest_first=newest_first
+        )
         
-        logger.info(f"Scanned {len(payments)} total payments")
+        logger.info(f"Found {len(payments)} payments by paid date")
         return payments
         
     except Exception as e:
-        logger.error(f"Error scanning payments: {str(e)}", exc_info=True)
+        logger.error(f"Error querying payments by date: {str(e)}", exc_info=True)
         raise
 
 
@@ -0,0 +1,171 @@
+"""
+Race catalogue
+Race definitions (PK=RACE) cached per container with prebuilt filter indexes,
+keyed by a catalogue version that the table stream consumer bumps whenever a
+race is written
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Catalogue version stamp (PK=COUNTER, SK=RACE_CATALOGUE)
+CATALOGUE_VERSION_PK = 'COUNTER'
+CATALOGUE_VERSION_SK = 'RACE_CATALOGUE'
+CATALOGUE_VERSION_ATTRIBUTE = 'version'
+
+# Seconds the cached catalogue is served without any read; after that it is
+# revalidated against the version stamp and only reloaded if it changed
+RACE_CATALOGUE_TTL = int(os.environ.get('RACE_CATALOGUE_TTL', '60'))
+
+# Race attributes with a prebuilt index (also the list_races query parameters)
+INDEXED_ATTRIBUTES = ('event_type', 'boat_type', 'age_category', 'gender_category')
+
+# Catalogue of the container (see get_race_catalogue)
+_catalogue = None
+
+
+class RaceCatalogue:
+    """
+    Race definitions with an index per filterable attribute
+
+    The races matching a filter combination are selected once and kept with
+    their ETag, a hash of the races themselves, so every container gives
+    the same races the same ETag.
+    """
+
+    def __init__(self, races: List[Dict[str, Any]], version: int):
+        """
+        Build the indexes of a list of races
+
+        Args:
+            races: Race items, in sort key order
+            version: Catalogue version the races were read at
+        """
+        self.races = races
+        self.version = version
+        self.checked_at = time.time()
+        self.indexes = {attribute: {} for attribute in INDEXED_ATTRIBUTES}
+        for position, race in enumerate(races):
+            for attribute in INDEXED_ATTRIBUTES:
+                value = race.get(attribute)
+                if value is not None:
+                    self.indexes[attribute].setdefault(value, []).append(position)
+        self._selections = {}
+
+    def select(self, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Races matching every filter
+
+        Args:
+            filters: Attribute to required value, for INDEXED_ATTRIBUTES
+
+        Returns:
+            Matching races, in catalogue order
+        """
+        positions = None
+        for attribute, value in filters.items():
+            matches = self.indexes[attribute].get(value, [])
+            if positions is None:
+                positions = matches
+            else:
+                matching = set(matches)
+                positions = [position for position in positions if position in matching]
+        if positions is None:
+            return list(self.races)
+        return [self.races[position] for position in positions]
+
+    def selection(self, filters: Dict[str, str]) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Cached races and ETag of a filter combination
+
+        Args:
+            filters: Attribute to required value, for INDEXED_ATTRIBUTES
+
+        Returns:
+            (matching races, weak ETag of their data)
+        """
+        key = tuple(sorted(filters.items()))
+        if key not in self._selections:
+            races = self.select(filters)
+            encoded = json.dumps(races, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+            self._selections[key] = (races, 'W/"' + hashlib.sha256(encoded).hexdigest()[:32] + '"')
+        return self._selections[key]
+
+
+def get_catalogue_version(db) -> int:
+    """
+    Current catalogue version
+
+    Args:
+        db: DatabaseClient instance
+
+    Returns:
+        Version stamp (0 before any race change went through the stream)
+    """
+    item = db.get_item(CATALOGUE_VERSION_PK, CATALOGUE_VERSION_SK)
+    return int((item or {}).get(CATALOGUE_VERSION_ATTRIBUTE, 0))
+
+
+def bump_catalogue_version(db) -> None:
+    """
+    Bump the catalogue version after races changed
+
+    Args:
+        db: DatabaseClient instance
+    """
+    db.increment_counters(CATALOGUE_VERSION_PK, CATALOGUE_VERSION_SK, {CATALOGUE_VERSION_ATTRIBUTE: 1})
+
+
+def get_race_catalogue(db) -> RaceCatalogue:
+    """
+    Race catalogue of the container
+
+    Served without any read for RACE_CATALOGUE_TTL seconds, then revalidated
+    with one read of the version stamp and reloaded only if it changed.
+
+    Args:
+        db: DatabaseClient instance
+
+    Returns:
+        RaceCatalogue
+    """
+    global _catalogue
+    now = time.time()
+
+    if _catalogue is not None:
+        if now - _catalogue.checked_at < RACE_CATALOGUE_TTL:
+            return _catalogue
+        try:
+            version = get_catalogue_version(db)
+        except Exception as e:
+            logger.error(f"Failed to get race catalogue version, serving cached catalogue: {e}")
+            return _catalogue
+        if version == _catalogue.version:
+            _catalogue.checked_at = now
+            return _catalogue
+    else:
+        version = get_catalogue_version(db)
+
+    races = db.query_by_pk(pk='RACE', sk_prefix='')
+    _catalogue = RaceCatalogue(races, version)
+    logger.info(f"Loaded race catalogue version {version} ({len(races)} races)")
+    return _catalogue
+
+
+def stream_record_is_race(record: Dict[str, Any]) -> bool:
+    """
+    Whether a stream record is a race change
+
+    Args:
+        record: DynamoDB stream record
+
+    Returns:
+        True for records of PK=RACE items
+    """
+    keys = record.get('dynamodb', {}).get('Keys', {})
+    return keys.get('PK', {}).get('S') == 'RACE'
@@ -0,0 +1,397 @@
+"""
+Registration data snapshot
+Compacted, gzip-compressed copy of the current edition's boats and payments,
+with crew members, profiles and races, in S3,
+fed incrementally from the table stream, for the admin exports' fast mode
+
+Layout in SNAPSHOT_BUCKET:
+- snapshots/registration.json.gz: base snapshot (all items and its watermark)
+- snapshots/changes/<watermark>-<sequence>.json.gz: one change set per stream
+  batch, applied on top of the base until compacted into it
+
+Items are stored in DynamoDB JSON (as in stream images), so types survive the
+round trip.
+"""
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from botocore.exceptions import ClientError
+
+from aws_clients import get_client
+from database import DatabaseClient, get_timestamp, current_edition, is_edition_scoped, EDITION_ATTRIBUTE
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'snapshots/registration.json.gz'
+SNAPSHOT_CHANGES_PREFIX = 'snapshots/changes/'
+
+# Change sets pending before the stream consumer compacts them into the base
+SNAPSHOT_COMPACT_THRESHOLD = int(os.environ.get('SNAPSHOT_COMPACT_THRESHOLD', '50'))
+
+# Loads restarted because a compaction replaced the base before giving up
+SNAPSHOT_LOAD_ATTEMPTS = 3
+
+# Table name of the in-memory copy the exports read in fast mode
+SNAPSHOT_TABLE_NAME = 'registration-snapshot'
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def snapshot_bucket() -> Optional[str]:
+    """
+    Bucket holding the snapshot (None when the snapshot is not configured)
+    """
+    return os.environ.get('SNAPSHOT_BUCKET') or None
+
+
+def is_snapshot_key(pk: str, sk: str) -> bool:
+    """
+    Whether an item belongs to the snapshot
+
+    Args:
+        pk: Partition key value
+        sk: Sort key value
+
+    Returns:
+        True for boats, crew members, payments, user profiles and races
+    """
+    if pk.startswith('TEAM#'):
+        return sk.startswith(('BOAT#', 'CREW#', 'PAYMENT#'))
+    if pk.startswith('USER#'):
+        return sk == 'PROFILE'
+    return pk == 'RACE'
+
+
+def _watermark(epoch_seconds=None) -> str:
+    """
+    Watermark of a stream record's ApproximateCreationDateTime (or of now),
+    always with microseconds so watermarks compare as strings
+    """
+    if epoch_seconds is None:
+        moment = datetime.now(timezone.utc)
+    else:
+        moment = datetime.fromtimestamp(float(epoch_seconds), tz=timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _in_current_edition(images: Dict[str, Any]) -> bool:
+    """Whether a stream record's item belongs to the current edition (or spans editions)"""
+    if not is_edition_scoped(images['Keys']['SK']['S']):
+        return True
+    image = images.get('NewImage') or images.get('OldImage') or {}
+    return image.get(EDITION_ATTRIBUTE, {}).get('S', '') == current_edition()
+
+
+def _write_object(s3, bucket: str, key: str, document: Dict[str, Any], **kwargs):
+    """Write a document as gzip-compressed JSON"""
+    return s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=gzip.compress(json.dumps(document).encode('utf-8')),
+        ContentType='application/json',
+        ContentEncoding='gzip',
+        **kwargs
+    )
+
+
+def _read_object(s3, bucket: str, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Read a gzip-compressed JSON document and its ETag (None, None when missing)"""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return None, None
+        raise
+    return json.loads(gzip.decompress(response['Body'].read())), response.get('ETag')
+
+
+def _object_etag(s3, bucket: str, key: str) -> Optional[str]:
+    """ETag of an object (None when missing)"""
+    try:
+        return s3.head_object(Bucket=bucket, Key=key).get('ETag')
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return None
+        raise
+
+
+def _list_changes(s3, bucket: str) -> List[Tuple[Tuple[str, int], str]]:
+    """List the pending change sets, in the order they must be applied"""
+    changes = []
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=SNAPSHOT_CHANGES_PREFIX):
+        for entry in page.get('Contents', []):
+            name = entry['Key'][len(SNAPSHOT_CHANGES_PREFIX):-len('.json.gz')]
+            watermark, _, sequence = name.rpartition('-')
+            changes.append(((watermark, int(sequence)), entry['Key']))
+    changes.sort()
+    return changes
+
+
+def _apply_changes(items: Dict[str, Any], change_set: Dict[str, Any]) -> None:
+    """Apply a change set to items indexed by 'PK|SK'"""
+    for change in change_set['changes']:
+        key = f"{change['PK']}|{change['SK']}"
+        if change.get('item') is None:
+            items.pop(key, None)
+        else:
+            items[key] = change['item']
+
+
+def write_snapshot_changes(records: List[Dict[str, Any]], s3=None) -> Optional[str]:
+    """
+    Store the snapshot changes of a batch of stream records as one change set
+
+    The object name is derived from the batch (latest record time and first
+    sequence number), so a retried batch overwrites its own change set.
+
+    Args:
+        records: Stream records from a Lambda event (NEW_AND_OLD_IMAGES)
+        s3: Optional S3 client
+
+    Returns:
+        Key of the change set written, or None when nothing changed
+    """
+    bucket = snapshot_bucket()
+    if not bucket:
+        return None
+
+    changes = []
+    watermark = None
+    for record in records:
+        images = record.get('dynamodb', {})
+        keys = images.get('Keys', {})
+        pk = keys.get('PK', {}).get('S', '')
+        sk = keys.get('SK', {}).get('S', '')
+        if not is_snapshot_key(pk, sk) or not _in_current_edition(images):
+            continue
+        changes.append({'PK': pk, 'SK': sk, 'item': images.get('NewImage')})
+        if 'ApproximateCreationDateTime' in images:
+            watermark = max(watermark or '', _watermark(images['ApproximateCreationDateTime']))
+
+    if not changes:
+        return None
+
+    watermark = watermark or _watermark()
+    sequence = records[0].get('dynamodb', {}).get('SequenceNumber', '0')
+    key = f'{SNAPSHOT_CHANGES_PREFIX}{watermark}-{sequence}.json.gz'
+    _write_object(s3 or get_client('s3'), bucket, key, {'watermark': watermark, 'changes': changes})
+
+    logger.info(f"Wrote {len(changes)} snapshot changes to {key}")
+    return key
+
+
+def load_snapshot(s3=None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Load the snapshot items: the base with every pending change set applied
+
+    A compaction can replace the base and delete the change sets it merged
+    between the base read and the listing, which would drop those changes;
+    the base ETag is checked again once the change sets are applied and the
+    load restarts when the base was replaced meanwhile.
+
+    Args:
+        s3: Optional S3 client
+
+    Returns:
+        Tuple of (items in DynamoDB JSON indexed by 'PK|SK', watermark),
+        or (None, None) when no snapshot exists
+
+    Raises:
+        RuntimeError: If the base kept changing for SNAPSHOT_LOAD_ATTEMPTS loads
+    """
+    bucket = snapshot_bucket()
+    if not bucket:
+        return None, None
+    s3 = s3 or get_client('s3')
+
+    for _ in range(SNAPSHOT_LOAD_ATTEMPTS):
+        base, etag = _read_object(s3, bucket, SNAPSHOT_KEY)
+        if base is None:
+            return None, None
+
+        items = base['items']
+        watermark = base['watermark']
+        complete = True
+        for (change_watermark, _), key in _list_changes(s3, bucket):
+            change_set, _ = _read_object(s3, bucket, key)
+            if change_set is None:
+                # Compacted into a newer base since the listing: reload from it
+                complete = False
+                break
+            _apply_changes(items, change_set)
+            watermark = max(watermark, change_watermark)
+
+        if complete and _object_etag(s3, bucket, SNAPSHOT_KEY) == etag:
+            return items, watermark
+        logger.info("Base snapshot replaced while loading, reloading")
+
+    raise RuntimeError(f"Base snapshot replaced during {SNAPSHOT_LOAD_ATTEMPTS} consecutive loads")
+
+
+def compact_snapshot(s3=None, min_changes=1) -> bool:
+    """
+    Merge the pending change sets into the base snapshot
+
+    The base is replaced with a conditional write on its ETag, so when two
+    compactions race only one wins; change sets are deleted only once they
+    are part of the stored base.
+
+    Args:
+        s3: Optional S3 client
+        min_changes: Only compact when at least this many change sets are pending
+
+    Returns:
+        True if the base was replaced
+    """
+    bucket = snapshot_bucket()
+    if not bucket:
+        return False
+    s3 = s3 or get_client('s3')
+
+    changes = _list_changes(s3, bucket)
+    if not changes or len(changes) < min_changes:
+        return False
+
+    base, etag = _read_object(s3, bucket, SNAPSHOT_KEY)
+    if base is None:
+        logger.warning("No base snapshot to compact into, run POST /admin/snapshot/rebuild")
+        return False
+
+    items = base['items']
+    watermark = base['watermark']
+    for (change_watermark, _), key in changes:
+        change_set, _ = _read_object(s3, bucket, key)
+        if change_set is None:
+            logger.info("Change set compacted concurrently, skipping compaction")
+            return False
+        _apply_changes(items, change_set)
+        watermark = max(watermark, change_watermark)
+
+    try:
+        _write_object(
+            s3, bucket, SNAPSHOT_KEY,
+            {'watermark': watermark, 'compacted_at': get_timestamp(), 'items': items},
+            IfMatch=etag
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict'):
+            logger.info("Base snapshot replaced concurrently, skipping compaction")
+            return False
+        raise
+
+    _delete_objects(s3, bucket, [key for _, key in changes])
+    logger.info(f"Compacted {len(changes)} change sets into the snapshot (watermark {watermark})")
+    return True
+
+
+def rebuild_snapshot(db, s3=None) -> Dict[str, Any]:
+    """
+    Rebuild the base snapshot from the table
+
+    Change sets older than the rebuild are dropped; newer ones (written while
+    the table was read) stay pending and are applied on top.
+
+    Args:
+        db: DatabaseClient instance
+        s3: Optional S3 client
+
+    Returns:
+        Dictionary with the watermark and the number of items
+    """
+    bucket = snapshot_bucket()
+    if not bucket:
+        raise ValueError('SNAPSHOT_BUCKET is not configured')
+    s3 = s3 or get_client('s3')
+
+    watermark = _watermark()
+    items = {}
+    sources = [db.iter_entities(entity_type) for entity_type in ('BOAT', 'CREW', 'PAYMENT', 'PROFILE')]
+    sources.append(db.iter_query('RACE'))
+    for source in sources:
+        for item in source:
+            if is_snapshot_key(item['PK'], item['SK']):
+                items[f"{item['PK']}|{item['SK']}"] = {
+                    name: _serializer.serialize(value) for name, value in item.items()
+                }
+
+    _write_object(s3, bucket, SNAPSHOT_KEY, {'watermark': watermark, 'compacted_at': watermark, 'items': items})
+    _delete_objects(s3, bucket, [
+        key for (change_watermark, _), key in _list_changes(s3, bucket) if change_watermark < watermark
+    ])
+
+    logger.info(f"Rebuilt snapshot with {len(items)} items (watermark {watermark})")
+    return {'watermark': watermark, 'item_count': len(items)}
+
+
+def _delete_objects(s3, bucket: str, keys: List[str]) -> None:
+    """Delete objects, 1000 keys per request"""
+    for start in range(0, len(keys), 1000):
+        s3.delete_objects(
+            Bucket=bucket,
+            Delete={'Objects': [{'Key': key} for key in keys[start:start + 1000]], 'Quiet': True}
+        )
+
+
+def snapshot_db_client(s3=None) -> Tuple[Optional[DatabaseClient], Optional[str]]:
+    """
+    Database client reading from the snapshot instead of the table
+
+    The snapshot is loaded into a MemoryDynamoDB table, the same shared
+    module the tests run on, so the exports run their usual queries (entity
+    and race indexes included) against it.
+
+    Args:
+        s3: Optional S3 client
+
+    Returns:
+        Tuple of (DatabaseClient, watermark), or (None, None) when no snapshot exists
+    """
+    from memory_table import MemoryDynamoDB
+
+    items, watermark = load_snapshot(s3)
+    if items is None:
+        return None, None
+
+    dynamodb = MemoryDynamoDB()
+    table = dynamodb.Table(SNAPSHOT_TABLE_NAME)
+    for item in items.values():
+        table.put_item(Item={name: _deserializer.deserialize(value) for name, value in item.items()})
+
+    return DatabaseClient(table_name=SNAPSHOT_TABLE_NAME, dynamodb=dynamodb), watermark
+
+
+def get_export_db_client(event) -> Tuple[DatabaseClient, Optional[str]]:
+    """
+    Database client of an export request
+
+    Exports read the live table unless called with ?mode=fast, which accepts
+    data as of the snapshot watermark. Fast mode falls back to the table when
+    no snapshot is available.
+
+    Args:
+        event: API Gateway event
+
+    Returns:
+        Tuple of (DatabaseClient, snapshot watermark or None for live data)
+    """
+    from database import get_db_client
+
+    query_params = event.get('queryStringParameters') or {}
+    if query_params.get('mode') == 'fast':
+        try:
+            db, watermark = snapshot_db_client()
+            if db is not None:
+                logger.info(f"Exporting from snapshot (watermark {watermark})")
+                return db, watermark
+            logger.warning("No snapshot available, exporting live data")
+        except Exception as e:
+            logger.warning(f"Failed to load snapshot, exporting live data: {str(e)}")
+
+    return get_db_client(), None
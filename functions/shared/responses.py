@@ -6,6 +6,7 @@ import json
 import logging
 from datetime import datetime
 from decimal import Decimal
+from database import ServiceOverloadedError, log_invocation_usage
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -63,6 +64,64 @@ def success_response(data, status_code=200, message=None):
     return response
 
 
+def not_modified_response(headers=None):
+    """
+    Create a 304 Not Modified response (for a matching If-None-Match)
+    
+    Args:
+        headers: Optional validator/caching headers to repeat (ETag, Cache-Control)
+        
+    Returns:
+        dict: API Gateway response
+    """
+    return {
+        'statusCode': 304,
+        'headers': {
+            'Access-Control-Allow-Origin': '*',  # CORS
+            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+            'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+            **(headers or {})
+        },
+        'body': ''
+    }
+
+
+def get_header(event, name):
+    """
+    Extract a request header from API Gateway event (case-insensitive)
+    
+    Args:
+        event: API Gateway event
+        name: Header name
+        
+    Returns:
+        str: Header value or None
+    """
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Whether an If-None-Match header matches an ETag (weak comparison)
+    
+    Args:
+        if_none_match: Header value (None if absent)
+        etag: Current ETag (strong or weak)
+        
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    opaque = [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+    return '*' in tags or (etag[2:] if etag.startswith('W/') else etag) in opaque
+
+
 def error_response(status_code, error_code, message, details=None):
     """
     Create an error API response
@@ -235,21 +294,26 @@ def bad_request_error(message, details=None):
     )
 
 
-def service_unavailable_error(message='Service temporarily unavailable'):
+def service_unavailable_error(message='Service temporarily unavailable', retry_after=None):
     """
     Create a service unavailable error response
     
     Args:
         message: Error message
+        retry_after: Optional number of seconds the client should wait
+            before retrying (sent as the Retry-After header)
         
     Returns:
         dict: API Gateway response
     """
-    return error_response(
+    response = error_response(
         status_code=503,
         error_code='SERVICE_UNAVAILABLE',
         message=message
     )
+    if retry_after is not None:
+        response['headers']['Retry-After'] = str(retry_after)
+    return response
 
 
 # Response decorators
@@ -271,9 +335,19 @@ def handle_exceptions(func):
         except KeyError as e:
             logger.error(f"KeyError: {str(e)}")
             return bad_request_error(f"Missing required field: {str(e)}")
+        except ServiceOverloadedError as e:
+            # Shed the request rather than queueing more retries behind throttling
+            logger.warning(f"Service overloaded: {str(e)}")
+            return service_unavailable_error(
+                'Service is busy, please retry shortly',
+                retry_after=e.retry_after
+            )
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}", exc_info=True)
             return internal_error()
+        finally:
+            # One DynamoDB usage line per invocation
+            log_invocation_usage()
     
     return wrapper
 
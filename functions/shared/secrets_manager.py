@@ -5,8 +5,8 @@ Retrieves secrets from S3 bucket with caching
 import json
 import logging
 import os
-import boto3
 from typing import Optional
+from aws_clients import get_client
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -22,7 +22,7 @@ def _get_s3_client():
     """Get or create the S3 client (lazy initialization)"""
     global _s3_client
     if _s3_client is None:
-        _s3_client = boto3.client('s3')
+        _s3_client = get_client('s3')
     return _s3_client
 
 
@@ -0,0 +1,62 @@
+"""
+Team activity counters
+Boat and crew counts kept on user profiles (PK=USER#<id>, SK=PROFILE), so team
+managers can be listed from the profiles alone
+"""
+import logging
+
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr
+
+from database import is_conditional_check_failure
+
+logger = logging.getLogger(__name__)
+
+BOAT_COUNT = 'boat_count'
+CREW_COUNT = 'crew_count'
+
+# Profile counter of each team item type, by sort key prefix
+ACTIVITY_COUNTERS = {
+    'BOAT#': BOAT_COUNT,
+    'CREW#': CREW_COUNT
+}
+
+
+def record_team_activity(db, team_manager_id: str, counter: str, amount: int) -> None:
+    """
+    Add to a profile activity counter after a boat or crew member is created or deleted
+
+    On delete, only call it when the delete removed an item (its response
+    has 'Attributes'), so a retried or concurrent delete is not counted
+    twice. Only existing profiles are updated. The boat or crew write has already
+    succeeded, so a failure is logged rather than raised; the
+    add_profile_activity_counts migration recomputes the counters.
+
+    Args:
+        db: DatabaseClient instance
+        team_manager_id: Owner of the boat or crew member
+        counter: BOAT_COUNT or CREW_COUNT
+        amount: 1 on create, -1 on delete
+    """
+    try:
+        db.increment_counters(
+            f'USER#{team_manager_id}',
+            'PROFILE',
+            {counter: amount},
+            condition_expression=Attr('PK').exists()
+        )
+    except ClientError as e:
+        if is_conditional_check_failure(e):
+            logger.info(f"No profile for team manager {team_manager_id}, {counter} not recorded")
+        else:
+            logger.error(f"Failed to update {counter} of team manager {team_manager_id}: {e}")
+
+
+def team_manager_filter():
+    """
+    Filter keeping the profiles of users with at least one boat or crew member
+
+    Returns:
+        Filter expression on the profile activity counters
+    """
+    return Attr(BOAT_COUNT).gt(0) | Attr(CREW_COUNT).gt(0)
@@ -0,0 +1,244 @@
+"""
+Team financial summary
+Per-team SUMMARY item (PK=TEAM#<id>, SK=SUMMARY) holding payment and boat figures,
+refreshed from the table stream and served to the payment summary and race export
+"""
+import logging
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr
+
+from database import get_timestamp, is_conditional_check_failure, in_current_edition
+from payment_calculations import (
+    calculate_total_paid,
+    calculate_outstanding_balance,
+    count_boats_in_payments
+)
+
+logger = logging.getLogger(__name__)
+
+TEAM_SUMMARY_SK = 'SUMMARY'
+
+# Sort key prefixes of the team items the summary is computed from
+TEAM_SUMMARY_SOURCES = ('BOAT#', 'CREW#', 'PAYMENT#')
+
+# Pricing version stored when no pricing configuration has been saved yet
+DEFAULT_PRICING_VERSION = 'default'
+
+
+def team_summary_key(team_manager_id: str):
+    """
+    Key of a team's summary item
+
+    Args:
+        team_manager_id: Team manager ID
+
+    Returns:
+        Tuple of (pk, sk)
+    """
+    return f'TEAM#{team_manager_id}', TEAM_SUMMARY_SK
+
+
+def pricing_version(pricing_config: Optional[Dict[str, Any]]) -> str:
+    """
+    Version of the pricing configuration a summary was computed with
+
+    Args:
+        pricing_config: Pricing configuration
+
+    Returns:
+        The configuration's updated_at, or DEFAULT_PRICING_VERSION
+    """
+    return (pricing_config or {}).get('updated_at') or DEFAULT_PRICING_VERSION
+
+
+def team_payment_status(total_paid, outstanding_balance) -> str:
+    """
+    Payment status label of a team
+
+    Args:
+        total_paid: Total amount paid
+        outstanding_balance: Amount still due
+
+    Returns:
+        'Paid in Full', 'Partial Payment' or 'No Payment'
+    """
+    if outstanding_balance == 0 and total_paid > 0:
+        return 'Paid in Full'
+    if total_paid > 0 and outstanding_balance > 0:
+        return 'Partial Payment'
+    return 'No Payment'
+
+
+def compute_team_summary(team_manager_id: str, items: List[Dict[str, Any]],
+                         pricing_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute a team's summary item from the items of its partition
+
+    Outstanding boats are the boats with status 'complete', priced like
+    the payment summary always did (locked pricing, otherwise current
+    pricing from the crew and the pricing configuration).
+
+    Args:
+        team_manager_id: Team manager ID
+        items: Items of the TEAM#<id> partition
+        pricing_config: Pricing configuration
+
+    Returns:
+        Summary item
+    """
+    boats = [item for item in items if item['SK'].startswith('BOAT#')]
+    crew_members = [item for item in items if item['SK'].startswith('CREW#')]
+    payments = [item for item in items if item['SK'].startswith('PAYMENT#')]
+
+    boats_by_status = {}
+    for boat in boats:
+        status = boat.get('registration_status') or 'incomplete'
+        boats_by_status[status] = boats_by_status.get(status, 0) + 1
+
+    outstanding_boats = []
+    for boat in boats:
+        if boat.get('registration_status') != 'complete':
+            continue
+        amount = calculate_outstanding_balance(
+            boats=[boat],
+            pricing_config=pricing_config,
+            all_crew_members=crew_members
+        )
+        outstanding_boats.append({
+            'boat_registration_id': boat.get('boat_registration_id'),
+            'boat_number': boat.get('boat_number'),
+            'event_type': boat.get('event_type'),
+            'boat_type': boat.get('boat_type'),
+            'amount': Decimal(str(amount))
+        })
+
+    total_paid = calculate_total_paid(payments)
+    outstanding_balance = sum((boat['amount'] for boat in outstanding_boats), Decimal('0'))
+
+    pk, sk = team_summary_key(team_manager_id)
+    return {
+        'PK': pk,
+        'SK': sk,
+        'team_manager_id': team_manager_id,
+        'total_paid': total_paid,
+        'payment_count': len(payments),
+        'boats_paid_count': count_boats_in_payments(payments),
+        'outstanding_balance': outstanding_balance,
+        'outstanding_boats': outstanding_boats,
+        'boats_by_status': boats_by_status,
+        'total_registered_boats': len(boats),
+        'payment_status': team_payment_status(total_paid, outstanding_balance),
+        'pricing_version': pricing_version(pricing_config)
+    }
+
+
+def refresh_team_summary(db, team_manager_id: str,
+                         pricing_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Recompute a team's summary from its partition and store it
+
+    The partition is read with one strongly consistent query, keeping the
+    items of the current edition (a team manager's partition holds every
+    year they registered). The write is
+    conditional on computed_at, so a refresh started earlier never
+    overwrites a newer summary; in that case the newer summary is returned.
+
+    Args:
+        db: DatabaseClient instance
+        team_manager_id: Team manager ID
+        pricing_config: Pricing configuration
+
+    Returns:
+        Stored summary item
+    """
+    computed_at = get_timestamp()
+    items = [
+        item for item in db.iter_query(f'TEAM#{team_manager_id}', consistent_read=True)
+        if item['SK'].startswith(TEAM_SUMMARY_SOURCES) and in_current_edition(item)
+    ]
+
+    summary = compute_team_summary(team_manager_id, items, pricing_config)
+    summary['computed_at'] = computed_at
+    summary['updated_at'] = get_timestamp()
+
+    try:
+        db.put_item(
+            summary,
+            condition_expression=Attr('computed_at').not_exists() | Attr('computed_at').lte(computed_at)
+        )
+    except ClientError as e:
+        if not is_conditional_check_failure(e):
+            raise
+        logger.info(f"Newer summary already stored for team manager {team_manager_id}")
+        return db.get_item(summary['PK'], summary['SK'])
+
+    return summary
+
+
+def get_team_summary(db, team_manager_id: str,
+                     pricing_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Get a team's summary, refreshing it when missing or priced with an older configuration
+
+    Args:
+        db: DatabaseClient instance
+        team_manager_id: Team manager ID
+        pricing_config: Current pricing configuration
+
+    Returns:
+        Summary item
+    """
+    summary = db.get_item(*team_summary_key(team_manager_id))
+    if summary and summary.get('pricing_version') == pricing_version(pricing_config):
+        return summary
+    return refresh_team_summary(db, team_manager_id, pricing_config)
+
+
+def get_team_summaries(db, team_manager_ids: List[str],
+                       pricing_config: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the summaries of several teams with one batch read
+
+    Missing or stale summaries are refreshed like in get_team_summary.
+
+    Args:
+        db: DatabaseClient instance
+        team_manager_ids: Team manager IDs
+        pricing_config: Current pricing configuration
+
+    Returns:
+        Dictionary of team manager ID to summary item
+    """
+    version = pricing_version(pricing_config)
+    summaries = {
+        summary['team_manager_id']: summary
+        for summary in db.batch_get_items([team_summary_key(tm_id) for tm_id in team_manager_ids])
+        if summary.get('pricing_version') == version
+    }
+
+    for team_manager_id in team_manager_ids:
+        if team_manager_id not in summaries:
+            summaries[team_manager_id] = refresh_team_summary(db, team_manager_id, pricing_config)
+
+    return summaries
+
+
+def stream_record_team(record: Dict[str, Any]) -> Optional[str]:
+    """
+    Team whose summary a DynamoDB stream record affects
+
+    Args:
+        record: Stream record from a Lambda event
+
+    Returns:
+        Team manager ID, or None when the record is not a source of a summary
+    """
+    keys = record.get('dynamodb', {}).get('Keys', {})
+    pk = keys.get('PK', {}).get('S', '')
+    sk = keys.get('SK', {}).get('S', '')
+    if pk.startswith('TEAM#') and sk.startswith(TEAM_SUMMARY_SOURCES):
+        return pk[len('TEAM#'):]
+    return None
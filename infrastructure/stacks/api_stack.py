@@ -8,6 +8,7 @@ from aws_cdk import (
     RemovalPolicy,
     aws_apigateway as apigateway,
     aws_lambda as lambda_,
+    aws_lambda_event_sources as event_sources,
     aws_iam as iam,
 )
 from constructs import Construct
@@ -67,6 +68,25 @@ class ApiStack(Stack):
             'USER_POOL_CLIENT_ID': auth_stack.user_pool_client.user_pool_client_id,
             'ENVIRONMENT': self.env_name,
             'SECRETS_BUCKET': database_stack.secrets_bucket.bucket_name,
+            # Competition year registrations belong to (see database.current_edition)
+            'EDITION': self.node.try_get_context('edition') or '',
+            # Registration snapshot read by the exports' fast mode (under snapshots/)
+            'SNAPSHOT_BUCKET': database_stack.secrets_bucket.bucket_name,
+            # Parallel scan segments for full-table admin listings and exports
+            'SCAN_SEGMENTS': '4',
+            # Retries one invocation may spend on throttled DynamoDB calls before shedding with 503
+            'DYNAMODB_RETRY_BUDGET': '10',
+            # Days before DynamoDB TTL deletes audit entries and ended temporary access grants
+            'AUDIT_LOG_RETENTION_DAYS': '365',
+            'TEMP_ACCESS_RETENTION_DAYS': '30',
+            # Seconds the configuration bundle is served before checking the config version
+            'CONFIG_BUNDLE_TTL': '30',
+            # Seconds list_races serves its cached races before checking the catalogue version
+            'RACE_CATALOGUE_TTL': '60',
+            # Seconds list_clubs serves its cached club directory before checking the S3 object
+            'CLUB_DIRECTORY_TTL': '300',
+            # Maximum number of clubs returned by a list_clubs search (?q=)
+            'CLUB_SEARCH_LIMIT': '20',
         }
         
         # Lambda functions dictionary
@@ -171,6 +191,25 @@ class ApiStack(Stack):
         
         return function
     
+    def _grant_snapshot_access(self, function, actions):
+        """Grant a function access to the registration snapshot objects"""
+        function.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=actions,
+                resources=[
+                    f'{self.database_stack.secrets_bucket.bucket_arn}/snapshots/*'
+                ]
+            )
+        )
+        # Listing pending change sets
+        function.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=['s3:ListBucket'],
+                resources=[self.database_stack.secrets_bucket.bucket_arn],
+                conditions={'StringLike': {'s3:prefix': ['snapshots/*']}}
+            )
+        )
+    
     def _create_auth_functions(self):
         """Create authentication Lambda functions"""
         
@@ -256,6 +295,8 @@ class ApiStack(Stack):
             'club/list_clubs',
             'List all rowing clubs'
         )
+        # Reads the prebuilt club directory (snapshots/clubs.json.gz)
+        self._grant_snapshot_access(self.lambda_functions['list_clubs'], ['s3:GetObject'])
     
     def _create_boat_functions(self):
         """Create boat registration Lambda functions"""
@@ -435,6 +476,46 @@ class ApiStack(Stack):
             'Get admin dashboard statistics'
         )
         
+        self.lambda_functions['rebuild_stats'] = self._create_lambda_function(
+            'RebuildStatsFunction',
+            'admin/rebuild_stats',
+            'Admin rebuild dashboard statistics from the table',
+            timeout=60
+        )
+        
+        # Table stream consumer maintaining the dashboard statistics and the
+        # per-team summaries (not exposed through the API)
+        self.lambda_functions['process_table_stream'] = self._create_lambda_function(
+            'ProcessTableStreamFunction',
+            'admin/process_table_stream',
+            'Maintain dashboard statistics, team summaries, the registration snapshot and the club directory from the table stream',
+            timeout=60
+        )
+        self._grant_snapshot_access(
+            self.lambda_functions['process_table_stream'],
+            ['s3:GetObject', 's3:PutObject', 's3:DeleteObject']
+        )
+        self.lambda_functions['process_table_stream'].add_event_source(
+            event_sources.DynamoEventSource(
+                self.database_stack.table,
+                starting_position=lambda_.StartingPosition.LATEST,
+                batch_size=100,
+                max_batching_window=Duration.seconds(5),
+                retry_attempts=10,
+                # Only crew members, boats, payments, profiles, races, clubs and
+                # legacy rental boats feed the derived items
+                filters=[
+                    lambda_.FilterCriteria.filter({'dynamodb': {'Keys': {'SK': {'S': lambda_.FilterRule.begins_with('CREW#')}}}}),
+                    lambda_.FilterCriteria.filter({'dynamodb': {'Keys': {'SK': {'S': lambda_.FilterRule.begins_with('BOAT#')}}}}),
+                    lambda_.FilterCriteria.filter({'dynamodb': {'Keys': {'SK': {'S': lambda_.FilterRule.begins_with('PAYMENT#')}}}}),
+                    lambda_.FilterCriteria.filter({'dynamodb': {'Keys': {'SK': {'S': lambda_.FilterRule.is_equal('PROFILE')}}}}),
+                    lambda_.FilterCriteria.filter({'dynamodb': {'Keys': {'PK': {'S': lambda_.FilterRule.is_equal('RACE')}}}}),
+                    lambda_.FilterCriteria.filter({'dynamodb': {'Keys': {'PK': {'S': lambda_.FilterRule.is_equal('CLUB')}}}}),
+                    lambda_.FilterCriteria.filter({'dynamodb': {'Keys': {'PK': {'S': lambda_.FilterRule.begins_with('RENTAL_BOAT#')}}}}),
+                ]
+            )
+        )
+        
         # Admin crew member management functions (bypass date restrictions)
         self.lambda_functions['admin_list_all_crew_members'] = self._create_lambda_function(
             'AdminListAllCrewMembersFunction',
@@ -492,6 +573,13 @@ class ApiStack(Stack):
             'Admin delete boat registration for any team manager'
         )
         
+        self.lambda_functions['rebuild_boat_number_counters'] = self._create_lambda_function(
+            'RebuildBoatNumberCountersFunction',
+            'admin/rebuild_boat_number_counters',
+            'Admin rebuild per-race boat number counters from existing boat numbers',
+            timeout=60
+        )
+        
         # List team managers function (for admin impersonation)
         self.lambda_functions['list_team_managers'] = self._create_lambda_function(
             'ListTeamManagersFunction',
@@ -521,6 +609,21 @@ class ApiStack(Stack):
             timeout=60
         )
         
+        # Exports read the registration snapshot in fast mode (?mode=fast)
+        for export_function in ('export_crew_members_json', 'export_boat_registrations_json', 'export_races_json'):
+            self._grant_snapshot_access(self.lambda_functions[export_function], ['s3:GetObject'])
+        
+        self.lambda_functions['rebuild_snapshot'] = self._create_lambda_function(
+            'RebuildSnapshotFunction',
+            'admin/rebuild_snapshot',
+            'Admin rebuild the registration snapshot from the table',
+            timeout=60
+        )
+        self._grant_snapshot_access(
+            self.lambda_functions['rebuild_snapshot'],
+            ['s3:GetObject', 's3:PutObject', 's3:DeleteObject']
+        )
+        
         # Permission configuration functions
         self.lambda_functions['get_permission_config'] = self._create_lambda_function(
             'GetPermissionConfigFunction',
@@ -1120,6 +1223,33 @@ class ApiStack(Stack):
             authorization_type=apigateway.AuthorizationType.COGNITO
         )
         
+        # POST /admin/stats/rebuild - Recompute dashboard statistics (admin only)
+        rebuild_stats_resource = stats_resource.add_resource('rebuild')
+        rebuild_stats_integration = apigateway.LambdaIntegration(
+            self.lambda_functions['rebuild_stats'],
+            proxy=True
+        )
+        rebuild_stats_resource.add_method(
+            'POST',
+            rebuild_stats_integration,
+            authorizer=self.authorizer,
+            authorization_type=apigateway.AuthorizationType.COGNITO
+        )
+        
+        # POST /admin/snapshot/rebuild - Rebuild the registration snapshot (admin only)
+        snapshot_resource = admin_resource.add_resource('snapshot')
+        rebuild_snapshot_resource = snapshot_resource.add_resource('rebuild')
+        rebuild_snapshot_integration = apigateway.LambdaIntegration(
+            self.lambda_functions['rebuild_snapshot'],
+            proxy=True
+        )
+        rebuild_snapshot_resource.add_method(
+            'POST',
+            rebuild_snapshot_integration,
+            authorizer=self.authorizer,
+            authorization_type=apigateway.AuthorizationType.COGNITO
+        )
+        
         # GET /admin/team-managers - List all team managers (admin only, for impersonation)
         team_managers_resource = admin_resource.add_resource('team-managers')
         list_team_managers_integration = apigateway.LambdaIntegration(
@@ -1463,6 +1593,20 @@ class ApiStack(Stack):
             authorization_type=apigateway.AuthorizationType.COGNITO
         )
         
+        # POST /admin/boat-number-counters/rebuild - Rebuild boat number counters (admin only)
+        boat_number_counters_resource = admin_resource.add_resource('boat-number-counters')
+        rebuild_boat_number_counters_resource = boat_number_counters_resource.add_resource('rebuild')
+        rebuild_boat_number_counters_integration = apigateway.LambdaIntegration(
+            self.lambda_functions['rebuild_boat_number_counters'],
+            proxy=True
+        )
+        rebuild_boat_number_counters_resource.add_method(
+            'POST',
+            rebuild_boat_number_counters_integration,
+            authorizer=self.authorizer,
+            authorization_type=apigateway.AuthorizationType.COGNITO
+        )
+        
         # POST /admin/html-proxy - Generic HTML proxy for CORS bypass (admin only)
         html_proxy_resource = admin_resource.add_resource('html-proxy')
         html_proxy_integration = apigateway.LambdaIntegration(
@@ -38,6 +38,14 @@ class DatabaseStack(Stack):
             else RemovalPolicy.RETAIN
         )
         
+        # Indexes added after the first release. DynamoDB creates one global
+        # secondary index per table update, so an existing table gets them one
+        # deploy at a time with the indexes context (e.g. --context
+        # indexes=GSI4,GSI5, see scripts/database/MIGRATIONS.md); new tables
+        # are created with all of them
+        indexes_context = self.node.try_get_context("indexes")
+        added_indexes = indexes_context.split(",") if indexes_context else ["GSI4", "GSI5", "GSI6"]
+        
         # Create DynamoDB table with single-table design
         self.table = dynamodb.Table(
             self,
@@ -56,6 +64,9 @@ class DatabaseStack(Stack):
             point_in_time_recovery=env_config.get("enable_point_in_time_recovery", False),
             removal_policy=removal_policy,
             stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
+            # Epoch seconds after which temporary access grants and audit
+            # entries are deleted (see access_control.TTL_ATTRIBUTE)
+            time_to_live_attribute="ttl",
         )
         
         # GSI1: Registration Status Index
@@ -103,6 +114,61 @@ class DatabaseStack(Stack):
             projection_type=dynamodb.ProjectionType.KEYS_ONLY,
         )
         
+        # GSI4: Race Index
+        # Used to list the boats of a race (boat number generation, per-race exports)
+        # without scanning the table. Sparse: only boats with a race carry GSI4PK
+        # (race_id) and GSI4SK (created_at)
+        if "GSI4" in added_indexes:
+            self.table.add_global_secondary_index(
+                index_name="GSI4",
+                partition_key=dynamodb.Attribute(
+                    name="GSI4PK",
+                    type=dynamodb.AttributeType.STRING
+                ),
+                sort_key=dynamodb.Attribute(
+                    name="GSI4SK",
+                    type=dynamodb.AttributeType.STRING
+                ),
+                projection_type=dynamodb.ProjectionType.ALL,
+            )
+        
+        # GSI5: Entity Index
+        # Used by admin listings, exports and stats to read one entity type
+        # (boats, crew members, payments, profiles) without scanning config,
+        # races, clubs and audit logs. Sparse: GSI5PK (entity type) and GSI5SK
+        # (owning PK) are written by the shared write helpers
+        if "GSI5" in added_indexes:
+            self.table.add_global_secondary_index(
+                index_name="GSI5",
+                partition_key=dynamodb.Attribute(
+                    name="GSI5PK",
+                    type=dynamodb.AttributeType.STRING
+                ),
+                sort_key=dynamodb.Attribute(
+                    name="GSI5SK",
+                    type=dynamodb.AttributeType.STRING
+                ),
+                projection_type=dynamodb.ProjectionType.ALL,
+            )
+        
+        # GSI6: Payment Date Index
+        # Used by admin payment listing and analytics for paid-date range
+        # queries. Write-sharded: GSI6PK is PAYMENT_DATE#<n> (n derived from
+        # the payment ID), GSI6SK is paid_at#payment_id
+        if "GSI6" in added_indexes:
+            self.table.add_global_secondary_index(
+                index_name="GSI6",
+                partition_key=dynamodb.Attribute(
+                    name="GSI6PK",
+                    type=dynamodb.AttributeType.STRING
+                ),
+                sort_key=dynamodb.Attribute(
+                    name="GSI6SK",
+                    type=dynamodb.AttributeType.STRING
+                ),
+                projection_type=dynamodb.ProjectionType.ALL,
+            )
+        
         # S3 bucket for application secrets (replaces Secrets Manager)
         self.secrets_bucket = s3.Bucket(
             self,
@@ -0,0 +1,96 @@
+"""
+Migration: Add entity index keys to existing items
+
+Admin listings, exports and stats read boats, crew members, payments and
+profiles from the GSI5 entity index. The shared write helpers add its key
+attributes to new items; this migration backfills them on existing items:
+- GSI5PK: entity type (BOAT, CREW, PAYMENT or PROFILE), suffixed with the
+  edition for boats and payments
+- GSI5SK: partition key of the item (owning team manager or user)
+- edition: on boats and payments, when EDITION is set (see
+  backfill_edition: items without one get EDITION, or the year they were
+  created in with EDITION_FROM_CREATION_YEAR=true)
+
+Run with: make db-migrate MIGRATION=add_entity_index_keys ENV=dev
+Run with: make db-migrate MIGRATION=add_entity_index_keys ENV=prod
+"""
+
+import boto3
+import os
+import sys
+
+# Add shared directory to path for the entity type mapping
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'functions', 'shared'))
+from database import entity_index_keys, backfill_edition, is_edition_scoped, EDITION_ATTRIBUTE
+
+dynamodb = boto3.resource('dynamodb')
+
+
+def migrate(table_name, team_manager_id=None):
+    """
+    Set GSI5PK/GSI5SK on every boat, crew member, payment and profile
+
+    Args:
+        table_name: DynamoDB table name
+        team_manager_id: User ID running the migration (optional)
+    """
+    table = dynamodb.Table(table_name)
+
+    print(f"Adding entity index keys in table: {table_name}")
+    if team_manager_id:
+        print(f"Executed by: {team_manager_id}")
+
+    updated = {}
+    unchanged = 0
+
+    try:
+        scan_kwargs = {
+            'ProjectionExpression': 'PK, SK, created_at, edition, GSI5PK, GSI5SK'
+        }
+        while True:
+            response = table.scan(**scan_kwargs)
+
+            for item in response.get('Items', []):
+                edition = backfill_edition(item)
+                keys = entity_index_keys(item['PK'], item['SK'], edition)
+                if keys and edition and is_edition_scoped(item['SK']):
+                    # Boats and payments belong to an edition
+                    keys[EDITION_ATTRIBUTE] = edition
+                if not keys or all(item.get(name) == value for name, value in keys.items()):
+                    unchanged += 1
+                    continue
+
+                table.update_item(
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression='SET ' + ', '.join(f'#{name} = :{name}' for name in keys),
+                    ExpressionAttributeNames={f'#{name}': name for name in keys},
+                    ExpressionAttributeValues={f':{name}': value for name, value in keys.items()}
+                )
+                updated[keys['GSI5PK']] = updated.get(keys['GSI5PK'], 0) + 1
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print("\n✓ Entity index keys added successfully")
+        for entity_type, count in sorted(updated.items()):
+            print(f"  - {entity_type}: {count} items indexed")
+        print(f"  - Items unchanged or not indexed: {unchanged}")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error adding entity index keys: {str(e)}")
+        raise
+
+
+if __name__ == '__main__':
+    # Support running directly with TABLE_NAME environment variable
+    table_name = os.environ.get('TABLE_NAME')
+    team_manager_id = os.environ.get('TEAM_MANAGER_ID')
+
+    if not table_name:
+        print("ERROR: TABLE_NAME environment variable not set")
+        print("Usage: TABLE_NAME=your-table-name python add_entity_index_keys.py")
+        exit(1)
+
+    migrate(table_name, team_manager_id)
@@ -0,0 +1,98 @@
+"""
+Migration: Add payment date index keys to existing payments
+
+Admin payment listing and analytics query payments by paid date on the GSI6
+payment date index. The shared write helpers add its key attributes to new
+payments; this migration backfills them on existing payments:
+- GSI6PK: PAYMENT_DATE#<shard>, the shard derived from the payment ID,
+  suffixed with the payment's edition
+- GSI6SK: paid_at#payment_id
+
+Re-run it after changing PAYMENT_DATE_SHARDS.
+
+Run with: make db-migrate MIGRATION=add_payment_date_index_keys ENV=dev
+Run with: make db-migrate MIGRATION=add_payment_date_index_keys ENV=prod
+"""
+
+import boto3
+import os
+import sys
+
+# Add shared directory to path for the index key layout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'functions', 'shared'))
+from database import payment_date_index_keys, backfill_edition
+
+dynamodb = boto3.resource('dynamodb')
+
+
+def migrate(table_name, team_manager_id=None):
+    """
+    Set GSI6PK/GSI6SK on every payment with a paid date
+
+    Args:
+        table_name: DynamoDB table name
+        team_manager_id: User ID running the migration (optional)
+    """
+    table = dynamodb.Table(table_name)
+
+    print(f"Adding payment date index keys in table: {table_name}")
+    if team_manager_id:
+        print(f"Executed by: {team_manager_id}")
+
+    updated = 0
+    unchanged = 0
+    skipped = 0
+
+    try:
+        scan_kwargs = {
+            'FilterExpression': 'begins_with(SK, :payment)',
+            'ExpressionAttributeValues': {':payment': 'PAYMENT#'},
+            'ProjectionExpression': 'PK, SK, payment_id, paid_at, created_at, edition, GSI6PK, GSI6SK'
+        }
+        while True:
+            response = table.scan(**scan_kwargs)
+
+            for item in response.get('Items', []):
+                payment_id = item.get('payment_id') or item['SK'][len('PAYMENT#'):]
+                keys = payment_date_index_keys(payment_id, item.get('paid_at'), backfill_edition(item))
+                if not keys:
+                    print(f"  ⚠ {item['PK']} / {item['SK']} has no paid_at, skipped")
+                    skipped += 1
+                    continue
+                if all(item.get(name) == value for name, value in keys.items()):
+                    unchanged += 1
+                    continue
+
+                table.update_item(
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression='SET GSI6PK = :shard, GSI6SK = :paid',
+                    ExpressionAttributeValues={':shard': keys['GSI6PK'], ':paid': keys['GSI6SK']}
+                )
+                updated += 1
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print("\n✓ Payment date index keys added successfully")
+        print(f"  - Payments indexed: {updated}")
+        print(f"  - Payments unchanged: {unchanged}")
+        print(f"  - Payments without paid_at: {skipped}")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error adding payment date index keys: {str(e)}")
+        raise
+
+
+if __name__ == '__main__':
+    # Support running directly with TABLE_NAME environment variable
+    table_name = os.environ.get('TABLE_NAME')
+    team_manager_id = os.environ.get('TEAM_MANAGER_ID')
+
+    if not table_name:
+        print("ERROR: TABLE_NAME environment variable not set")
+        print("Usage: TABLE_NAME=your-table-name python add_payment_date_index_keys.py")
+        exit(1)
+
+    migrate(table_name, team_manager_id)
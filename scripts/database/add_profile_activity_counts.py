@@ -0,0 +1,113 @@
+"""
+Migration: Add boat and crew activity counters to user profiles
+
+The admin team manager list reads users with boats or crew members from
+their profiles alone. Boat and crew create/delete handlers keep two
+counters on USER#<id>/PROFILE up to date; this migration sets them on
+existing profiles from the current data:
+- boat_count: number of TEAM#<id>/BOAT# items
+- crew_count: number of TEAM#<id>/CREW# items
+
+Also safe to re-run to correct counters that drifted.
+
+Run with: make db-migrate MIGRATION=add_profile_activity_counts ENV=dev
+Run with: make db-migrate MIGRATION=add_profile_activity_counts ENV=prod
+"""
+
+import boto3
+import os
+import sys
+
+from botocore.exceptions import ClientError
+
+# Add shared directory to path for the counter names
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'functions', 'shared'))
+from team_activity import ACTIVITY_COUNTERS, BOAT_COUNT, CREW_COUNT
+
+dynamodb = boto3.resource('dynamodb')
+
+
+def migrate(table_name, team_manager_id=None):
+    """
+    Set boat_count/crew_count on every user profile
+
+    Args:
+        table_name: DynamoDB table name
+        team_manager_id: User ID running the migration (optional)
+    """
+    table = dynamodb.Table(table_name)
+
+    print(f"Adding profile activity counters in table: {table_name}")
+    if team_manager_id:
+        print(f"Executed by: {team_manager_id}")
+
+    counts = {}
+    profiles = []
+
+    try:
+        scan_kwargs = {'ProjectionExpression': 'PK, SK, boat_count, crew_count'}
+        while True:
+            response = table.scan(**scan_kwargs)
+
+            for item in response.get('Items', []):
+                if item['PK'].startswith('USER#') and item['SK'] == 'PROFILE':
+                    profiles.append(item)
+                    continue
+                if not item['PK'].startswith('TEAM#'):
+                    continue
+                for prefix, counter in ACTIVITY_COUNTERS.items():
+                    if item['SK'].startswith(prefix):
+                        user_id = item['PK'][len('TEAM#'):]
+                        team_counts = counts.setdefault(user_id, {BOAT_COUNT: 0, CREW_COUNT: 0})
+                        team_counts[counter] += 1
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        updated = 0
+        unchanged = 0
+        for profile in profiles:
+            user_id = profile['PK'][len('USER#'):]
+            expected = counts.get(user_id, {BOAT_COUNT: 0, CREW_COUNT: 0})
+            if all(profile.get(counter) == value for counter, value in expected.items()):
+                unchanged += 1
+                continue
+
+            try:
+                table.update_item(
+                    Key={'PK': profile['PK'], 'SK': 'PROFILE'},
+                    UpdateExpression='SET boat_count = :boats, crew_count = :crew',
+                    ConditionExpression='attribute_exists(PK)',
+                    ExpressionAttributeValues={':boats': expected[BOAT_COUNT], ':crew': expected[CREW_COUNT]}
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                print(f"  ⚠ Profile of {user_id} deleted during the migration, skipped")
+
+        teams_without_profile = set(counts) - {profile['PK'][len('USER#'):] for profile in profiles}
+
+        print("\n✓ Profile activity counters added successfully")
+        print(f"  - Profiles updated: {updated}")
+        print(f"  - Profiles unchanged: {unchanged}")
+        print(f"  - Teams without a profile (not listed): {len(teams_without_profile)}")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error adding profile activity counters: {str(e)}")
+        raise
+
+
+if __name__ == '__main__':
+    # Support running directly with TABLE_NAME environment variable
+    table_name = os.environ.get('TABLE_NAME')
+    team_manager_id = os.environ.get('TEAM_MANAGER_ID')
+
+    if not table_name:
+        print("ERROR: TABLE_NAME environment variable not set")
+        print("Usage: TABLE_NAME=your-table-name python add_profile_activity_counts.py")
+        exit(1)
+
+    migrate(table_name, team_manager_id)
@@ -0,0 +1,104 @@
+"""
+Migration: Add race index keys to existing boat registrations
+
+Boat registrations are listed per race with the GSI4 race index. New and
+updated boats carry its key attributes; this migration backfills them on
+existing boats:
+- GSI4PK: race_id of the boat, suffixed with its edition (race_id#<edition>)
+- GSI4SK: created_at of the boat
+
+Boats without a race are left out of the index (the attributes are removed).
+
+Run with: make db-migrate MIGRATION=add_race_index_keys ENV=dev
+Run with: make db-migrate MIGRATION=add_race_index_keys ENV=prod
+"""
+
+import boto3
+import os
+import sys
+from boto3.dynamodb.conditions import Attr
+
+# Add shared directory to path for the index key layout
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'functions', 'shared'))
+from database import race_index_keys, backfill_edition
+
+dynamodb = boto3.resource('dynamodb')
+
+
+def migrate(table_name, team_manager_id=None):
+    """
+    Set GSI4PK/GSI4SK on every boat registration with a race
+
+    Args:
+        table_name: DynamoDB table name
+        team_manager_id: User ID running the migration (optional)
+    """
+    table = dynamodb.Table(table_name)
+
+    print(f"Adding race index keys to boat registrations in table: {table_name}")
+    if team_manager_id:
+        print(f"Executed by: {team_manager_id}")
+
+    updated = 0
+    removed = 0
+    unchanged = 0
+
+    try:
+        scan_kwargs = {
+            'FilterExpression': Attr('SK').begins_with('BOAT#'),
+            'ProjectionExpression': 'PK, SK, race_id, created_at, updated_at, edition, GSI4PK, GSI4SK'
+        }
+        while True:
+            response = table.scan(**scan_kwargs)
+
+            for boat in response.get('Items', []):
+                key = {'PK': boat['PK'], 'SK': boat['SK']}
+                race_id = boat.get('race_id')
+
+                if not race_id:
+                    if 'GSI4PK' in boat or 'GSI4SK' in boat:
+                        table.update_item(Key=key, UpdateExpression='REMOVE GSI4PK, GSI4SK')
+                        removed += 1
+                    else:
+                        unchanged += 1
+                    continue
+
+                sort_key = boat.get('created_at') or boat.get('updated_at') or boat['SK']
+                keys = race_index_keys(race_id, sort_key, backfill_edition(boat))
+                if boat.get('GSI4PK') == keys['GSI4PK'] and boat.get('GSI4SK') == sort_key:
+                    unchanged += 1
+                    continue
+
+                table.update_item(
+                    Key=key,
+                    UpdateExpression='SET GSI4PK = :race, GSI4SK = :sort',
+                    ExpressionAttributeValues={':race': keys['GSI4PK'], ':sort': sort_key}
+                )
+                updated += 1
+
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        print("\n✓ Race index keys added successfully")
+        print(f"  - Boats indexed: {updated}")
+        print(f"  - Boats removed from index (no race): {removed}")
+        print(f"  - Boats already up to date: {unchanged}")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error adding race index keys: {str(e)}")
+        raise
+
+
+if __name__ == '__main__':
+    # Support running directly with TABLE_NAME environment variable
+    table_name = os.environ.get('TABLE_NAME')
+    team_manager_id = os.environ.get('TEAM_MANAGER_ID')
+
+    if not table_name:
+        print("ERROR: TABLE_NAME environment variable not set")
+        print("Usage: TABLE_NAME=your-table-name python add_race_index_keys.py")
+        exit(1)
+
+    migrate(table_name, team_manager_id)
@@ -0,0 +1,141 @@
+"""
+Migration: Add TTL attributes to temporary access grants and audit entries
+
+DynamoDB TTL deletes temporary access grants and audit entries once their
+`ttl` attribute (epoch seconds) has passed. New items get it when written;
+this migration sets it on existing ones:
+- TEMP_ACCESS grants: expires_at (expiration in epoch seconds) and
+  ttl = expiration + TEMP_ACCESS_RETENTION_DAYS
+- AUDIT#* entries: ttl = entry timestamp + AUDIT_LOG_RETENTION_DAYS
+
+Entries already past their retention are deleted by DynamoDB shortly after
+the migration.
+
+Run with: make db-migrate MIGRATION=add_ttl_attributes ENV=dev
+Run with: make db-migrate MIGRATION=add_ttl_attributes ENV=prod
+"""
+
+import boto3
+import os
+import sys
+from datetime import datetime, timedelta
+
+from boto3.dynamodb.conditions import Key
+
+# Add shared directory to path for the TTL helpers
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'functions', 'shared'))
+from access_control import (
+    GRANT_EXPIRES_AT,
+    TTL_ATTRIBUTE,
+    audit_ttl,
+    grant_expires_at,
+    grant_expiry_attributes
+)
+
+dynamodb = boto3.resource('dynamodb')
+
+# Audit partitions written by the admin functions and access control
+AUDIT_PARTITIONS = [
+    'AUDIT#PERMISSION_DENIAL',
+    'AUDIT#PERMISSION_BYPASS',
+    'AUDIT#PERMISSION_CONFIG',
+    'AUDIT#TEMP_ACCESS_GRANT',
+    'AUDIT#TEMP_ACCESS_REVOKE'
+]
+
+
+def query_partition(table, pk):
+    """Yield every item of a partition"""
+    query_kwargs = {'KeyConditionExpression': Key('PK').eq(pk)}
+    while True:
+        response = table.query(**query_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            break
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def audit_timestamp(item):
+    """
+    Timestamp of an audit entry
+
+    Sort keys start with the ISO timestamp of the entry
+    ('<timestamp>#<user>'), with or without a trailing 'Z'.
+    """
+    value = item['SK'].split('#', 1)[0].rstrip('Z')
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.utcnow()
+
+
+def set_attributes(table, item, attributes):
+    """Set attributes on an existing item"""
+    names = {f'#a{index}': name for index, name in enumerate(attributes)}
+    values = {f':v{index}': value for index, value in enumerate(attributes.values())}
+    table.update_item(
+        Key={'PK': item['PK'], 'SK': item['SK']},
+        UpdateExpression='SET ' + ', '.join(f'#a{index} = :v{index}' for index in range(len(attributes))),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+
+def migrate(table_name, team_manager_id=None):
+    """
+    Set the TTL attributes on grants and audit entries that lack them
+
+    Args:
+        table_name: DynamoDB table name
+        team_manager_id: User ID running the migration (optional)
+    """
+    table = dynamodb.Table(table_name)
+
+    print(f"Adding TTL attributes in table: {table_name}")
+    if team_manager_id:
+        print(f"Executed by: {team_manager_id}")
+
+    updated = {}
+    skipped = 0
+
+    try:
+        for grant in query_partition(table, 'TEMP_ACCESS'):
+            if GRANT_EXPIRES_AT in grant and TTL_ATTRIBUTE in grant:
+                skipped += 1
+                continue
+            expires_at = grant_expires_at(grant)
+            # Grants without a valid expiration never granted access
+            expiration = datetime.utcfromtimestamp(expires_at) if expires_at is not None else datetime.utcnow()
+            set_attributes(table, grant, grant_expiry_attributes(expiration))
+            updated['TEMP_ACCESS'] = updated.get('TEMP_ACCESS', 0) + 1
+
+        for pk in AUDIT_PARTITIONS:
+            for entry in query_partition(table, pk):
+                if TTL_ATTRIBUTE in entry:
+                    skipped += 1
+                    continue
+                set_attributes(table, entry, audit_ttl(audit_timestamp(entry)))
+                updated[pk] = updated.get(pk, 0) + 1
+
+        print("\n✓ TTL attributes added successfully")
+        for pk, count in updated.items():
+            print(f"  - {pk}: {count} updated")
+        print(f"  - Already up to date: {skipped}")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error adding TTL attributes: {str(e)}")
+        raise
+
+
+if __name__ == '__main__':
+    # Support running directly with TABLE_NAME environment variable
+    table_name = os.environ.get('TABLE_NAME')
+    team_manager_id = os.environ.get('TEAM_MANAGER_ID')
+
+    if not table_name:
+        print("ERROR: TABLE_NAME environment variable not set")
+        print("Usage: TABLE_NAME=your-table-name python add_ttl_attributes.py")
+        exit(1)
+
+    migrate(table_name, team_manager_id)
@@ -14,6 +14,7 @@ Phase 2: Generate boat_numbers for all boats with races
 - Sort boats by created_at within each race
 - Assign sequence numbers starting from 1
 - Generate and store boat_number for each boat
+- Reset each race's boat number counter to the last assigned sequence
 
 Requirements: 1.1, 2.1, 2.4, 2.5, 4.3
 """
@@ -25,7 +26,13 @@ from collections import defaultdict
 
 # Add parent directory to path to import shared utilities
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
-from boat_registration_utils import calculate_boat_club_info, generate_boat_number
+from boat_registration_utils import (
+    calculate_boat_club_info,
+    generate_boat_number,
+    compute_boat_number_sequences,
+    boat_number_counter_key,
+    BOAT_NUMBER_COUNTER_ATTRIBUTE
+)
 
 
 def get_assigned_crew_members(seats, all_crew_members):
@@ -263,6 +270,23 @@ def phase2_generate_boat_numbers(table, boats_by_team, items):
         
         print()
     
+    # Keep the per-race sequence counters in step with the new numbers
+    sequences = compute_boat_number_sequences(all_boats)
+    for race_id in races:
+        sequences.setdefault(race_id, 0)
+    updated_at = datetime.utcnow().isoformat() + 'Z'
+    for race_id, sequence in sequences.items():
+        pk, sk = boat_number_counter_key(race_id)
+        table.put_item(Item={
+            'PK': pk,
+            'SK': sk,
+            'race_id': race_id,
+            BOAT_NUMBER_COUNTER_ATTRIBUTE: sequence,
+            'updated_at': updated_at
+        })
+    print(f"Reset boat number counters of {len(sequences)} races")
+    print()
+    
     # Count boats without races
     boats_without_race = len([b for b in all_boats if not b.get('race_id')])
     if boats_without_race > 0:
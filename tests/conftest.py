@@ -43,6 +43,29 @@ spec.loader.exec_module(responses_module)
 print(f"  Loaded our responses module from: {responses_path}")
 
 
+@pytest.fixture(autouse=True)
+def cold_container_caches():
+    """
+    Start every test with cold container-level caches (PermissionChecker,
+    configuration bundles, race catalogue, club directory), as tests create
+    their own tables and seed configuration, races and clubs without bumping
+    their version stamps
+    """
+    import access_control
+    import configuration
+    import race_catalogue
+    import club_directory
+    access_control._permission_checker = None
+    configuration._config_bundles.clear()
+    race_catalogue._catalogue = None
+    club_directory._directory = None
+    yield
+    access_control._permission_checker = None
+    configuration._config_bundles.clear()
+    race_catalogue._catalogue = None
+    club_directory._directory = None
+
+
 @pytest.fixture(scope='function')
 def aws_credentials():
     """Mock AWS credentials for moto"""
@@ -54,8 +77,12 @@ def aws_credentials():
 
 
 @pytest.fixture(scope='function')
-def dynamodb_table(aws_credentials):
+def dynamodb_table(aws_credentials, request):
     """Create a mock DynamoDB table for testing"""
+    if os.environ.get('TEST_DYNAMODB_BACKEND') == 'memory':
+        yield request.getfixturevalue('memory_table')
+        return
+    
     with mock_dynamodb():
         # Set table name
         table_name = 'test-impressionnistes-table'
@@ -74,7 +101,13 @@ def dynamodb_table(aws_credentials):
             AttributeDefinitions=[
                 {'AttributeName': 'PK', 'AttributeType': 'S'},
                 {'AttributeName': 'SK', 'AttributeType': 'S'},
-                {'AttributeName': 'license_number', 'AttributeType': 'S'}
+                {'AttributeName': 'license_number', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI4PK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI4SK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI5PK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI5SK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI6PK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI6SK', 'AttributeType': 'S'}
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -83,6 +116,30 @@ def dynamodb_table(aws_credentials):
                         {'AttributeName': 'license_number', 'KeyType': 'HASH'}
                     ],
                     'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'GSI4',
+                    'KeySchema': [
+                        {'AttributeName': 'GSI4PK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'GSI4SK', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'GSI5',
+                    'KeySchema': [
+                        {'AttributeName': 'GSI5PK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'GSI5SK', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'GSI6',
+                    'KeySchema': [
+                        {'AttributeName': 'GSI6PK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'GSI6SK', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
                 }
             ],
             BillingMode='PAY_PER_REQUEST'
@@ -97,6 +154,50 @@ def dynamodb_table(aws_credentials):
         yield table
 
 
+@pytest.fixture(scope='function')
+def memory_table(aws_credentials, monkeypatch):
+    """
+    In-memory table with the production schema, seeded like dynamodb_table
+
+    The stand-in is registered as the shared DynamoDB resource and backs new
+    global DatabaseClient/ConfigurationManager instances, so handlers run
+    without moto.
+    """
+    import aws_clients
+    import database
+    import configuration
+    from memory_table import MemoryDynamoDB
+
+    table_name = 'test-impressionnistes-table'
+    monkeypatch.setenv('TABLE_NAME', table_name)
+
+    dynamodb = MemoryDynamoDB()
+    monkeypatch.setitem(aws_clients._resources, ('dynamodb', aws_clients._region(None)), dynamodb)
+    monkeypatch.setattr(database, '_db_client', database.DatabaseClient())
+    monkeypatch.setattr(configuration, '_config_manager', configuration.ConfigurationManager())
+
+    table = dynamodb.Table(table_name)
+    _seed_configuration(table)
+    yield table
+
+
+@pytest.fixture
+def put_indexed_item(dynamodb_table):
+    """
+    Seed an item with the index keys the shared write helpers add in the
+    application (and the backfill migrations add to existing data)
+
+    Raw dynamodb_table.put_item writes stay unindexed, like any write that
+    bypasses the helpers.
+    """
+    from database import index_keys
+
+    def _put(item):
+        dynamodb_table.put_item(Item={**item, **index_keys(item)})
+
+    return _put
+
+
 def _seed_configuration(table):
     """Seed the table with default configuration"""
     from datetime import datetime, timedelta
@@ -280,6 +381,8 @@ def test_races(dynamodb_table):
 @pytest.fixture
 def test_team_manager_profile(dynamodb_table, test_team_manager_id):
     """Create a test team manager profile"""
+    from database import entity_index_keys
+    
     profile = {
         'first_name': 'Test',
         'last_name': 'Manager',
@@ -291,7 +394,8 @@ def test_team_manager_profile(dynamodb_table, test_team_manager_id):
     dynamodb_table.put_item(Item={
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
-        **profile
+        **profile,
+        **entity_index_keys(f'USER#{test_team_manager_id}', 'PROFILE')
     })
     
     return profile
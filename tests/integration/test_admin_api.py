@@ -23,10 +23,10 @@ def mock_admin_event(mock_api_gateway_event, admin_user_id):
     return _create_admin_event
 
 
-def test_admin_list_all_boats(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_list_all_boats(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin listing all boats across all teams"""
     # Create boats for different teams
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -36,7 +36,7 @@ def test_admin_list_all_boats(dynamodb_table, mock_admin_event, mock_lambda_cont
         'seats': []
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#another-team',
         'SK': 'BOAT#boat-2',
         'boat_registration_id': 'boat-2',
@@ -66,10 +66,10 @@ def test_admin_list_all_boats(dynamodb_table, mock_admin_event, mock_lambda_cont
     assert len(body['data']['boats']) >= 2
 
 
-def test_admin_list_all_crew_members(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_list_all_crew_members(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin listing all crew members across all teams"""
     # Create crew members for different teams
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -81,7 +81,7 @@ def test_admin_list_all_crew_members(dynamodb_table, mock_admin_event, mock_lamb
         'club_affiliation': 'RCPM'
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#another-team',
         'SK': 'CREW#crew-2',
         'crew_member_id': 'crew-2',
@@ -113,10 +113,10 @@ def test_admin_list_all_crew_members(dynamodb_table, mock_admin_event, mock_lamb
     assert len(body['data']['crew_members']) >= 2
 
 
-def test_admin_get_stats(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_get_stats(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin getting event statistics"""
     # Seed some data
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -126,7 +126,7 @@ def test_admin_get_stats(dynamodb_table, mock_admin_event, mock_lambda_context,
         'seats': []
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -512,10 +512,10 @@ def test_non_admin_cannot_access_admin_endpoints(dynamodb_table, mock_api_gatewa
 # JSON Export API Tests (Export API Refactoring)
 # ============================================================================
 
-def test_export_crew_members_json_structure(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_crew_members_json_structure(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test crew members JSON export returns correct structure"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -525,7 +525,7 @@ def test_export_crew_members_json_structure(dynamodb_table, mock_admin_event, mo
     })
     
     # Add crew members
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -576,10 +576,10 @@ def test_export_crew_members_json_structure(dynamodb_table, mock_admin_event, mo
     assert member['club_affiliation'] == 'Test Club'
 
 
-def test_export_crew_members_json_includes_team_manager_info(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_crew_members_json_includes_team_manager_info(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test crew members JSON export includes team manager information"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -589,7 +589,7 @@ def test_export_crew_members_json_includes_team_manager_info(dynamodb_table, moc
     })
     
     # Add crew member
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -619,10 +619,10 @@ def test_export_crew_members_json_includes_team_manager_info(dynamodb_table, moc
     assert member['team_manager_club'] == 'RCPM'
 
 
-def test_export_crew_members_json_sorting(dynamodb_table, mock_admin_event, mock_lambda_context):
+def test_export_crew_members_json_sorting(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context):
     """Test crew members JSON export sorts by team manager name, then crew member last name"""
     # Add team managers
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'USER#tm-1',
         'SK': 'PROFILE',
         'first_name': 'Alice',
@@ -631,7 +631,7 @@ def test_export_crew_members_json_sorting(dynamodb_table, mock_admin_event, mock
         'club_affiliation': 'Club A'
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'USER#tm-2',
         'SK': 'PROFILE',
         'first_name': 'Bob',
@@ -641,7 +641,7 @@ def test_export_crew_members_json_sorting(dynamodb_table, mock_admin_event, mock
     })
     
     # Add crew members for first team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#tm-1',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -651,7 +651,7 @@ def test_export_crew_members_json_sorting(dynamodb_table, mock_admin_event, mock
         'date_of_birth': '1990-01-15'
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#tm-1',
         'SK': 'CREW#crew-2',
         'crew_member_id': 'crew-2',
@@ -662,7 +662,7 @@ def test_export_crew_members_json_sorting(dynamodb_table, mock_admin_event, mock
     })
     
     # Add crew member for second team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#tm-2',
         'SK': 'CREW#crew-3',
         'crew_member_id': 'crew-3',
@@ -691,10 +691,10 @@ def test_export_crew_members_json_sorting(dynamodb_table, mock_admin_event, mock
     assert crew_members[2]['crew_member_id'] == 'crew-3'  # Bob Manager -> Brown
 
 
-def test_export_crew_members_json_pagination(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_crew_members_json_pagination(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test crew members JSON export handles pagination for large datasets"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -705,7 +705,7 @@ def test_export_crew_members_json_pagination(dynamodb_table, mock_admin_event, m
     
     # Add many crew members (more than typical page size)
     for i in range(50):
-        dynamodb_table.put_item(Item={
+        put_indexed_item({
             'PK': f'TEAM#{test_team_manager_id}',
             'SK': f'CREW#crew-{i}',
             'crew_member_id': f'crew-{i}',
@@ -753,12 +753,12 @@ def test_export_crew_members_json_empty_database(dynamodb_table, mock_admin_even
 
 
 
-def test_export_boat_registrations_json_structure(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_boat_registrations_json_structure(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test boat registrations JSON export returns correct structure"""
     from decimal import Decimal
     
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -778,7 +778,7 @@ def test_export_boat_registrations_json_structure(dynamodb_table, mock_admin_eve
     })
     
     # Add boat registration
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -836,10 +836,10 @@ def test_export_boat_registrations_json_structure(dynamodb_table, mock_admin_eve
     assert 'crew_composition' in boat
 
 
-def test_export_boat_registrations_json_includes_all_boats(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_boat_registrations_json_includes_all_boats(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test boat registrations JSON export includes all boats regardless of status"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -861,7 +861,7 @@ def test_export_boat_registrations_json_includes_all_boats(dynamodb_table, mock_
     # Add boats with different statuses
     statuses = ['incomplete', 'complete', 'paid', 'free']
     for i, status in enumerate(statuses):
-        dynamodb_table.put_item(Item={
+        put_indexed_item({
             'PK': f'TEAM#{test_team_manager_id}',
             'SK': f'BOAT#boat-{i}',
             'boat_registration_id': f'boat-{i}',
@@ -874,7 +874,7 @@ def test_export_boat_registrations_json_includes_all_boats(dynamodb_table, mock_
         })
     
     # Add a forfait boat
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-forfait',
         'boat_registration_id': 'boat-forfait',
@@ -914,10 +914,10 @@ def test_export_boat_registrations_json_includes_all_boats(dynamodb_table, mock_
     assert len(forfait_boats) == 1
 
 
-def test_export_boat_registrations_json_includes_race_names(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_boat_registrations_json_includes_race_names(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test boat registrations JSON export includes race names"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -946,7 +946,7 @@ def test_export_boat_registrations_json_includes_race_names(dynamodb_table, mock
     })
     
     # Add boat registrations
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -957,7 +957,7 @@ def test_export_boat_registrations_json_includes_race_names(dynamodb_table, mock
         'seats': []
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-2',
         'boat_registration_id': 'boat-2',
@@ -988,12 +988,12 @@ def test_export_boat_registrations_json_includes_race_names(dynamodb_table, mock
     assert boat2['race_name'] == 'Semi-Marathon Women Junior'
 
 
-def test_export_boat_registrations_json_includes_crew_composition(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_boat_registrations_json_includes_crew_composition(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test boat registrations JSON export includes crew composition details"""
     from decimal import Decimal
     
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1013,7 +1013,7 @@ def test_export_boat_registrations_json_includes_crew_composition(dynamodb_table
     })
     
     # Add boat with crew composition
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1056,10 +1056,10 @@ def test_export_boat_registrations_json_includes_crew_composition(dynamodb_table
     assert crew_comp['total_seats'] == 5
 
 
-def test_export_boat_registrations_json_sorting(dynamodb_table, mock_admin_event, mock_lambda_context):
+def test_export_boat_registrations_json_sorting(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context):
     """Test boat registrations JSON export sorts by team manager, event type, boat type"""
     # Add team managers
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'USER#tm-1',
         'SK': 'PROFILE',
         'first_name': 'Alice',
@@ -1068,7 +1068,7 @@ def test_export_boat_registrations_json_sorting(dynamodb_table, mock_admin_event
         'club_affiliation': 'Club A'
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'USER#tm-2',
         'SK': 'PROFILE',
         'first_name': 'Bob',
@@ -1088,7 +1088,7 @@ def test_export_boat_registrations_json_sorting(dynamodb_table, mock_admin_event
     })
     
     # Add boats for first team manager (different event types and boat types)
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#tm-1',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1099,7 +1099,7 @@ def test_export_boat_registrations_json_sorting(dynamodb_table, mock_admin_event
         'seats': []
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#tm-1',
         'SK': 'BOAT#boat-2',
         'boat_registration_id': 'boat-2',
@@ -1110,7 +1110,7 @@ def test_export_boat_registrations_json_sorting(dynamodb_table, mock_admin_event
         'seats': []
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#tm-1',
         'SK': 'BOAT#boat-3',
         'boat_registration_id': 'boat-3',
@@ -1122,7 +1122,7 @@ def test_export_boat_registrations_json_sorting(dynamodb_table, mock_admin_event
     })
     
     # Add boat for second team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': 'TEAM#tm-2',
         'SK': 'BOAT#boat-4',
         'boat_registration_id': 'boat-4',
@@ -1154,7 +1154,7 @@ def test_export_boat_registrations_json_sorting(dynamodb_table, mock_admin_event
 
 
 
-def test_export_races_json_includes_all_entities(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_races_json_includes_all_entities(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test races JSON export includes all entities (races, boats, crew, managers)"""
     # Add system config
     dynamodb_table.put_item(Item={
@@ -1164,7 +1164,7 @@ def test_export_races_json_includes_all_entities(dynamodb_table, mock_admin_even
     })
     
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1187,7 +1187,7 @@ def test_export_races_json_includes_all_entities(dynamodb_table, mock_admin_even
     })
     
     # Add crew member
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -1201,7 +1201,7 @@ def test_export_races_json_includes_all_entities(dynamodb_table, mock_admin_even
     })
     
     # Add boat
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1273,7 +1273,77 @@ def test_export_races_json_includes_all_entities(dynamodb_table, mock_admin_even
     assert tm['club_affiliation'] == 'Test Club'
 
 
-def test_export_races_json_includes_all_boat_statuses(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_races_json_single_race(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
+    """Test races JSON export of one race reads its boats, crew and managers only"""
+    from unittest.mock import patch
+    from database import get_db_client, race_index_keys
+    
+    put_indexed_item({
+        'PK': f'USER#{test_team_manager_id}',
+        'SK': 'PROFILE',
+        'first_name': 'John',
+        'last_name': 'Manager',
+        'email': 'john@example.com',
+        'club_affiliation': 'Test Club'
+    })
+    put_indexed_item({
+        'PK': 'USER#other-manager',
+        'SK': 'PROFILE',
+        'first_name': 'Other',
+        'club_affiliation': 'Other Club'
+    })
+    
+    for race_id in ('M01', 'M02'):
+        dynamodb_table.put_item(Item={'PK': 'RACE', 'SK': race_id, 'race_id': race_id, 'event_type': '42km'})
+    
+    for crew_member_id in ('crew-1', 'crew-2'):
+        put_indexed_item({
+            'PK': f'TEAM#{test_team_manager_id}',
+            'SK': f'CREW#{crew_member_id}',
+            'crew_member_id': crew_member_id,
+            'first_name': crew_member_id
+        })
+    
+    boats = [
+        (test_team_manager_id, 'boat-1', 'M01', 'crew-1'),
+        (test_team_manager_id, 'boat-2', 'M02', 'crew-2'),
+        ('other-manager', 'boat-3', 'M02', None)
+    ]
+    for team_manager_id, boat_id, race_id, crew_member_id in boats:
+        put_indexed_item({
+            'PK': f'TEAM#{team_manager_id}',
+            'SK': f'BOAT#{boat_id}',
+            'boat_registration_id': boat_id,
+            'race_id': race_id,
+            'registration_status': 'complete',
+            'created_at': f'2025-01-01T00:00:0{boat_id[-1]}Z',
+            'seats': [{'crew_member_id': crew_member_id, 'position': 1, 'type': 'rower'}],
+            **race_index_keys(race_id, f'2025-01-01T00:00:0{boat_id[-1]}Z')
+        })
+    
+    from admin.export_races_json import lambda_handler
+    
+    event = mock_admin_event(
+        http_method='GET',
+        path='/admin/export/races',
+        query_parameters={'race_id': 'M01'}
+    )
+    
+    with patch.object(get_db_client().table, 'scan') as mock_scan:
+        response = lambda_handler(event, mock_lambda_context)
+    
+    mock_scan.assert_not_called()
+    assert response['statusCode'] == 200
+    
+    data = json.loads(response['body'])['data']
+    assert [race['race_id'] for race in data['races']] == ['M01']
+    assert [boat['boat_registration_id'] for boat in data['boats']] == ['boat-1']
+    assert [crew['crew_member_id'] for crew in data['crew_members']] == ['crew-1']
+    assert [tm['user_id'] for tm in data['team_managers']] == [test_team_manager_id]
+    assert data['boats'][0]['club_affiliation'] == 'Test Club'
+
+
+def test_export_races_json_includes_all_boat_statuses(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test races JSON export includes boats with all statuses (complete, paid, free, incomplete, forfait)"""
     # Add system config
     dynamodb_table.put_item(Item={
@@ -1283,7 +1353,7 @@ def test_export_races_json_includes_all_boat_statuses(dynamodb_table, mock_admin
     })
     
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1306,7 +1376,7 @@ def test_export_races_json_includes_all_boat_statuses(dynamodb_table, mock_admin
     # Add boats with all statuses
     statuses = ['incomplete', 'complete', 'paid', 'free']
     for i, status in enumerate(statuses):
-        dynamodb_table.put_item(Item={
+        put_indexed_item({
             'PK': f'TEAM#{test_team_manager_id}',
             'SK': f'BOAT#boat-{status}',
             'boat_registration_id': f'boat-{status}',
@@ -1319,7 +1389,7 @@ def test_export_races_json_includes_all_boat_statuses(dynamodb_table, mock_admin
         })
     
     # Add a forfait boat
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-forfait',
         'boat_registration_id': 'boat-forfait',
@@ -1360,7 +1430,7 @@ def test_export_races_json_includes_all_boat_statuses(dynamodb_table, mock_admin
     assert forfait_boats[0]['boat_registration_id'] == 'boat-forfait'
 
 
-def test_export_races_json_converts_decimals(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_races_json_converts_decimals(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test races JSON export converts Decimal types to numbers"""
     from decimal import Decimal
     
@@ -1372,7 +1442,7 @@ def test_export_races_json_converts_decimals(dynamodb_table, mock_admin_event, m
     })
     
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1393,7 +1463,7 @@ def test_export_races_json_converts_decimals(dynamodb_table, mock_admin_event, m
     })
     
     # Add crew member with age as Decimal
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -1405,7 +1475,7 @@ def test_export_races_json_converts_decimals(dynamodb_table, mock_admin_event, m
     })
     
     # Add boat with Decimal values in crew_composition
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1446,7 +1516,7 @@ def test_export_races_json_converts_decimals(dynamodb_table, mock_admin_event, m
     assert isinstance(crew_comp['total_seats'], (int, float))
 
 
-def test_export_races_json_handles_missing_team_manager(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_export_races_json_handles_missing_team_manager(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test races JSON export handles missing team manager gracefully"""
     # Add system config
     dynamodb_table.put_item(Item={
@@ -1467,7 +1537,7 @@ def test_export_races_json_handles_missing_team_manager(dynamodb_table, mock_adm
     })
     
     # Add boat WITHOUT adding team manager profile
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1538,10 +1608,10 @@ def test_export_races_json_empty_database(dynamodb_table, mock_admin_event, mock
 # Boat Assignment Tests (Boat Hull Assignment Request Feature)
 # ============================================================================
 
-def test_admin_can_assign_boat_identifier(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_can_assign_boat_identifier(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin can assign boat identifier to a crew with boat request enabled"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1561,7 +1631,7 @@ def test_admin_can_assign_boat_identifier(dynamodb_table, mock_admin_event, mock
     })
     
     # Add crew member
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -1574,7 +1644,7 @@ def test_admin_can_assign_boat_identifier(dynamodb_table, mock_admin_event, mock
     })
     
     # Add boat with boat request enabled but no assignment
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1616,10 +1686,10 @@ def test_admin_can_assign_boat_identifier(dynamodb_table, mock_admin_event, mock
     assert body['data']['assigned_boat_identifier'] == 'Boat 42'
 
 
-def test_admin_can_add_assignment_comment(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_can_add_assignment_comment(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin can add assignment comment when assigning boat"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1639,7 +1709,7 @@ def test_admin_can_add_assignment_comment(dynamodb_table, mock_admin_event, mock
     })
     
     # Add crew member
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -1652,7 +1722,7 @@ def test_admin_can_add_assignment_comment(dynamodb_table, mock_admin_event, mock
     })
     
     # Add boat with boat request enabled
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1696,10 +1766,10 @@ def test_admin_can_add_assignment_comment(dynamodb_table, mock_admin_event, mock
     assert body['data']['assigned_boat_comment'] == 'Hull in rack 3, oars in locker B'
 
 
-def test_completion_status_recalculates_after_assignment(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_completion_status_recalculates_after_assignment(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test completion status recalculates after admin assigns boat"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1719,7 +1789,7 @@ def test_completion_status_recalculates_after_assignment(dynamodb_table, mock_ad
     })
     
     # Add crew member
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -1733,7 +1803,7 @@ def test_completion_status_recalculates_after_assignment(dynamodb_table, mock_ad
     
     # Add boat with boat request enabled, all seats filled, race selected
     # Should be incomplete because no boat assigned yet
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1777,10 +1847,10 @@ def test_completion_status_recalculates_after_assignment(dynamodb_table, mock_ad
     assert body['data']['registration_status'] == 'complete'
 
 
-def test_admin_can_clear_boat_assignment(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_can_clear_boat_assignment(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin can clear boat assignment by setting to null"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1800,7 +1870,7 @@ def test_admin_can_clear_boat_assignment(dynamodb_table, mock_admin_event, mock_
     })
     
     # Add crew member
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -1813,7 +1883,7 @@ def test_admin_can_clear_boat_assignment(dynamodb_table, mock_admin_event, mock_
     })
     
     # Add boat with boat already assigned
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1858,10 +1928,10 @@ def test_admin_can_clear_boat_assignment(dynamodb_table, mock_admin_event, mock_
     assert body['data']['registration_status'] == 'incomplete'
 
 
-def test_admin_boat_identifier_length_validation(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_boat_identifier_length_validation(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin boat identifier length validation (max 100 chars)"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1871,7 +1941,7 @@ def test_admin_boat_identifier_length_validation(dynamodb_table, mock_admin_even
     })
     
     # Add boat
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1909,10 +1979,10 @@ def test_admin_boat_identifier_length_validation(dynamodb_table, mock_admin_even
     assert 'assigned_boat_identifier' in body['error']['details']
 
 
-def test_admin_boat_comment_length_validation(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_boat_comment_length_validation(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin boat comment length validation (max 500 chars)"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1922,7 +1992,7 @@ def test_admin_boat_comment_length_validation(dynamodb_table, mock_admin_event,
     })
     
     # Add boat
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -1961,10 +2031,10 @@ def test_admin_boat_comment_length_validation(dynamodb_table, mock_admin_event,
     assert 'assigned_boat_comment' in body['error']['details']
 
 
-def test_admin_boat_identifier_whitespace_trimming(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_boat_identifier_whitespace_trimming(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin boat identifier whitespace is trimmed"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -1984,7 +2054,7 @@ def test_admin_boat_identifier_whitespace_trimming(dynamodb_table, mock_admin_ev
     })
     
     # Add crew member
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'CREW#crew-1',
         'crew_member_id': 'crew-1',
@@ -1997,7 +2067,7 @@ def test_admin_boat_identifier_whitespace_trimming(dynamodb_table, mock_admin_ev
     })
     
     # Add boat
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
@@ -2036,10 +2106,10 @@ def test_admin_boat_identifier_whitespace_trimming(dynamodb_table, mock_admin_ev
     assert body['data']['assigned_boat_identifier'] == 'Boat 42'  # Trimmed
 
 
-def test_admin_empty_string_boat_identifier_becomes_null(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+def test_admin_empty_string_boat_identifier_becomes_null(dynamodb_table, put_indexed_item, mock_admin_event, mock_lambda_context, test_team_manager_id):
     """Test admin empty string boat identifier becomes null"""
     # Add team manager
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'USER#{test_team_manager_id}',
         'SK': 'PROFILE',
         'first_name': 'John',
@@ -2049,7 +2119,7 @@ def test_admin_empty_string_boat_identifier_becomes_null(dynamodb_table, mock_ad
     })
     
     # Add boat with assignment
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f'TEAM#{test_team_manager_id}',
         'SK': 'BOAT#boat-1',
         'boat_registration_id': 'boat-1',
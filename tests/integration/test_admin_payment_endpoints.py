@@ -12,7 +12,7 @@ from decimal import Decimal
 
 
 @pytest.fixture
-def multi_team_payments(dynamodb_table, test_team_manager_id, test_admin_id):
+def multi_team_payments(dynamodb_table, put_indexed_item, test_team_manager_id, test_admin_id):
     """Create payment records for multiple team managers"""
     # Create payments for test team manager
     for i in range(2):
@@ -29,7 +29,7 @@ def multi_team_payments(dynamodb_table, test_team_manager_id, test_admin_id):
             'stripe_receipt_url': f'https://stripe.com/receipt_{i}',
             'status': 'succeeded'
         }
-        dynamodb_table.put_item(Item=payment)
+        put_indexed_item(payment)
     
     # Create payments for another team manager
     other_tm_id = 'other_team_manager'
@@ -47,10 +47,10 @@ def multi_team_payments(dynamodb_table, test_team_manager_id, test_admin_id):
             'stripe_receipt_url': f'https://stripe.com/receipt_other_{i}',
             'status': 'succeeded'
         }
-        dynamodb_table.put_item(Item=payment)
+        put_indexed_item(payment)
     
     # Create profiles for team managers
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f"TEAM#{test_team_manager_id}",
         'SK': 'PROFILE',
         'first_name': 'Test',
@@ -59,7 +59,7 @@ def multi_team_payments(dynamodb_table, test_team_manager_id, test_admin_id):
         'club_affiliation': 'Test Club'
     })
     
-    dynamodb_table.put_item(Item={
+    put_indexed_item({
         'PK': f"TEAM#{other_tm_id}",
         'SK': 'PROFILE',
         'first_name': 'Other',
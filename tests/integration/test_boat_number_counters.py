@@ -0,0 +1,144 @@
+"""
+Integration tests for per-race boat number sequence counters
+
+Tests atomic allocation, concurrent allocation in one race, seeding of a
+missing counter and the admin rebuild endpoint.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from database import DatabaseClient, race_index_keys
+from boat_registration_utils import (
+    allocate_boat_number,
+    boat_number_counter_key,
+    compute_boat_number_sequences
+)
+
+
+def test_allocate_boat_number_increments_per_race(dynamodb_table):
+    """Test that each race has its own sequence starting at 1"""
+    db = DatabaseClient(table_name=dynamodb_table.name)
+
+    numbers = [allocate_boat_number(db, '21km', 15, 'race-15') for _ in range(3)]
+    marathon = allocate_boat_number(db, '42km', 1, 'race-1')
+
+    assert numbers == ['SM.15.1', 'SM.15.2', 'SM.15.3']
+    assert marathon == 'M.1.1'
+
+    pk, sk = boat_number_counter_key('race-15')
+    assert db.get_item(pk, sk)['last_sequence'] == 3
+
+
+def test_concurrent_allocations_are_unique(dynamodb_table):
+    """Test that concurrent allocations in the same race never collide"""
+    db = DatabaseClient(table_name=dynamodb_table.name)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        numbers = list(executor.map(
+            lambda _: allocate_boat_number(db, '21km', 20, 'race-20'),
+            range(20)
+        ))
+
+    assert sorted(numbers, key=lambda n: int(n.split('.')[2])) == [f'SM.20.{i}' for i in range(1, 21)]
+
+
+def test_missing_counter_starts_after_existing_boats(dynamodb_table, put_indexed_item):
+    """Test that a race's first allocation continues from its existing boat numbers"""
+    db = DatabaseClient(table_name=dynamodb_table.name)
+    for i, boat_number in enumerate(['SM.15.3', 'SM.15.7']):
+        put_indexed_item({
+            'PK': 'TEAM#team-1',
+            'SK': f'BOAT#boat-{i}',
+            'race_id': 'race-15',
+            'boat_number': boat_number,
+            **race_index_keys('race-15', f'2026-01-0{i + 1}T00:00:00Z')
+        })
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        numbers = list(executor.map(lambda _: allocate_boat_number(db, '21km', 15, 'race-15'), range(4)))
+
+    assert sorted(numbers) == ['SM.15.10', 'SM.15.11', 'SM.15.8', 'SM.15.9']
+    pk, sk = boat_number_counter_key('race-15')
+    assert db.get_item(pk, sk)['last_sequence'] == 11
+
+def test_invalid_race_does_not_consume_a_number(dynamodb_table):
+    """Test that an invalid race returns None without touching the counter"""
+    db = DatabaseClient(table_name=dynamodb_table.name)
+
+    assert allocate_boat_number(db, '10km', 15, 'race-15') is None
+    assert allocate_boat_number(db, '21km', None, 'race-15') is None
+
+    pk, sk = boat_number_counter_key('race-15')
+    assert db.get_item(pk, sk) is None
+
+
+def test_compute_boat_number_sequences_skips_malformed_numbers():
+    """Test that the highest valid sequence of each race is kept"""
+    boats = [
+        {'race_id': 'race-15', 'boat_number': 'SM.15.2'},
+        {'race_id': 'race-15', 'boat_number': 'SM.15.7'},
+        {'race_id': 'race-15', 'boat_number': 'SM.15.x'},
+        {'race_id': 'race-1', 'boat_number': 'M.1.1'},
+        {'race_id': None, 'boat_number': None}
+    ]
+
+    assert compute_boat_number_sequences(boats) == {'race-15': 7, 'race-1': 1}
+
+
+def test_rebuild_counters_endpoint(dynamodb_table, put_indexed_item, mock_api_gateway_event, mock_lambda_context,
+                                   test_team_manager_id, test_team_manager_profile, test_races):
+    """Test that rebuilt counters continue from the highest existing boat number"""
+    for i, boat_number in enumerate(['SM.15.1', 'SM.15.4']):
+        put_indexed_item({
+            'PK': f'TEAM#{test_team_manager_id}',
+            'SK': f'BOAT#boat-{i}',
+            'boat_registration_id': f'boat-{i}',
+            'race_id': 'race-15',
+            'boat_number': boat_number
+        })
+    # A counter ahead of the boat numbers (e.g. a number allocated while the
+    # rebuild read the boats) is kept; one behind them is raised
+    pk, sk = boat_number_counter_key('race-20')
+    dynamodb_table.put_item(Item={'PK': pk, 'SK': sk, 'last_sequence': 9})
+    pk, sk = boat_number_counter_key('race-15')
+    dynamodb_table.put_item(Item={'PK': pk, 'SK': sk, 'last_sequence': 2})
+
+    from admin.rebuild_boat_number_counters import lambda_handler as rebuild_handler
+    from boat.create_boat_registration import lambda_handler as create_handler
+
+    rebuild_event = mock_api_gateway_event(
+        http_method='POST',
+        path='/admin/boat-number-counters/rebuild',
+        user_id='test-admin-456',
+        groups=['admins']
+    )
+    response = rebuild_handler(rebuild_event, mock_lambda_context)
+
+    assert response['statusCode'] == 200
+    counters = json.loads(response['body'])['data']['counters']
+    assert counters == {'race-1': 0, 'race-15': 4, 'race-20': 9, 'race-30': 0}
+    assert dynamodb_table.get_item(Key={'PK': pk, 'SK': sk})['Item']['last_sequence'] == 4
+
+    create_event = mock_api_gateway_event(
+        http_method='POST',
+        path='/boat',
+        body=json.dumps({'event_type': '21km', 'boat_type': '4-', 'race_id': 'race-15'}),
+        user_id=test_team_manager_id
+    )
+    create_response = create_handler(create_event, mock_lambda_context)
+
+    assert create_response['statusCode'] == 201
+    assert json.loads(create_response['body'])['data']['boat_number'] == 'SM.15.5'
+
+
+def test_rebuild_counters_requires_admin(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that team managers cannot rebuild the counters"""
+    from admin.rebuild_boat_number_counters import lambda_handler
+
+    event = mock_api_gateway_event(
+        http_method='POST',
+        path='/admin/boat-number-counters/rebuild',
+        user_id=test_team_manager_id
+    )
+
+    assert lambda_handler(event, mock_lambda_context)['statusCode'] == 403
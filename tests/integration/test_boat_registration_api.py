@@ -1360,6 +1360,62 @@ def test_multiple_boats_same_race_unique_sequences(dynamodb_table, mock_api_gate
     assert boat_numbers == expected_numbers
 
 
+def test_race_index_follows_race_changes(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id, test_team_manager_profile, test_crew_members, test_races):
+    """
+    Integration Test: Race index keys are set, moved and removed with race_id,
+    and boat numbers are generated without scanning the table
+    """
+    from unittest.mock import patch
+    from database import get_db_client
+    from boat.create_boat_registration import lambda_handler as create_handler
+    from boat.update_boat_registration import lambda_handler as update_handler
+    
+    def update_race(boat_id, race_id):
+        update_event = mock_api_gateway_event(
+            http_method='PUT',
+            path=f'/boat/{boat_id}',
+            path_parameters={'boat_registration_id': boat_id},
+            body=json.dumps({'race_id': race_id}),
+            user_id=test_team_manager_id
+        )
+        assert update_handler(update_event, mock_lambda_context)['statusCode'] == 200
+        return dynamodb_table.get_item(
+            Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'}
+        )['Item']
+    
+    create_event = mock_api_gateway_event(
+        http_method='POST',
+        path='/boat',
+        body=json.dumps({
+            'event_type': '21km',
+            'boat_type': '4-',
+            'race_id': 'race-15'
+        }),
+        user_id=test_team_manager_id
+    )
+    
+    with patch.object(get_db_client().table, 'scan') as mock_scan:
+        create_response = create_handler(create_event, mock_lambda_context)
+    
+    mock_scan.assert_not_called()
+    assert create_response['statusCode'] == 201
+    boat_id = json.loads(create_response['body'])['data']['boat_registration_id']
+    
+    boat = dynamodb_table.get_item(
+        Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'}
+    )['Item']
+    assert boat['GSI4PK'] == 'race-15'
+    assert boat['GSI4SK'] == boat['created_at']
+    
+    boat = update_race(boat_id, 'race-20')
+    assert boat['GSI4PK'] == 'race-20'
+    assert [b['boat_registration_id'] for b in get_db_client().list_race_boats('race-15')] == []
+    
+    boat = update_race(boat_id, None)
+    assert 'GSI4PK' not in boat
+    assert 'GSI4SK' not in boat
+
+
 def test_boat_number_persists_across_updates(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id, test_team_manager_profile, test_crew_members, test_races):
     """
     Integration Test: Boat number persists when updating other fields
@@ -1692,6 +1748,53 @@ def test_assigned_boat_identifier_exactly_100_chars(dynamodb_table, mock_api_gat
     assert len(body['data']['assigned_boat_identifier']) == 100
 
 
+def test_admin_race_change_moves_race_index(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_admin_id, test_team_manager_id, test_team_manager_profile, test_races):
+    """
+    Test that admin race changes keep the race index keys in step with race_id
+    """
+    from admin.admin_update_boat import lambda_handler
+    
+    boat_id = 'boat-admin-race-index'
+    key = {'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'}
+    dynamodb_table.put_item(Item={
+        **key,
+        'boat_registration_id': boat_id,
+        'event_type': '21km',
+        'boat_type': '4-',
+        'race_id': 'race-15',
+        'boat_number': 'SM.15.1',
+        'registration_status': 'incomplete',
+        'created_at': '2025-01-01T00:00:00Z',
+        'GSI4PK': 'race-15',
+        'GSI4SK': '2025-01-01T00:00:00Z',
+        'seats': []
+    })
+    
+    def update_race(race_id):
+        event = mock_api_gateway_event(
+            http_method='PUT',
+            path=f'/admin/teams/{test_team_manager_id}/boats/{boat_id}',
+            body=json.dumps({'race_id': race_id}),
+            path_parameters={
+                'team_manager_id': test_team_manager_id,
+                'boat_registration_id': boat_id
+            },
+            user_id=test_admin_id,
+            groups=['admins']
+        )
+        assert lambda_handler(event, mock_lambda_context)['statusCode'] == 200
+        return dynamodb_table.get_item(Key=key)['Item']
+    
+    boat = update_race('race-20')
+    assert boat['boat_number'] == 'SM.20.1'
+    assert boat['GSI4PK'] == 'race-20'
+    assert boat['GSI4SK'] == '2025-01-01T00:00:00Z'
+    
+    boat = update_race(None)
+    assert 'GSI4PK' not in boat
+    assert 'GSI4SK' not in boat
+
+
 def test_assigned_boat_identifier_101_chars_rejected(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_admin_id, test_team_manager_id, test_team_manager_profile):
     """
     Test that assigned_boat_identifier with 101 characters is rejected (boundary test)
@@ -3362,3 +3465,322 @@ def test_xss_sanitization_removes_style_tags(dynamodb_table, mock_api_gateway_ev
     # Safe content should be preserved
     assert 'Need boat' in sanitized_comment
     assert 'for race' in sanitized_comment
+
+
+# ============================================================================
+# Conditional partial writes (seat assignment and deletion)
+# ============================================================================
+
+def _put_boat_with_crew(table, team_manager_id, boat_id, crew_assignments, updated_at='2026-01-01T00:00:00Z'):
+    """Helper to create a boat and its crew, crew_assignments maps crew_member_id -> assigned_boat_id"""
+    for crew_member_id, assigned_boat_id in crew_assignments.items():
+        table.put_item(Item={
+            'PK': f'TEAM#{team_manager_id}',
+            'SK': f'CREW#{crew_member_id}',
+            'crew_member_id': crew_member_id,
+            'first_name': crew_member_id,
+            'last_name': 'Rower',
+            'date_of_birth': '1990-01-15',
+            'gender': 'M',
+            'club_affiliation': 'RCPM',
+            'assigned_boat_id': assigned_boat_id
+        })
+    
+    table.put_item(Item={
+        'PK': f'TEAM#{team_manager_id}',
+        'SK': f'BOAT#{boat_id}',
+        'boat_registration_id': boat_id,
+        'event_type': '21km',
+        'boat_type': '4-',
+        'registration_status': 'incomplete',
+        'updated_at': updated_at,
+        'seats': [
+            {'position': position, 'type': 'rower', 'crew_member_id': crew_member_id}
+            for position, crew_member_id in enumerate(list(crew_assignments) + [None] * (4 - len(crew_assignments)), start=1)
+        ]
+    })
+
+
+def test_assign_seat_writes_only_seat_fields(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that assigning a seat leaves unrelated boat fields untouched"""
+    boat_id = 'boat-partial-write'
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, boat_id, {'crew-a': boat_id})
+    dynamodb_table.put_item(Item={
+        'PK': f'TEAM#{test_team_manager_id}',
+        'SK': 'CREW#crew-b',
+        'crew_member_id': 'crew-b',
+        'first_name': 'Bob',
+        'last_name': 'Rower',
+        'date_of_birth': '1990-01-15',
+        'gender': 'M',
+        'club_affiliation': 'RCPM'
+    })
+    dynamodb_table.update_item(
+        Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'},
+        UpdateExpression='SET boat_request_comment = :comment',
+        ExpressionAttributeValues={':comment': 'Keep me'}
+    )
+    
+    from boat.assign_seat import lambda_handler
+    
+    event = mock_api_gateway_event(
+        http_method='POST',
+        path=f'/boat/{boat_id}/seat',
+        body=json.dumps({'position': 2, 'crew_member_id': 'crew-b'}),
+        path_parameters={'boat_registration_id': boat_id},
+        user_id=test_team_manager_id
+    )
+    response = lambda_handler(event, mock_lambda_context)
+    assert response['statusCode'] == 200
+    
+    boat = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'})['Item']
+    assert boat['boat_request_comment'] == 'Keep me'
+    assert boat['seats'][1]['crew_member_id'] == 'crew-b'
+    
+    crew = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-b'})['Item']
+    assert crew['assigned_boat_id'] == boat_id
+
+
+def test_assign_seat_conflict_when_boat_changed_concurrently(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that a boat modified after it was read is not overwritten"""
+    from unittest.mock import patch
+    from database import DatabaseClient
+    
+    boat_id = 'boat-concurrent'
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, boat_id, {'crew-a': boat_id})
+    
+    real_batch_get_items = DatabaseClient.batch_get_items
+    
+    def concurrent_writer(self, *args, **kwargs):
+        # Another request updates the boat between our read and our write
+        dynamodb_table.update_item(
+            Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'},
+            UpdateExpression='SET updated_at = :ts',
+            ExpressionAttributeValues={':ts': '2026-01-02T00:00:00Z'}
+        )
+        return real_batch_get_items(self, *args, **kwargs)
+    
+    from boat.assign_seat import lambda_handler
+    
+    event = mock_api_gateway_event(
+        http_method='POST',
+        path=f'/boat/{boat_id}/seat',
+        body=json.dumps({'position': 1, 'crew_member_id': None}),
+        path_parameters={'boat_registration_id': boat_id},
+        user_id=test_team_manager_id
+    )
+    with patch.object(DatabaseClient, 'batch_get_items', concurrent_writer):
+        response = lambda_handler(event, mock_lambda_context)
+    
+    assert response['statusCode'] == 409
+    
+    # Neither the boat nor the crew member was changed
+    boat = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'})['Item']
+    assert boat['seats'][0]['crew_member_id'] == 'crew-a'
+    crew = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-a'})['Item']
+    assert crew['assigned_boat_id'] == boat_id
+
+
+def test_delete_boat_only_unassigns_crew_still_on_boat(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that deleting a boat does not clear a crew member already moved to another boat"""
+    boat_id = 'boat-delete-crew'
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, boat_id, {
+        'crew-a': boat_id,
+        'crew-b': 'another-boat'
+    })
+    
+    from boat.delete_boat_registration import lambda_handler
+    
+    event = mock_api_gateway_event(
+        http_method='DELETE',
+        path=f'/boat/{boat_id}',
+        path_parameters={'boat_registration_id': boat_id},
+        user_id=test_team_manager_id
+    )
+    response = lambda_handler(event, mock_lambda_context)
+    assert response['statusCode'] == 200
+    
+    crew_a = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-a'})['Item']
+    crew_b = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-b'})['Item']
+    assert crew_a['assigned_boat_id'] is None
+    assert crew_b['assigned_boat_id'] == 'another-boat'
+
+
+
+def test_delete_boat_paid_concurrently_keeps_crew(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that a boat paid between the read and the delete keeps its crew"""
+    from unittest.mock import patch
+    from database import DatabaseClient
+    
+    boat_id = 'boat-paid-concurrently'
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, boat_id, {'crew-a': boat_id})
+    boat_key = {'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'}
+    
+    original = DatabaseClient.get_item
+    
+    def read_then_pay(self, pk, sk, *args, **kwargs):
+        item = original(self, pk, sk, *args, **kwargs)
+        if sk == boat_key['SK']:
+            dynamodb_table.update_item(
+                Key=boat_key,
+                UpdateExpression='SET registration_status = :paid',
+                ExpressionAttributeValues={':paid': 'paid'}
+            )
+        return item
+    
+    from boat.delete_boat_registration import lambda_handler
+    
+    event = mock_api_gateway_event(
+        http_method='DELETE',
+        path=f'/boat/{boat_id}',
+        path_parameters={'boat_registration_id': boat_id},
+        user_id=test_team_manager_id
+    )
+    with patch.object(DatabaseClient, 'get_item', read_then_pay):
+        response = lambda_handler(event, mock_lambda_context)
+    
+    assert response['statusCode'] == 403
+    assert 'Item' in dynamodb_table.get_item(Key=boat_key)
+    crew = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-a'})['Item']
+    assert crew['assigned_boat_id'] == boat_id
+
+
+def test_assign_seat_rejects_crew_seated_elsewhere(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that a crew member whose record points at another boat is rejected"""
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, 'boat-other', {'crew-a': 'boat-other'})
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, 'boat-target', {})
+    
+    from boat.assign_seat import lambda_handler
+    
+    event = mock_api_gateway_event(
+        http_method='POST',
+        path='/boat/boat-target/seat',
+        body=json.dumps({'position': 1, 'crew_member_id': 'crew-a'}),
+        path_parameters={'boat_registration_id': 'boat-target'},
+        user_id=test_team_manager_id
+    )
+    response = lambda_handler(event, mock_lambda_context)
+    
+    assert response['statusCode'] == 409
+    assert 'already assigned to another boat' in json.loads(response['body'])['error']['message']
+
+
+
+def test_assign_seat_rejects_crew_seated_at_boat_creation(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id, test_crew_members):
+    """Test that a rower seated through create_boat_registration cannot be assigned to a second boat"""
+    from boat.create_boat_registration import lambda_handler as create_handler
+    from boat.assign_seat import lambda_handler as assign_handler
+    
+    response = create_handler(mock_api_gateway_event(
+        http_method='POST',
+        path='/boat',
+        body=json.dumps({
+            'event_type': '21km',
+            'boat_type': '4-',
+            'seats': [
+                {'position': 1, 'type': 'rower', 'crew_member_id': 'crew-1'},
+                {'position': 2, 'type': 'rower', 'crew_member_id': None},
+                {'position': 3, 'type': 'rower', 'crew_member_id': None},
+                {'position': 4, 'type': 'rower', 'crew_member_id': None}
+            ]
+        }),
+        user_id=test_team_manager_id
+    ), mock_lambda_context)
+    assert response['statusCode'] == 201
+    
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, 'boat-second', {})
+    
+    response = assign_handler(mock_api_gateway_event(
+        http_method='POST',
+        path='/boat/boat-second/seat',
+        body=json.dumps({'position': 1, 'crew_member_id': 'crew-1'}),
+        path_parameters={'boat_registration_id': 'boat-second'},
+        user_id=test_team_manager_id
+    ), mock_lambda_context)
+    
+    assert response['statusCode'] == 409
+    assert 'already assigned to another boat' in json.loads(response['body'])['error']['message']
+
+
+
+def test_assign_seat_accepts_rower_seated_last_edition(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id, monkeypatch):
+    """Test that a rower still seated in a past edition's boat can be seated in the new edition"""
+    from boat.assign_seat import lambda_handler
+    
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, 'boat-last-year', {'crew-veteran': 'boat-last-year'})
+    dynamodb_table.update_item(
+        Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-last-year'},
+        UpdateExpression='SET edition = :edition',
+        ExpressionAttributeValues={':edition': '2025'}
+    )
+    monkeypatch.setenv('EDITION', '2026')
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, 'boat-this-year', {})
+    dynamodb_table.update_item(
+        Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-this-year'},
+        UpdateExpression='SET edition = :edition',
+        ExpressionAttributeValues={':edition': '2026'}
+    )
+    
+    response = lambda_handler(mock_api_gateway_event(
+        http_method='POST',
+        path='/boat/boat-this-year/seat',
+        body=json.dumps({'position': 1, 'crew_member_id': 'crew-veteran'}),
+        path_parameters={'boat_registration_id': 'boat-this-year'},
+        user_id=test_team_manager_id
+    ), mock_lambda_context)
+    
+    assert response['statusCode'] == 200
+    crew = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-veteran'})['Item']
+    assert crew['assigned_boat_id'] == 'boat-this-year'
+
+
+def test_parallel_assignments_cannot_seat_rower_twice(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that a rower seated by a concurrent request makes the whole assignment fail"""
+    from unittest.mock import patch
+    from database import DatabaseClient
+    
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, 'boat-first', {})
+    _put_boat_with_crew(dynamodb_table, test_team_manager_id, 'boat-second', {})
+    dynamodb_table.put_item(Item={
+        'PK': f'TEAM#{test_team_manager_id}',
+        'SK': 'CREW#crew-x',
+        'crew_member_id': 'crew-x',
+        'first_name': 'Xavier',
+        'last_name': 'Rower',
+        'date_of_birth': '1990-01-15',
+        'gender': 'M',
+        'club_affiliation': 'RCPM',
+        'assigned_boat_id': None
+    })
+    
+    real_batch_get_items = DatabaseClient.batch_get_items
+    
+    def concurrent_assignment(self, *args, **kwargs):
+        # Another request seats the rower in boat-first after our read
+        items = real_batch_get_items(self, *args, **kwargs)
+        dynamodb_table.update_item(
+            Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-x'},
+            UpdateExpression='SET assigned_boat_id = :boat',
+            ExpressionAttributeValues={':boat': 'boat-first'}
+        )
+        return items
+    
+    from boat.assign_seat import lambda_handler
+    
+    event = mock_api_gateway_event(
+        http_method='POST',
+        path='/boat/boat-second/seat',
+        body=json.dumps({'position': 1, 'crew_member_id': 'crew-x'}),
+        path_parameters={'boat_registration_id': 'boat-second'},
+        user_id=test_team_manager_id
+    )
+    with patch.object(DatabaseClient, 'batch_get_items', concurrent_assignment):
+        response = lambda_handler(event, mock_lambda_context)
+    
+    assert response['statusCode'] == 409
+    
+    # The boat seat was not written either
+    boat = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-second'})['Item']
+    assert boat['seats'][0]['crew_member_id'] is None
+    crew = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-x'})['Item']
+    assert crew['assigned_boat_id'] == 'boat-first'
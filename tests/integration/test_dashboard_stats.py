@@ -0,0 +1,132 @@
+"""
+Integration tests for the stream-maintained dashboard statistics
+
+Tests the stream consumer, the rebuild endpoint and the single-read
+get_stats endpoint.
+"""
+import json
+import pytest
+
+from boto3.dynamodb.types import TypeSerializer
+
+from database import DatabaseClient
+from dashboard_stats import STATS_PK, STATS_SK, stats_deltas
+
+_serializer = TypeSerializer()
+
+
+def stream_record(old_item=None, new_item=None):
+    """Build a NEW_AND_OLD_IMAGES stream record for an item change"""
+    images = {}
+    for name, item in (('OldImage', old_item), ('NewImage', new_item)):
+        if item is not None:
+            images[name] = {key: _serializer.serialize(value) for key, value in item.items()}
+    event_name = 'MODIFY' if old_item and new_item else ('INSERT' if new_item else 'REMOVE')
+    return {'eventName': event_name, 'dynamodb': images}
+
+
+def boat(boat_id, status):
+    """Boat registration item with a registration status"""
+    return {'PK': 'TEAM#team-1', 'SK': f'BOAT#{boat_id}', 'registration_status': status}
+
+
+def test_stats_deltas():
+    """Test counter changes for inserts, status changes, removals and other items"""
+    crew = {'PK': 'TEAM#team-1', 'SK': 'CREW#crew-1'}
+
+    assert stats_deltas(None, crew) == {'total_crew_members': 1}
+    assert stats_deltas(crew, crew) == {}
+    assert stats_deltas(boat('b1', 'complete'), boat('b1', 'paid')) == {'boats_complete': -1, 'boats_paid': 1}
+    assert stats_deltas(boat('b1', 'paid'), None) == {'total_boat_registrations': -1, 'boats_paid': -1}
+    assert stats_deltas(None, {'PK': 'CONFIG', 'SK': 'SYSTEM'}) == {}
+
+
+def test_stream_consumer_updates_stats(dynamodb_table, mock_api_gateway_event, mock_lambda_context):
+    """Test that a batch of stream records is applied and served by get_stats"""
+    from admin.process_table_stream import lambda_handler as stream_handler
+    from admin.get_stats import lambda_handler as stats_handler
+
+    records = [
+        stream_record(new_item={'PK': 'TEAM#team-1', 'SK': 'CREW#crew-1'}),
+        stream_record(new_item=boat('b1', 'incomplete')),
+        stream_record(new_item=boat('b2', 'complete')),
+        stream_record(boat('b2', 'complete'), boat('b2', 'paid')),
+        stream_record(new_item={'PK': 'RENTAL_BOAT#r1', 'SK': 'METADATA', 'status': 'requested'}),
+    ]
+    stream_handler({'Records': records}, mock_lambda_context)
+    stream_handler({'Records': [stream_record(old_item=boat('b1', 'incomplete'))]}, mock_lambda_context)
+
+    response = stats_handler(
+        mock_api_gateway_event(http_method='GET', path='/admin/stats', user_id='test-admin-456', groups=['admins']),
+        mock_lambda_context
+    )
+
+    assert response['statusCode'] == 200
+    stats = json.loads(response['body'])['data']
+    assert stats['total_crew_members'] == 1
+    assert stats['total_boat_registrations'] == 1
+    assert stats['total_payments'] == 1
+    assert stats['rental_boats_reserved'] == 1
+    assert stats['boats_by_status'] == {'paid': 1}
+
+
+
+def test_stream_consumer_resets_retry_budget(dynamodb_table, mock_lambda_context):
+    """Test that retries charged by a batch do not carry over to the next warm invocation"""
+    from unittest.mock import patch
+    import database
+    from admin.process_table_stream import lambda_handler as stream_handler
+
+    db = database.get_db_client()
+    records = [stream_record(new_item=boat('b1', 'incomplete'))]
+
+    def throttled_batch(*args, **kwargs):
+        # A batch that spends the whole budget and fails
+        db._retries_used = database.RETRY_BUDGET + 1
+        raise database.ServiceOverloadedError('DynamoDB increment_counters throttled')
+
+    with patch.object(db, 'increment_counters', side_effect=throttled_batch):
+        with pytest.raises(database.ServiceOverloadedError):
+            stream_handler({'Records': records}, mock_lambda_context)
+
+    assert db._retries_used == 0
+    assert stream_handler({'Records': records}, mock_lambda_context)['deltas'] == {
+        'total_boat_registrations': 1, 'boats_incomplete': 1
+    }
+
+
+def test_rebuild_stats_endpoint(dynamodb_table, put_indexed_item, mock_api_gateway_event, mock_lambda_context):
+    """Test that rebuilt counters replace drifted ones"""
+    for i, status in enumerate(['incomplete', 'complete', 'paid', 'paid']):
+        put_indexed_item(boat(f'b{i}', status))
+    put_indexed_item({'PK': 'TEAM#team-1', 'SK': 'CREW#crew-1'})
+    dynamodb_table.put_item(Item={'PK': STATS_PK, 'SK': STATS_SK, 'total_crew_members': 42})
+
+    from admin.rebuild_stats import lambda_handler
+
+    response = lambda_handler(
+        mock_api_gateway_event(http_method='POST', path='/admin/stats/rebuild', user_id='test-admin-456', groups=['admins']),
+        mock_lambda_context
+    )
+
+    assert response['statusCode'] == 200
+    stats = json.loads(response['body'])['data']
+    assert stats['total_crew_members'] == 1
+    assert stats['total_boat_registrations'] == 4
+    assert stats['boats_by_status'] == {'incomplete': 1, 'complete': 1, 'paid': 2}
+
+    db = DatabaseClient(table_name=dynamodb_table.name)
+    assert db.get_item(STATS_PK, STATS_SK)['boats_paid'] == 2
+
+
+def test_rebuild_stats_requires_admin(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
+    """Test that team managers cannot rebuild the statistics"""
+    from admin.rebuild_stats import lambda_handler
+
+    event = mock_api_gateway_event(
+        http_method='POST',
+        path='/admin/stats/rebuild',
+        user_id=test_team_manager_id
+    )
+
+    assert lambda_handler(event, mock_lambda_context)['statusCode'] == 403
@@ -133,6 +133,62 @@ def test_bulk_update_license_verification(dynamodb_table, mock_admin_event, mock
         assert 'crew_member_id' in result
 
 
+
+def test_bulk_update_license_verification_is_transactional(dynamodb_table, mock_admin_event, mock_lambda_context, test_team_manager_id):
+    """Test that verifications are written in transactions and missing crew members are reported"""
+    from unittest.mock import patch
+    from database import DatabaseClient
+    
+    for i in range(3):
+        dynamodb_table.put_item(Item={
+            'PK': f'TEAM#{test_team_manager_id}',
+            'SK': f'CREW#crew-{i}',
+            'crew_member_id': f'crew-{i}',
+            'first_name': f'Member{i}'
+        })
+    
+    from admin.bulk_update_license_verification import lambda_handler
+    
+    verifications = [
+        {'team_manager_id': test_team_manager_id, 'crew_member_id': crew_member_id, 'status': status}
+        for crew_member_id, status in (
+            ('crew-0', 'verified_valid'),
+            ('crew-1', 'verified_valid'),
+            ('crew-missing', 'verified_valid'),
+            ('crew-2', 'verified_invalid'),
+            # The same crew member twice goes to a second transaction
+            ('crew-0', 'manually_verified_invalid')
+        )
+    ]
+    event = mock_admin_event(
+        http_method='POST',
+        path='/admin/crew/bulk-license-verification',
+        body=json.dumps({'verifications': verifications})
+    )
+    
+    transactions = []
+    original = DatabaseClient.transact_update_items
+    
+    def counted(self, operations):
+        transactions.append(len(operations))
+        return original(self, operations)
+    
+    with patch.object(DatabaseClient, 'transact_update_items', counted), \
+            patch.object(DatabaseClient, 'update_item', side_effect=AssertionError('no item-by-item writes')):
+        response = lambda_handler(event, mock_lambda_context)
+    
+    data = json.loads(response['body'])['data']
+    assert data['success_count'] == 4
+    assert data['failure_count'] == 1
+    assert data['results'][2] == {'crew_member_id': 'crew-missing', 'success': False, 'error': 'Crew member not found'}
+    assert transactions == [3, 1]
+    
+    crew = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-0'})['Item']
+    assert crew['license_verification_status'] == 'manually_verified_invalid'
+    # A missing crew member is not created
+    assert 'Item' not in dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'CREW#crew-missing'})
+
+
 def test_non_admin_cannot_update_license_verification(dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_team_manager_id):
     """Test that non-admin users cannot update license verification"""
     # Create crew member
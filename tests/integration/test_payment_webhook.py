@@ -0,0 +1,63 @@
+"""
+Integration tests for the Stripe webhook boat status update
+Tests that paid status is written in place with mock DynamoDB
+"""
+import pytest
+
+from database import get_db_client
+
+
+@pytest.fixture
+def unpaid_boats(dynamodb_table, test_team_manager_id):
+    """Create one complete boat with pricing and one already paid boat"""
+    boats = [
+        {
+            'PK': f'TEAM#{test_team_manager_id}',
+            'SK': 'BOAT#boat-complete',
+            'boat_registration_id': 'boat-complete',
+            'registration_status': 'complete',
+            'boat_request_comment': 'Need a boat',
+            'pricing': {'total': 100}
+        },
+        {
+            'PK': f'TEAM#{test_team_manager_id}',
+            'SK': 'BOAT#boat-paid',
+            'boat_registration_id': 'boat-paid',
+            'registration_status': 'paid',
+            'payment_id': 'payment-old',
+            'pricing': {'total': 80}
+        }
+    ]
+    for boat in boats:
+        dynamodb_table.put_item(Item=boat)
+    return boats
+
+
+def test_update_boat_status_to_paid(dynamodb_table, test_team_manager_id, unpaid_boats):
+    """Test that boats are marked paid and their pricing locked without rewriting other fields"""
+    from payment.confirm_payment_webhook import update_boat_status_to_paid
+    
+    update_boat_status_to_paid(test_team_manager_id, unpaid_boats[:1], 'payment-new', get_db_client())
+    
+    boat = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-complete'})['Item']
+    assert boat['registration_status'] == 'paid'
+    assert boat['payment_id'] == 'payment-new'
+    assert boat['locked_pricing'] == {'total': 100}
+    assert boat['boat_request_comment'] == 'Need a boat'
+
+
+def test_update_boat_status_to_paid_skips_paid_and_deleted_boats(dynamodb_table, test_team_manager_id, unpaid_boats):
+    """Test that a redelivered webhook does not overwrite paid boats or recreate deleted ones"""
+    from payment.confirm_payment_webhook import update_boat_status_to_paid
+    
+    deleted_boat = {'boat_registration_id': 'boat-deleted', 'pricing': {'total': 50}}
+    update_boat_status_to_paid(
+        test_team_manager_id, unpaid_boats[1:] + [deleted_boat], 'payment-new', get_db_client()
+    )
+    
+    boat = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-paid'})['Item']
+    assert boat['payment_id'] == 'payment-old'
+    assert 'locked_pricing' not in boat
+    
+    response = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-deleted'})
+    assert 'Item' not in response
@@ -327,3 +327,54 @@ def test_audit_log_created_on_reset(dynamodb_table):
     assert audit_entry['action'] == 'reset_permission_config'
     assert audit_entry['admin_email'] == 'admin@example.com'
     assert 'timestamp' in audit_entry
+
+
+def test_configuration_change_invalidates_warm_permission_checker(dynamodb_table):
+    """Test that the container-level checker keeps its cache until the configuration version changes."""
+    from access_control import get_permission_checker
+    
+    dynamodb_table.put_item(
+        Item={
+            'PK': 'CONFIG',
+            'SK': 'PERMISSIONS',
+            'permissions': get_default_permissions()
+        }
+    )
+    
+    checker = get_permission_checker('test-table')
+    checker.sync_config_version()
+    assert checker.get_permission_matrix()['create_crew_member']['before_registration'] is False
+    
+    custom_permissions = get_default_permissions()
+    custom_permissions['create_crew_member']['before_registration'] = True
+    
+    # Written without bumping the version: warm requests keep the cached matrix
+    dynamodb_table.put_item(
+        Item={
+            'PK': 'CONFIG',
+            'SK': 'PERMISSIONS',
+            'permissions': custom_permissions
+        }
+    )
+    assert get_permission_checker('test-table') is checker
+    checker.sync_config_version()
+    assert checker.get_permission_matrix()['create_crew_member']['before_registration'] is False
+    
+    # The admin API bumps the version: the next request reloads the matrix
+    update_event = {
+        'httpMethod': 'PUT',
+        'body': json.dumps({
+            'permissions': custom_permissions
+        }),
+        'requestContext': {
+            'authorizer': {
+                'claims': {
+                    'email': 'admin@example.com'
+                }
+            }
+        }
+    }
+    
+    assert update_config_handler(update_event, None)['statusCode'] == 200
+    checker.sync_config_version()
+    assert checker.get_permission_matrix()['create_crew_member']['before_registration'] is True
@@ -84,3 +84,94 @@ def test_list_clubs_public(dynamodb_table, mock_api_gateway_event, mock_lambda_c
     assert 'RCPM' in club_names
     assert 'Club A' in club_names
     assert 'Club B' in club_names
+
+
+def seed_clubs(dynamodb_table, names):
+    """Seed clubs named as given, with ids club-0, club-1, ..."""
+    for index, name in enumerate(names):
+        dynamodb_table.put_item(Item={
+            'PK': 'CLUB', 'SK': f'club-{index}', 'club_id': f'club-{index}',
+            'name': name, 'url': '', 'phone': ['0100000000']
+        })
+
+
+def test_list_clubs_prefix_search(dynamodb_table, mock_api_gateway_event, mock_lambda_context):
+    """Test that ?q= matches name word prefixes, ignoring case and accents, with a capped result"""
+    seed_clubs(dynamodb_table, [
+        'AVIRON CLUB DE NÎMES', 'CLUB NAUTIQUE DE NICE', 'ASPTT D’HYÈRES AVIRON',
+        'SOCIÉTÉ NAUTIQUE DE NANTES', 'ROWING CLUB DE PARIS'
+    ])
+    from club.list_clubs import lambda_handler
+
+    def search(**query_parameters):
+        event = mock_api_gateway_event(http_method='GET', path='/clubs', query_parameters=query_parameters)
+        return lambda_handler(event, mock_lambda_context)
+
+    data = json.loads(search(q='ni')['body'])['data']
+    assert [club['name'] for club in data['clubs']] == ['AVIRON CLUB DE NÎMES', 'CLUB NAUTIQUE DE NICE']
+    assert data['truncated'] is False
+
+    # Every word must match, names starting with the query come first
+    data = json.loads(search(q='Hyeres avi')['body'])['data']
+    assert [club['club_id'] for club in data['clubs']] == ['club-2']
+    data = json.loads(search(q='club')['body'])['data']
+    assert [club['name'] for club in data['clubs']] == [
+        'CLUB NAUTIQUE DE NICE', 'AVIRON CLUB DE NÎMES', 'ROWING CLUB DE PARIS'
+    ]
+    assert set(data['clubs'][0]) == {'club_id', 'name', 'url'}
+
+    data = json.loads(search(q='nautique', limit='1')['body'])['data']
+    assert data['count'] == 1 and data['truncated'] is True
+
+    assert json.loads(search(q='zzz')['body'])['data']['clubs'] == []
+    assert search(q='club', limit='abc')['statusCode'] == 400
+
+
+def test_list_clubs_serves_prebuilt_directory(dynamodb_table, mock_api_gateway_event, mock_lambda_context, aws_credentials, monkeypatch):
+    """Test that the stream consumer rewrites the directory and list_clubs revalidates it"""
+    import boto3
+    from boto3.dynamodb.types import TypeSerializer
+    from moto import mock_s3
+    import club_directory
+    from club.list_clubs import lambda_handler
+    from admin.process_table_stream import lambda_handler as stream_handler
+
+    monkeypatch.setattr(club_directory, 'CLUB_DIRECTORY_TTL', 0)
+    serializer = TypeSerializer()
+
+    def club_record(club_id, name):
+        item = {'PK': 'CLUB', 'SK': club_id, 'club_id': club_id, 'name': name, 'url': ''}
+        dynamodb_table.put_item(Item=item)
+        return {'eventName': 'INSERT', 'dynamodb': {
+            'Keys': {'PK': {'S': 'CLUB'}, 'SK': {'S': club_id}},
+            'NewImage': {key: serializer.serialize(value) for key, value in item.items()}
+        }}
+
+    def list_clubs(headers=None):
+        event = mock_api_gateway_event(http_method='GET', path='/clubs')
+        event['headers'].update(headers or {})
+        return lambda_handler(event, mock_lambda_context)
+
+    with mock_s3():
+        s3 = boto3.client('s3', region_name='eu-west-3')
+        s3.create_bucket(Bucket='test-snapshot-bucket', CreateBucketConfiguration={'LocationConstraint': 'eu-west-3'})
+        monkeypatch.setenv('SNAPSHOT_BUCKET', 'test-snapshot-bucket')
+
+        stream_handler({'Records': [club_record('club-a', 'Club A')]}, mock_lambda_context)
+        s3.head_object(Bucket='test-snapshot-bucket', Key=club_directory.CLUB_DIRECTORY_KEY)
+
+        response = list_clubs()
+        assert response['statusCode'] == 200
+        assert response['headers']['Cache-Control'].startswith('public, max-age=')
+        assert json.loads(response['body'])['data']['count'] == 1
+        etag = response['headers']['ETag']
+
+        # Unchanged directory: conditional requests are answered with 304
+        assert list_clubs({'If-None-Match': etag})['statusCode'] == 304
+
+        stream_handler({'Records': [club_record('club-b', 'Club B')]}, mock_lambda_context)
+
+        response = list_clubs({'If-None-Match': etag})
+        assert response['statusCode'] == 200
+        assert response['headers']['ETag'] != etag
+        assert [club['name'] for club in json.loads(response['body'])['data']['clubs']] == ['Club A', 'Club B']
@@ -3,6 +3,7 @@ Integration tests for race API endpoints
 Tests Lambda handlers with mock DynamoDB
 """
 import json
+import time
 import pytest
 
 
@@ -123,3 +124,91 @@ def test_list_races_filtered_by_event_type(dynamodb_table, mock_api_gateway_even
     # All returned races should be 21km
     for race in body['data']['races']:
         assert race['event_type'] == '21km'
+
+
+def seed_catalogue_races(table):
+    """Seed races covering each filter"""
+    for race_id, event_type, boat_type, gender in (
+        ('SM01', '21km', '4-', 'M'),
+        ('SM02', '21km', '4-', 'F'),
+        ('SM03', '21km', '8+', 'M'),
+        ('M01', '42km', '4-', 'M'),
+    ):
+        table.put_item(Item={
+            'PK': 'RACE', 'SK': race_id, 'race_id': race_id, 'event_type': event_type,
+            'boat_type': boat_type, 'age_category': 'senior', 'gender_category': gender
+        })
+
+
+def test_list_races_etag_and_not_modified(dynamodb_table, mock_api_gateway_event, mock_lambda_context):
+    """Test that list_races combines filters, returns a weak ETag and answers 304"""
+    import race_catalogue
+    from race.list_races import lambda_handler
+    
+    seed_catalogue_races(dynamodb_table)
+    
+    event = mock_api_gateway_event(
+        http_method='GET',
+        path='/races',
+        query_parameters={'event_type': '21km', 'boat_type': '4-', 'gender_category': 'M'}
+    )
+    response = lambda_handler(event, mock_lambda_context)
+    
+    assert response['statusCode'] == 200
+    assert [race['race_id'] for race in json.loads(response['body'])['data']['races']] == ['SM01']
+    etag = response['headers']['ETag']
+    assert etag.startswith('W/"') and response['headers']['Cache-Control'] == 'public, no-cache'
+    
+    # A cold container gives the same races the same ETag, with a fresh body
+    race_catalogue._catalogue = None
+    time.sleep(0.001)
+    again = lambda_handler(event, mock_lambda_context)
+    assert again['headers']['ETag'] == etag
+    assert json.loads(again['body'])['timestamp'] != json.loads(response['body'])['timestamp']
+    
+    event['headers']['If-None-Match'] = etag
+    not_modified = lambda_handler(event, mock_lambda_context)
+    assert not_modified['statusCode'] == 304
+    assert not_modified['body'] == ''
+    assert not_modified['headers']['ETag'] == etag
+    
+    # Another filter combination has its own ETag
+    event['queryStringParameters'] = {'event_type': '21km'}
+    other = lambda_handler(event, mock_lambda_context)
+    assert other['statusCode'] == 200
+    assert [race['race_id'] for race in json.loads(other['body'])['data']['races']] == ['SM01', 'SM02', 'SM03']
+
+
+def test_list_races_reloads_changed_catalogue(dynamodb_table, mock_api_gateway_event, mock_lambda_context, monkeypatch):
+    """Test that a race change seen by the stream consumer reaches warm containers"""
+    import race_catalogue
+    from boto3.dynamodb.types import TypeSerializer
+    from race.list_races import lambda_handler
+    from admin.process_table_stream import lambda_handler as stream_handler
+    
+    seed_catalogue_races(dynamodb_table)
+    monkeypatch.setattr(race_catalogue, 'RACE_CATALOGUE_TTL', 0)
+    
+    event = mock_api_gateway_event(http_method='GET', path='/races')
+    response = lambda_handler(event, mock_lambda_context)
+    assert len(json.loads(response['body'])['data']['races']) == 4
+    
+    new_race = {'PK': 'RACE', 'SK': 'M02', 'race_id': 'M02', 'event_type': '42km'}
+    dynamodb_table.put_item(Item=new_race)
+    # Without a version change the cached catalogue is still current
+    assert lambda_handler(event, mock_lambda_context)['headers']['ETag'] == response['headers']['ETag']
+    
+    serializer = TypeSerializer()
+    stream_handler({'Records': [{
+        'eventName': 'INSERT',
+        'dynamodb': {
+            'Keys': {'PK': {'S': 'RACE'}, 'SK': {'S': 'M02'}},
+            'NewImage': {key: serializer.serialize(value) for key, value in new_race.items()}
+        }
+    }]}, mock_lambda_context)
+    
+    event['headers']['If-None-Match'] = response['headers']['ETag']
+    reloaded = lambda_handler(event, mock_lambda_context)
+    assert reloaded['statusCode'] == 200
+    assert reloaded['headers']['ETag'] != response['headers']['ETag']
+    assert len(json.loads(reloaded['body'])['data']['races']) == 5
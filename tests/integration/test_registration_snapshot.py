@@ -0,0 +1,217 @@
+"""
+Integration tests for the registration snapshot
+
+Tests the stream-fed change sets and their compaction, the rebuild endpoint
+and the exports' fast mode.
+"""
+import json
+import time
+from datetime import datetime, timezone
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.types import TypeSerializer
+from moto import mock_s3
+
+import registration_snapshot
+from registration_snapshot import (
+    SNAPSHOT_CHANGES_PREFIX,
+    load_snapshot,
+    compact_snapshot,
+    snapshot_db_client,
+    write_snapshot_changes
+)
+
+_serializer = TypeSerializer()
+
+BUCKET = 'test-snapshot-bucket'
+
+
+@pytest.fixture
+def s3_bucket(aws_credentials, monkeypatch):
+    """Mock S3 bucket configured as the snapshot bucket"""
+    with mock_s3():
+        s3 = boto3.client('s3', region_name='eu-west-3')
+        s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={'LocationConstraint': 'eu-west-3'})
+        monkeypatch.setenv('SNAPSHOT_BUCKET', BUCKET)
+        yield s3
+
+
+def stream_record(sequence, old_item=None, new_item=None, created=None):
+    """Build a NEW_AND_OLD_IMAGES stream record for an item change"""
+    item = new_item or old_item
+    images = {
+        'Keys': {'PK': {'S': item['PK']}, 'SK': {'S': item['SK']}},
+        'SequenceNumber': str(sequence),
+        'ApproximateCreationDateTime': created or int(time.time())
+    }
+    for name, image in (('OldImage', old_item), ('NewImage', new_item)):
+        if image is not None:
+            images[name] = {key: _serializer.serialize(value) for key, value in image.items()}
+    event_name = 'MODIFY' if old_item and new_item else ('INSERT' if new_item else 'REMOVE')
+    return {'eventName': event_name, 'dynamodb': images}
+
+
+def boat(boat_id, status='complete'):
+    """Boat registration item"""
+    return {
+        'PK': 'TEAM#team-1', 'SK': f'BOAT#{boat_id}', 'boat_registration_id': boat_id,
+        'registration_status': status, 'event_type': '42km', 'boat_type': '4+',
+        'GSI5PK': 'BOAT', 'GSI5SK': 'TEAM#team-1'
+    }
+
+
+def pending_changes(s3):
+    """Keys of the pending change sets"""
+    response = s3.list_objects_v2(Bucket=BUCKET, Prefix=SNAPSHOT_CHANGES_PREFIX)
+    return [entry['Key'] for entry in response.get('Contents', [])]
+
+
+def admin_event(mock_api_gateway_event, path, method='GET', query_parameters=None):
+    """Admin API Gateway event"""
+    return mock_api_gateway_event(
+        http_method=method, path=path, query_parameters=query_parameters,
+        user_id='test-admin-456', groups=['admins']
+    )
+
+
+def test_change_sets_are_applied_and_compacted(dynamodb_table, s3_bucket, mock_api_gateway_event, mock_lambda_context):
+    """Test that stream batches are applied on top of the base and merged into it"""
+    from admin.rebuild_snapshot import lambda_handler as rebuild_handler
+    from admin.process_table_stream import lambda_handler as stream_handler
+
+    response = rebuild_handler(admin_event(mock_api_gateway_event, '/admin/snapshot/rebuild', 'POST'), mock_lambda_context)
+    assert response['statusCode'] == 200
+
+    batch = [
+        stream_record(1, new_item=boat('b1')),
+        stream_record(2, new_item=boat('b2')),
+        stream_record(3, new_item={'PK': 'CONFIG', 'SK': 'SYSTEM'}),
+    ]
+    stream_handler({'Records': batch}, mock_lambda_context)
+    # A retried batch overwrites its own change set
+    stream_handler({'Records': batch}, mock_lambda_context)
+    removed_at = int(time.time()) + 60
+    stream_handler({'Records': [stream_record(4, old_item=boat('b1'), created=removed_at)]}, mock_lambda_context)
+
+    assert len(pending_changes(s3_bucket)) == 2
+    items, watermark = load_snapshot(s3_bucket)
+    assert sorted(key for key in items if '|BOAT#' in key) == ['TEAM#team-1|BOAT#b2']
+    assert 'CONFIG|SYSTEM' not in items
+    assert watermark == datetime.fromtimestamp(removed_at, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000000Z')
+
+    assert compact_snapshot(s3_bucket) is True
+    assert pending_changes(s3_bucket) == []
+    assert load_snapshot(s3_bucket) == (items, watermark)
+
+
+def test_change_sets_without_bucket_are_skipped(monkeypatch):
+    """Test that the stream consumer works without a snapshot bucket"""
+    monkeypatch.delenv('SNAPSHOT_BUCKET', raising=False)
+
+    assert write_snapshot_changes([stream_record(1, new_item=boat('b1'))]) is None
+    assert load_snapshot() == (None, None)
+
+
+def test_export_fast_mode_reads_snapshot(dynamodb_table, s3_bucket, mock_api_gateway_event, mock_lambda_context):
+    """Test that fast mode serves the snapshot while the default stays live"""
+    from admin.rebuild_snapshot import lambda_handler as rebuild_handler
+    from admin.export_boat_registrations_json import lambda_handler as export_handler
+    from admin.export_races_json import lambda_handler as races_handler
+
+    dynamodb_table.put_item(Item=boat('b1'))
+    dynamodb_table.put_item(Item={
+        'PK': 'USER#team-1', 'SK': 'PROFILE', 'first_name': 'Jean', 'last_name': 'Dupont',
+        'GSI5PK': 'PROFILE', 'GSI5SK': 'USER#team-1'
+    })
+    response = rebuild_handler(admin_event(mock_api_gateway_event, '/admin/snapshot/rebuild', 'POST'), mock_lambda_context)
+    watermark = json.loads(response['body'])['data']['watermark']
+
+    # Written after the rebuild, without a stream consumer to pick it up
+    dynamodb_table.put_item(Item=boat('b2'))
+
+    path = '/admin/export/boat-registrations-json'
+    fast = json.loads(export_handler(
+        admin_event(mock_api_gateway_event, path, query_parameters={'mode': 'fast'}), mock_lambda_context
+    )['body'])['data']
+    live = json.loads(export_handler(admin_event(mock_api_gateway_event, path), mock_lambda_context)['body'])['data']
+
+    assert (fast['source'], fast['snapshot_watermark'], fast['total_count']) == ('snapshot', watermark, 1)
+    assert fast['boats'][0]['team_manager_name'] == 'Jean Dupont'
+    assert (live['source'], live['snapshot_watermark'], live['total_count']) == ('live', None, 2)
+
+    races = json.loads(races_handler(
+        admin_event(mock_api_gateway_event, '/admin/export/races-json', query_parameters={'mode': 'fast'}),
+        mock_lambda_context
+    )['body'])['data']
+    assert races['source'] == 'snapshot'
+    assert races['total_boats'] == 1
+    assert races['config']['competition_date']
+
+
+def test_export_fast_mode_falls_back_to_live(dynamodb_table, s3_bucket, mock_api_gateway_event, mock_lambda_context):
+    """Test that fast mode exports live data when no snapshot was built"""
+    from admin.export_crew_members_json import lambda_handler
+
+    dynamodb_table.put_item(Item={
+        'PK': 'TEAM#team-1', 'SK': 'CREW#crew-1', 'crew_member_id': 'crew-1',
+        'GSI5PK': 'CREW', 'GSI5SK': 'TEAM#team-1'
+    })
+
+    response = lambda_handler(
+        admin_event(mock_api_gateway_event, '/admin/export/crew-members-json', query_parameters={'mode': 'fast'}),
+        mock_lambda_context
+    )
+
+    data = json.loads(response['body'])['data']
+    assert data['source'] == 'live'
+    assert data['snapshot_watermark'] is None
+    assert data['total_count'] == 1
+
+
+
+def test_load_snapshot_survives_concurrent_compaction(dynamodb_table, s3_bucket, monkeypatch,
+                                                      mock_api_gateway_event, mock_lambda_context):
+    """Test that a compaction between the base read and the listing loses no change"""
+    from admin.rebuild_snapshot import lambda_handler as rebuild_handler
+    from admin.process_table_stream import lambda_handler as stream_handler
+
+    rebuild_handler(admin_event(mock_api_gateway_event, '/admin/snapshot/rebuild', 'POST'), mock_lambda_context)
+    stream_handler({'Records': [stream_record(1, new_item=boat('b1'))]}, mock_lambda_context)
+    stream_handler({'Records': [stream_record(2, new_item=boat('b2'))]}, mock_lambda_context)
+
+    list_changes = registration_snapshot._list_changes
+    compacted = []
+
+    def list_after_compaction(s3, bucket):
+        # Another container compacts right after the first base read
+        if not compacted:
+            monkeypatch.setattr(registration_snapshot, '_list_changes', list_changes)
+            compacted.append(compact_snapshot(s3))
+            monkeypatch.setattr(registration_snapshot, '_list_changes', list_after_compaction)
+        return list_changes(s3, bucket)
+
+    monkeypatch.setattr(registration_snapshot, '_list_changes', list_after_compaction)
+    items, _ = load_snapshot(s3_bucket)
+
+    assert compacted == [True]
+    assert sorted(key for key in items if '|BOAT#' in key) == ['TEAM#team-1|BOAT#b1', 'TEAM#team-1|BOAT#b2']
+
+
+def test_snapshot_client_runs_export_queries(dynamodb_table, s3_bucket, mock_api_gateway_event, mock_lambda_context):
+    """Test the entity index reads of the exports against the in-memory snapshot table"""
+    from admin.rebuild_snapshot import lambda_handler as rebuild_handler
+    from admin.process_table_stream import lambda_handler as stream_handler
+
+    for i in range(5):
+        dynamodb_table.put_item(Item=boat(f'b{i}', status='complete' if i % 2 else 'incomplete'))
+    rebuild_handler(admin_event(mock_api_gateway_event, '/admin/snapshot/rebuild', 'POST'), mock_lambda_context)
+    stream_handler({'Records': [stream_record(1, old_item=boat('b0'))]}, mock_lambda_context)
+
+    db, _ = snapshot_db_client(s3_bucket)
+
+    boats = list(db.iter_entities('BOAT', attributes=['boat_registration_id'], page_size=2))
+    assert sorted(boat['boat_registration_id'] for boat in boats) == ['b1', 'b2', 'b3', 'b4']
+    assert all(set(boat) == {'boat_registration_id'} for boat in boats)
+    assert db.count_entities('BOAT', filter_expression=Attr('registration_status').eq('complete')) == 2
@@ -0,0 +1,137 @@
+"""
+Integration tests for the boat and crew activity counters on user profiles
+
+Tests that creating and deleting crew members keeps the counters up to
+date and that team managers are listed from the profiles alone.
+"""
+import json
+from unittest.mock import patch
+
+from database import DatabaseClient, entity_index_keys
+from team_activity import record_team_activity, CREW_COUNT
+
+
+def seed_profile(table, user_id, last_name, **counters):
+    """Create a user profile with optional activity counters"""
+    table.put_item(Item={
+        'PK': f'USER#{user_id}',
+        'SK': 'PROFILE',
+        'user_id': user_id,
+        'first_name': 'Test',
+        'last_name': last_name,
+        'email': f'{user_id}@test.com',
+        **counters,
+        **entity_index_keys(f'USER#{user_id}', 'PROFILE')
+    })
+
+
+def list_team_managers(mock_api_gateway_event, mock_lambda_context):
+    """Call the admin team manager list and return the listed user IDs"""
+    from admin.list_team_managers import lambda_handler
+
+    event = mock_api_gateway_event(
+        http_method='GET',
+        path='/admin/team-managers',
+        user_id='test-admin-456',
+        groups=['admins']
+    )
+    response = lambda_handler(event, mock_lambda_context)
+    assert response['statusCode'] == 200
+    return [tm['user_id'] for tm in json.loads(response['body'])['data']['team_managers']]
+
+
+def test_crew_create_and_delete_update_profile(dynamodb_table, mock_api_gateway_event, mock_lambda_context,
+                                               test_team_manager_id):
+    """Test that the crew counter follows creates and deletes"""
+    seed_profile(dynamodb_table, test_team_manager_id, 'Manager')
+
+    from crew.create_crew_member import lambda_handler as create_handler
+    from crew.delete_crew_member import lambda_handler as delete_handler
+
+    create_event = mock_api_gateway_event(
+        http_method='POST',
+        path='/crew',
+        body=json.dumps({
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'date_of_birth': '1990-01-01',
+            'gender': 'M',
+            'license_number': 'ABC123',
+            'club_affiliation': 'Test Club'
+        }),
+        user_id=test_team_manager_id
+    )
+    create_response = create_handler(create_event, mock_lambda_context)
+    assert create_response['statusCode'] == 201
+    crew_member_id = json.loads(create_response['body'])['data']['crew_member_id']
+
+    profile_key = {'PK': f'USER#{test_team_manager_id}', 'SK': 'PROFILE'}
+    assert dynamodb_table.get_item(Key=profile_key)['Item'][CREW_COUNT] == 1
+    assert list_team_managers(mock_api_gateway_event, mock_lambda_context) == [test_team_manager_id]
+
+    delete_event = mock_api_gateway_event(
+        http_method='DELETE',
+        path=f'/crew/{crew_member_id}',
+        path_parameters={'crew_member_id': crew_member_id},
+        user_id=test_team_manager_id
+    )
+    assert delete_handler(delete_event, mock_lambda_context)['statusCode'] == 200
+
+    assert dynamodb_table.get_item(Key=profile_key)['Item'][CREW_COUNT] == 0
+    assert list_team_managers(mock_api_gateway_event, mock_lambda_context) == []
+
+
+def test_team_managers_listed_from_profiles_alone(dynamodb_table, mock_api_gateway_event, mock_lambda_context):
+    """Test that only profiles with activity are listed, without reading team partitions"""
+    seed_profile(dynamodb_table, 'user-boats', 'Boats', boat_count=2, crew_count=0)
+    seed_profile(dynamodb_table, 'user-crew', 'Crew', crew_count=3)
+    seed_profile(dynamodb_table, 'user-idle', 'Idle', boat_count=0, crew_count=0)
+    seed_profile(dynamodb_table, 'user-new', 'New')
+
+    with patch.object(DatabaseClient, 'iter_query') as mock_iter_query, \
+            patch.object(DatabaseClient, 'query_by_pk') as mock_query_by_pk:
+        user_ids = list_team_managers(mock_api_gateway_event, mock_lambda_context)
+
+    mock_iter_query.assert_not_called()
+    mock_query_by_pk.assert_not_called()
+    assert user_ids == ['user-boats', 'user-crew']
+
+
+def test_activity_without_profile_creates_nothing(dynamodb_table):
+    """Test that a counter update for a user without a profile is skipped"""
+    db = DatabaseClient(table_name=dynamodb_table.name)
+
+    record_team_activity(db, 'no-profile', CREW_COUNT, 1)
+
+    assert 'Item' not in dynamodb_table.get_item(Key={'PK': 'USER#no-profile', 'SK': 'PROFILE'})
+
+
+def test_delete_that_removed_nothing_keeps_counter(dynamodb_table, mock_api_gateway_event, mock_lambda_context,
+                                                   test_team_manager_id):
+    """Test that a delete racing another delete of the same boat does not decrement twice"""
+    seed_profile(dynamodb_table, test_team_manager_id, 'Manager', boat_count=1)
+    boat_key = {'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-1'}
+    dynamodb_table.put_item(Item={**boat_key, 'boat_registration_id': 'boat-1',
+                                  'registration_status': 'incomplete', 'seats': []})
+
+    from boat.delete_boat_registration import lambda_handler
+
+    original = DatabaseClient.get_item
+
+    def read_then_delete_concurrently(self, pk, sk, *args, **kwargs):
+        item = original(self, pk, sk, *args, **kwargs)
+        if sk == boat_key['SK']:
+            dynamodb_table.delete_item(Key=boat_key)
+        return item
+
+    event = mock_api_gateway_event(
+        http_method='DELETE',
+        path='/boat/boat-1',
+        path_parameters={'boat_registration_id': 'boat-1'},
+        user_id=test_team_manager_id
+    )
+    with patch.object(DatabaseClient, 'get_item', read_then_delete_concurrently):
+        assert lambda_handler(event, mock_lambda_context)['statusCode'] == 200
+
+    profile = dynamodb_table.get_item(Key={'PK': f'USER#{test_team_manager_id}', 'SK': 'PROFILE'})['Item']
+    assert profile['boat_count'] == 1
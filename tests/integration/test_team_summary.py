@@ -0,0 +1,196 @@
+"""
+Integration tests for the per-team financial summary item
+
+Tests the summary served by GET /payment/summary, its refresh from the
+table stream and on pricing changes, and its use by the race export.
+"""
+import json
+from decimal import Decimal
+
+from database import DatabaseClient
+from team_summary import TEAM_SUMMARY_SK, refresh_team_summary, get_team_summary
+
+
+def seed_team(table, team_manager_id):
+    """Seed one external crew member, two complete skiffs and one payment"""
+    table.put_item(Item={
+        'PK': f'TEAM#{team_manager_id}',
+        'SK': 'CREW#crew-1',
+        'crew_member_id': 'crew-1',
+        'club_affiliation': 'Other Club'
+    })
+    for boat_id in ('boat-1', 'boat-2'):
+        table.put_item(Item={
+            'PK': f'TEAM#{team_manager_id}',
+            'SK': f'BOAT#{boat_id}',
+            'boat_registration_id': boat_id,
+            'boat_type': 'skiff',
+            'registration_status': 'complete',
+            'seats': [{'position': 1, 'type': 'rower', 'crew_member_id': 'crew-1'}]
+        })
+    table.put_item(Item={
+        'PK': f'TEAM#{team_manager_id}',
+        'SK': 'PAYMENT#payment-1',
+        'payment_id': 'payment-1',
+        'amount': Decimal('30.00'),
+        'paid_at': '2026-01-15T10:00:00Z',
+        'boat_registration_ids': ['boat-0'],
+        'status': 'succeeded'
+    })
+
+
+def set_pricing(table, base_seat_price, updated_at):
+    """Store a pricing configuration"""
+    table.put_item(Item={
+        'PK': 'CONFIG',
+        'SK': 'PRICING',
+        'base_seat_price': Decimal(base_seat_price),
+        'updated_at': updated_at
+    })
+
+
+def test_payment_summary_is_stored_and_reused(dynamodb_table, mock_api_gateway_event, mock_lambda_context,
+                                              test_team_manager_id):
+    """Test that the first read stores the summary and later reads use it"""
+    seed_team(dynamodb_table, test_team_manager_id)
+    set_pricing(dynamodb_table, '20.00', '2026-01-01T00:00:00Z')
+
+    from payment.get_payment_summary import lambda_handler
+
+    event = mock_api_gateway_event(http_method='GET', path='/payment/summary', user_id=test_team_manager_id)
+    data = json.loads(lambda_handler(event, mock_lambda_context)['body'])['data']
+
+    assert data['paid'] == {'total_amount': 30.0, 'currency': 'EUR', 'payment_count': 1, 'boat_count': 1}
+    assert data['outstanding']['total_amount'] == 40.0
+    assert data['outstanding']['boat_count'] == 2
+    assert data['total_registered_boats'] == 2
+    assert data['payment_status'] == 'Partial Payment'
+
+    stored = dynamodb_table.get_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': TEAM_SUMMARY_SK})['Item']
+    assert stored['boats_by_status'] == {'complete': 2}
+
+    # The stored summary is served as is: a change not yet seen by the stream is not visible
+    dynamodb_table.delete_item(Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': 'BOAT#boat-2'})
+    data = json.loads(lambda_handler(event, mock_lambda_context)['body'])['data']
+    assert data['total_registered_boats'] == 2
+
+
+def test_stream_refreshes_touched_teams(dynamodb_table, mock_lambda_context, test_team_manager_id):
+    """Test that a recorded payment and paid boat update the team summary"""
+    seed_team(dynamodb_table, test_team_manager_id)
+    db = DatabaseClient(table_name=dynamodb_table.name)
+    assert get_team_summary(db, test_team_manager_id, None)['payment_count'] == 1
+
+    dynamodb_table.put_item(Item={
+        'PK': f'TEAM#{test_team_manager_id}',
+        'SK': 'PAYMENT#payment-2',
+        'payment_id': 'payment-2',
+        'amount': Decimal('40.00'),
+        'paid_at': '2026-01-16T10:00:00Z',
+        'boat_registration_ids': ['boat-1', 'boat-2'],
+        'status': 'succeeded'
+    })
+    for boat_id in ('boat-1', 'boat-2'):
+        dynamodb_table.update_item(
+            Key={'PK': f'TEAM#{test_team_manager_id}', 'SK': f'BOAT#{boat_id}'},
+            UpdateExpression='SET registration_status = :paid',
+            ExpressionAttributeValues={':paid': 'paid'}
+        )
+
+    from admin.process_table_stream import lambda_handler
+
+    records = [
+        {'eventName': 'MODIFY', 'dynamodb': {'Keys': {
+            'PK': {'S': f'TEAM#{test_team_manager_id}'}, 'SK': {'S': sk}
+        }}}
+        for sk in ('PAYMENT#payment-2', 'BOAT#boat-1', 'BOAT#boat-2')
+    ]
+    result = lambda_handler({'Records': records}, mock_lambda_context)
+
+    assert result['teams'] == 1
+    summary = db.get_item(f'TEAM#{test_team_manager_id}', TEAM_SUMMARY_SK)
+    assert summary['total_paid'] == Decimal('70.00')
+    assert summary['boats_paid_count'] == 3
+    assert summary['outstanding_balance'] == 0
+    assert summary['boats_by_status'] == {'paid': 2}
+    assert summary['payment_status'] == 'Paid in Full'
+
+
+def test_pricing_change_refreshes_summary(dynamodb_table, test_team_manager_id):
+    """Test that a summary priced with an older configuration is recomputed on read"""
+    seed_team(dynamodb_table, test_team_manager_id)
+    db = DatabaseClient(table_name=dynamodb_table.name)
+
+    set_pricing(dynamodb_table, '20.00', '2026-01-01T00:00:00Z')
+    old_pricing = db.get_item('CONFIG', 'PRICING')
+    assert get_team_summary(db, test_team_manager_id, old_pricing)['outstanding_balance'] == Decimal('40')
+
+    set_pricing(dynamodb_table, '25.00', '2026-02-01T00:00:00Z')
+    new_pricing = dynamodb_table.get_item(Key={'PK': 'CONFIG', 'SK': 'PRICING'})['Item']
+    summary = get_team_summary(db, test_team_manager_id, new_pricing)
+
+    assert summary['outstanding_balance'] == Decimal('50')
+    assert summary['pricing_version'] == '2026-02-01T00:00:00Z'
+
+
+def test_summary_covers_the_current_edition(dynamodb_table, test_team_manager_id, monkeypatch):
+    """Test that boats and payments of past editions are left out of the summary"""
+    seed_team(dynamodb_table, test_team_manager_id)
+    db = DatabaseClient(table_name=dynamodb_table.name)
+    for item in db.iter_query(f'TEAM#{test_team_manager_id}'):
+        db.put_item({**item, 'edition': '2025'})
+
+    monkeypatch.setenv('EDITION', '2026')
+    db.put_item({
+        'PK': f'TEAM#{test_team_manager_id}',
+        'SK': 'BOAT#boat-3',
+        'boat_registration_id': 'boat-3',
+        'registration_status': 'incomplete'
+    })
+
+    summary = refresh_team_summary(db, test_team_manager_id, None)
+
+    assert summary['total_registered_boats'] == 1
+    assert summary['payment_count'] == 0
+    assert summary['outstanding_balance'] == 0
+
+
+def test_older_refresh_does_not_overwrite_newer_summary(dynamodb_table, test_team_manager_id):
+    """Test that a refresh started before the stored summary keeps the stored one"""
+    seed_team(dynamodb_table, test_team_manager_id)
+    dynamodb_table.put_item(Item={
+        'PK': f'TEAM#{test_team_manager_id}',
+        'SK': TEAM_SUMMARY_SK,
+        'team_manager_id': test_team_manager_id,
+        'payment_count': 99,
+        'computed_at': '2999-01-01T00:00:00Z'
+    })
+    db = DatabaseClient(table_name=dynamodb_table.name)
+
+    summary = refresh_team_summary(db, test_team_manager_id, None)
+
+    assert summary['payment_count'] == 99
+
+
+def test_export_reads_team_summaries(dynamodb_table, mock_api_gateway_event, mock_lambda_context,
+                                     test_team_manager_id, test_team_manager_profile):
+    """Test that the race export takes team balances from the summaries"""
+    seed_team(dynamodb_table, test_team_manager_id)
+    set_pricing(dynamodb_table, '20.00', '2026-01-01T00:00:00Z')
+
+    from admin.export_races_json import lambda_handler
+
+    event = mock_api_gateway_event(
+        http_method='GET',
+        path='/admin/export/races-json',
+        user_id='test-admin-456',
+        groups=['admins']
+    )
+    response = lambda_handler(event, mock_lambda_context)
+
+    assert response['statusCode'] == 200
+    team_managers = json.loads(response['body'])['data']['team_managers']
+    team_manager = next(tm for tm in team_managers if tm['user_id'] == test_team_manager_id)
+    assert team_manager['total_paid'] == 30.0
+    assert team_manager['outstanding_balance'] == 40.0
+    assert team_manager['payment_status'] == 'Partial Payment'
@@ -4,7 +4,7 @@ Tests grant creation, revocation, listing, and permission bypass functionality
 """
 import json
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 
 def test_grant_temporary_access_success(
@@ -460,10 +460,10 @@ def test_list_temporary_access_grants_filters_by_status(
     assert body['data']['grants'][0]['user_id'] == test_team_manager_id
 
 
-def test_list_grants_marks_expired_grants(
+def test_list_grants_reports_expired_grants(
     dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_admin_id
 ):
-    """Test listing grants automatically marks expired grants"""
+    """Test listing grants reports expired grants without updating them"""
     # Create grant that should be expired
     now = datetime.utcnow()
     
@@ -492,7 +492,7 @@ def test_list_grants_marks_expired_grants(
     
     response = lambda_handler(event, mock_lambda_context)
     
-    # Assert grant was marked as expired
+    # Assert grant is reported as expired
     assert response['statusCode'] == 200
     body = json.loads(response['body'])
     grants = body['data']['grants']
@@ -500,8 +500,41 @@ def test_list_grants_marks_expired_grants(
     assert expired_grant['status'] == 'expired'
     assert expired_grant['remaining_hours'] == 0
     
-    # Verify database was updated
+    # Verify database was not updated (TTL deletes the grant later)
     grant = dynamodb_table.get_item(
         Key={'PK': 'TEMP_ACCESS', 'SK': 'USER#user-expired'}
     )
-    assert grant['Item']['status'] == 'expired'
+    assert grant['Item']['status'] == 'active'
+
+
+def test_grants_and_audit_entries_expire_with_ttl(
+    dynamodb_table, mock_api_gateway_event, mock_lambda_context, test_admin_id, test_team_manager_id
+):
+    """Test grants and their audit entries carry the TTL attribute"""
+    from admin.grant_temporary_access import lambda_handler
+    from access_control import AUDIT_LOG_RETENTION_DAYS, TEMP_ACCESS_RETENTION_DAYS
+    from boto3.dynamodb.conditions import Key
+    
+    event = mock_api_gateway_event(
+        http_method='POST',
+        path='/admin/temporary-access/grant',
+        body=json.dumps({'user_id': test_team_manager_id, 'hours': 24}),
+        user_id=test_admin_id,
+        groups=['admins']
+    )
+    
+    response = lambda_handler(event, mock_lambda_context)
+    assert response['statusCode'] == 200
+    
+    grant = dynamodb_table.get_item(
+        Key={'PK': 'TEMP_ACCESS', 'SK': f'USER#{test_team_manager_id}'}
+    )['Item']
+    expires_at = datetime.fromisoformat(grant['expiration_timestamp'].rstrip('Z')).replace(tzinfo=timezone.utc)
+    assert grant['expires_at'] == int(expires_at.timestamp())
+    assert grant['ttl'] == grant['expires_at'] + TEMP_ACCESS_RETENTION_DAYS * 86400
+    
+    audit = dynamodb_table.query(
+        KeyConditionExpression=Key('PK').eq('AUDIT#TEMP_ACCESS_GRANT')
+    )['Items'][0]
+    granted_at = datetime.fromisoformat(audit['grant_timestamp'].rstrip('Z')).replace(tzinfo=timezone.utc)
+    assert audit['ttl'] == int(granted_at.timestamp()) + AUDIT_LOG_RETENTION_DAYS * 86400
@@ -12,9 +12,12 @@ from datetime import datetime, timedelta
 from moto import mock_dynamodb
 import boto3
 import os
+import time
 
 # Import the access control module
 from access_control import PermissionChecker
+from configuration import bump_config_version
+from memory_table import MemoryDynamoDB
 
 
 @pytest.fixture
@@ -103,20 +106,20 @@ class TestTemporaryAccessGrants:
         
         assert has_grant is False
     
-    def test_expired_grant_marked_as_expired(self, mock_dynamodb_table):
-        """Test that expired grant is automatically marked as expired in database"""
+    def test_expired_grant_not_updated(self, mock_dynamodb_table):
+        """Test that checking an expired grant does not write to the database"""
         user_id = 'user789'
         
         # Create grant that expired 2 hours ago
         create_grant(mock_dynamodb_table, user_id, status='active', hours_from_now=-2)
         
-        # Check grant (should mark as expired)
+        # Check grant (read only, TTL deletes it later)
         checker = PermissionChecker(table_name='test-access-control-table')
         has_grant = checker.check_temporary_access_grant(user_id)
         
         assert has_grant is False
         
-        # Verify grant was marked as expired in database
+        # Verify grant was left as written
         response = mock_dynamodb_table.get_item(
             Key={
                 'PK': 'TEMP_ACCESS',
@@ -125,8 +128,23 @@ class TestTemporaryAccessGrants:
         )
         
         assert 'Item' in response
-        assert response['Item']['status'] == 'expired'
-        assert 'updated_at' in response['Item']
+        assert response['Item']['status'] == 'active'
+    
+    def test_expires_at_takes_precedence(self, mock_dynamodb_table):
+        """Test that the numeric expires_at is used over the ISO timestamp"""
+        user_id = 'user_expires_at'
+        
+        # ISO timestamp in the future, expires_at in the past
+        create_grant(mock_dynamodb_table, user_id, status='active', hours_from_now=48)
+        mock_dynamodb_table.update_item(
+            Key={'PK': 'TEMP_ACCESS', 'SK': f'USER#{user_id}'},
+            UpdateExpression='SET expires_at = :expires_at',
+            ExpressionAttributeValues={':expires_at': int(time.time()) - 60}
+        )
+        
+        checker = PermissionChecker(table_name='test-access-control-table')
+        
+        assert checker.check_temporary_access_grant(user_id) is False
     
     def test_no_grant_returns_false(self, mock_dynamodb_table):
         """Test that user with no grant returns False"""
@@ -290,3 +308,69 @@ class TestTemporaryAccessGrants:
         has_grant = checker.check_temporary_access_grant(user_id)
         
         assert has_grant is True
+
+
+@pytest.fixture
+def counted_memory_table(monkeypatch):
+    """In-memory table recording its reads, with the resource to pass to checkers"""
+    dynamodb = MemoryDynamoDB()
+    table = dynamodb.Table('test-grants-table')
+    reads = []
+    for name in ('get_item', 'query'):
+        method = getattr(table, name)
+        
+        def counted(*args, _name=name, _method=method, **kwargs):
+            reads.append(_name)
+            return _method(*args, **kwargs)
+        
+        monkeypatch.setattr(table, name, counted)
+    return dynamodb, table, reads
+
+
+class TestGrantLookupCaching:
+    """Test the request memo and container caches of grant lookups"""
+    
+    def test_no_active_grants_costs_no_read(self, counted_memory_table):
+        """Test that warm requests skip grant lookups while no grant is active"""
+        dynamodb, table, reads = counted_memory_table
+        create_grant(table, 'user_old', status='active', hours_from_now=-2)
+        checker = PermissionChecker(db_client=dynamodb, table_name='test-grants-table')
+        
+        checker.start_request()
+        assert checker.check_temporary_access_grant('user1') is False
+        assert checker.check_temporary_access_grant('user1') is False
+        assert reads == ['get_item', 'query']
+        
+        # Next request: only the configuration version is read
+        checker.start_request()
+        assert checker.check_temporary_access_grant('user2') is False
+        assert reads == ['get_item', 'query', 'get_item']
+    
+    def test_grant_invalidates_cached_lookups(self, counted_memory_table):
+        """Test that a new grant is seen by the next request"""
+        dynamodb, table, reads = counted_memory_table
+        checker = PermissionChecker(db_client=dynamodb, table_name='test-grants-table')
+        
+        checker.start_request()
+        assert checker.check_temporary_access_grant('user1') is False
+        
+        create_grant(table, 'user1', status='active', hours_from_now=48)
+        bump_config_version(table)
+        
+        checker.start_request()
+        assert checker.check_temporary_access_grant('user1') is True
+    
+    def test_users_without_grant_are_remembered(self, counted_memory_table):
+        """Test the negative cache while other users have active grants"""
+        dynamodb, table, reads = counted_memory_table
+        create_grant(table, 'user_granted', status='active', hours_from_now=48)
+        checker = PermissionChecker(db_client=dynamodb, table_name='test-grants-table')
+        
+        checker.start_request()
+        assert checker.check_temporary_access_grant('user1') is False
+        assert checker.check_temporary_access_grant('user_granted') is True
+        assert reads == ['get_item', 'query', 'get_item', 'get_item']
+        
+        checker.start_request()
+        assert checker.check_temporary_access_grant('user1') is False
+        assert reads == ['get_item', 'query', 'get_item', 'get_item', 'get_item']
@@ -0,0 +1,68 @@
+"""
+Unit tests for the shared AWS client registry
+
+Tests that clients are built once, on first use, with the shared config.
+"""
+import pytest
+from unittest.mock import patch
+
+import aws_clients
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    """Start every test with no cached clients"""
+    with patch.dict(aws_clients._clients, clear=True), \
+         patch.dict(aws_clients._resources, clear=True):
+        yield
+
+
+class TestRegistry:
+    """Test get_client and get_resource"""
+
+    def test_client_is_built_once(self):
+        """Test that repeated lookups return the same client"""
+        with patch.object(aws_clients.boto3, 'client') as mock_client:
+            first = aws_clients.get_client('s3')
+            second = aws_clients.get_client('s3')
+
+        assert first is second
+        mock_client.assert_called_once_with('s3', region_name=None, config=aws_clients.CLIENT_CONFIG)
+
+    def test_clients_are_keyed_by_region(self):
+        """Test that an explicit region gets its own client"""
+        with patch.object(aws_clients.boto3, 'client', side_effect=lambda *a, **k: object()):
+            default = aws_clients.get_client('ses')
+            paris = aws_clients.get_client('ses', region_name='eu-west-1')
+
+        assert default is not paris
+
+    def test_resource_is_built_once(self):
+        """Test that the DynamoDB resource is shared"""
+        with patch.object(aws_clients.boto3, 'resource') as mock_resource:
+            assert aws_clients.get_dynamodb_resource() is aws_clients.get_dynamodb_resource()
+
+        mock_resource.assert_called_once()
+
+    def test_config_is_tuned(self):
+        """Test the connection settings applied to every client"""
+        config = aws_clients.CLIENT_CONFIG
+
+        assert config.max_pool_connections >= 10
+        assert config.tcp_keepalive is True
+        assert config.connect_timeout < 10
+
+
+class TestLazyClient:
+    """Test the module-level lazy client"""
+
+    def test_client_is_built_on_first_use(self):
+        """Test that no client exists until an attribute is used"""
+        with patch.object(aws_clients.boto3, 'client') as mock_client:
+            cognito = aws_clients.LazyClient('cognito-idp')
+            mock_client.assert_not_called()
+
+            cognito.admin_get_user(UserPoolId='pool', Username='user')
+
+        mock_client.assert_called_once()
+        mock_client.return_value.admin_get_user.assert_called_once_with(UserPoolId='pool', Username='user')
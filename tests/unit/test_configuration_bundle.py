@@ -0,0 +1,84 @@
+"""
+Unit tests for the configuration bundle
+
+Tests that bundle mode reads every configuration type from one query, that
+the bundle is shared by the managers of the container, and that it is
+revalidated against the configuration version stamp.
+"""
+import pytest
+from decimal import Decimal
+
+import configuration
+from configuration import ConfigurationManager, bump_config_version
+from memory_table import MemoryDynamoDB
+
+
+@pytest.fixture
+def dynamodb():
+    """In-memory resource with system, pricing and permission configuration"""
+    dynamodb = MemoryDynamoDB()
+    table = dynamodb.Table('test-table')
+    table.put_item(Item={'PK': 'CONFIG', 'SK': 'SYSTEM', 'competition_date': '2026-05-01'})
+    table.put_item(Item={'PK': 'CONFIG', 'SK': 'PRICING', 'base_seat_price': Decimal('20')})
+    table.put_item(Item={'PK': 'CONFIG', 'SK': 'PERMISSIONS', 'permissions': {}})
+    return dynamodb
+
+
+@pytest.fixture
+def reads(dynamodb, monkeypatch):
+    """Names of the table reads, in order"""
+    table = dynamodb.Table('test-table')
+    calls = []
+    for name in ('get_item', 'query'):
+        method = getattr(table, name)
+
+        def counted(*args, _name=name, _method=method, **kwargs):
+            calls.append(_name)
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(table, name, counted)
+    return calls
+
+
+def test_bundle_reads_every_config_type_in_one_query(dynamodb, reads):
+    """Test that several configuration types cost one query, shared by the container"""
+    config = ConfigurationManager(table_name='test-table', dynamodb=dynamodb, bundle=True)
+
+    assert config.get_system_config()['competition_date'] == '2026-05-01'
+    assert config.get_pricing_config()['base_seat_price'] == 20
+    # Missing types fall back to their defaults
+    assert config.get_race_timing_config()['marathon_start_time'] == '07:45'
+    assert 'permissions' in config.get_config_bundle()['PERMISSIONS']
+
+    other = ConfigurationManager(table_name='test-table', dynamodb=dynamodb, bundle=True)
+    assert other.get_system_config()['competition_date'] == '2026-05-01'
+
+    assert reads == ['query']
+
+
+def test_bundle_is_revalidated_with_the_version_stamp(dynamodb, reads, monkeypatch):
+    """Test that an expired bundle is reloaded only when the version changed"""
+    monkeypatch.setattr(configuration, 'CONFIG_BUNDLE_TTL', 0)
+    config = ConfigurationManager(table_name='test-table', dynamodb=dynamodb, bundle=True)
+    table = dynamodb.Table('test-table')
+
+    config.get_system_config()
+    config.get_system_config()
+    assert reads == ['query', 'get_item']
+
+    table.put_item(Item={'PK': 'CONFIG', 'SK': 'SYSTEM', 'competition_date': '2026-05-08'})
+    bump_config_version(table)
+
+    assert config.get_system_config()['competition_date'] == '2026-05-08'
+    assert reads == ['query', 'get_item', 'get_item', 'query']
+
+
+def test_update_config_reloads_the_bundle(dynamodb, reads):
+    """Test that a configuration update is visible to the container at once"""
+    config = ConfigurationManager(table_name='test-table', dynamodb=dynamodb, bundle=True)
+    assert config.get_pricing_config()['base_seat_price'] == 20
+
+    config.update_config('PRICING', {'base_seat_price': Decimal('25')}, 'admin-1')
+
+    assert config.get_pricing_config()['base_seat_price'] == 25
+    assert config.get_config_bundle()['VERSION']['version'] == 1
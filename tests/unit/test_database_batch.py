@@ -0,0 +1,171 @@
+"""
+Unit tests for DatabaseClient bulk read/write primitives
+
+Tests chunking to DynamoDB batch limits, retry of unprocessed
+keys/items, and failure once retries are exhausted.
+"""
+import pytest
+from unittest.mock import patch
+
+import database
+from database import DatabaseClient, BatchOperationError
+
+
+def make_crew(team_id, index):
+    """Helper to build a crew member item"""
+    return {
+        'PK': f'TEAM#{team_id}',
+        'SK': f'CREW#crew-{index:03d}',
+        'crew_member_id': f'crew-{index:03d}',
+        'first_name': f'Rower{index}'
+    }
+
+
+@pytest.fixture
+def db(dynamodb_table):
+    """Database client bound to the mock table"""
+    return DatabaseClient(table_name=dynamodb_table.name)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep():
+    """Skip backoff delays during retries"""
+    with patch.object(database.time, 'sleep'):
+        yield
+
+
+class TestBatchWriteItems:
+    """Test batch_write_items chunking and retries"""
+
+    def test_writes_more_than_25_items(self, db, dynamodb_table):
+        """Test that more than 25 items are split into legal chunks"""
+        items = [make_crew('team-1', i) for i in range(60)]
+
+        with patch.object(db.dynamodb, 'batch_write_item', wraps=db.dynamodb.batch_write_item) as spy:
+            written = db.batch_write_items(items_to_put=items)
+
+        assert written == 60
+        assert spy.call_count == 3
+        for call in spy.call_args_list:
+            assert len(call.kwargs['RequestItems'][db.table_name]) <= 25
+        assert len(db.query_by_pk('TEAM#team-1', sk_prefix='CREW#')) == 60
+
+    def test_puts_and_deletes_in_one_call(self, db):
+        """Test mixing put and delete requests"""
+        db.batch_write_items(items_to_put=[make_crew('team-1', i) for i in range(5)])
+
+        db.batch_write_items(
+            items_to_put=[make_crew('team-1', 10)],
+            items_to_delete=[('TEAM#team-1', 'CREW#crew-000'), ('TEAM#team-1', 'CREW#crew-001')]
+        )
+
+        remaining = {item['SK'] for item in db.query_by_pk('TEAM#team-1', sk_prefix='CREW#')}
+        assert remaining == {'CREW#crew-002', 'CREW#crew-003', 'CREW#crew-004', 'CREW#crew-010'}
+
+    def test_empty_input_makes_no_request(self, db):
+        """Test that empty input does not call DynamoDB"""
+        with patch.object(db.dynamodb, 'batch_write_item') as mock_write:
+            assert db.batch_write_items() == 0
+
+        mock_write.assert_not_called()
+
+    def test_unprocessed_items_are_retried(self, db):
+        """Test that UnprocessedItems are resent until written"""
+        items = [make_crew('team-1', i) for i in range(3)]
+        real_write = db.dynamodb.batch_write_item
+        calls = []
+
+        def flaky_write(RequestItems, **kwargs):
+            calls.append(RequestItems)
+            requests = RequestItems[db.table_name]
+            if len(calls) == 1:
+                # Only the first request is processed
+                real_write(RequestItems={db.table_name: requests[:1]})
+                return {'UnprocessedItems': {db.table_name: requests[1:]}}
+            return real_write(RequestItems=RequestItems)
+
+        with patch.object(db.dynamodb, 'batch_write_item', side_effect=flaky_write):
+            db.batch_write_items(items_to_put=items)
+
+        assert len(calls) == 2
+        assert len(calls[1][db.table_name]) == 2
+        assert len(db.query_by_pk('TEAM#team-1', sk_prefix='CREW#')) == 3
+
+    def test_raises_when_retries_exhausted(self, db):
+        """Test that persistently unprocessed items raise BatchOperationError"""
+        items = [make_crew('team-1', i) for i in range(2)]
+
+        def never_processed(RequestItems, **kwargs):
+            return {'UnprocessedItems': RequestItems}
+
+        with patch.object(db.dynamodb, 'batch_write_item', side_effect=never_processed):
+            with pytest.raises(BatchOperationError) as exc_info:
+                db.batch_write_items(items_to_put=items)
+
+        assert len(exc_info.value.unprocessed) == 2
+
+
+class TestBatchGetItems:
+    """Test batch_get_items chunking and retries"""
+
+    def test_gets_more_than_100_keys(self, db):
+        """Test that more than 100 keys are split into legal chunks"""
+        db.batch_write_items(items_to_put=[make_crew('team-1', i) for i in range(150)])
+        keys = [('TEAM#team-1', f'CREW#crew-{i:03d}') for i in range(150)]
+
+        with patch.object(db.dynamodb, 'batch_get_item', wraps=db.dynamodb.batch_get_item) as spy:
+            items = db.batch_get_items(keys)
+
+        assert len(items) == 150
+        assert spy.call_count == 2
+        for call in spy.call_args_list:
+            assert len(call.kwargs['RequestItems'][db.table_name]['Keys']) <= 100
+
+    def test_missing_and_duplicate_keys(self, db):
+        """Test that missing items are absent and duplicate keys are fetched once"""
+        db.batch_write_items(items_to_put=[make_crew('team-1', 1)])
+
+        items = db.batch_get_items([
+            ('TEAM#team-1', 'CREW#crew-001'),
+            ('TEAM#team-1', 'CREW#crew-001'),
+            ('TEAM#team-1', 'CREW#missing')
+        ])
+
+        assert [item['crew_member_id'] for item in items] == ['crew-001']
+
+    def test_empty_keys_makes_no_request(self, db):
+        """Test that an empty key list does not call DynamoDB"""
+        with patch.object(db.dynamodb, 'batch_get_item') as mock_get:
+            assert db.batch_get_items([]) == []
+
+        mock_get.assert_not_called()
+
+    def test_unprocessed_keys_are_retried(self, db):
+        """Test that UnprocessedKeys are refetched"""
+        db.batch_write_items(items_to_put=[make_crew('team-1', i) for i in range(4)])
+        real_get = db.dynamodb.batch_get_item
+        calls = []
+
+        def flaky_get(RequestItems, **kwargs):
+            calls.append(RequestItems)
+            keys = RequestItems[db.table_name]['Keys']
+            if len(calls) == 1:
+                response = real_get(RequestItems={db.table_name: {'Keys': keys[:1]}})
+                response['UnprocessedKeys'] = {db.table_name: {'Keys': keys[1:]}}
+                return response
+            return real_get(RequestItems=RequestItems)
+
+        with patch.object(db.dynamodb, 'batch_get_item', side_effect=flaky_get):
+            items = db.batch_get_items([('TEAM#team-1', f'CREW#crew-{i:03d}') for i in range(4)])
+
+        assert len(calls) == 2
+        assert len(items) == 4
+
+    def test_raises_when_retries_exhausted(self, db):
+        """Test that persistently unprocessed keys raise BatchOperationError"""
+        def never_processed(RequestItems, **kwargs):
+            return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+
+        with patch.object(db.dynamodb, 'batch_get_item', side_effect=never_processed):
+            with pytest.raises(BatchOperationError):
+                db.batch_get_items([('TEAM#team-1', 'CREW#crew-001')])
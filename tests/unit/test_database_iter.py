@@ -0,0 +1,287 @@
+"""
+Unit tests for DatabaseClient streaming iterators
+
+Tests iter_query/iter_scan projection, pagination and early termination,
+race and entity index listings, payment date range queries and edition
+partitioning.
+"""
+import pytest
+from unittest.mock import patch
+from boto3.dynamodb.conditions import Attr
+
+from database import (
+    DatabaseClient,
+    race_index_keys,
+    entity_index_keys,
+    payment_date_index_keys,
+    backfill_edition,
+    in_current_edition,
+    PAYMENT_DATE_SHARDS
+)
+
+
+@pytest.fixture
+def db(dynamodb_table):
+    """Database client bound to the mock table, seeded with boats and crew"""
+    client = DatabaseClient(table_name=dynamodb_table.name)
+    for i in range(10):
+        dynamodb_table.put_item(Item={
+            'PK': 'TEAM#team-1',
+            'SK': f'BOAT#boat-{i:02d}',
+            'name': f'Boat {i}',
+            'status': 'paid' if i % 2 else 'complete',
+            'seats': [{'position': 1, 'type': 'rower'}],
+            **entity_index_keys('TEAM#team-1', f'BOAT#boat-{i:02d}')
+        })
+        dynamodb_table.put_item(Item={
+            'PK': 'TEAM#team-1',
+            'SK': f'CREW#crew-{i:02d}',
+            'first_name': f'Rower{i}',
+            **entity_index_keys('TEAM#team-1', f'CREW#crew-{i:02d}')
+        })
+    return client
+
+
+class TestIterQuery:
+    """Test iter_query"""
+
+    def test_yields_all_items_across_pages(self, db):
+        """Test that pages are followed until the partition is exhausted"""
+        with patch.object(db.table, 'query', wraps=db.table.query) as spy:
+            items = list(db.iter_query('TEAM#team-1', sk_prefix='BOAT#', page_size=3))
+
+        assert [item['SK'] for item in items] == [f'BOAT#boat-{i:02d}' for i in range(10)]
+        assert spy.call_count == 4
+        assert all(call.kwargs['Limit'] == 3 for call in spy.call_args_list)
+
+    def test_projection_with_reserved_words(self, db):
+        """Test that only projected attributes are returned, including reserved words"""
+        items = list(db.iter_query('TEAM#team-1', sk_prefix='BOAT#', attributes=['SK', 'name', 'status']))
+
+        assert len(items) == 10
+        assert all(set(item) == {'SK', 'name', 'status'} for item in items)
+
+    def test_projection_combined_with_filter(self, db):
+        """Test that a filter expression and a projection can be used together"""
+        items = list(db.iter_query(
+            'TEAM#team-1',
+            sk_prefix='BOAT#',
+            filter_expression=Attr('status').eq('paid'),
+            attributes=['SK']
+        ))
+
+        assert [item['SK'] for item in items] == [f'BOAT#boat-{i:02d}' for i in range(1, 10, 2)]
+
+    def test_stops_reading_when_consumer_stops(self, db):
+        """Test that no further page is requested once iteration stops"""
+        with patch.object(db.table, 'query', wraps=db.table.query) as spy:
+            first = next(db.iter_query('TEAM#team-1', sk_prefix='CREW#', attributes=['SK'], page_size=1))
+
+        assert first == {'SK': 'CREW#crew-00'}
+        assert spy.call_count == 1
+
+    def test_empty_partition(self, db):
+        """Test that an empty partition yields nothing"""
+        assert next(db.iter_query('TEAM#unknown', sk_prefix='BOAT#'), None) is None
+
+
+class TestIterScan:
+    """Test iter_scan"""
+
+    def test_filter_and_projection(self, db):
+        """Test scanning with a filter and a projection"""
+        items = list(db.iter_scan(
+            filter_expression=Attr('SK').begins_with('CREW#'),
+            attributes=['first_name'],
+            page_size=4
+        ))
+
+        assert sorted(item['first_name'] for item in items) == sorted(f'Rower{i}' for i in range(10))
+        assert all(set(item) == {'first_name'} for item in items)
+
+    def test_is_lazy(self, db):
+        """Test that creating the iterator does not read from the table"""
+        with patch.object(db.table, 'scan') as mock_scan:
+            db.iter_scan()
+
+        mock_scan.assert_not_called()
+
+
+class TestListRaceBoats:
+    """Test list_race_boats"""
+
+    def test_queries_the_race_index(self, db, dynamodb_table):
+        """Test that only the boats of the race are returned, in creation order, without a scan"""
+        for i, race_id in enumerate(['race-1', 'race-2', 'race-1', None]):
+            dynamodb_table.put_item(Item={
+                'PK': 'TEAM#team-2',
+                'SK': f'BOAT#race-boat-{i}',
+                'boat_registration_id': f'race-boat-{i}',
+                'race_id': race_id,
+                **race_index_keys(race_id, f'2025-01-0{i + 1}T00:00:00Z')
+            })
+
+        with patch.object(db.table, 'scan') as mock_scan:
+            boats = db.list_race_boats('race-1', attributes=['boat_registration_id'])
+
+        mock_scan.assert_not_called()
+        assert boats == [{'boat_registration_id': 'race-boat-0'}, {'boat_registration_id': 'race-boat-2'}]
+
+    def test_no_race_has_no_index_keys(self):
+        """Test that a boat without a race gets no (null) index keys"""
+        assert race_index_keys(None, '2025-01-01T00:00:00Z') == {}
+        assert race_index_keys('', '2025-01-01T00:00:00Z') == {}
+
+
+class TestEntityIndex:
+    """Test the entity index keys and listings"""
+
+    def test_put_item_adds_entity_keys(self, db, dynamodb_table):
+        """Test that entity items get index keys and other items do not"""
+        crew = {'PK': 'TEAM#team-3', 'SK': 'CREW#crew-x', 'first_name': 'New'}
+        db.put_item(crew)
+        db.put_item({'PK': 'CONFIG', 'SK': 'SYSTEM'})
+
+        stored = dynamodb_table.get_item(Key={'PK': 'TEAM#team-3', 'SK': 'CREW#crew-x'})['Item']
+        config = dynamodb_table.get_item(Key={'PK': 'CONFIG', 'SK': 'SYSTEM'})['Item']
+        assert (stored['GSI5PK'], stored['GSI5SK']) == ('CREW', 'TEAM#team-3')
+        assert 'GSI5PK' not in config
+        assert 'GSI5PK' not in crew
+
+    def test_batch_write_adds_entity_keys(self, db):
+        """Test that batch puts are indexed like single puts"""
+        db.batch_write_items(items_to_put=[
+            {'PK': f'TEAM#team-{i}', 'SK': f'PAYMENT#payment-{i}', 'amount': i} for i in range(3)
+        ])
+
+        assert len(db.list_entities('PAYMENT')) == 3
+
+    def test_list_and_count_read_one_entity_type(self, db):
+        """Test that listings query the index instead of scanning the table"""
+        with patch.object(db.table, 'scan') as mock_scan:
+            boats = db.list_entities('BOAT', filter_expression=Attr('status').eq('paid'), attributes=['SK'])
+            crew_count = db.count_entities('CREW')
+
+        mock_scan.assert_not_called()
+        assert sorted(boat['SK'] for boat in boats) == [f'BOAT#boat-{i:02d}' for i in range(1, 10, 2)]
+        assert crew_count == 10
+
+    def test_entity_index_keys(self):
+        """Test the entity type of each sort key prefix"""
+        assert entity_index_keys('USER#user-1', 'PROFILE') == {'GSI5PK': 'PROFILE', 'GSI5SK': 'USER#user-1'}
+        assert entity_index_keys('TEAM#team-1', 'BOAT#boat-1')['GSI5PK'] == 'BOAT'
+        assert entity_index_keys('RACE', 'race-1') == {}
+        assert entity_index_keys('AUDIT#PERMISSION_DENIAL', '2025-01-01T00:00:00Z') == {}
+
+
+class TestPaymentDateIndex:
+    """Test the payment date index"""
+
+    @pytest.fixture
+    def payments(self, db):
+        """Twelve payments, one per day of January 2026, across three teams"""
+        for day in range(1, 13):
+            db.put_item({
+                'PK': f'TEAM#team-{day % 3}',
+                'SK': f'PAYMENT#payment-{day:02d}',
+                'payment_id': f'payment-{day:02d}',
+                'paid_at': f'2026-01-{day:02d}T10:00:00Z',
+                'amount': day
+            })
+        return db
+
+    def test_date_range_reads_only_matching_payments(self, payments):
+        """Test that the range is applied on the index sort key, end date inclusive"""
+        with patch.object(payments.table, 'scan') as mock_scan:
+            in_range = payments.query_payments_by_date('2026-01-03', '2026-01-05T10:00:00Z')
+
+        mock_scan.assert_not_called()
+        assert [p['payment_id'] for p in in_range] == ['payment-05', 'payment-04', 'payment-03']
+
+    def test_end_date_bound_matches_paid_at_comparison(self, payments):
+        """Test that the end bound keeps the paid_at <= end_date semantics of the filter it replaced"""
+        for end_date in ('2026-01-05', '2026-01-05T10:00:00Z', '2026-01-05T09:59:59Z', '2026-01-05T23:59:59Z'):
+            expected = sorted(
+                (f'payment-{day:02d}' for day in range(1, 13) if f'2026-01-{day:02d}T10:00:00Z' <= end_date),
+                reverse=True
+            )
+            assert [p['payment_id'] for p in payments.query_payments_by_date(end_date=end_date)] == expected
+            assert [p['payment_id'] for p in payments.query_payments_by_date('2026-01-03', end_date)] == \
+                [payment_id for payment_id in expected if payment_id >= 'payment-03']
+
+        # A date-only end date does not include payments made later that day
+        assert payments.query_payments_by_date(end_date='2026-01-05')[0]['payment_id'] == 'payment-04'
+
+    def test_latest_payments_across_shards(self, payments):
+        """Test that the newest and oldest N payments are merged from every shard"""
+        latest = payments.query_payments_by_date(limit=4)
+        earliest = payments.query_payments_by_date(start_date='2026-01-10', limit=2, newest_first=False)
+
+        assert [p['payment_id'] for p in latest] == ['payment-12', 'payment-11', 'payment-10', 'payment-09']
+        assert [p['payment_id'] for p in earliest] == ['payment-10', 'payment-11']
+
+    def test_payments_are_spread_over_shards(self):
+        """Test that the partition comes from the payment ID, not the date"""
+        shards = {
+            payment_date_index_keys(f'payment-{i}', '2026-01-15T10:00:00Z')['GSI6PK']
+            for i in range(50)
+        }
+
+        assert shards == {f'PAYMENT_DATE#{n}' for n in range(PAYMENT_DATE_SHARDS)}
+        assert payment_date_index_keys('payment-1', None) == {}
+
+
+class TestEditions:
+    """Test the per-edition index partitions"""
+
+    def test_index_keys_carry_the_edition(self, monkeypatch):
+        """Test that edition-scoped keys are suffixed and profiles are not"""
+        monkeypatch.setenv('EDITION', '2026')
+
+        assert entity_index_keys('TEAM#team-1', 'BOAT#boat-1')['GSI5PK'] == 'BOAT#2026'
+        assert entity_index_keys('TEAM#team-1', 'PAYMENT#payment-1', '2025')['GSI5PK'] == 'PAYMENT#2025'
+        assert entity_index_keys('TEAM#team-1', 'CREW#crew-1', '2025')['GSI5PK'] == 'CREW'
+        assert entity_index_keys('USER#user-1', 'PROFILE')['GSI5PK'] == 'PROFILE'
+        assert race_index_keys('race-1', '2026-03-01T00:00:00Z')['GSI4PK'] == 'race-1#2026'
+        assert payment_date_index_keys('payment-1', '2026-03-01T00:00:00Z')['GSI6PK'].endswith('#2026')
+
+    def test_listings_only_read_the_current_edition(self, db, monkeypatch):
+        """Test that items keep their edition and listings stay within one edition"""
+        monkeypatch.setenv('EDITION', '2025')
+        db.put_item({'PK': 'TEAM#team-9', 'SK': 'BOAT#old', 'race_id': 'race-1',
+                     **race_index_keys('race-1', '2025-03-01T00:00:00Z')})
+        db.put_item({'PK': 'USER#team-9', 'SK': 'PROFILE'})
+        db.put_item({'PK': 'TEAM#team-9', 'SK': 'CREW#rower'})
+
+        monkeypatch.setenv('EDITION', '2026')
+        old_boat = db.get_item('TEAM#team-9', 'BOAT#old')
+        db.put_item({**old_boat, 'name': 'Renamed'})
+        db.put_item({'PK': 'TEAM#team-9', 'SK': 'BOAT#new', 'race_id': 'race-1',
+                     **race_index_keys('race-1', '2026-03-01T00:00:00Z')})
+
+        assert db.get_item('TEAM#team-9', 'BOAT#old')['edition'] == '2025'
+        assert [boat['SK'] for boat in db.list_entities('BOAT')] == ['BOAT#new']
+        assert [boat['SK'] for boat in db.list_entities('BOAT', edition='2025')] == ['BOAT#old']
+        assert [boat['SK'] for boat in db.list_race_boats('race-1')] == ['BOAT#new']
+        assert db.count_entities('PROFILE') == 1
+        assert 'edition' not in db.get_item('USER#team-9', 'PROFILE')
+        # Crew members are seated again in later editions
+        crew_member = db.get_item('TEAM#team-9', 'CREW#rower')
+        assert 'CREW#rower' in [crew['SK'] for crew in db.list_entities('CREW')]
+        assert 'edition' not in crew_member and in_current_edition(crew_member)
+
+    def test_backfill_edition(self, monkeypatch):
+        """Test the edition the migrations give to existing items"""
+        monkeypatch.delenv('EDITION', raising=False)
+        assert backfill_edition({'created_at': '2025-03-01T00:00:00Z'}) == ''
+
+        monkeypatch.setenv('EDITION', '2026')
+        # Registered in the autumn before the competition
+        assert backfill_edition({'created_at': '2025-10-01T00:00:00Z'}) == '2026'
+        assert backfill_edition({'edition': '2024', 'created_at': '2025-03-01T00:00:00Z'}) == '2024'
+        assert backfill_edition({}) == '2026'
+
+        # Importing past editions
+        monkeypatch.setenv('EDITION_FROM_CREATION_YEAR', 'true')
+        assert backfill_edition({'created_at': '2025-03-01T00:00:00Z'}) == '2025'
+        assert backfill_edition({}) == '2026'
@@ -0,0 +1,159 @@
+"""
+Unit tests for the DatabaseClient request-scoped identity map
+
+Tests memoization of get_item/query_by_pk/batch_get_items, write-through
+updates, and the with_request_cache handler decorator.
+"""
+import pytest
+from unittest.mock import patch
+
+import database
+from database import DatabaseClient, with_request_cache
+
+
+@pytest.fixture
+def db(dynamodb_table):
+    """Database client bound to the mock table with the request cache enabled"""
+    client = DatabaseClient(table_name=dynamodb_table.name)
+    client.enable_request_cache()
+    yield client
+    client.clear_request_cache()
+
+
+def seed_crew(table, crew_member_id, **fields):
+    """Helper to write a crew member directly to the table"""
+    table.put_item(Item={
+        'PK': 'TEAM#team-1',
+        'SK': f'CREW#{crew_member_id}',
+        'crew_member_id': crew_member_id,
+        **fields
+    })
+
+
+class TestRequestCache:
+    """Test identity map behaviour"""
+
+    def test_get_item_is_memoized(self, db, dynamodb_table):
+        """Test that a repeated get_item costs one round trip"""
+        seed_crew(dynamodb_table, 'crew-1', first_name='Alice')
+
+        with patch.object(db.table, 'get_item', wraps=db.table.get_item) as spy:
+            first = db.get_item('TEAM#team-1', 'CREW#crew-1')
+            second = db.get_item('TEAM#team-1', 'CREW#crew-1')
+
+        assert spy.call_count == 1
+        assert first == second
+        assert db._cache_hits == 1
+        assert db._cache_misses == 1
+
+    def test_missing_item_is_memoized(self, db):
+        """Test that a not-found result is cached too"""
+        with patch.object(db.table, 'get_item', wraps=db.table.get_item) as spy:
+            assert db.get_item('TEAM#team-1', 'CREW#missing') is None
+            assert db.get_item('TEAM#team-1', 'CREW#missing') is None
+
+        assert spy.call_count == 1
+
+    def test_returned_items_are_copies(self, db, dynamodb_table):
+        """Test that mutating a returned item does not alter the cache"""
+        seed_crew(dynamodb_table, 'crew-1', assigned_boat_id=None)
+
+        item = db.get_item('TEAM#team-1', 'CREW#crew-1')
+        item['assigned_boat_id'] = 'boat-1'
+
+        assert db.get_item('TEAM#team-1', 'CREW#crew-1')['assigned_boat_id'] is None
+
+    def test_writes_update_the_cache(self, db, dynamodb_table):
+        """Test that put/update/delete keep the cache consistent"""
+        seed_crew(dynamodb_table, 'crew-1', first_name='Alice')
+        db.get_item('TEAM#team-1', 'CREW#crew-1')
+
+        db.update_item('TEAM#team-1', 'CREW#crew-1', {'first_name': 'Alicia'})
+        assert db.get_item('TEAM#team-1', 'CREW#crew-1')['first_name'] == 'Alicia'
+
+        db.put_item({'PK': 'TEAM#team-1', 'SK': 'CREW#crew-1', 'first_name': 'Ally'})
+        assert db.get_item('TEAM#team-1', 'CREW#crew-1')['first_name'] == 'Ally'
+
+        db.delete_item('TEAM#team-1', 'CREW#crew-1')
+        with patch.object(db.table, 'get_item') as mock_get:
+            assert db.get_item('TEAM#team-1', 'CREW#crew-1') is None
+        mock_get.assert_not_called()
+
+    def test_query_is_memoized_and_invalidated_by_writes(self, db, dynamodb_table):
+        """Test that a write to a partition invalidates cached queries on it"""
+        seed_crew(dynamodb_table, 'crew-1')
+
+        with patch.object(db.table, 'query', wraps=db.table.query) as spy:
+            assert len(db.query_by_pk('TEAM#team-1', sk_prefix='CREW#')) == 1
+            assert len(db.query_by_pk('TEAM#team-1', sk_prefix='CREW#')) == 1
+            assert spy.call_count == 1
+
+            db.put_item({'PK': 'TEAM#team-1', 'SK': 'CREW#crew-2', 'crew_member_id': 'crew-2'})
+            assert len(db.query_by_pk('TEAM#team-1', sk_prefix='CREW#')) == 2
+            assert spy.call_count == 2
+
+    def test_query_results_serve_get_item(self, db, dynamodb_table):
+        """Test that items returned by a query are reused by get_item"""
+        seed_crew(dynamodb_table, 'crew-1')
+        db.query_by_pk('TEAM#team-1', sk_prefix='CREW#')
+
+        with patch.object(db.table, 'get_item') as mock_get:
+            assert db.get_item('TEAM#team-1', 'CREW#crew-1')['crew_member_id'] == 'crew-1'
+        mock_get.assert_not_called()
+
+    def test_batch_get_only_fetches_uncached_keys(self, db, dynamodb_table):
+        """Test that batch_get_items skips keys already in the cache"""
+        seed_crew(dynamodb_table, 'crew-1')
+        seed_crew(dynamodb_table, 'crew-2')
+        db.get_item('TEAM#team-1', 'CREW#crew-1')
+
+        with patch.object(db.dynamodb, 'batch_get_item', wraps=db.dynamodb.batch_get_item) as spy:
+            items = db.batch_get_items([('TEAM#team-1', 'CREW#crew-1'), ('TEAM#team-1', 'CREW#crew-2')])
+
+        assert {item['crew_member_id'] for item in items} == {'crew-1', 'crew-2'}
+        keys = spy.call_args.kwargs['RequestItems'][db.table_name]['Keys']
+        assert keys == [{'PK': 'TEAM#team-1', 'SK': 'CREW#crew-2'}]
+
+    def test_disabled_by_default(self, dynamodb_table):
+        """Test that a new client does not cache reads"""
+        client = DatabaseClient(table_name=dynamodb_table.name)
+        seed_crew(dynamodb_table, 'crew-1', first_name='Alice')
+
+        with patch.object(client.table, 'get_item', wraps=client.table.get_item) as spy:
+            client.get_item('TEAM#team-1', 'CREW#crew-1')
+            client.get_item('TEAM#team-1', 'CREW#crew-1')
+
+        assert spy.call_count == 2
+
+
+class TestWithRequestCache:
+    """Test the handler decorator"""
+
+    def test_cache_is_reset_after_handler(self, dynamodb_table):
+        """Test that the cache is enabled during the handler and cleared afterwards"""
+        client = DatabaseClient(table_name=dynamodb_table.name)
+
+        @with_request_cache
+        def handler(event, context):
+            assert client._item_cache == {}
+            client.get_item('TEAM#team-1', 'CREW#crew-1')
+            return 'ok'
+
+        with patch.object(database, 'get_db_client', return_value=client):
+            assert handler({}, None) == 'ok'
+
+        assert client._item_cache is None
+
+    def test_cache_is_reset_when_handler_raises(self, dynamodb_table):
+        """Test that the cache is cleared even if the handler fails"""
+        client = DatabaseClient(table_name=dynamodb_table.name)
+
+        @with_request_cache
+        def handler(event, context):
+            raise ValueError('boom')
+
+        with patch.object(database, 'get_db_client', return_value=client):
+            with pytest.raises(ValueError):
+                handler({}, None)
+
+        assert client._item_cache is None
@@ -0,0 +1,155 @@
+"""
+Unit tests for DatabaseClient retry accounting and load shedding
+
+Tests the per-invocation retry budget, the mapping of throttling errors
+to ServiceOverloadedError and the 503 response built from it.
+"""
+import json
+import pytest
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+
+import database
+from database import DatabaseClient, ServiceOverloadedError
+from responses import handle_exceptions, success_response
+
+
+def throttling_error(operation='Query'):
+    """ClientError as raised by boto3 once its own retries are exhausted"""
+    return ClientError(
+        {
+            'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Rate exceeded'},
+            'ResponseMetadata': {'RetryAttempts': 2}
+        },
+        operation
+    )
+
+
+@pytest.fixture
+def db(dynamodb_table):
+    """Database client bound to the mock table"""
+    dynamodb_table.put_item(Item={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'})
+    return DatabaseClient(table_name=dynamodb_table.name)
+
+
+class TestRetryAccounting:
+    """Test retries recorded per operation and charged to the budget"""
+
+    def test_sdk_retries_are_recorded(self, db):
+        """Test that RetryAttempts from the response are counted"""
+        def retried_get(**kwargs):
+            return {'Item': {'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'},
+                    'ResponseMetadata': {'RetryAttempts': 2}}
+
+        with patch.object(db.table, 'get_item', side_effect=retried_get):
+            db.get_item('TEAM#team-1', 'BOAT#boat-1')
+
+        assert db._usage['get_item']['retries'] == 2
+        assert db._retries_used == 2
+
+    def test_batch_resends_spend_budget(self, db):
+        """Test that re-sending unprocessed batch keys is charged as a retry"""
+        key = {'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'}
+        responses = [
+            {'Responses': {db.table_name: []}, 'UnprocessedKeys': {db.table_name: {'Keys': [key]}}},
+            {'Responses': {db.table_name: [key]}, 'UnprocessedKeys': {}}
+        ]
+
+        with patch.object(db.dynamodb, 'batch_get_item', side_effect=responses), \
+             patch('database.time.sleep'):
+            items = db.batch_get_items([('TEAM#team-1', 'BOAT#boat-1')])
+
+        assert items == [key]
+        assert db._usage['batch_get_item']['retries'] == 1
+        assert db._retries_used == 1
+
+    def test_summary_reports_and_resets_budget(self, db, caplog):
+        """Test that the usage line reports retries and the budget starts over"""
+        db._record_usage('query', {'ResponseMetadata': {'RetryAttempts': 3}})
+
+        with caplog.at_level('INFO', logger=database.logger.name):
+            db.log_usage_summary()
+
+        assert any('retries=3' in record.message for record in caplog.records)
+        assert db._retries_used == 0
+
+
+class TestLoadShedding:
+    """Test fail-fast behaviour once DynamoDB is throttling"""
+
+    def test_throttling_raises_service_overloaded(self, db):
+        """Test that a throttled request surfaces as ServiceOverloadedError"""
+        with patch.object(db.table, 'query', side_effect=throttling_error()):
+            with pytest.raises(ServiceOverloadedError):
+                db.query_by_pk('TEAM#team-1')
+
+        assert db._retries_used == 2
+
+    def test_other_client_errors_are_unchanged(self, db):
+        """Test that non-throttling errors still propagate as ClientError"""
+        error = ClientError({'Error': {'Code': 'ValidationException', 'Message': 'bad'}}, 'Query')
+
+        with patch.object(db.table, 'query', side_effect=error):
+            with pytest.raises(ClientError):
+                db.query_by_pk('TEAM#team-1')
+
+    def test_spent_budget_fails_fast(self, db):
+        """Test that no request is sent once the budget is exceeded"""
+        db._retries_used = database.RETRY_BUDGET + 1
+
+        with patch.object(db.table, 'get_item') as mock_get:
+            with pytest.raises(ServiceOverloadedError):
+                db.get_item('TEAM#team-1', 'BOAT#boat-1')
+
+        mock_get.assert_not_called()
+
+    def test_spent_budget_stops_batch_resends(self, db):
+        """Test that unprocessed batch keys are not re-sent past the budget"""
+        key = {'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'}
+        unprocessed = {'Responses': {db.table_name: []}, 'UnprocessedKeys': {db.table_name: {'Keys': [key]}}}
+
+        with patch.object(db.dynamodb, 'batch_get_item', return_value=unprocessed) as mock_batch, \
+             patch.object(database, 'RETRY_BUDGET', 2), \
+             patch('database.time.sleep'):
+            with pytest.raises(ServiceOverloadedError):
+                db.batch_get_items([('TEAM#team-1', 'BOAT#boat-1')])
+
+        assert mock_batch.call_count == 3
+
+    def test_budget_allows_exactly_retry_budget_resends(self, db):
+        """Test that the budget is charged and checked with the same bound"""
+        with patch.object(database, 'RETRY_BUDGET', 2):
+            db._spend_retry('batch_get_item')
+            db._spend_retry('batch_get_item')
+            with pytest.raises(ServiceOverloadedError):
+                db._spend_retry('batch_get_item')
+
+    def test_new_invocation_resets_budget(self, db, monkeypatch):
+        """Test that a handler without the decorators cannot lock the client"""
+        monkeypatch.setenv(database.INVOCATION_ID_VARIABLE, 'Root=1-invocation-1')
+        db.get_item('TEAM#team-1', 'BOAT#boat-1')
+        db._retries_used = database.RETRY_BUDGET + 1
+
+        with pytest.raises(ServiceOverloadedError):
+            db.get_item('TEAM#team-1', 'BOAT#boat-1')
+
+        monkeypatch.setenv(database.INVOCATION_ID_VARIABLE, 'Root=1-invocation-2')
+        assert db.get_item('TEAM#team-1', 'BOAT#boat-1')['SK'] == 'BOAT#boat-1'
+        assert db._retries_used == 0
+
+    def test_handler_returns_503_with_retry_after(self, db):
+        """Test that handle_exceptions sheds the request with Retry-After"""
+        @handle_exceptions
+        def handler(event, context):
+            db.query_by_pk('TEAM#team-1')
+            return success_response(data={})
+
+        with patch.object(database, '_db_client', db), \
+             patch.object(db.table, 'query', side_effect=throttling_error()):
+            response = handler({}, None)
+
+        assert response['statusCode'] == 503
+        assert response['headers']['Retry-After'] == str(database.RETRY_AFTER_SECONDS)
+        assert json.loads(response['body'])['error']['code'] == 'SERVICE_UNAVAILABLE'
+        # Budget is reset once the invocation's usage has been logged
+        assert db._retries_used == 0
@@ -0,0 +1,115 @@
+"""
+Unit tests for DatabaseClient scan helpers
+
+Tests serial and parallel (segmented) scans and the scan_by_sk_prefix helper.
+"""
+import zlib
+import pytest
+from unittest.mock import patch
+from boto3.dynamodb.conditions import Attr
+
+from database import DatabaseClient
+
+
+@pytest.fixture
+def db(dynamodb_table):
+    """Database client bound to the mock table, seeded with boats and crew"""
+    client = DatabaseClient(table_name=dynamodb_table.name)
+    for i in range(12):
+        dynamodb_table.put_item(Item={
+            'PK': f'TEAM#team-{i % 3}',
+            'SK': f'BOAT#boat-{i}',
+            'registration_status': 'paid' if i % 2 else 'complete'
+        })
+        dynamodb_table.put_item(Item={
+            'PK': f'TEAM#team-{i % 3}',
+            'SK': f'CREW#crew-{i}'
+        })
+    return client
+
+
+def segmented(real_scan):
+    """
+    Emulate DynamoDB parallel scan on top of the mock table, which ignores
+    Segment/TotalSegments: each segment keeps the items hashed to it
+    """
+    calls = []
+
+    def scan(**kwargs):
+        calls.append(dict(kwargs))
+        segment = kwargs.pop('Segment', None)
+        total_segments = kwargs.pop('TotalSegments', None)
+        response = real_scan(**kwargs)
+        if segment is not None:
+            response['Items'] = [
+                item for item in response['Items']
+                if zlib.crc32(f"{item['PK']}|{item['SK']}".encode()) % total_segments == segment
+            ]
+        return response
+
+    return scan, calls
+
+
+class TestScanTable:
+    """Test scan_table with and without segments"""
+
+    def test_serial_scan(self, db):
+        """Test that a scan without segments sends no Segment parameters"""
+        with patch.object(db.table, 'scan', wraps=db.table.scan) as spy:
+            items = db.scan_table(filter_expression=Attr('SK').begins_with('BOAT#'))
+
+        assert len(items) == 12
+        assert 'Segment' not in spy.call_args.kwargs
+
+    def test_parallel_scan_merges_all_segments(self, db):
+        """Test that every segment is scanned once and the results merged"""
+        scan, calls = segmented(db.table.scan)
+
+        with patch.object(db.table, 'scan', side_effect=scan):
+            items = db.scan_table(filter_expression=Attr('SK').begins_with('BOAT#'), segments=4)
+
+        assert sorted(call['Segment'] for call in calls) == [0, 1, 2, 3]
+        assert all(call['TotalSegments'] == 4 for call in calls)
+        assert sorted(item['SK'] for item in items) == sorted(f'BOAT#boat-{i}' for i in range(12))
+
+    def test_parallel_scan_respects_limit(self, db):
+        """Test that the merged result is truncated to the limit"""
+        scan, _ = segmented(db.table.scan)
+
+        with patch.object(db.table, 'scan', side_effect=scan):
+            items = db.scan_table(limit=5, segments=3)
+
+        assert len(items) <= 5
+
+
+class TestScanBySkPrefix:
+    """Test the scan_by_sk_prefix helper"""
+
+    def test_filters_by_prefix(self, db):
+        """Test that only items with the sort key prefix are returned"""
+        items = db.scan_by_sk_prefix('CREW#', segments=1)
+
+        assert len(items) == 12
+        assert all(item['SK'].startswith('CREW#') for item in items)
+
+    def test_combines_additional_filter(self, db):
+        """Test that an additional filter expression is ANDed with the prefix"""
+        items = db.scan_by_sk_prefix(
+            'BOAT#',
+            filter_expression=Attr('registration_status').eq('paid'),
+            segments=1
+        )
+
+        assert len(items) == 6
+        assert all(item['registration_status'] == 'paid' for item in items)
+
+    def test_uses_default_segments(self, db):
+        """Test that DEFAULT_SCAN_SEGMENTS is used when segments is not given"""
+        scan, calls = segmented(db.table.scan)
+
+        with patch('database.DEFAULT_SCAN_SEGMENTS', 2), \
+             patch.object(db.table, 'scan', side_effect=scan):
+            items = db.scan_by_sk_prefix('BOAT#')
+
+        assert sorted(call['Segment'] for call in calls) == [0, 1]
+        assert len(items) == 12
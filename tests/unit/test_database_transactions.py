@@ -0,0 +1,80 @@
+"""
+Unit tests for DatabaseClient transactional updates
+
+Tests all-or-nothing application of conditional updates and
+consistency of the request cache afterwards.
+"""
+import pytest
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from database import DatabaseClient, is_conditional_check_failure
+
+
+@pytest.fixture
+def db(dynamodb_table):
+    """Database client bound to the mock table, seeded with two crew members"""
+    client = DatabaseClient(table_name=dynamodb_table.name)
+    for crew_member_id in ('crew-1', 'crew-2'):
+        dynamodb_table.put_item(Item={
+            'PK': 'TEAM#team-1',
+            'SK': f'CREW#{crew_member_id}',
+            'crew_member_id': crew_member_id,
+            'assigned_boat_id': None
+        })
+    return client
+
+
+class TestTransactUpdateItems:
+    """Test transact_update_items"""
+
+    def test_applies_all_updates(self, db):
+        """Test that every update is written when all conditions hold"""
+        db.transact_update_items([
+            {
+                'pk': 'TEAM#team-1',
+                'sk': f'CREW#{crew_member_id}',
+                'updates': {'assigned_boat_id': 'boat-1'},
+                'condition_expression': Attr('assigned_boat_id').attribute_type('NULL')
+            }
+            for crew_member_id in ('crew-1', 'crew-2')
+        ])
+
+        assert db.get_item('TEAM#team-1', 'CREW#crew-1')['assigned_boat_id'] == 'boat-1'
+        assert db.get_item('TEAM#team-1', 'CREW#crew-2')['assigned_boat_id'] == 'boat-1'
+
+    def test_failed_condition_cancels_everything(self, db):
+        """Test that one failed condition leaves every item unchanged"""
+        with pytest.raises(ClientError) as exc_info:
+            db.transact_update_items([
+                {
+                    'pk': 'TEAM#team-1',
+                    'sk': 'CREW#crew-1',
+                    'updates': {'assigned_boat_id': 'boat-1'}
+                },
+                {
+                    'pk': 'TEAM#team-1',
+                    'sk': 'CREW#crew-2',
+                    'updates': {'assigned_boat_id': 'boat-1'},
+                    'condition_expression': Attr('assigned_boat_id').eq('boat-2')
+                }
+            ])
+
+        assert is_conditional_check_failure(exc_info.value)
+        assert db.get_item('TEAM#team-1', 'CREW#crew-1')['assigned_boat_id'] is None
+
+    def test_request_cache_is_refreshed(self, db):
+        """Test that cached copies of updated items are refetched"""
+        db.enable_request_cache()
+        try:
+            assert db.get_item('TEAM#team-1', 'CREW#crew-1')['assigned_boat_id'] is None
+
+            db.transact_update_items([{
+                'pk': 'TEAM#team-1',
+                'sk': 'CREW#crew-1',
+                'updates': {'assigned_boat_id': 'boat-1'}
+            }])
+
+            assert db.get_item('TEAM#team-1', 'CREW#crew-1')['assigned_boat_id'] == 'boat-1'
+        finally:
+            db.clear_request_cache()
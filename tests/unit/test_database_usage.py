@@ -0,0 +1,116 @@
+"""
+Unit tests for DatabaseClient consumed-capacity and scan accounting
+
+Tests per-operation totals, the one-line usage summary and its
+emission at the end of a handler invocation.
+"""
+import logging
+import pytest
+from unittest.mock import patch
+from boto3.dynamodb.conditions import Attr
+
+import database
+from database import DatabaseClient
+from responses import handle_exceptions, success_response
+
+
+@pytest.fixture
+def db(dynamodb_table):
+    """Database client bound to the mock table, seeded with boats and crew"""
+    client = DatabaseClient(table_name=dynamodb_table.name)
+    for i in range(5):
+        dynamodb_table.put_item(Item={'PK': 'TEAM#team-1', 'SK': f'BOAT#boat-{i}'})
+        dynamodb_table.put_item(Item={'PK': 'TEAM#team-1', 'SK': f'CREW#crew-{i}'})
+    return client
+
+
+class TestUsageAccounting:
+    """Test usage totals recorded per operation"""
+
+    def test_requests_consumed_capacity(self, db):
+        """Test that requests ask DynamoDB for their consumed capacity"""
+        with patch.object(db.table, 'get_item', wraps=db.table.get_item) as spy:
+            db.get_item('TEAM#team-1', 'BOAT#boat-0')
+
+        assert spy.call_args.kwargs['ReturnConsumedCapacity'] == 'TOTAL'
+
+    def test_counts_scanned_and_returned_items(self, db, dynamodb_table):
+        """Test that a filtered scan records items read versus items returned"""
+        table_size = dynamodb_table.scan(Select='COUNT')['Count']
+
+        db.scan_table(filter_expression=Attr('SK').begins_with('CREW#'))
+
+        assert db._usage['scan']['calls'] == 1
+        assert db._usage['scan']['scanned'] == table_size
+        assert db._usage['scan']['returned'] == 5
+
+    def test_capacity_is_summed_per_operation(self, db):
+        """Test that consumed capacity from responses is added up by operation"""
+        def fake_query(**kwargs):
+            return {'Items': [], 'Count': 0, 'ScannedCount': 3,
+                    'ConsumedCapacity': {'TableName': db.table_name, 'CapacityUnits': 0.5}}
+
+        with patch.object(db.table, 'query', side_effect=fake_query):
+            db.query_by_pk('TEAM#team-1')
+            db.query_by_pk('TEAM#team-2')
+
+        assert db._usage['query'] == {'calls': 2, 'capacity_units': 1.0, 'scanned': 6, 'returned': 0}
+
+    def test_batch_capacity_list_is_summed(self, db):
+        """Test that the per-table capacity list of batch calls is handled"""
+        db._record_usage('batch_write_item', {
+            'ConsumedCapacity': [{'TableName': 'a', 'CapacityUnits': 2.0}, {'TableName': 'b', 'CapacityUnits': 1.0}]
+        })
+
+        assert db._usage['batch_write_item'] == {'calls': 1, 'capacity_units': 3.0}
+
+
+class TestUsageSummary:
+    """Test the per-invocation summary line"""
+
+    def test_summary_is_one_line_and_resets(self, db, caplog):
+        """Test that one summary line is logged and totals start over"""
+        db._record_usage('query', {'ConsumedCapacity': {'CapacityUnits': 1.5}, 'Count': 2, 'ScannedCount': 8})
+        db._record_usage('put_item', {'ConsumedCapacity': {'CapacityUnits': 1.0}})
+
+        with caplog.at_level(logging.INFO, logger=database.logger.name):
+            db.log_usage_summary()
+            db.log_usage_summary()
+
+        lines = [record.message for record in caplog.records if record.message.startswith('DynamoDB usage')]
+        assert len(lines) == 1
+        assert 'read_units=1.50 write_units=1.00' in lines[0]
+        assert '"scanned": 8' in lines[0]
+        assert db._usage == {}
+
+    def test_handle_exceptions_logs_summary(self, db):
+        """Test that the summary is logged once the handler returns, even on error"""
+        @handle_exceptions
+        def handler(event, context):
+            db.get_item('TEAM#team-1', 'BOAT#boat-0')
+            raise RuntimeError('boom')
+
+        with patch.object(database, '_db_client', db), \
+             patch.object(db, 'log_usage_summary') as mock_summary:
+            response = handler({}, None)
+
+        assert response['statusCode'] == 500
+        mock_summary.assert_called_once()
+
+
+class TestCountItems:
+    """Test the Select=COUNT helper"""
+
+    def test_counts_across_pages(self, db):
+        """Test that counts from every scan page are added up and accounted"""
+        real_scan = db.table.scan
+
+        def small_pages(**kwargs):
+            return real_scan(Limit=3, **kwargs)
+
+        with patch.object(db.table, 'scan', side_effect=small_pages):
+            count = db.count_items(Attr('SK').begins_with('BOAT#'))
+
+        assert count == 5
+        assert db._usage['scan']['calls'] > 1
+        assert db._usage['scan']['returned'] == 5
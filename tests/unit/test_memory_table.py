@@ -0,0 +1,259 @@
+"""
+Unit tests for the in-memory DynamoDB stand-in
+
+Tests the Table API subset (writes, conditions, update expressions, query,
+scan, indexes, pagination) and its use behind DatabaseClient,
+ConfigurationManager and a Lambda handler.
+"""
+import json
+import pytest
+from decimal import Decimal
+from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
+
+from database import DatabaseClient, is_conditional_check_failure
+from configuration import ConfigurationManager
+from memory_table import MemoryDynamoDB, MemoryTable
+
+
+@pytest.fixture
+def table():
+    """Empty in-memory table with the production schema"""
+    table = MemoryTable('test-table')
+    for i in range(5):
+        table.put_item(Item={'PK': 'TEAM#team-1', 'SK': f'BOAT#boat-{i}', 'race_id': f'race-{i % 2}', 'seats': i})
+        table.put_item(Item={'PK': 'TEAM#team-1', 'SK': f'CREW#crew-{i}', 'license_number': f'LIC{i}'})
+    table.put_item(Item={'PK': 'TEAM#team-2', 'SK': 'BOAT#boat-9', 'race_id': 'race-1'})
+    return table
+
+
+class TestWrites:
+    """Test single-item writes"""
+
+    def test_put_and_get_round_trip_numbers_as_decimal(self, table):
+        """Test that stored numbers come back as Decimal and items are copies"""
+        item = table.get_item(Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-3'})['Item']
+        assert item['seats'] == Decimal('3')
+
+        item['seats'] = 99
+        assert table.get_item(Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-3'})['Item']['seats'] == 3
+
+    def test_missing_item_has_no_item_key(self, table):
+        """Test that a missing item returns no Item"""
+        assert 'Item' not in table.get_item(Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#missing'})
+
+    def test_floats_are_rejected(self, table):
+        """Test that floats raise TypeError as with boto3"""
+        with pytest.raises(TypeError):
+            table.put_item(Item={'PK': 'A', 'SK': 'B', 'price': 1.5})
+
+    def test_put_condition(self, table):
+        """Test that a failed ConditionExpression raises ConditionalCheckFailedException"""
+        with pytest.raises(ClientError) as exc_info:
+            table.put_item(
+                Item={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-0'},
+                ConditionExpression='attribute_not_exists(PK)'
+            )
+
+        assert is_conditional_check_failure(exc_info.value)
+
+    def test_update_expression_clauses(self, table):
+        """Test SET arithmetic, if_not_exists, list_append, REMOVE and ADD"""
+        response = table.update_item(
+            Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'},
+            UpdateExpression=(
+                'SET seats = seats + :one, #n = if_not_exists(#n, :zero), tags = list_append(:tags, :tags) '
+                'REMOVE race_id ADD counter :one'
+            ),
+            ExpressionAttributeNames={'#n': 'boat_number'},
+            ExpressionAttributeValues={':one': 1, ':zero': 0, ':tags': ['a']},
+            ReturnValues='ALL_NEW'
+        )
+
+        item = response['Attributes']
+        assert item['seats'] == 2
+        assert item['boat_number'] == 0
+        assert item['tags'] == ['a', 'a']
+        assert item['counter'] == 1
+        assert 'race_id' not in item
+
+    def test_update_with_boto3_condition(self, table):
+        """Test that boto3 condition objects are accepted like strings"""
+        with pytest.raises(ClientError) as exc_info:
+            table.update_item(
+                Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'},
+                UpdateExpression='SET seats = :v',
+                ExpressionAttributeValues={':v': 0},
+                ConditionExpression=Attr('race_id').eq('race-0') & Attr('seats').gt(0)
+            )
+
+        assert is_conditional_check_failure(exc_info.value)
+
+    def test_update_cannot_change_key(self, table):
+        """Test that key attributes cannot be updated"""
+        with pytest.raises(ClientError) as exc_info:
+            table.update_item(
+                Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'},
+                UpdateExpression='SET SK = :v',
+                ExpressionAttributeValues={':v': 'BOAT#other'}
+            )
+
+        assert exc_info.value.response['Error']['Code'] == 'ValidationException'
+
+    def test_unused_placeholder_is_rejected(self, table):
+        """Test that unused ExpressionAttributeValues are rejected as by DynamoDB"""
+        with pytest.raises(ClientError) as exc_info:
+            table.update_item(
+                Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-1'},
+                UpdateExpression='SET seats = :v',
+                ExpressionAttributeValues={':v': 0, ':unused': 1}
+            )
+
+        assert exc_info.value.response['Error']['Code'] == 'ValidationException'
+
+
+class TestReads:
+    """Test query, scan and pagination"""
+
+    def test_query_begins_with_in_sort_order(self, table):
+        """Test a key condition with begins_with, forward and backward"""
+        condition = Key('PK').eq('TEAM#team-1') & Key('SK').begins_with('BOAT#')
+
+        forward = table.query(KeyConditionExpression=condition)['Items']
+        backward = table.query(KeyConditionExpression=condition, ScanIndexForward=False)['Items']
+
+        assert [item['SK'] for item in forward] == [f'BOAT#boat-{i}' for i in range(5)]
+        assert backward == forward[::-1]
+
+    def test_query_between_and_filter(self, table):
+        """Test BETWEEN in a string key condition with a filter expression"""
+        response = table.query(
+            KeyConditionExpression='PK = :pk AND SK BETWEEN :low AND :high',
+            FilterExpression='race_id = :race',
+            ExpressionAttributeValues={':pk': 'TEAM#team-1', ':low': 'BOAT#boat-1', ':high': 'BOAT#boat-3', ':race': 'race-1'}
+        )
+
+        assert [item['SK'] for item in response['Items']] == ['BOAT#boat-1', 'BOAT#boat-3']
+        assert response['ScannedCount'] == 3
+
+    def test_query_gsi_is_sparse(self, table):
+        """Test that only items carrying the index key are in the index"""
+        response = table.query(IndexName='GSI3', KeyConditionExpression=Key('license_number').eq('LIC2'))
+
+        assert [item['SK'] for item in response['Items']] == ['CREW#crew-2']
+
+    def test_query_pagination(self, table):
+        """Test that Limit and LastEvaluatedKey walk every page once"""
+        kwargs = {'KeyConditionExpression': Key('PK').eq('TEAM#team-1'), 'Limit': 3}
+        seen = []
+        while True:
+            response = table.query(**kwargs)
+            seen.extend(item['SK'] for item in response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                break
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        assert len(seen) == 10
+        assert len(set(seen)) == 10
+
+    def test_scan_segments_partition_the_table(self, table):
+        """Test that parallel scan segments cover every item exactly once"""
+        keys = []
+        for segment in range(4):
+            items = table.scan(Segment=segment, TotalSegments=4)['Items']
+            keys.extend((item['PK'], item['SK']) for item in items)
+
+        assert len(keys) == len(set(keys)) == len(table)
+
+    def test_scan_count_and_projection(self, table):
+        """Test Select=COUNT and ProjectionExpression"""
+        count = table.scan(Select='COUNT', FilterExpression=Attr('SK').begins_with('BOAT#'))
+        projected = table.scan(ProjectionExpression='PK, #sk', ExpressionAttributeNames={'#sk': 'SK'})
+
+        assert count['Count'] == 6
+        assert 'Items' not in count
+        assert all(set(item) == {'PK', 'SK'} for item in projected['Items'])
+
+    def test_consumed_capacity_is_reported(self, table):
+        """Test that ReturnConsumedCapacity is honoured"""
+        response = table.get_item(Key={'PK': 'TEAM#team-1', 'SK': 'BOAT#boat-0'}, ReturnConsumedCapacity='TOTAL')
+
+        assert response['ConsumedCapacity']['CapacityUnits'] == 0.5
+
+
+class TestDatabaseClient:
+    """Test DatabaseClient and ConfigurationManager over the in-memory resource"""
+
+    @pytest.fixture
+    def db(self):
+        return DatabaseClient(table_name='test-table', dynamodb=MemoryDynamoDB())
+
+    def test_batch_operations(self, db):
+        """Test chunked batch writes and reads"""
+        items = [{'PK': 'TEAM#team-1', 'SK': f'CREW#crew-{i}'} for i in range(60)]
+        db.batch_write_items(items_to_put=items)
+
+        fetched = db.batch_get_items([(item['PK'], item['SK']) for item in items])
+
+        assert len(fetched) == 60
+        assert db.count_items() == 60
+
+    def test_transaction_is_all_or_nothing(self, db):
+        """Test that a failed condition cancels the whole transaction"""
+        db.put_item({'PK': 'TEAM#team-1', 'SK': 'CREW#crew-1', 'assigned_boat_id': None})
+        db.put_item({'PK': 'TEAM#team-1', 'SK': 'CREW#crew-2', 'assigned_boat_id': 'boat-2'})
+
+        with pytest.raises(ClientError) as exc_info:
+            db.transact_update_items([
+                {'pk': 'TEAM#team-1', 'sk': f'CREW#{crew_member_id}', 'updates': {'assigned_boat_id': 'boat-1'},
+                 'condition_expression': Attr('assigned_boat_id').attribute_type('NULL')}
+                for crew_member_id in ('crew-1', 'crew-2')
+            ])
+
+        assert is_conditional_check_failure(exc_info.value)
+        assert db.get_item('TEAM#team-1', 'CREW#crew-1')['assigned_boat_id'] is None
+
+    def test_parallel_scan(self, db):
+        """Test a segmented scan through the client"""
+        db.batch_write_items(items_to_put=[{'PK': f'TEAM#team-{i}', 'SK': 'BOAT#b'} for i in range(40)])
+
+        assert len(db.scan_table(segments=4)) == 40
+
+    def test_configuration_manager(self):
+        """Test that configuration is read and updated through the injected resource"""
+        dynamodb = MemoryDynamoDB()
+        dynamodb.Table('test-table').put_item(Item={'PK': 'CONFIG', 'SK': 'PRICING', 'base_seat_price': Decimal('20')})
+        config = ConfigurationManager(table_name='test-table', dynamodb=dynamodb)
+
+        assert config.get_pricing_config()['base_seat_price'] == 20
+        updated = config.update_config('PRICING', {'base_seat_price': Decimal('25')}, 'admin-1')
+        assert updated['base_seat_price'] == 25
+
+
+class TestHandlers:
+    """Test handlers running against the memory_table fixture"""
+
+    def test_create_crew_member(self, memory_table, mock_api_gateway_event, mock_lambda_context):
+        """Test a full handler invocation without moto"""
+        from crew.create_crew_member import lambda_handler
+
+        event = mock_api_gateway_event(
+            http_method='POST',
+            path='/crew',
+            body=json.dumps({
+                'first_name': 'Jeanne',
+                'last_name': 'Martin',
+                'date_of_birth': '1990-05-15',
+                'gender': 'F',
+                'license_number': 'ABC123456',
+                'club_affiliation': 'RCPM'
+            }),
+            user_id='test-team-manager-123'
+        )
+
+        response = lambda_handler(event, mock_lambda_context)
+
+        assert response['statusCode'] == 201
+        crew = [item for item in memory_table.items() if item['SK'].startswith('CREW#')]
+        assert len(crew) == 1
+        assert crew[0]['license_number'] == 'ABC123456'